@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+import argparse
 import csv
+import hashlib
+import json
+import os
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import date, timedelta
 from decimal import Decimal
@@ -16,6 +23,7 @@ from backend.dashboard_service import (
     tracked_stock_assets,
     yahoo_symbol,
 )
+from backend.money_backend import MONEY_BACKEND_ENV, FloatMoney, MoneyBackend, money_backend
 from backend.news_strategy import load_daily_news_counts, news_metrics
 
 
@@ -24,6 +32,7 @@ GRID_START = date(2026, 1, 1)
 TRAIN_END = date(2026, 3, 31)
 REPORT_FILE = ROOT / "research" / "signal_news_grid_search_since_2026-01-01.md"
 CSV_FILE = ROOT / "research" / "signal_news_grid_search_since_2026-01-01.csv"
+RESULTS_FILE = ROOT / "research" / "signal_news_grid_results.jsonl"
 ENTRY_SIGNAL_RULES = {
     "any-signal": {"fresh", "strict", "near"},
     "fresh-or-strict": {"fresh", "strict"},
@@ -34,6 +43,13 @@ ENTRY_NEWS_RULES = ("ignore", "active", "accelerating")
 EXIT_NEWS_RULES = ("ignore", "cooling", "zero")
 NONE_STREAKS = (5, 10, 15, 20)
 MOMENTUM_CUTOFFS = (Decimal("0"), Decimal("-5"), Decimal("-10"))
+CATEGORY_CODES = {None: 0, "fresh": 1, "strict": 2, "near": 3}
+MISSING_CODE = -1
+ENTRY_SIGNAL_MASKS = {
+    rule: sum(1 << CATEGORY_CODES[category] for category in categories)
+    for rule, categories in ENTRY_SIGNAL_RULES.items()
+}
+STRATEGY_CHUNK = 64
 
 
 @dataclass(frozen=True)
@@ -81,36 +97,68 @@ def exit_news_matches(rule: str, row: Observation) -> bool:
     raise ValueError(f"unknown exit news rule: {rule}")
 
 
-def build_observations(
-    charts: dict[str, tuple[object, ...]],
-    market_bars: tuple[object, ...],
-    counts_by_ticker: dict[str, dict[str, int]],
-    end: date,
-) -> tuple[list[date], dict[date, dict[str, Observation]]]:
-    sessions = [bar.day for bar in market_bars if GRID_START <= bar.day <= end]
-    observations: dict[date, dict[str, Observation]] = {}
+def observation_schedule(market_bars: tuple[object, ...], end: date) -> list[tuple[date, date]]:
+    schedule: list[tuple[date, date]] = []
     previous_session = on_or_before(market_bars, GRID_START - timedelta(days=1))
-    for session in sessions:
+    for bar in market_bars:
+        session = bar.day
+        if not GRID_START <= session <= end:
+            continue
         if not previous_session:
             previous_session = on_or_before(market_bars, session - timedelta(days=1))
-        daily: dict[str, Observation] = {}
-        for ticker, bars in charts.items():
-            price = on_or_before(bars, session)
-            if not price:
-                continue
-            signal_bars = tuple(bar for bar in bars if bar.day <= previous_session.day)
-            signal = live_signal(signal_bars)
-            one_month = (signal or {}).get("horizons", {}).get("1m", {})
-            news = news_metrics(counts_by_ticker.get(ticker, {}), previous_session.day)
-            daily[ticker] = Observation(
+        schedule.append((session, previous_session.day))
+        previous_session = bar
+    return schedule
+
+
+def ticker_observations(
+    bars: tuple[object, ...],
+    schedule: list[tuple[date, date]],
+    counts: dict[str, int],
+) -> list[Observation | None]:
+    ordinals = [bar.day.toordinal() for bar in bars]
+    rows: list[Observation | None] = []
+    for session, observed_day in schedule:
+        price_count = bisect_right(ordinals, session.toordinal())
+        if not price_count:
+            rows.append(None)
+            continue
+        signal = live_signal(tuple(bars[: bisect_right(ordinals, observed_day.toordinal())]))
+        one_month = (signal or {}).get("horizons", {}).get("1m", {})
+        news = news_metrics(counts, observed_day)
+        rows.append(
+            Observation(
                 category=entry_signal(signal),
                 one_month_return=Decimal(str(one_month.get("return_pct", "0"))),
                 articles_7d=int(news["articles_7d"]),
                 articles_prior_7d=int(news["articles_prior_7d"]),
-                close=price.close,
+                close=bars[price_count - 1].close,
             )
-        observations[session] = daily
-        previous_session = on_or_before(market_bars, session)
+        )
+    return rows
+
+
+def build_observations(
+    charts: dict[str, tuple[object, ...]],
+    market_bars: tuple[object, ...],
+    counts_by_ticker: dict[str, dict[str, int]],
+    end: date,
+    workers: int = 1,
+) -> tuple[list[date], dict[date, dict[str, Observation]]]:
+    schedule = observation_schedule(market_bars, end)
+    sessions = [session for session, _ in schedule]
+    tickers = list(charts)
+    arguments = [(charts[ticker], schedule, counts_by_ticker.get(ticker, {})) for ticker in tickers]
+    if workers > 1 and len(tickers) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            per_ticker = list(executor.map(ticker_observations, *zip(*arguments)))
+    else:
+        per_ticker = [ticker_observations(*values) for values in arguments]
+    observations: dict[date, dict[str, Observation]] = {session: {} for session in sessions}
+    for ticker, rows in zip(tickers, per_ticker):
+        for session, row in zip(sessions, rows):
+            if row is not None:
+                observations[session][ticker] = row
     return sessions, observations
 
 
@@ -118,9 +166,12 @@ def simulate(
     strategy: Strategy,
     sessions: list[date],
     observations: dict[date, dict[str, Observation]],
+    money: MoneyBackend | None = None,
 ) -> dict[str, object]:
+    money = money or money_backend()
+    entry_amount = money.amount(VARIABLE_ENTRY_USD)
     active: dict[str, dict[str, object]] = {}
-    closed_value = Decimal("0")
+    closed_value = money.zero
     deployed = Decimal("0")
     for session in sessions:
         rows = observations[session]
@@ -145,13 +196,13 @@ def simulate(
             if not should_exit:
                 active[ticker] = position
                 continue
-            closed_value += Decimal(str(position["shares"])) * row.close
+            closed_value += money.value(position["shares"], money.price(row.close))
         for ticker in sorted(technically_active - set(active)):
             row = rows[ticker]
             if not eligible_news(strategy.entry_news_rule, row):
                 continue
             active[ticker] = {
-                "shares": VARIABLE_ENTRY_USD / row.close,
+                "shares": money.shares(entry_amount, money.price(row.close)),
                 "none_streak": 0,
             }
             deployed += VARIABLE_ENTRY_USD
@@ -160,7 +211,8 @@ def simulate(
     for ticker, position in active.items():
         row = latest_rows.get(ticker)
         if row:
-            ending += Decimal(str(position["shares"])) * row.close
+            ending += money.value(position["shares"], money.price(row.close))
+    ending = money.to_decimal(ending)
     gain = ending - deployed
     return {
         "strategy": strategy.label,
@@ -179,6 +231,238 @@ def simulate(
     }
 
 
+@dataclass(frozen=True)
+class ObservationArrays:
+    tickers: tuple[str, ...]
+    sessions: tuple[date, ...]
+    category: array
+    one_month_return: array
+    articles_7d: array
+    articles_prior_7d: array
+    close: array
+
+    def fingerprint(self) -> str:
+        digest = hashlib.sha1("|".join(self.tickers).encode("utf-8"))
+        digest.update("|".join(session.isoformat() for session in self.sessions).encode("utf-8"))
+        for values in (self.category, self.one_month_return, self.articles_7d, self.articles_prior_7d, self.close):
+            digest.update(values.tobytes())
+        return digest.hexdigest()[:16]
+
+
+def observation_arrays(
+    sessions: list[date],
+    observations: dict[date, dict[str, Observation]],
+) -> ObservationArrays:
+    tickers = tuple(sorted({ticker for session in sessions for ticker in observations[session]}))
+    size = len(sessions) * len(tickers)
+    arrays = ObservationArrays(
+        tickers=tickers,
+        sessions=tuple(sessions),
+        category=array("b", [MISSING_CODE]) * size,
+        one_month_return=array("d", [0.0]) * size,
+        articles_7d=array("i", [0]) * size,
+        articles_prior_7d=array("i", [0]) * size,
+        close=array("d", [0.0]) * size,
+    )
+    for session_index, session in enumerate(sessions):
+        base = session_index * len(tickers)
+        rows = observations[session]
+        for ticker_index, ticker in enumerate(tickers):
+            row = rows.get(ticker)
+            if row is None:
+                continue
+            index = base + ticker_index
+            arrays.category[index] = CATEGORY_CODES[row.category]
+            arrays.one_month_return[index] = float(row.one_month_return)
+            arrays.articles_7d[index] = row.articles_7d
+            arrays.articles_prior_7d[index] = row.articles_prior_7d
+            arrays.close[index] = float(row.close)
+    return arrays
+
+
+def array_money_backend() -> MoneyBackend:
+    money = money_backend(os.environ.get(MONEY_BACKEND_ENV) or FloatMoney.name)
+    if money.name != FloatMoney.name:
+        raise ValueError(
+            f"{MONEY_BACKEND_ENV}={money.name} is not supported by the grid search, which runs float64 money math; "
+            f"unset it or set it to {FloatMoney.name}"
+        )
+    return money
+
+
+def simulate_arrays(
+    strategy: Strategy,
+    arrays: ObservationArrays,
+    first: int = 0,
+    last: int | None = None,
+) -> dict[str, object]:
+    last = len(arrays.sessions) if last is None else last
+    width = len(arrays.tickers)
+    mask = ENTRY_SIGNAL_MASKS[strategy.entry_signal_rule]
+    entry_news = ENTRY_NEWS_RULES.index(strategy.entry_news_rule)
+    exit_news = EXIT_NEWS_RULES.index(strategy.exit_news_rule)
+    cutoff = float(strategy.momentum_cutoff)
+    entry_usd = float(VARIABLE_ENTRY_USD)
+    category, one_month = arrays.category, arrays.one_month_return
+    articles, prior_articles, close = arrays.articles_7d, arrays.articles_prior_7d, arrays.close
+    active: dict[int, list[float]] = {}
+    closed_value = 0.0
+    entries = 0
+    for session_index in range(first, last):
+        base = session_index * width
+        for ticker_index in range(width):
+            index = base + ticker_index
+            code = category[index]
+            if code < 0:
+                continue
+            signalled = (mask >> code) & 1
+            position = active.get(ticker_index)
+            if position is not None:
+                if signalled:
+                    position[1] = 0
+                    continue
+                position[1] += 1
+                if position[1] < strategy.none_streak or one_month[index] > cutoff:
+                    continue
+                if exit_news == 1 and articles[index] > prior_articles[index]:
+                    continue
+                if exit_news == 2 and articles[index] != 0:
+                    continue
+                closed_value += position[0] * close[index]
+                del active[ticker_index]
+            elif signalled:
+                if entry_news == 1 and articles[index] <= 0:
+                    continue
+                if entry_news == 2 and articles[index] <= prior_articles[index]:
+                    continue
+                active[ticker_index] = [entry_usd / close[index], 0]
+                entries += 1
+    ending = closed_value
+    if last > first:
+        base = (last - 1) * width
+        for ticker_index, position in active.items():
+            if category[base + ticker_index] >= 0:
+                ending += position[0] * close[base + ticker_index]
+    deployed = entries * entry_usd
+    gain = ending - deployed
+    return {
+        "strategy": strategy.label,
+        "entry_signal_rule": strategy.entry_signal_rule,
+        "entry_news_rule": strategy.entry_news_rule,
+        "exit_news_rule": strategy.exit_news_rule,
+        "none_streak": strategy.none_streak,
+        "momentum_cutoff": strategy.momentum_cutoff,
+        "entries": entries,
+        "closed": entries - len(active),
+        "open": len(active),
+        "deployed": round(deployed, 6),
+        "ending": round(ending, 6),
+        "gain": round(gain, 6),
+        "return_pct": round(gain / deployed * 100, 6) if deployed else 0.0,
+    }
+
+
+_WORKER_STATE: tuple[ObservationArrays, int] | None = None
+
+
+def init_grid_worker(arrays: ObservationArrays, split: int) -> None:
+    global _WORKER_STATE
+    _WORKER_STATE = (arrays, split)
+
+
+def evaluate_strategies(strategies: list[Strategy]) -> list[dict[str, object]]:
+    arrays, split = _WORKER_STATE
+    rows = []
+    for strategy in strategies:
+        row = simulate_arrays(strategy, arrays)
+        row["train_return_pct"] = simulate_arrays(strategy, arrays, 0, split)["return_pct"]
+        row["test_return_pct"] = simulate_arrays(strategy, arrays, split)["return_pct"]
+        rows.append(row)
+    return rows
+
+
+def strategy_grid(
+    entry_signal_rules: tuple[str, ...] = tuple(ENTRY_SIGNAL_RULES),
+    entry_news_rules: tuple[str, ...] = ENTRY_NEWS_RULES,
+    exit_news_rules: tuple[str, ...] = EXIT_NEWS_RULES,
+    none_streaks: tuple[int, ...] = NONE_STREAKS,
+    momentum_cutoffs: tuple[Decimal, ...] = MOMENTUM_CUTOFFS,
+) -> list[Strategy]:
+    for rule in entry_signal_rules:
+        if rule not in ENTRY_SIGNAL_RULES:
+            raise ValueError(f"unknown entry signal rule: {rule}")
+    for rule in entry_news_rules:
+        if rule not in ENTRY_NEWS_RULES:
+            raise ValueError(f"unknown entry news rule: {rule}")
+    for rule in exit_news_rules:
+        if rule not in EXIT_NEWS_RULES:
+            raise ValueError(f"unknown exit news rule: {rule}")
+    return [
+        Strategy(*values)
+        for values in product(entry_signal_rules, entry_news_rules, exit_news_rules, none_streaks, momentum_cutoffs)
+    ]
+
+
+def read_finished_rows(path: Path, fingerprint: str) -> dict[str, dict[str, object]]:
+    finished: dict[str, dict[str, object]] = {}
+    if not path.exists():
+        return finished
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(row, dict) and row.pop("fingerprint", None) == fingerprint:
+                row["momentum_cutoff"] = Decimal(str(row["momentum_cutoff"]))
+                finished[str(row["strategy"])] = row
+    return finished
+
+
+def run_grid(
+    arrays: ObservationArrays,
+    strategies: list[Strategy],
+    results_file: Path | None = None,
+    workers: int = 1,
+) -> list[dict[str, object]]:
+    split = bisect_right([session.toordinal() for session in arrays.sessions], TRAIN_END.toordinal())
+    fingerprint = arrays.fingerprint()
+    finished = read_finished_rows(results_file, fingerprint) if results_file else {}
+    pending = [strategy for strategy in strategies if strategy.label not in finished]
+    chunks = [pending[index : index + STRATEGY_CHUNK] for index in range(0, len(pending), STRATEGY_CHUNK)]
+    handle = None
+    if results_file and pending:
+        results_file.parent.mkdir(parents=True, exist_ok=True)
+        handle = results_file.open("a", encoding="utf-8")
+    try:
+        def record(rows: list[dict[str, object]]) -> None:
+            for row in rows:
+                finished[str(row["strategy"])] = row
+                if handle:
+                    handle.write(json.dumps({"fingerprint": fingerprint, **row}, default=str) + "\n")
+            if handle:
+                handle.flush()
+
+        if workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_grid_worker, initargs=(arrays, split)) as executor:
+                for future in as_completed([executor.submit(evaluate_strategies, chunk) for chunk in chunks]):
+                    record(future.result())
+        else:
+            init_grid_worker(arrays, split)
+            for chunk in chunks:
+                record(evaluate_strategies(chunk))
+    finally:
+        if handle:
+            handle.close()
+    rows = [finished[strategy.label] for strategy in strategies]
+    rows.sort(key=lambda row: (float(row["return_pct"]), float(row["gain"])), reverse=True)
+    return rows
+
+
+def csv_list(value: str) -> tuple[str, ...]:
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
 def write_results(rows: list[dict[str, object]], counts_to_date: str | None, end: date) -> None:
     CSV_FILE.parent.mkdir(parents=True, exist_ok=True)
     with CSV_FILE.open("w", newline="", encoding="utf-8") as handle:
@@ -223,6 +507,40 @@ def write_results(rows: list[dict[str, object]], counts_to_date: str | None, end
 
 
 def main() -> int:
+    parser = argparse.ArgumentParser(description="Rank technical and Alpaca-news strategy combinations since January 1.")
+    parser.add_argument("--entry-signal-rules", type=csv_list, default=tuple(ENTRY_SIGNAL_RULES))
+    parser.add_argument("--entry-news-rules", type=csv_list, default=ENTRY_NEWS_RULES)
+    parser.add_argument("--exit-news-rules", type=csv_list, default=EXIT_NEWS_RULES)
+    parser.add_argument(
+        "--none-streaks",
+        type=lambda value: tuple(int(item) for item in csv_list(value)),
+        default=NONE_STREAKS,
+        help="Comma-separated missing-signal session counts, for example 3,5,10,20.",
+    )
+    parser.add_argument(
+        "--momentum-cutoffs",
+        type=lambda value: tuple(Decimal(item) for item in csv_list(value)),
+        default=MOMENTUM_CUTOFFS,
+        help="Comma-separated one-month return cutoffs in percent, for example 0,-5,-10.",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes for observations and strategies.")
+    parser.add_argument("--results", type=Path, default=RESULTS_FILE, help="Resumable JSONL result file.")
+    parser.add_argument("--restart", action="store_true", help="Discard finished rows in the result file first.")
+    args = parser.parse_args()
+    try:
+        array_money_backend()
+    except ValueError as exc:
+        parser.error(str(exc))
+    strategies = strategy_grid(
+        args.entry_signal_rules,
+        args.entry_news_rules,
+        args.exit_news_rules,
+        args.none_streaks,
+        args.momentum_cutoffs,
+    )
+    if args.restart and args.results.exists():
+        args.results.unlink()
+
     _, market_bars = fetch_chart("SPY")
     end_bar = on_or_before(market_bars, None)
     if not end_bar:
@@ -243,34 +561,17 @@ def main() -> int:
         market_bars,
         counts_by_ticker,
         end_bar.day,
+        args.workers,
     )
-    strategies = [
-        Strategy(*values)
-        for values in product(
-            ENTRY_SIGNAL_RULES,
-            ENTRY_NEWS_RULES,
-            EXIT_NEWS_RULES,
-            NONE_STREAKS,
-            MOMENTUM_CUTOFFS,
-        )
-    ]
-    train_sessions = [session for session in sessions if session <= TRAIN_END]
-    test_sessions = [session for session in sessions if session > TRAIN_END]
-    rows = []
-    for strategy in strategies:
-        row = simulate(strategy, sessions, observations)
-        train = simulate(strategy, train_sessions, observations)
-        test = simulate(strategy, test_sessions, observations)
-        row["train_return_pct"] = train["return_pct"]
-        row["test_return_pct"] = test["return_pct"]
-        rows.append(row)
-    rows.sort(key=lambda row: (row["return_pct"], row["gain"]), reverse=True)
+    arrays = observation_arrays(sessions, observations)
+    rows = run_grid(arrays, strategies, args.results, args.workers)
     write_results(rows, payload.get("to_date"), end_bar.day)
-    print(f"Tested {len(rows)} combinations from {GRID_START} to {end_bar.day}.")
+    print(f"Tested {len(rows)} combinations from {GRID_START} to {end_bar.day} on {args.workers} workers.")
     for rank, row in enumerate(rows[:10], start=1):
         print(f"{rank}. {row['strategy']}: gain=${row['gain']:,.2f} return={row['return_pct']:.2f}%")
     print(f"Wrote {REPORT_FILE}")
     print(f"Wrote {CSV_FILE}")
+    print(f"Wrote {args.results}")
     return 0
 
 
@@ -9,8 +9,9 @@ from datetime import date, datetime, timezone
 from decimal import Decimal
 from pathlib import Path
 from urllib.parse import quote, urlencode
-from urllib.request import Request, urlopen
+from urllib.request import Request
 
+from backend.http_transport import urlopen
 from compare_investors import TSX_SYMBOLS
 
 
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from array import array
 from collections import defaultdict
+from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal, InvalidOperation
 from typing import Any, Iterable
@@ -82,6 +84,70 @@ def resolved_instrument_metadata(
     }
 
 
+@dataclass(slots=True)
+class PositionColumns:
+    portfolio_names: list[str]
+    portfolio_codes: array
+    resolution_codes: array
+    values: list[Decimal]
+    resolutions: list[tuple[str, str, str, str]]
+    security_resolutions: dict[tuple[str, str], int]
+
+
+def position_columns(
+    portfolios: Iterable[dict[str, object]],
+    metadata: dict[tuple[str, str], dict[str, object]],
+    warnings: list[str],
+) -> PositionColumns:
+    columns = PositionColumns([], array("i"), array("i"), [], [], {})
+    raw_codes: dict[tuple[str, str, object, object], int] = {}
+    resolved_codes: dict[tuple[str, str, str, str], int] = {}
+    for portfolio in portfolios:
+        portfolio_name = str(portfolio.get("investor") or portfolio.get("portfolio_name"))
+        positions = portfolio.get("positions")
+        if not isinstance(positions, list):
+            warnings.append(f"{portfolio_name}: positions are unavailable")
+            continue
+        portfolio_code = len(columns.portfolio_names)
+        columns.portfolio_names.append(portfolio_name)
+        for position in positions:
+            if not isinstance(position, dict):
+                continue
+            value = decimal_value(position.get("current_value"))
+            if value <= 0:
+                continue
+            ticker, asset_type = normalized_key(
+                position.get("ticker"),
+                position.get("security_type") or position.get("asset_type"),
+            )
+            if not ticker:
+                warnings.append(f"{portfolio_name}: ignored a position without a ticker")
+                continue
+            raw_key = (ticker, asset_type, position.get("sector"), position.get("currency"))
+            code = raw_codes.get(raw_key)
+            if code is None:
+                meta = metadata.get((ticker, asset_type)) or metadata.get((ticker, "")) or {}
+                resolved = resolved_instrument_metadata(ticker, asset_type, position, meta)
+                resolution = (ticker, resolved["asset_type"], resolved["sector"], resolved["currency"])
+                code = resolved_codes.setdefault(resolution, len(columns.resolutions))
+                if code == len(columns.resolutions):
+                    columns.resolutions.append(resolution)
+                raw_codes[raw_key] = code
+            columns.portfolio_codes.append(portfolio_code)
+            columns.resolution_codes.append(code)
+            columns.values.append(value)
+            resolution = columns.resolutions[code]
+            columns.security_resolutions[(ticker, resolution[1])] = code
+    return columns
+
+
+def grouped_sums(codes: array, values: list[Decimal], size: int) -> list[Decimal]:
+    sums = [Decimal("0")] * size
+    for code, value in zip(codes, values):
+        sums[code] += value
+    return sums
+
+
 def allocation_rows(values: dict[str, Decimal], total: Decimal) -> list[dict[str, object]]:
     rows = [
         {
@@ -177,64 +243,42 @@ def build_allocation_response(
             continue
         unique_portfolios[key] = portfolio
 
+    warnings: list[str] = []
+    columns = position_columns(unique_portfolios.values(), metadata, warnings)
+    resolution_values = grouped_sums(columns.resolution_codes, columns.values, len(columns.resolutions))
     portfolio_values: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0"))
+    for name, value in zip(
+        columns.portfolio_names,
+        grouped_sums(columns.portfolio_codes, columns.values, len(columns.portfolio_names)),
+    ):
+        if value:
+            portfolio_values[name] += value
     sector_values: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0"))
     type_values: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0"))
     currency_values: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0"))
     security_values: defaultdict[tuple[str, str], Decimal] = defaultdict(lambda: Decimal("0"))
-    security_metadata: dict[tuple[str, str], dict[str, str]] = {}
-    warnings: list[str] = []
     classified_value = Decimal("0")
     type_classified_value = Decimal("0")
     sector_classified_value = Decimal("0")
     currency_classified_value = Decimal("0")
-    position_rows = 0
-
-    for portfolio in unique_portfolios.values():
-        portfolio_name = str(portfolio.get("investor") or portfolio.get("portfolio_name"))
-        positions = portfolio.get("positions")
-        if not isinstance(positions, list):
-            warnings.append(f"{portfolio_name}: positions are unavailable")
-            continue
-        for position in positions:
-            if not isinstance(position, dict):
-                continue
-            value = decimal_value(position.get("current_value"))
-            if value <= 0:
-                continue
-            ticker, asset_type = normalized_key(
-                position.get("ticker"),
-                position.get("security_type") or position.get("asset_type"),
-            )
-            if not ticker:
-                warnings.append(f"{portfolio_name}: ignored a position without a ticker")
-                continue
-            meta = metadata.get((ticker, asset_type)) or metadata.get((ticker, "")) or {}
-            resolved = resolved_instrument_metadata(ticker, asset_type, position, meta)
-            resolved_type = resolved["asset_type"]
-            sector = resolved["sector"]
-            currency = resolved["currency"]
-            complete = resolved_type != UNKNOWN and sector != UNKNOWN and currency != UNKNOWN
-            if complete:
-                classified_value += value
-            if resolved_type != UNKNOWN:
-                type_classified_value += value
-            if sector != UNKNOWN:
-                sector_classified_value += value
-            if currency != UNKNOWN:
-                currency_classified_value += value
-            portfolio_values[portfolio_name] += value
-            sector_values[sector] += value
-            type_values[resolved_type] += value
-            currency_values[currency] += value
-            security_values[(ticker, resolved_type)] += value
-            security_metadata[(ticker, resolved_type)] = {
-                "ticker": ticker,
-                "asset_type": resolved_type,
-                "sector": sector,
-                "currency": currency,
-            }
-            position_rows += 1
+    for (ticker, resolved_type, sector, currency), value in zip(columns.resolutions, resolution_values):
+        if resolved_type != UNKNOWN and sector != UNKNOWN and currency != UNKNOWN:
+            classified_value += value
+        if resolved_type != UNKNOWN:
+            type_classified_value += value
+        if sector != UNKNOWN:
+            sector_classified_value += value
+        if currency != UNKNOWN:
+            currency_classified_value += value
+        sector_values[sector] += value
+        type_values[resolved_type] += value
+        currency_values[currency] += value
+        security_values[(ticker, resolved_type)] += value
+    security_metadata = {
+        key: dict(zip(("ticker", "asset_type", "sector", "currency"), columns.resolutions[code]))
+        for key, code in columns.security_resolutions.items()
+    }
+    position_rows = len(columns.values)
 
     total = sum(portfolio_values.values(), Decimal("0"))
     portfolio_rows = allocation_rows(dict(portfolio_values), total)
@@ -3,16 +3,16 @@ from __future__ import annotations
 import sys
 import os
 import hashlib
+import json
 import threading
 import time
-from calendar import monthrange
 from datetime import date
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
 from typing import Any
 
 from fastapi import Body, FastAPI, HTTPException, Query
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 
@@ -24,6 +24,8 @@ from backend.dashboard_service import (  # noqa: E402
     HISTORY_START,
     PUBLIC_DASHBOARD,
     asset_detail,
+    benchmark_comparison,
+    chart_cache_report,
     latest_market_date,
     paper_ledger_summaries,
     parse_date,
@@ -40,8 +42,17 @@ from backend.dashboard_cache import (  # noqa: E402
     read_cache,
 )
 from backend.benchmark_service import benchmark_registry_response, upsert_benchmark  # noqa: E402
+from backend.multi_benchmark_service import multi_benchmark_comparison, multi_benchmark_overview  # noqa: E402
 from backend.correlation_service import correlation_response  # noqa: E402
-from backend.scenario_service import scenario_response  # noqa: E402
+from backend.scenario_service import (  # noqa: E402
+    BOOTSTRAP_BLOCK_SESSIONS,
+    BOOTSTRAP_HORIZON_SESSIONS,
+    BOOTSTRAP_PATHS,
+    BOOTSTRAP_SEED,
+    STRESS_WORST_WINDOWS,
+    historical_stress_replay,
+    scenario_response,
+)
 from backend.basket_service import (  # noqa: E402
     basket_performance,
     custom_basket_response,
@@ -59,20 +70,35 @@ from backend.day_rotation_service import daily_rotation_portfolio_response  # no
 from backend.external_portfolio_service import external_portfolio_response  # noqa: E402
 from backend.macro_statement_service import bank_of_canada_macro_context  # noqa: E402
 from backend.model_portfolio_service import (  # noqa: E402
+    MODEL_RISK_MODES,
     systematic_model_portfolio_response,
+    systematic_model_portfolio_responses,
     systematic_model_portfolio_v2_response,
     systematic_model_portfolio_v3_response,
     systematic_model_portfolio_v4_response,
 )
 from backend.news_service import market_news_dashboard, news_summary  # noqa: E402
+from backend.portfolio_detail_store import detail_store_report, detail_store_scope, stored_detail  # noqa: E402
 from backend.performance_service import portfolio_performance_response  # noqa: E402
 from backend.research_service import research_index_response, research_note_response  # noqa: E402
-from backend.rebalance_service import rebalance_preview, rebalance_profiles_response  # noqa: E402
+from backend.rebalance_service import (  # noqa: E402
+    optimize_all_profiles,
+    rebalance_preview,
+    rebalance_profiles_response,
+)
 from backend.risk_service import portfolio_risk_response  # noqa: E402
+from backend.simulation_checkpoints import checkpoint_dates  # noqa: E402
 from backend.strategy_registry_service import read_strategies, strategy_registry_response, upsert_strategy  # noqa: E402
+from backend.strategy_lab_service import (  # noqa: E402
+    iter_strategy_lab_batch,
+    rank_lab_results,
+    strategy_lab_batch_response,
+    strategy_lab_configs,
+)
 from backend.strategy_selector_service import strategy_selector_response  # noqa: E402
 from backend.universe_service import asset_universe_response, read_asset_universe, update_asset, upsert_asset  # noqa: E402
 from backend.wealth_intelligence_service import wealth_intelligence_response  # noqa: E402
+from backend.walk_forward_service import WALK_FORWARD_WINDOW_SESSIONS, walk_forward_response  # noqa: E402
 from backend.wealth_operations_service import wealth_operations_response  # noqa: E402
 
 
@@ -144,24 +170,13 @@ def startup() -> None:
 
 
 def month_checkpoints(start: date, end: date) -> list[dict[str, str]]:
-    checkpoints: list[dict[str, str]] = []
-    year, month = start.year, start.month
-    while (year, month) <= (end.year, end.month):
-        last_day = monthrange(year, month)[1]
-        for label, day in (("BOM", 1), ("Mid-month", 15), ("EOM", last_day)):
-            checkpoint = date(year, month, day)
-            if start <= checkpoint <= end:
-                checkpoints.append(
-                    {
-                        "label": f"{checkpoint.strftime('%b %Y')} {label}",
-                        "date": checkpoint.isoformat(),
-                    }
-                )
-        month += 1
-        if month == 13:
-            year += 1
-            month = 1
-    return checkpoints
+    return [
+        {
+            "label": f"{checkpoint.strftime('%b %Y')} {label}",
+            "date": checkpoint.isoformat(),
+        }
+        for label, checkpoint in checkpoint_dates(start, end)
+    ]
 
 
 def window(from_date: str | None, to_date: str | None) -> tuple[date, date | None]:
@@ -450,6 +465,16 @@ def get_preload_cache_rebuild() -> dict[str, object]:
     return preload_job_response(snapshot)
 
 
+@app.get("/api/chart-cache")
+def chart_cache() -> dict[str, object]:
+    return chart_cache_report()
+
+
+@app.get("/api/detail-store")
+def detail_store() -> dict[str, object]:
+    return detail_store_report()
+
+
 @app.get("/api/eod")
 def eod(wealthsimple_fx_fees: bool = Query(default=False)) -> dict[str, object]:
     return cached_or_build_eod(wealthsimple_fx_fees)
@@ -655,36 +680,38 @@ def day_rotation_portfolio(
 
 
 def strategy_selector_candidates(start: date, end: date, wealthsimple_fx_fees: bool) -> tuple[list[dict[str, object]], list[str]]:
-    candidates: list[dict[str, object]] = []
-    warnings: list[str] = []
-    for strategy_id, builder in [
-        ("systematic-model-portfolio", lambda: systematic_model_portfolio_response(end)),
-        ("systematic-model-portfolio-2", lambda: systematic_model_portfolio_v2_response(end)),
-        ("systematic-model-portfolio-3", lambda: systematic_model_portfolio_v3_response(end)),
-        ("systematic-model-portfolio-4", lambda: systematic_model_portfolio_v4_response(end)),
-        ("daily-eod-rotation-portfolio", lambda: daily_rotation_portfolio_response(end)),
-    ]:
+    with detail_store_scope():
+        candidates: list[dict[str, object]] = []
+        warnings: list[str] = []
         try:
-            detail = builder()
+            model_details = stored_model_portfolio_details(end, list(MODEL_RISK_MODES))
+        except ValueError as exc:
+            model_details = {}
+            warnings.extend(f"{strategy_id}: {exc}" for strategy_id in MODEL_RISK_MODES)
+        for strategy_id, detail in model_details.items():
             detail["label"] = strategy_id.replace("-", " ").title()
             candidates.append(detail)
-        except ValueError as exc:
-            warnings.append(f"{strategy_id}: {exc}")
-    for strategy_id in [
-        "watchlist-variable-news-optimized-experimental",
-        "master-portfolio",
-        "insta_watchlist",
-        "social_media_signal",
-        "model-portfolio",
-    ]:
         try:
-            detail = trader_detail(strategy_id, start, end, wealthsimple_fx_fees)
-            detail["label"] = strategy_id.replace("-", " ").replace("_", " ").title()
+            detail = wealth_portfolio_detail("daily-eod-rotation-portfolio", start, end, wealthsimple_fx_fees)
+            detail["label"] = "Daily Eod Rotation Portfolio"
             candidates.append(detail)
-        except KeyError:
-            warnings.append(f"{strategy_id}: not present in tracked paper ledgers for this window.")
         except ValueError as exc:
-            warnings.append(f"{strategy_id}: {exc}")
+            warnings.append(f"daily-eod-rotation-portfolio: {exc}")
+        for strategy_id in [
+            "watchlist-variable-news-optimized-experimental",
+            "master-portfolio",
+            "insta_watchlist",
+            "social_media_signal",
+            "model-portfolio",
+        ]:
+            try:
+                detail = wealth_portfolio_detail(strategy_id, start, end, wealthsimple_fx_fees)
+                detail["label"] = strategy_id.replace("-", " ").replace("_", " ").title()
+                candidates.append(detail)
+            except KeyError:
+                warnings.append(f"{strategy_id}: not present in tracked paper ledgers for this window.")
+            except ValueError as exc:
+                warnings.append(f"{strategy_id}: {exc}")
     return candidates, warnings
 
 
@@ -693,11 +720,21 @@ def wealth_strategy_selector(
     from_date: str | None = Query(default=None),
     to_date: str | None = Query(default=None),
     wealthsimple_fx_fees: bool = Query(default=False),
+    rolling: bool = Query(default=False),
 ) -> dict[str, object]:
     start, end = window(from_date, to_date)
     resolved_end = end or latest_market_date()
     candidates, warnings = strategy_selector_candidates(start, resolved_end, wealthsimple_fx_fees)
-    payload = strategy_selector_response(start, resolved_end, candidates, apply_wealthsimple_fx_fees=wealthsimple_fx_fees)
+    if rolling:
+        for detail in candidates:
+            detail["market_series"] = spy_series(detail)
+    payload = strategy_selector_response(
+        start,
+        resolved_end,
+        candidates,
+        apply_wealthsimple_fx_fees=wealthsimple_fx_fees,
+        include_rolling_risk=rolling,
+    )
     payload["warnings"] = sorted(set([*payload.get("warnings", []), *warnings]))
     return payload
 
@@ -727,35 +764,66 @@ def wealth_risk(
     from_date: str | None = Query(default=None),
     to_date: str | None = Query(default=None),
     wealthsimple_fx_fees: bool = Query(default=False),
+    exact: bool = Query(default=False),
+    rolling: bool = Query(default=False),
 ) -> dict[str, object]:
     start, end = window(from_date, to_date)
     resolved_end = end or latest_market_date()
     try:
         detail = wealth_portfolio_detail(portfolio, start, resolved_end, wealthsimple_fx_fees)
-        return portfolio_risk_response(detail, start, resolved_end)
+        return portfolio_risk_response(
+            detail,
+            start,
+            resolved_end,
+            exact=exact,
+            rolling=rolling,
+            market_series=spy_series(detail) if rolling else None,
+        )
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=f"unknown portfolio: {portfolio}") from exc
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
+def spy_series(detail: dict[str, object]) -> list[dict[str, object]] | None:
+    benchmark = detail.get("benchmark_comparison") if isinstance(detail.get("benchmark_comparison"), dict) else {}
+    if str(benchmark.get("benchmark") or "SPY") == "SPY":
+        return None
+    return list(benchmark_comparison(list(detail.get("series") or []), "SPY").get("benchmark_series") or [])
+
+
 def wealth_portfolio_detail(
     portfolio: str,
     start: date,
     end: date,
     wealthsimple_fx_fees: bool,
 ) -> dict[str, object]:
-    if portfolio == "systematic-model-portfolio":
-        return systematic_model_portfolio_response(end)
-    if portfolio == "systematic-model-portfolio-2":
-        return systematic_model_portfolio_v2_response(end)
-    if portfolio == "systematic-model-portfolio-3":
-        return systematic_model_portfolio_v3_response(end)
-    if portfolio == "systematic-model-portfolio-4":
-        return systematic_model_portfolio_v4_response(end)
+    if portfolio in MODEL_RISK_MODES:
+        return stored_model_portfolio_details(end, [portfolio])[portfolio]
     if portfolio == "daily-eod-rotation-portfolio":
-        return daily_rotation_portfolio_response(end)
-    return trader_detail(portfolio, start, end, wealthsimple_fx_fees)
+        return stored_detail(portfolio, None, end, False, lambda: daily_rotation_portfolio_response(end))
+    return stored_detail(
+        portfolio,
+        start,
+        end,
+        wealthsimple_fx_fees,
+        lambda: trader_detail(portfolio, start, end, wealthsimple_fx_fees),
+    )
+
+
+def stored_model_portfolio_details(end: date, portfolios: list[str]) -> dict[str, dict[str, object]]:
+    built: dict[str, dict[str, object]] = {}
+
+    def build(portfolio: str) -> dict[str, object]:
+        if not built:
+            built.update(systematic_model_portfolio_responses(end, portfolios=portfolios))
+        return built[portfolio]
+
+    with detail_store_scope():
+        return {
+            portfolio: stored_detail(portfolio, None, end, False, lambda: build(portfolio))
+            for portfolio in portfolios
+        }
 
 
 def detail_with_instrument_metadata(detail: dict[str, object]) -> dict[str, object]:
@@ -803,12 +871,20 @@ def wealth_correlation(
     from_date: str | None = Query(default=None),
     to_date: str | None = Query(default=None),
     wealthsimple_fx_fees: bool = Query(default=False),
+    max_positions: int | None = Query(default=None, ge=2),
+    clusters: bool = Query(default=False),
 ) -> dict[str, object]:
     start, end = window(from_date, to_date)
     resolved_end = end or latest_market_date()
     try:
         detail = wealth_portfolio_detail(portfolio, start, resolved_end, wealthsimple_fx_fees)
-        return correlation_response(detail, start, resolved_end)
+        return correlation_response(
+            detail,
+            start,
+            resolved_end,
+            max_positions=max_positions,
+            include_clusters=clusters,
+        )
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=f"unknown portfolio: {portfolio}") from exc
     except ValueError as exc:
@@ -821,19 +897,85 @@ def wealth_scenarios(
     from_date: str | None = Query(default=None),
     to_date: str | None = Query(default=None),
     wealthsimple_fx_fees: bool = Query(default=False),
+    simulate: bool = Query(default=False),
+    paths: int = Query(default=BOOTSTRAP_PATHS, ge=100, le=100_000),
+    horizon_sessions: int = Query(default=BOOTSTRAP_HORIZON_SESSIONS, ge=1, le=252),
+    block_sessions: int = Query(default=BOOTSTRAP_BLOCK_SESSIONS, ge=1, le=63),
+    seed: int = Query(default=BOOTSTRAP_SEED, ge=0),
+    replay_history: bool = Query(default=False),
 ) -> dict[str, object]:
     start, end = window(from_date, to_date)
     resolved_end = end or latest_market_date()
     try:
         detail = wealth_portfolio_detail(portfolio, start, resolved_end, wealthsimple_fx_fees)
         detail = detail_with_instrument_metadata(detail)
-        return scenario_response(detail)
+        return scenario_response(
+            detail,
+            simulate=simulate,
+            paths=paths,
+            horizon_sessions=horizon_sessions,
+            block_sessions=block_sessions,
+            seed=seed,
+            replay_history=replay_history,
+        )
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=f"unknown portfolio: {portfolio}") from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@app.get("/api/wealth/stress-replay")
+def wealth_stress_replay(
+    from_date: str | None = Query(default=None),
+    to_date: str | None = Query(default=None),
+    wealthsimple_fx_fees: bool = Query(default=False),
+    worst_windows: int = Query(default=STRESS_WORST_WINDOWS, ge=0, le=10),
+) -> dict[str, object]:
+    start, end = window(from_date, to_date)
+    resolved_end = end or latest_market_date()
+    candidates, warnings = strategy_selector_candidates(start, resolved_end, wealthsimple_fx_fees)
+    payload = historical_stress_replay(
+        [detail_with_instrument_metadata(detail) for detail in candidates],
+        resolved_end,
+        worst_windows=worst_windows,
+    )
+    payload["warnings"] = sorted(set([*payload["warnings"], *warnings]))
+    return payload
+
+
+@app.get("/api/wealth/benchmarks/compare")
+def wealth_benchmark_compare(
+    portfolio: str = Query(..., min_length=1),
+    from_date: str | None = Query(default=None),
+    to_date: str | None = Query(default=None),
+    wealthsimple_fx_fees: bool = Query(default=False),
+    include_series: bool = Query(default=False),
+) -> dict[str, object]:
+    start, end = window(from_date, to_date)
+    resolved_end = end or latest_market_date()
+    try:
+        detail = wealth_portfolio_detail(portfolio, start, resolved_end, wealthsimple_fx_fees)
+        return multi_benchmark_comparison(list(detail.get("series") or []), include_series=include_series)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=f"unknown portfolio: {portfolio}") from exc
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
+@app.get("/api/wealth/benchmarks/overview")
+def wealth_benchmark_overview(
+    from_date: str | None = Query(default=None),
+    to_date: str | None = Query(default=None),
+    wealthsimple_fx_fees: bool = Query(default=False),
+) -> dict[str, object]:
+    start, end = window(from_date, to_date)
+    resolved_end = end or latest_market_date()
+    candidates, warnings = strategy_selector_candidates(start, resolved_end, wealthsimple_fx_fees)
+    payload = multi_benchmark_overview(candidates)
+    payload["warnings"] = sorted(set([*payload["warnings"], *warnings]))
+    return payload
+
+
 @app.get("/api/wealth/allocation")
 def wealth_allocation(
     from_date: str | None = Query(default=None),
@@ -864,6 +1006,23 @@ def wealth_rebalance_preview(payload: dict[str, object] = Body(...)) -> dict[str
             list(payload.get("current_allocations") or []),
             Decimal(str(payload.get("portfolio_value") or 0)),
             exact_target=bool(payload.get("exact_target", False)),
+            mode=str(payload.get("mode") or "bands"),
+            apply_fx_fees=bool(payload.get("wealthsimple_fx_fees", False)),
+            min_trade_dollars=Decimal(str(payload.get("min_trade_dollars") or 0)),
+            sector_caps=dict(payload.get("sector_caps") or {}),
+        )
+    except (ValueError, InvalidOperation) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@app.post("/api/wealth/rebalance/optimize")
+def wealth_rebalance_optimize(payload: dict[str, object] = Body(...)) -> dict[str, object]:
+    try:
+        return optimize_all_profiles(
+            dict(payload.get("portfolios") or {}),
+            apply_fx_fees=bool(payload.get("wealthsimple_fx_fees", False)),
+            min_trade_dollars=Decimal(str(payload.get("min_trade_dollars") or 0)),
+            sector_caps=dict(payload.get("sector_caps") or {}),
         )
     except (ValueError, InvalidOperation) as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -883,6 +1042,26 @@ def create_or_update_strategy(payload: dict[str, object] = Body(...)) -> dict[st
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
+@app.get("/api/strategies/walk-forward")
+def strategies_walk_forward(
+    to_date: str | None = Query(default=None),
+    window_sessions: int = Query(default=WALK_FORWARD_WINDOW_SESSIONS, ge=1, le=252),
+    step_sessions: int | None = Query(default=None, ge=1),
+    strategy_id: str | None = Query(default=None),
+    wealthsimple_fx_fees: bool = Query(default=False),
+) -> dict[str, object]:
+    try:
+        end = parse_date(to_date)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="dates must use YYYY-MM-DD") from exc
+    try:
+        return walk_forward_response(end, window_sessions, step_sessions, strategy_id, wealthsimple_fx_fees)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=f"unknown strategy: {strategy_id}") from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
 @app.get("/api/strategies/{strategy_id}/preview")
 def strategy_preview(
     strategy_id: str,
@@ -945,6 +1124,32 @@ def run_strategy_lab(
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
+@app.post("/api/strategy-lab/batch", response_model=None)
+def run_strategy_lab_batch(
+    payload: dict[str, object] = Body(...),
+    from_date: str | None = Query(default=None),
+    to_date: str | None = Query(default=None),
+    wealthsimple_fx_fees: bool = Query(default=False),
+    stream: bool = Query(default=False),
+) -> dict[str, object] | StreamingResponse:
+    start, end = window(from_date, to_date)
+    try:
+        if not stream:
+            return strategy_lab_batch_response(start, end, payload, wealthsimple_fx_fees)
+        configs = strategy_lab_configs(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    def lines():
+        rows = []
+        for row in iter_strategy_lab_batch(start, end, configs, wealthsimple_fx_fees):
+            rows.append(row)
+            yield json.dumps({"type": "result", "completed": len(rows), "total": len(configs), **row}) + "\n"
+        yield json.dumps({"type": "ranking", "config_count": len(configs), **rank_lab_results(rows)}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @app.post("/api/notifications/daily-instructions")
 def daily_instructions(
     from_date: str | None = Query(default=None),
@@ -238,6 +238,33 @@ def should_rebalance(previous_day: date, current_day: date, frequency: str) -> b
     return False
 
 
+def aligned_closes(
+    components: list[dict[str, object]],
+    sessions: list[date],
+) -> list[list[Decimal | None]]:
+    columns: list[list[Decimal | None]] = []
+    for component in components:
+        bars = component["bars"]
+        column: list[Decimal | None] = []
+        index = 0
+        close: Decimal | None = None
+        for session in sessions:
+            while index < len(bars) and bars[index].day <= session:
+                close = bars[index].close
+                index += 1
+            column.append(close)
+        columns.append(column)
+    return columns
+
+
+def rebalance_indexes(sessions: list[date], frequency: str) -> list[int]:
+    return [0] + [
+        index
+        for index in range(1, len(sessions))
+        if should_rebalance(sessions[index - 1], sessions[index], frequency)
+    ]
+
+
 def basket_return_series(
     components: list[dict[str, object]],
     start: date,
@@ -256,44 +283,33 @@ def basket_return_series(
     )
     if not sessions:
         return []
-    portfolio_value = Decimal("1")
-    shares: dict[tuple[str, str], Decimal] = {}
-
-    def price_for(component: dict[str, object], day: date) -> Decimal | None:
-        bar = on_or_before(component["bars"], day)
-        return bar.close if bar else None
-
-    def rebalance(day: date) -> None:
-        shares.clear()
-        for component in components:
-            price = price_for(component, day)
-            if not price:
-                continue
-            key = (str(component["ticker"]), str(component["asset_type"]))
-            shares[key] = portfolio_value * Decimal(str(component["weight"])) / price
-
-    rebalance(sessions[0])
-    series: list[dict[str, object]] = []
-    previous_day = sessions[0]
-    for session in sessions:
-        current_value = Decimal("0")
-        for component in components:
-            key = (str(component["ticker"]), str(component["asset_type"]))
-            price = price_for(component, session)
-            if price and key in shares:
-                current_value += shares[key] * price
-        portfolio_value = current_value
-        series.append(
-            {
-                "date": session.isoformat(),
-                "value": as_float(portfolio_value),
-                "return_pct": as_float((portfolio_value - Decimal("1")) * Decimal("100")),
-            }
-        )
-        if should_rebalance(previous_day, session, rebalance_frequency):
-            rebalance(session)
-        previous_day = session
-    return series
+    columns = aligned_closes(components, sessions)
+    weights = [Decimal(str(component["weight"])) for component in components]
+    values: list[Decimal] = []
+    rebalances = rebalance_indexes(sessions, rebalance_frequency)
+    for period, first in enumerate(rebalances):
+        portfolio_value = values[-1] if values else Decimal("1")
+        held: list[tuple[Decimal, list[Decimal | None]]] = []
+        for weight, column in zip(weights, columns):
+            price = column[first]
+            if price:
+                held.append((portfolio_value * weight / price, column))
+        last = rebalances[period + 1] if period + 1 < len(rebalances) else len(sessions) - 1
+        for index in range(len(values), last + 1):
+            current_value = Decimal("0")
+            for shares, column in held:
+                price = column[index]
+                if price:
+                    current_value += shares * price
+            values.append(current_value)
+    return [
+        {
+            "date": session.isoformat(),
+            "value": as_float(value),
+            "return_pct": as_float((value - Decimal("1")) * Decimal("100")),
+        }
+        for session, value in zip(sessions, values)
+    ]
 
 
 def basket_performance(
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Callable, Generic, TypeVar
+
+
+T = TypeVar("T")
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ChartCache(Generic[T]):
+    def __init__(
+        self,
+        loader: Callable[[str], T],
+        max_entries: int | None = 512,
+        *,
+        max_bytes: int | None = None,
+        sizeof: Callable[[T], int] | None = None,
+        updater: Callable[[str, T], T] | None = None,
+        needs_refresh: Callable[[str, datetime, datetime], bool] | None = None,
+        clock: Callable[[], datetime] = utc_now,
+    ) -> None:
+        self.loader = loader
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.updater = updater
+        self.needs_refresh = needs_refresh
+        self.clock = clock
+        self._entries: OrderedDict[str, T] = OrderedDict()
+        self._fetched_at: dict[str, datetime] = {}
+        self._sizes: dict[str, int] = {}
+        self._total_bytes = 0
+        self._loading: dict[str, Future[T]] = {}
+        self._refreshing: dict[str, Future[T]] = {}
+        self._lock = Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "shared_waits": 0,
+            "loads": 0,
+            "refreshes": 0,
+            "stale_hits": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+
+    def get(self, symbol: str) -> T:
+        with self._lock:
+            if symbol in self._entries:
+                self._entries.move_to_end(symbol)
+                value = self._entries[symbol]
+                stale = (
+                    self.needs_refresh is not None
+                    and symbol not in self._refreshing
+                    and self.needs_refresh(symbol, self._fetched_at[symbol], self.clock())
+                )
+                if not stale:
+                    self._stats["hits"] += 1
+                    return value
+                self._stats["stale_hits"] += 1
+                future: Future[T] = Future()
+                self._refreshing[symbol] = future
+                self._stats["refreshes"] += 1
+                owner = None
+            else:
+                future = self._loading.get(symbol)
+                owner = future is None
+                if owner:
+                    future = Future()
+                    self._loading[symbol] = future
+                    self._stats["misses"] += 1
+                else:
+                    self._stats["shared_waits"] += 1
+        if owner is None:
+            try:
+                return self._load(symbol, future, self._refreshing, self._update_loader(value))
+            except Exception:
+                return value
+        if not owner:
+            return future.result()
+        return self._load(symbol, future, self._loading, self.loader)
+
+    def refresh(self, symbol: str) -> T:
+        with self._lock:
+            value = self._entries.get(symbol)
+            cached = symbol in self._entries
+            if cached:
+                future = self._refreshing.get(symbol)
+                owner = future is None
+                if owner:
+                    future = Future()
+                    self._refreshing[symbol] = future
+                    self._stats["refreshes"] += 1
+        if not cached:
+            return self.get(symbol)
+        if not owner:
+            return future.result()
+        return self._load(symbol, future, self._refreshing, self._update_loader(value))
+
+    def peek(self, symbol: str) -> T | None:
+        with self._lock:
+            return self._entries.get(symbol)
+
+    def fetched_at(self, symbol: str) -> datetime | None:
+        with self._lock:
+            return self._fetched_at.get(symbol)
+
+    def put(self, symbol: str, value: T) -> None:
+        with self._lock:
+            self._store(symbol, value)
+
+    def invalidate(self, symbol: str) -> None:
+        with self._lock:
+            self._discard(symbol)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._fetched_at.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def symbols(self) -> list[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "in_flight": len(self._loading) + len(self._refreshing),
+                "max_entries": self.max_entries,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def entries(self) -> list[tuple[str, T, datetime, int]]:
+        with self._lock:
+            return [
+                (symbol, value, self._fetched_at[symbol], self._sizes.get(symbol, 0))
+                for symbol, value in self._entries.items()
+            ]
+
+    def _update_loader(self, value: T) -> Callable[[str], T]:
+        if self.updater is None:
+            return self.loader
+        updater = self.updater
+        return lambda symbol: updater(symbol, value)
+
+    def _load(
+        self,
+        symbol: str,
+        future: Future[T],
+        pending: dict[str, Future[T]],
+        loader: Callable[[str], T],
+    ) -> T:
+        try:
+            value = loader(symbol)
+        except BaseException as exc:
+            with self._lock:
+                pending.pop(symbol, None)
+                self._stats["errors"] += 1
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._stats["loads"] += 1
+            self._store(symbol, value)
+            pending.pop(symbol, None)
+        future.set_result(value)
+        return value
+
+    def _store(self, symbol: str, value: T) -> None:
+        self._discard(symbol)
+        self._entries[symbol] = value
+        self._fetched_at[symbol] = self.clock()
+        if self.sizeof is not None:
+            self._sizes[symbol] = self.sizeof(value)
+            self._total_bytes += self._sizes[symbol]
+        while len(self._entries) > 1 and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+        ):
+            self._discard(next(iter(self._entries)))
+            self._stats["evictions"] += 1
+
+    def _discard(self, symbol: str) -> None:
+        self._entries.pop(symbol, None)
+        self._fetched_at.pop(symbol, None)
+        self._total_bytes -= self._sizes.pop(symbol, 0)
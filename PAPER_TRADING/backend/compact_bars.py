@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Iterable
+
+
+@dataclass(frozen=True, slots=True)
+class Bar:
+    day: date
+    close: Decimal
+    volume: Decimal
+
+
+def volume_decimal(value: float) -> Decimal:
+    return Decimal(int(value)) if value.is_integer() else Decimal(repr(value))
+
+
+class CompactBars(Sequence):
+    __slots__ = ("ordinals", "closes", "volumes", "_bars")
+
+    def __init__(
+        self,
+        ordinals: array | None = None,
+        closes: array | None = None,
+        volumes: array | None = None,
+    ) -> None:
+        self.ordinals = ordinals if ordinals is not None else array("i")
+        self.closes = closes if closes is not None else array("d")
+        self.volumes = volumes if volumes is not None else array("d")
+        self._bars: tuple[Bar, ...] | None = None
+
+    @classmethod
+    def from_bars(cls, bars: Iterable[Bar]) -> CompactBars:
+        compact = cls()
+        for bar in bars:
+            compact.ordinals.append(bar.day.toordinal())
+            compact.closes.append(float(bar.close))
+            compact.volumes.append(float(bar.volume))
+        return compact
+
+    def view(self) -> CompactBars:
+        return CompactBars(self.ordinals, self.closes, self.volumes)
+
+    def materialize(self) -> tuple[Bar, ...]:
+        if self._bars is None:
+            self._bars = tuple(
+                Bar(date.fromordinal(ordinal), Decimal(repr(close)), volume_decimal(volume))
+                for ordinal, close, volume in zip(self.ordinals, self.closes, self.volumes)
+            )
+        return self._bars
+
+    def first_day(self) -> date | None:
+        return date.fromordinal(self.ordinals[0]) if self.ordinals else None
+
+    def last_day(self) -> date | None:
+        return date.fromordinal(self.ordinals[-1]) if self.ordinals else None
+
+    def spliced(self, recent: CompactBars) -> CompactBars:
+        if not recent.ordinals:
+            return self
+        keep = len(self.ordinals)
+        while keep and self.ordinals[keep - 1] >= recent.ordinals[0]:
+            keep -= 1
+        return CompactBars(
+            self.ordinals[:keep] + recent.ordinals,
+            self.closes[:keep] + recent.closes,
+            self.volumes[:keep] + recent.volumes,
+        )
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self) + sum(sys.getsizeof(column) for column in (self.ordinals, self.closes, self.volumes))
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def __getitem__(self, index):
+        return self.materialize()[index]
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+    def __reversed__(self):
+        return reversed(self.materialize())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompactBars):
+            return (self.ordinals, self.closes, self.volumes) == (other.ordinals, other.closes, other.volumes)
+        if isinstance(other, tuple):
+            return self.materialize() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __add__(self, other: object) -> tuple[Bar, ...]:
+        return self.materialize() + tuple(other)
+
+    def __radd__(self, other: object) -> tuple[Bar, ...]:
+        return tuple(other) + self.materialize()
+
+    def __repr__(self) -> str:
+        return f"CompactBars({len(self)} bars, {self.first_day()} to {self.last_day()})"
+
+
+def estimated_bar_tuple_bytes(bars: CompactBars) -> int:
+    if not bars:
+        return sys.getsizeof(())
+    sample = Bar(date.fromordinal(bars.ordinals[-1]), Decimal(repr(bars.closes[-1])), volume_decimal(bars.volumes[-1]))
+    per_bar = sum(sys.getsizeof(value) for value in (sample, sample.day, sample.close, sample.volume))
+    return sys.getsizeof(()) + len(bars) * (per_bar + 8)
@@ -3,15 +3,18 @@ from __future__ import annotations
 from collections import defaultdict
 from datetime import date
 from math import sqrt
+from operator import mul
 from typing import Callable, Iterable
 
 from backend.dashboard_service import fetch_chart, yahoo_symbol
+from backend.returns_store import symbol_returns
 
 
 SCHEMA_VERSION = "1.0"
-CALCULATION_VERSION = "correlation-overlap-1.0"
+CALCULATION_VERSION = "correlation-overlap-1.1"
 MAX_INTERACTIVE_POSITIONS = 12
 DEFAULT_MINIMUM_OBSERVATIONS = 20
+CLUSTER_CORRELATION_THRESHOLD = 0.7
 PriceLoader = Callable[[str, str, date, date], dict[date, float]]
 
 
@@ -30,7 +33,7 @@ def position_values(detail: dict[str, object]) -> dict[str, float]:
     return dict(values)
 
 
-def top_positions(detail: dict[str, object], limit: int = MAX_INTERACTIVE_POSITIONS) -> list[dict[str, object]]:
+def top_positions(detail: dict[str, object], limit: int | None = MAX_INTERACTIVE_POSITIONS) -> list[dict[str, object]]:
     values = position_values(detail)
     total = sum(values.values())
     rows = [
@@ -58,20 +61,159 @@ def pair_correlation(
     dates = sorted(set(left) & set(right))
     if len(dates) < minimum_observations:
         return {"correlation": None, "observations": len(dates), "warning": "insufficient aligned history"}
-    left_values = [left[day] for day in dates]
-    right_values = [right[day] for day in dates]
-    left_mean = sum(left_values) / len(left_values)
-    right_mean = sum(right_values) / len(right_values)
-    left_variance = sum((value - left_mean) ** 2 for value in left_values)
-    right_variance = sum((value - right_mean) ** 2 for value in right_values)
+    return aligned_correlation([left[day] for day in dates], [right[day] for day in dates])
+
+
+def centered(values: list[float]) -> tuple[list[float], float]:
+    mean = sum(values) / len(values)
+    deviations = [value - mean for value in values]
+    return deviations, sum(value**2 for value in deviations)
+
+
+def aligned_correlation(
+    left_values: list[float],
+    right_values: list[float],
+    left: tuple[list[float], float] | None = None,
+    right: tuple[list[float], float] | None = None,
+) -> dict[str, object]:
+    left_deviations, left_variance = left or centered(left_values)
+    right_deviations, right_variance = right or centered(right_values)
     if left_variance == 0 or right_variance == 0:
-        return {"correlation": None, "observations": len(dates), "warning": "zero-variance return series"}
-    covariance = sum(
-        (left_value - left_mean) * (right_value - right_mean)
-        for left_value, right_value in zip(left_values, right_values)
-    )
+        return {"correlation": None, "observations": len(left_values), "warning": "zero-variance return series"}
+    covariance = sum(map(mul, left_deviations, right_deviations))
     correlation = covariance / sqrt(left_variance * right_variance)
-    return {"correlation": max(-1.0, min(1.0, correlation)), "observations": len(dates), "warning": None}
+    return {"correlation": max(-1.0, min(1.0, correlation)), "observations": len(left_values), "warning": None}
+
+
+def aligned_returns(
+    return_series: dict[str, dict[date, float]],
+    tickers: list[str],
+) -> tuple[list[date], list[list[float | None]], list[int]]:
+    calendar = sorted({day for ticker in tickers for day in return_series.get(ticker, {})})
+    rows: list[list[float | None]] = []
+    masks: list[int] = []
+    for ticker in tickers:
+        returns = return_series.get(ticker, {})
+        row = [returns.get(day) for day in calendar]
+        rows.append(row)
+        masks.append(sum(1 << index for index, value in enumerate(row) if value is not None))
+    return calendar, rows, masks
+
+
+def correlation_matrix(
+    return_series: dict[str, dict[date, float]],
+    tickers: list[str],
+    minimum_observations: int = DEFAULT_MINIMUM_OBSERVATIONS,
+) -> list[dict[str, object]]:
+    _, rows, masks = aligned_returns(return_series, tickers)
+    present = [[value for value in row if value is not None] for row in rows]
+    full = [centered(values) if len(values) >= minimum_observations else None for values in present]
+    pairs: list[dict[str, object]] = []
+    for left_index, left in enumerate(tickers):
+        left_row = rows[left_index]
+        left_mask = masks[left_index]
+        for right_index in range(left_index + 1, len(tickers)):
+            right_mask = masks[right_index]
+            shared = left_mask & right_mask
+            observations = shared.bit_count()
+            if observations < minimum_observations:
+                result: dict[str, object] = {
+                    "correlation": None,
+                    "observations": observations,
+                    "warning": "insufficient aligned history",
+                }
+            elif left_mask == right_mask:
+                result = aligned_correlation(
+                    present[left_index],
+                    present[right_index],
+                    full[left_index],
+                    full[right_index],
+                )
+            else:
+                right_row = rows[right_index]
+                indexes = [index for index, value in enumerate(left_row) if value is not None and right_row[index] is not None]
+                result = aligned_correlation(
+                    [float(left_row[index]) for index in indexes],
+                    [float(right_row[index]) for index in indexes],
+                )
+            pairs.append({"left": left, "right": tickers[right_index], **result})
+    return pairs
+
+
+def correlation_lookup(pairs: list[dict[str, object]]) -> dict[tuple[str, str], float]:
+    lookup: dict[tuple[str, str], float] = {}
+    for row in pairs:
+        if row["correlation"] is None:
+            continue
+        lookup[(str(row["left"]), str(row["right"]))] = float(row["correlation"])
+        lookup[(str(row["right"]), str(row["left"]))] = float(row["correlation"])
+    return lookup
+
+
+def effective_number_of_bets(weights: dict[str, float], lookup: dict[tuple[str, str], float]) -> float | None:
+    total = sum(weights.values())
+    if total <= 0:
+        return None
+    shares = {ticker: weight / total for ticker, weight in weights.items()}
+    variance = sum(
+        left_share * right_share * (1.0 if left == right else lookup.get((left, right), 0.0))
+        for left, left_share in shares.items()
+        for right, right_share in shares.items()
+    )
+    return 1 / variance if variance > 0 else None
+
+
+def correlation_clusters(
+    tickers: list[str],
+    weights: dict[str, float],
+    lookup: dict[tuple[str, str], float],
+    threshold: float = CLUSTER_CORRELATION_THRESHOLD,
+) -> list[dict[str, object]]:
+    groups = [[ticker] for ticker in tickers]
+    sums = [[lookup.get((left, right), 0.0) for right in tickers] for left in tickers]
+    counts = [[int((left, right) in lookup) for right in tickers] for left in tickers]
+    inner = [(0.0, 0) for _ in tickers]
+
+    while len(groups) > 1:
+        best: tuple[float, int, int] | None = None
+        for left_index in range(len(groups)):
+            left_sums, left_counts = sums[left_index], counts[left_index]
+            for right_index in range(left_index + 1, len(groups)):
+                if not left_counts[right_index]:
+                    continue
+                value = left_sums[right_index] / left_counts[right_index]
+                if value >= threshold and (best is None or value > best[0]):
+                    best = (value, left_index, right_index)
+        if best is None:
+            break
+        _, left_index, right_index = best
+        left_inner, right_inner = inner[left_index], inner.pop(right_index)
+        inner[left_index] = (
+            left_inner[0] + right_inner[0] + sums[left_index][right_index],
+            left_inner[1] + right_inner[1] + counts[left_index][right_index],
+        )
+        for matrix in (sums, counts):
+            merged = [value + other for value, other in zip(matrix[left_index], matrix.pop(right_index))]
+            del merged[right_index]
+            for row, value in zip(matrix, merged):
+                del row[right_index]
+                row[left_index] = value
+            matrix[left_index] = merged
+        groups[left_index] = groups[left_index] + groups.pop(right_index)
+
+    total = sum(weights.values())
+    clusters = []
+    for group, (inner_sum, inner_count) in zip(groups, inner):
+        weight = sum(weights.get(ticker, 0.0) for ticker in group)
+        clusters.append(
+            {
+                "tickers": sorted(group),
+                "size": len(group),
+                "weight_pct": weight / total * 100 if total else 0.0,
+                "average_correlation": inner_sum / inner_count if inner_count else None,
+            }
+        )
+    return sorted(clusters, key=lambda row: (-float(row["weight_pct"]), row["tickers"]))
 
 
 def default_price_loader(ticker: str, asset_type: str, start: date, end: date) -> dict[date, float]:
@@ -79,6 +221,12 @@ def default_price_loader(ticker: str, asset_type: str, start: date, end: date) -
     return {bar.day: float(bar.close) for bar in bars if start <= bar.day <= end}
 
 
+def stored_returns(ticker: str, asset_type: str, start: date, end: date) -> dict[date, float]:
+    symbol = yahoo_symbol(ticker, asset_type or "stock")
+    _, bars = fetch_chart(symbol)
+    return symbol_returns(symbol, bars).window(start, end).simple_by_day()
+
+
 def diversification_warning(valid_pairs: list[dict[str, object]], security_count: int) -> str | None:
     if security_count < 2:
         return "Fewer than two positions have usable values; correlation cannot assess diversification."
@@ -99,8 +247,10 @@ def correlation_response(
     *,
     price_loader: PriceLoader = default_price_loader,
     minimum_observations: int = DEFAULT_MINIMUM_OBSERVATIONS,
+    max_positions: int | None = None,
+    include_clusters: bool = False,
 ) -> dict[str, object]:
-    selected = top_positions(portfolio_detail)
+    selected = top_positions(portfolio_detail, max_positions)
     raw_positions = position_values(portfolio_detail)
     position_types = {
         str(row.get("ticker") or "").strip().upper(): str(
@@ -114,8 +264,11 @@ def correlation_response(
     for row in selected:
         ticker = str(row["ticker"])
         try:
-            prices = price_loader(ticker, position_types.get(ticker, "stock"), start, end)
-            returns = close_returns(prices)
+            asset_type = position_types.get(ticker, "stock")
+            if price_loader is default_price_loader:
+                returns = stored_returns(ticker, asset_type, start, end)
+            else:
+                returns = close_returns(price_loader(ticker, asset_type, start, end))
             if len(returns) < minimum_observations:
                 warnings.append(f"{ticker}: only {len(returns)} close-to-close returns available")
             return_series[ticker] = returns
@@ -123,18 +276,16 @@ def correlation_response(
             warnings.append(f"{ticker}: price history unavailable: {exc}")
             return_series[ticker] = {}
 
-    pairs: list[dict[str, object]] = []
     tickers = [str(row["ticker"]) for row in selected]
-    for index, left in enumerate(tickers):
-        for right in tickers[index + 1 :]:
-            result = pair_correlation(return_series[left], return_series[right], minimum_observations)
-            pairs.append({"left": left, "right": right, **result})
+    pairs = correlation_matrix(return_series, tickers, minimum_observations)
+    lookup = correlation_lookup(pairs)
+    weights = {str(row["ticker"]): float(row["current_value"]) for row in selected}
     valid_pairs = [row for row in pairs if row["correlation"] is not None]
     valid_pairs.sort(key=lambda row: float(row["correlation"]), reverse=True)
     correlations = [float(row["correlation"]) for row in valid_pairs]
     omitted_count = max(len(raw_positions) - len(selected), 0)
     if omitted_count:
-        warnings.append(f"Limited interactive analysis to the top {len(selected)} positions; omitted {omitted_count} smaller positions.")
+        warnings.append(f"Limited analysis to the top {len(selected)} positions; omitted {omitted_count} smaller positions.")
 
     return {
         "schema_version": SCHEMA_VERSION,
@@ -147,6 +298,15 @@ def correlation_response(
         "total_position_count": len(raw_positions),
         "minimum_observations": minimum_observations,
         "pairwise_correlations": pairs,
+        "correlation_matrix": {
+            "tickers": tickers,
+            "correlations": [
+                [1.0 if left == right else lookup.get((left, right)) for right in tickers]
+                for left in tickers
+            ],
+        },
+        "effective_number_of_bets": effective_number_of_bets(weights, lookup),
+        **({"clusters": correlation_clusters(tickers, weights, lookup)} if include_clusters else {}),
         "average_correlation": sum(correlations) / len(correlations) if correlations else None,
         "highest_correlation_pairs": valid_pairs[:5],
         "lowest_correlation_pairs": list(reversed(valid_pairs[-5:])),
@@ -157,7 +317,8 @@ def correlation_response(
             "unavailable_pair_count": len(pairs) - len(valid_pairs),
             "assumptions": [
                 "Correlation uses aligned close-to-close returns and does not fill missing dates.",
-                "Interactive analysis is limited to the 12 largest current positions.",
+                "Every current position is analyzed unless a position limit is requested.",
+                "Effective number of bets is 1 / (w' C w) over value weights; unavailable pairs count as uncorrelated.",
                 "Correlation is historical co-movement, not a forecast or guarantee of diversification.",
                 "ETF look-through overlap is unavailable.",
             ],
@@ -4,18 +4,28 @@ import csv
 import json
 import math
 import os
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
-from functools import lru_cache
 from pathlib import Path
+from threading import Lock
+from typing import Callable, Iterator
 from urllib.parse import quote, urlencode
-from urllib.request import Request, urlopen
-
+from urllib.request import Request
+
+from backend.chart_cache import ChartCache
+from backend.compact_bars import Bar, CompactBars, estimated_bar_tuple_bytes
+from backend.detail_memo import detail_key, recall_detail, remember_detail
+from backend.fx_service import WEALTHSIMPLE_FX_FEE, fee_adjusted, forward_filled, fx_series
+from backend.http_transport import transport_mode, urlopen
+from backend.market_calendar import chart_needs_refresh as market_chart_needs_refresh
+from backend.money_backend import MoneyBackend, money_backend
 from backend.news_strategy import NEWS_STRATEGIES, load_daily_news_counts, news_metrics, should_exit as news_should_exit
-from backend.wealthsimple_metadata import WEALTHSIMPLE_FX_FEE_RATE, wealthsimple_metadata
+from backend.returns_store import returns_store_report, symbol_returns
+from backend.simulation_checkpoints import SimulationCheckpoints, series_tail
+from backend.simulation_kernel import MARKET_KEY, Order, SessionPrices, simulate, simulation_days
+from backend.wealthsimple_metadata import wealthsimple_metadata
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -24,6 +34,8 @@ MASS_CHANGE_WATCHLIST_FILE = ROOT / "data" / "mass_change_watchlist.csv"
 DEFAULT_START = date(2026, 5, 20)
 HISTORY_START = date(2026, 1, 1)
 FETCH_START = date(2025, 12, 1)
+CHART_TAIL_OVERLAP_DAYS = 7
+DEFAULT_CHART_CACHE_MB = 64
 TSX_SYMBOLS = {
     "ATD": "ATD.TO",
     "BNS": "BNS.TO",
@@ -226,7 +238,6 @@ VARIABLE_STRATEGY_START = date(2026, 1, 31)
 VARIABLE_ENTRY_USD = Decimal("1000")
 MASTER_POSITION_LIMIT = 25
 MASTER_SECTOR_LIMIT = 5
-WEALTHSIMPLE_FX_FEE = Decimal(str(WEALTHSIMPLE_FX_FEE_RATE))
 SUMMARY_KEYS = (
     "investor",
     "initial_value",
@@ -261,13 +272,6 @@ LOW_PRIORITY_PORTFOLIOS = {
 }
 
 
-@dataclass(frozen=True)
-class Bar:
-    day: date
-    close: Decimal
-    volume: Decimal
-
-
 def as_float(value: Decimal) -> float:
     return round(float(value), 6)
 
@@ -388,8 +392,9 @@ def benchmark_comparison(
     last_value = Decimal(str(series[-1]["value"]))
     first_day = date.fromisoformat(str(series[0]["date"]))
     last_day = date.fromisoformat(str(series[-1]["date"]))
-    first_benchmark = on_or_before(benchmark_bars, first_day)
-    last_benchmark = on_or_before(benchmark_bars, last_day)
+    benchmark_returns = symbol_returns(benchmark_symbol, benchmark_bars)
+    first_benchmark = benchmark_returns.bar(first_day)
+    last_benchmark = benchmark_returns.bar(last_day)
     if not first_value or not first_benchmark or not last_benchmark:
         return {
             "benchmark": benchmark_symbol,
@@ -417,7 +422,7 @@ def benchmark_comparison(
     for index, row in enumerate(series):
         row_day = date.fromisoformat(str(row["date"]))
         row_value = Decimal(str(row["value"]))
-        benchmark_bar = on_or_before(benchmark_bars, row_day)
+        benchmark_bar = benchmark_returns.bar(row_day)
         if benchmark_bar:
             normalized_value = first_value * benchmark_bar.close / first_benchmark.close
             benchmark_series.append(
@@ -606,30 +611,150 @@ def yahoo_symbol(ticker: str, security_type: str) -> str:
     return TSX_SYMBOLS.get(ticker, ticker)
 
 
-@lru_cache(maxsize=512)
-def fetch_chart(symbol: str) -> tuple[str, tuple[Bar, ...]]:
-    period1 = int(datetime.combine(FETCH_START, datetime.min.time(), tzinfo=timezone.utc).timestamp())
+def chart_url(symbol: str, start: date = FETCH_START) -> str:
+    period1 = int(datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc).timestamp())
     period2 = int(datetime.now(timezone.utc).timestamp()) + 86_400
     query = urlencode({"period1": period1, "period2": period2, "interval": "1d"})
-    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{quote(symbol)}?{query}"
-    request = Request(url, headers={"User-Agent": "Mozilla/5.0"})
+    return f"https://query1.finance.yahoo.com/v8/finance/chart/{quote(symbol)}?{query}"
+
+
+def download_chart(symbol: str, start: date = FETCH_START) -> tuple[str, tuple[Bar, ...]]:
+    request = Request(chart_url(symbol, start), headers={"User-Agent": "Mozilla/5.0"})
     with urlopen(request, timeout=20) as response:
         result = json.load(response)["chart"]["result"][0]
     quote_rows = result["indicators"]["quote"][0]
-    closes = quote_rows["close"]
-    volumes = quote_rows.get("volume", [0] * len(closes))
+    closes = quote_rows.get("close") or []
+    volumes = quote_rows.get("volume") or [0] * len(closes)
     bars = tuple(
         Bar(
             datetime.fromtimestamp(timestamp, timezone.utc).date(),
             Decimal(str(close)),
             Decimal(str(volume or 0)),
         )
-        for timestamp, close, volume in zip(result["timestamp"], closes, volumes)
+        for timestamp, close, volume in zip(result.get("timestamp") or [], closes, volumes)
         if close is not None
     )
     return result["meta"]["currency"], bars
 
 
+def load_compact_chart(symbol: str, start: date = FETCH_START) -> tuple[str, CompactBars]:
+    currency, bars = download_chart(symbol, start)
+    return currency, CompactBars.from_bars(bars)
+
+
+def update_chart_tail(symbol: str, cached: tuple[str, CompactBars]) -> tuple[str, CompactBars]:
+    currency, bars = cached
+    last_day = bars.last_day()
+    if last_day is None:
+        return load_compact_chart(symbol)
+    _, recent = load_compact_chart(symbol, last_day - timedelta(days=CHART_TAIL_OVERLAP_DAYS))
+    return currency, bars.spliced(recent)
+
+
+def chart_needs_refresh(symbol: str, fetched_at: datetime, now: datetime) -> bool:
+    if transport_mode() == "replay":
+        return False
+    return market_chart_needs_refresh(fetched_at, now, symbol=symbol)
+
+
+def chart_cache_bytes() -> int:
+    try:
+        megabytes = float(os.environ.get("PAPER_TRADING_CHART_CACHE_MB", DEFAULT_CHART_CACHE_MB))
+    except ValueError:
+        megabytes = DEFAULT_CHART_CACHE_MB
+    return int(max(megabytes, 1) * 1024 * 1024)
+
+
+CHART_CACHE: ChartCache[tuple[str, CompactBars]] = ChartCache(
+    load_compact_chart,
+    max_entries=None,
+    max_bytes=chart_cache_bytes(),
+    sizeof=lambda value: value[1].nbytes(),
+    updater=update_chart_tail,
+    needs_refresh=chart_needs_refresh,
+)
+
+
+HOT_CHART_LOCK = Lock()
+HOT_CHARTS: OrderedDict[str, tuple[CompactBars, tuple[Bar, ...], int]] = OrderedDict()
+HOT_CHART_STATS = {"bytes": 0, "evictions": 0}
+
+
+def hot_chart_budget() -> int:
+    return max(int(CHART_CACHE.max_bytes or 0) - CHART_CACHE.stats()["bytes"], 0)
+
+
+def hot_chart_bars(symbol: str, compact: CompactBars) -> tuple[Bar, ...]:
+    with HOT_CHART_LOCK:
+        hot = HOT_CHARTS.get(symbol)
+        if hot and hot[0] is compact:
+            HOT_CHARTS.move_to_end(symbol)
+            return hot[1]
+    bars = compact.view().materialize()
+    size = estimated_bar_tuple_bytes(compact)
+    budget = hot_chart_budget()
+    with HOT_CHART_LOCK:
+        previous = HOT_CHARTS.pop(symbol, None)
+        if previous:
+            HOT_CHART_STATS["bytes"] -= previous[2]
+        HOT_CHARTS[symbol] = (compact, bars, size)
+        HOT_CHART_STATS["bytes"] += size
+        while HOT_CHARTS and HOT_CHART_STATS["bytes"] > budget:
+            _, (_, _, evicted) = HOT_CHARTS.popitem(last=False)
+            HOT_CHART_STATS["bytes"] -= evicted
+            HOT_CHART_STATS["evictions"] += 1
+    return bars
+
+
+def clear_hot_charts() -> None:
+    with HOT_CHART_LOCK:
+        HOT_CHARTS.clear()
+        for name in HOT_CHART_STATS:
+            HOT_CHART_STATS[name] = 0
+
+
+def fetch_chart(symbol: str) -> tuple[str, tuple[Bar, ...]]:
+    currency, bars = CHART_CACHE.get(symbol)
+    return currency, hot_chart_bars(symbol, bars)
+
+
+def refresh_chart(symbol: str) -> tuple[str, tuple[Bar, ...]]:
+    currency, bars = CHART_CACHE.refresh(symbol)
+    return currency, hot_chart_bars(symbol, bars)
+
+
+def chart_cache_report() -> dict[str, object]:
+    rows = [
+        {
+            "symbol": symbol,
+            "currency": currency,
+            "bars": len(bars),
+            "first_day": bars.first_day().isoformat() if bars else None,
+            "last_day": bars.last_day().isoformat() if bars else None,
+            "bytes": size,
+            "bar_tuple_bytes_estimate": estimated_bar_tuple_bytes(bars),
+            "fetched_at": fetched_at.isoformat(timespec="seconds"),
+        }
+        for symbol, (currency, bars), fetched_at, size in CHART_CACHE.entries()
+    ]
+    rows.sort(key=lambda row: (-int(row["bytes"]), str(row["symbol"])))
+    budget = hot_chart_budget()
+    with HOT_CHART_LOCK:
+        hot_symbols = list(HOT_CHARTS)
+        hot_stats = {f"materialized_{name}": value for name, value in HOT_CHART_STATS.items()}
+    return {
+        "summary": {
+            **CHART_CACHE.stats(),
+            **hot_stats,
+            "materialized_symbols": len(hot_symbols),
+            "materialized_budget_bytes": budget,
+        },
+        "materialized_symbols": hot_symbols,
+        "returns_store": returns_store_report(),
+        "symbols": rows,
+    }
+
+
 def on_or_after(bars: tuple[Bar, ...], day: date) -> Bar | None:
     return next((bar for bar in bars if bar.day >= day), None)
 
@@ -739,6 +864,7 @@ def hybrid_news_optimized_assets() -> list[tuple[str, str]]:
     return sorted(set(tracked_stock_assets()) | set(mass_change_assets()))
 
 
+ObservationCache = dict[tuple[str, date], tuple[dict[str, object] | None, dict[str, Decimal | int | None]]]
 STRATEGY_LAB_ENTRY_RULES = {
     "any": None,
     "fresh": {"fresh"},
@@ -766,6 +892,7 @@ def strategy_lab_detail(
     exit_rule: str = "signal-disappears",
     universe: str = "tracked-stocks",
     apply_wealthsimple_fx_fees: bool = False,
+    observation_cache: ObservationCache | None = None,
 ) -> dict[str, object]:
     entry_signal_rule = entry_signal_rule.casefold()
     entry_news_rule = entry_news_rule.casefold()
@@ -801,6 +928,7 @@ def strategy_lab_detail(
             "Strategy Lab preview. This is an unsaved backtest using the selected "
             "entry, news, exit, and universe settings."
         ),
+        observation_cache=observation_cache,
     )
     return {
         **detail,
@@ -1188,6 +1316,170 @@ def analysis_entry_score(
     return score
 
 
+def variable_strategy_note(
+    strategy_name: str,
+    more_signals_exit: bool,
+    news_rule: str | None,
+    entry_news_rule: str,
+    entry_analysis_rule: str,
+    news_note: str | None,
+    news_to_date: object,
+) -> str:
+    return (
+        (
+            "News + analysis driven EOD strategy. "
+            if entry_analysis_rule != "ignore"
+            else "News-assisted EOD strategy. "
+        )
+        + f"{news_note or NEWS_STRATEGIES.get(strategy_name, {}).get('note', 'News-assisted strategy.')} "
+        f"Committed Alpaca daily news counts currently end on {news_to_date}. "
+        "Signals and news are observed at one close and executed at the next "
+        "available close. Each entry deploys $1,000. FX conversion is intentionally ignored."
+        if news_rule or entry_news_rule != "ignore" or entry_analysis_rule != "ignore"
+        else
+        "Multi-signal EOD strategy. Entries use the five-day non-none signal. "
+        "An exit requires ten consecutive five-day none observations and a "
+        "one-month return of -5% or worse. Signals are observed at one close "
+        "and executed at the next available close. Each entry deploys $1,000. "
+        "FX conversion is intentionally ignored."
+        if more_signals_exit
+        else
+        "Daily EOD signal strategy. Signals are observed at one market close "
+        "and executed at the next available close. Each entry deploys $1,000. "
+        "FX conversion is intentionally ignored."
+    )
+
+
+class TicketBook:
+    def __init__(
+        self,
+        sector_of: Callable[[str, dict[str, object]], str],
+        confirm_exit: Callable[[dict[str, object], Order], bool] | None = None,
+        money: MoneyBackend | None = None,
+    ) -> None:
+        self.sector_of = sector_of
+        self.confirm_exit = confirm_exit
+        self.money = money or money_backend()
+        self.entry_amount = self.money.amount(VARIABLE_ENTRY_USD)
+        self.active: dict[str, dict[str, object]] = {}
+        self.units: dict[str, object] = {}
+        self.cycles: list[dict[str, object]] = []
+        self.series: list[dict[str, object]] = []
+        self.sector_exposure: list[dict[str, object]] = []
+        self.signal_mix: list[dict[str, object]] = []
+        self.deployed = Decimal("0")
+        self.realized = Decimal("0")
+
+    def restore(self, state: dict[str, object]) -> None:
+        self.active = state["active"]
+        self.units = {
+            ticker: self.money.shares_from_decimal(Decimal(str(position["shares"])))
+            for ticker, position in self.active.items()
+        }
+        self.cycles = state.get("cycles", [])
+        self.series = state["series"]
+        self.deployed = state["deployed"]
+        self.realized = state.get("realized", Decimal("0"))
+
+    def checkpoint_state(self, observed_day: date) -> dict[str, object]:
+        return {
+            "session": observed_day.isoformat(),
+            "active": self.active,
+            "cycles": self.cycles,
+            "series": series_tail(self.series),
+            "deployed": self.deployed,
+            "realized": self.realized,
+        }
+
+    def fill(self, order: Order, price_bar: Bar, observed_day: date) -> None:
+        if order.action == "buy":
+            units = self.money.shares(self.entry_amount, self.money.price(price_bar.close))
+            self.units[order.ticker] = units
+            self.deployed += VARIABLE_ENTRY_USD
+            self.active[order.ticker] = {
+                "ticker": order.ticker,
+                "entry_signal": order.candidate["entry_signal"],
+                "signal_observed_date": observed_day.isoformat(),
+                "entry_date": price_bar.day.isoformat(),
+                "entry_price": as_float(price_bar.close),
+                "shares": self.money.shares_to_decimal(units),
+                "initial_value": as_float(VARIABLE_ENTRY_USD),
+                **order.candidate.get("fields", {}),
+            }
+            return
+        position = self.active.pop(order.ticker)
+        if self.confirm_exit is not None and not self.confirm_exit(position, order):
+            self.active[order.ticker] = position
+            return
+        units = self.units.pop(order.ticker)
+        proceeds = self.money.to_decimal(self.money.value(units, self.money.price(price_bar.close)))
+        pnl = proceeds - VARIABLE_ENTRY_USD
+        self.realized += pnl
+        self.cycles.append(
+            {
+                **position,
+                "exit_signal_observed_date": observed_day.isoformat(),
+                "exit_date": price_bar.day.isoformat(),
+                "exit_price": as_float(price_bar.close),
+                "ending_value": as_float(proceeds),
+                "gain_loss": as_float(pnl),
+                "return_pct": as_float(pct_change(proceeds, VARIABLE_ENTRY_USD)),
+                "status": "closed",
+            }
+        )
+
+    def mark(self, session: date, observed_day: date, marks: list[tuple[str, Bar]]) -> None:
+        open_units = self.money.zero
+        sector_units: defaultdict[str, object] = defaultdict(lambda: self.money.zero)
+        for ticker, price_bar in marks:
+            position_units = self.money.value(self.units[ticker], self.money.price(price_bar.close))
+            open_units += position_units
+            sector_units[self.sector_of(ticker, self.active[ticker])] += position_units
+        open_value = self.money.to_decimal(open_units)
+        sector_values = {sector: self.money.to_decimal(units) for sector, units in sector_units.items()}
+        entry_capital = VARIABLE_ENTRY_USD * len(self.active)
+        self.series.append(
+            {
+                "date": session.isoformat(),
+                "value": as_float(self.deployed + self.realized + open_value - entry_capital),
+                "gain_loss": as_float(self.realized + open_value - entry_capital),
+                "deployed_capital": as_float(self.deployed),
+                "active_positions": len(self.active),
+            }
+        )
+        self.sector_exposure.append(
+            {
+                "date": session.isoformat(),
+                "sectors": [
+                    {
+                        "sector": sector,
+                        "value": as_float(value),
+                        "weight_pct": as_float(value / open_value * Decimal("100")),
+                    }
+                    for sector, value in sorted(sector_values.items())
+                    if open_value
+                ],
+            }
+        )
+        signal_counts: defaultdict[str, int] = defaultdict(int)
+        for position in self.active.values():
+            signal_counts[str(position.get("entry_signal") or "unknown")] += 1
+        self.signal_mix.append(
+            {
+                "date": session.isoformat(),
+                "signals": [
+                    {
+                        "signal": signal,
+                        "positions": count,
+                        "weight_pct": as_float(Decimal(count) / Decimal(len(self.active)) * Decimal("100")),
+                    }
+                    for signal, count in sorted(signal_counts.items())
+                    if self.active
+                ],
+            }
+        )
+
+
 def variable_strategy_detail(
     start: date,
     end: date | None,
@@ -1200,6 +1492,7 @@ def variable_strategy_detail(
     apply_wealthsimple_fx_fees: bool = False,
     universe_assets: list[tuple[str, str]] | None = None,
     news_note: str | None = None,
+    observation_cache: ObservationCache | None = None,
 ) -> dict[str, object]:
     selected_start = max(start, VARIABLE_STRATEGY_START)
     _, market_bars = fetch_chart("SPY")
@@ -1226,18 +1519,47 @@ def variable_strategy_detail(
             charts[ticker] = bars
             asset_types[ticker] = security_type
 
-    active: dict[str, dict[str, object]] = {}
-    cycles: list[dict[str, object]] = []
-    series: list[dict[str, object]] = []
-    sector_exposure: list[dict[str, object]] = []
-    signal_mix: list[dict[str, object]] = []
-    deployed = Decimal("0")
-    realized = Decimal("0")
-    previous_session = on_or_before(market_bars, VARIABLE_STRATEGY_START - timedelta(days=1))
     daily_news = load_daily_news_counts()
     news_counts = daily_news.get("tickers", {})
     if not isinstance(news_counts, dict):
         news_counts = {}
+    memo_key = detail_key(
+        "variable-detail",
+        {
+            "selected_start": selected_start,
+            "to_date": latest_market.day,
+            "more_signals_exit": more_signals_exit,
+            "news_rule": news_rule,
+            "entry_categories": sorted(entry_categories) if entry_categories is not None else None,
+            "entry_news_rule": entry_news_rule,
+            "entry_analysis_rule": entry_analysis_rule,
+            "apply_wealthsimple_fx_fees": apply_wealthsimple_fx_fees,
+            "assets": sorted(asset_types.items()),
+            "sector_owner": SECTOR_OWNER_LABELS.get(strategy_name),
+            "money_backend": money_backend().name,
+        },
+        {**charts, MARKET_KEY: market_bars},
+        daily_news.get("to_date"),
+        news_counts,
+    )
+    note = variable_strategy_note(
+        strategy_name,
+        more_signals_exit,
+        news_rule,
+        entry_news_rule,
+        entry_analysis_rule,
+        news_note,
+        daily_news.get("to_date"),
+    )
+    remembered = recall_detail(memo_key)
+    if remembered is not None:
+        return {**remembered, "investor": strategy_name, "note": note}
+
+    previous_session = on_or_before(market_bars, VARIABLE_STRATEGY_START - timedelta(days=1))
+    prices = SessionPrices(
+        {**charts, MARKET_KEY: market_bars},
+        simulation_days(market_bars, VARIABLE_STRATEGY_START, latest_market.day),
+    )
 
     def observed_state(
         observed_day: date,
@@ -1249,14 +1571,17 @@ def variable_strategy_detail(
         desired: dict[str, str] = {}
         observed: dict[str, dict[str, object] | None] = {}
         observed_news: dict[str, dict[str, Decimal | int | None]] = {}
-        for ticker, bars in charts.items():
-            signal_bars = tuple(bar for bar in bars if bar.day <= observed_day)
-            observed[ticker] = live_signal(signal_bars)
-            ticker_counts = news_counts.get(ticker, {})
-            observed_news[ticker] = news_metrics(
-                ticker_counts if isinstance(ticker_counts, dict) else {},
-                observed_day,
-            )
+        for ticker in charts:
+            cached = observation_cache.get((ticker, observed_day)) if observation_cache is not None else None
+            if cached is None:
+                ticker_counts = news_counts.get(ticker, {})
+                cached = (
+                    live_signal(prices.history(ticker, observed_day)),
+                    news_metrics(ticker_counts if isinstance(ticker_counts, dict) else {}, observed_day),
+                )
+                if observation_cache is not None:
+                    observation_cache[(ticker, observed_day)] = cached
+            observed[ticker], observed_news[ticker] = cached
             category = entry_signal(observed[ticker])
             if category and (entry_categories is None or category in entry_categories):
                 desired[ticker] = category
@@ -1299,114 +1624,63 @@ def variable_strategy_detail(
             else int(position["none_streak"]) >= 1
         )
 
-    for session in sessions:
-        if not previous_session:
-            previous_session = on_or_before(market_bars, session - timedelta(days=1))
-        desired, observed, observed_news = observed_state(previous_session.day)
-
-        for ticker in set(active) & set(desired):
-            active[ticker]["none_streak"] = 0
-
-        for ticker in sorted(set(active) - set(desired)):
-            price_bar = on_or_before(charts[ticker], session)
-            if not price_bar or price_bar.day <= previous_session.day:
-                continue
-            position = active.pop(ticker)
-            position["none_streak"] = int(position.get("none_streak", 0)) + 1
-            if not exit_matches(position, observed[ticker], observed_news[ticker]):
-                active[ticker] = position
-                continue
-            proceeds = Decimal(str(position["shares"])) * price_bar.close
-            pnl = proceeds - VARIABLE_ENTRY_USD
-            realized += pnl
-            cycles.append(
-                {
-                    **position,
-                    "exit_signal_observed_date": previous_session.day.isoformat(),
-                    "exit_date": price_bar.day.isoformat(),
-                    "exit_price": as_float(price_bar.close),
-                    "ending_value": as_float(proceeds),
-                    "gain_loss": as_float(pnl),
-                    "return_pct": as_float(pct_change(proceeds, VARIABLE_ENTRY_USD)),
-                    "status": "closed",
-                }
-            )
-
-        for ticker in sorted(set(desired) - set(active)):
+    def orders(observed_day: date) -> Iterator[Order]:
+        desired, observed, observed_news = observed_state(observed_day)
+        for ticker in set(book.active) & set(desired):
+            book.active[ticker]["none_streak"] = 0
+        for ticker in sorted(set(book.active) - set(desired)):
+            yield Order(ticker, "sell", candidate={"signal": observed[ticker], "news": observed_news[ticker]})
+        for ticker in sorted(set(desired) - set(book.active)):
             if not entry_news_matches(observed_news[ticker]):
                 continue
             if not entry_analysis_matches(observed[ticker], desired[ticker], observed_news[ticker]):
                 continue
-            price_bar = on_or_before(charts[ticker], session)
-            if not price_bar or price_bar.day <= previous_session.day:
-                continue
-            shares = VARIABLE_ENTRY_USD / price_bar.close
-            deployed += VARIABLE_ENTRY_USD
-            active[ticker] = {
-                "ticker": ticker,
-                "entry_signal": desired[ticker],
-                "signal_observed_date": previous_session.day.isoformat(),
-                "entry_date": price_bar.day.isoformat(),
-                "entry_price": as_float(price_bar.close),
-                "shares": shares,
-                "initial_value": as_float(VARIABLE_ENTRY_USD),
-                "none_streak": 0,
-            }
+            yield Order(ticker, "buy", candidate={"entry_signal": desired[ticker], "fields": {"none_streak": 0}})
 
-        open_value = Decimal("0")
-        sector_values: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0"))
-        for ticker, position in active.items():
-            price_bar = on_or_before(charts[ticker], session)
-            if price_bar:
-                position_value = Decimal(str(position["shares"])) * price_bar.close
-                open_value += position_value
-                sector, _ = sector_for_asset(
-                    ticker,
-                    asset_types.get(ticker, "stock"),
-                    [strategy_name],
-                )
-                sector_values[sector] += position_value
-        series.append(
-            {
-                "date": session.isoformat(),
-                "value": as_float(deployed + realized + open_value - VARIABLE_ENTRY_USD * len(active)),
-                "gain_loss": as_float(realized + open_value - VARIABLE_ENTRY_USD * len(active)),
-                "deployed_capital": as_float(deployed),
-                "active_positions": len(active),
-            }
-        )
-        sector_exposure.append(
-            {
-                "date": session.isoformat(),
-                "sectors": [
-                    {
-                        "sector": sector,
-                        "value": as_float(value),
-                        "weight_pct": as_float(value / open_value * Decimal("100")),
-                    }
-                    for sector, value in sorted(sector_values.items())
-                    if open_value
-                ],
-            }
-        )
-        signal_counts: defaultdict[str, int] = defaultdict(int)
-        for position in active.values():
-            signal_counts[str(position.get("entry_signal") or "unknown")] += 1
-        signal_mix.append(
-            {
-                "date": session.isoformat(),
-                "signals": [
-                    {
-                        "signal": signal,
-                        "positions": count,
-                        "weight_pct": as_float(Decimal(count) / Decimal(len(active)) * Decimal("100")),
-                    }
-                    for signal, count in sorted(signal_counts.items())
-                    if active
-                ],
-            }
-        )
-        previous_session = on_or_before(market_bars, session)
+    def confirm_exit(position: dict[str, object], order: Order) -> bool:
+        position["none_streak"] = int(position.get("none_streak", 0)) + 1
+        return exit_matches(position, order.candidate["signal"], order.candidate["news"])
+
+    book = TicketBook(
+        lambda ticker, position: sector_for_asset(ticker, asset_types.get(ticker, "stock"), [strategy_name])[0],
+        confirm_exit,
+    )
+    checkpoints = SimulationCheckpoints(
+        "variable",
+        {
+            "strategy_name": strategy_name,
+            "more_signals_exit": more_signals_exit,
+            "news_rule": news_rule,
+            "entry_categories": sorted(entry_categories) if entry_categories is not None else None,
+            "entry_news_rule": entry_news_rule,
+            "entry_analysis_rule": entry_analysis_rule,
+            "analysis_entry_score": ANALYSIS_ENTRY_SCORE,
+            "entry_usd": VARIABLE_ENTRY_USD,
+            "money_backend": book.money.name,
+            "strategy_start": VARIABLE_STRATEGY_START,
+        },
+        sessions,
+        prices.charts,
+        news_counts,
+    )
+    resumed = checkpoints.resume(selected_start)
+    if resumed:
+        book.restore(resumed)
+        previous_session = on_or_before(market_bars, date.fromisoformat(resumed["session"]))
+        sessions = [session for session in sessions if session > previous_session.day]
+
+    simulate(
+        sessions,
+        previous_session,
+        prices,
+        book.active,
+        orders,
+        book.fill,
+        book.mark,
+        lambda session, observed_day: checkpoints.record(session, lambda: book.checkpoint_state(observed_day)),
+    )
+    active, cycles, series = book.active, book.cycles, book.series
+    sector_exposure, signal_mix = book.sector_exposure, book.signal_mix
 
     open_positions: list[dict[str, object]] = []
     open_value = Decimal("0")
@@ -1603,31 +1877,9 @@ def variable_strategy_detail(
         "news_counts_to_date": daily_news.get("to_date")
         if news_rule or entry_news_rule != "ignore" or entry_analysis_rule != "ignore"
         else None,
-        "note": (
-            (
-                "News + analysis driven EOD strategy. "
-                if entry_analysis_rule != "ignore"
-                else "News-assisted EOD strategy. "
-            )
-            + f"{news_note or NEWS_STRATEGIES.get(strategy_name, {}).get('note', 'News-assisted strategy.')} "
-            f"Committed Alpaca daily news counts currently end on {daily_news.get('to_date')}. "
-            "Signals and news are observed at one close and executed at the next "
-            "available close. Each entry deploys $1,000. FX conversion is intentionally ignored."
-            if news_rule or entry_news_rule != "ignore" or entry_analysis_rule != "ignore"
-            else
-            "Multi-signal EOD strategy. Entries use the five-day non-none signal. "
-            "An exit requires ten consecutive five-day none observations and a "
-            "one-month return of -5% or worse. Signals are observed at one close "
-            "and executed at the next available close. Each entry deploys $1,000. "
-            "FX conversion is intentionally ignored."
-            if more_signals_exit
-            else
-            "Daily EOD signal strategy. Signals are observed at one market close "
-            "and executed at the next available close. Each entry deploys $1,000. "
-            "FX conversion is intentionally ignored."
-        ),
+        "note": note,
     }
-    return with_variable_fx_fees(detail) if apply_wealthsimple_fx_fees else detail
+    return remember_detail(memo_key, with_variable_fx_fees(detail) if apply_wealthsimple_fx_fees else detail)
 
 
 def variable_strategy_summary(
@@ -1719,11 +1971,15 @@ def master_portfolio_detail(
     if not isinstance(news_counts, dict):
         news_counts = {}
 
+    prices = SessionPrices(
+        {**charts, MARKET_KEY: market_bars},
+        simulation_days(market_bars, VARIABLE_STRATEGY_START, latest_market.day),
+    )
+
     def ranked_candidates(observed_day: date) -> list[dict[str, object]]:
         rows: list[dict[str, object]] = []
-        for ticker, bars in charts.items():
-            signal_bars = tuple(bar for bar in bars if bar.day <= observed_day)
-            signal = live_signal(signal_bars)
+        for ticker in charts:
+            signal = live_signal(prices.history(ticker, observed_day))
             category = entry_signal(signal)
             if not category or not isinstance(signal, dict):
                 continue
@@ -1779,22 +2035,11 @@ def master_portfolio_detail(
             sector_counts[sector] += 1
         return selected
 
-    active: dict[str, dict[str, object]] = {}
-    cycles: list[dict[str, object]] = []
-    series: list[dict[str, object]] = []
-    sector_exposure: list[dict[str, object]] = []
-    signal_mix: list[dict[str, object]] = []
-    deployed = Decimal("0")
-    realized = Decimal("0")
-    previous_session = on_or_before(market_bars, VARIABLE_STRATEGY_START - timedelta(days=1))
-
-    for session in sessions:
-        if not previous_session:
-            previous_session = on_or_before(market_bars, session - timedelta(days=1))
-        candidates = ranked_candidates(previous_session.day)
+    def orders(observed_day: date) -> Iterator[Order]:
+        candidates = ranked_candidates(observed_day)
         candidate_by_ticker = {str(row["ticker"]): row for row in candidates}
         tickers_to_sell: set[str] = set()
-        for ticker, position in list(active.items()):
+        for ticker, position in list(book.active.items()):
             row = candidate_by_ticker.get(ticker)
             if row:
                 news = row["news"]
@@ -1813,100 +2058,61 @@ def master_portfolio_detail(
                     tickers_to_sell.add(ticker)
 
         for ticker in sorted(tickers_to_sell):
-            price_bar = on_or_before(charts[ticker], session)
-            if not price_bar or price_bar.day <= previous_session.day:
-                continue
-            position = active.pop(ticker)
-            proceeds = Decimal(str(position["shares"])) * price_bar.close
-            pnl = proceeds - VARIABLE_ENTRY_USD
-            realized += pnl
-            cycles.append(
-                {
-                    **position,
-                    "exit_signal_observed_date": previous_session.day.isoformat(),
-                    "exit_date": price_bar.day.isoformat(),
-                    "exit_price": as_float(price_bar.close),
-                    "ending_value": as_float(proceeds),
-                    "gain_loss": as_float(pnl),
-                    "return_pct": as_float(pct_change(proceeds, VARIABLE_ENTRY_USD)),
-                    "status": "closed",
-                }
-            )
+            yield Order(ticker, "sell")
 
-        selected_by_ticker = fill_candidates(candidates, active)
-        for ticker, row in sorted(selected_by_ticker.items()):
-            if ticker in active:
-                continue
-            price_bar = on_or_before(charts[ticker], session)
-            if not price_bar or price_bar.day <= previous_session.day:
+        for ticker, row in sorted(fill_candidates(candidates, book.active).items()):
+            if ticker in book.active:
                 continue
-            shares = VARIABLE_ENTRY_USD / price_bar.close
-            deployed += VARIABLE_ENTRY_USD
             news = row["news"]
-            active[ticker] = {
-                "ticker": ticker,
-                "entry_signal": row["entry_signal"],
-                "signal_observed_date": previous_session.day.isoformat(),
-                "entry_date": price_bar.day.isoformat(),
-                "entry_price": as_float(price_bar.close),
-                "shares": shares,
-                "initial_value": as_float(VARIABLE_ENTRY_USD),
-                "master_score": as_float(Decimal(str(row["master_score"]))),
-                "news_articles_7d": int(news["articles_7d"]),
-                "news_articles_prior_7d": int(news["articles_prior_7d"]),
-                "sector": row["sector"],
-                "below_master_streak": 0,
-            }
+            yield Order(
+                ticker,
+                "buy",
+                candidate={
+                    "entry_signal": row["entry_signal"],
+                    "fields": {
+                        "master_score": as_float(Decimal(str(row["master_score"]))),
+                        "news_articles_7d": int(news["articles_7d"]),
+                        "news_articles_prior_7d": int(news["articles_prior_7d"]),
+                        "sector": row["sector"],
+                        "below_master_streak": 0,
+                    },
+                },
+            )
 
-        open_value = Decimal("0")
-        sector_values: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0"))
-        for ticker, position in active.items():
-            price_bar = on_or_before(charts[ticker], session)
-            if price_bar:
-                position_value = Decimal(str(position["shares"])) * price_bar.close
-                open_value += position_value
-                sector_values[str(position.get("sector") or "Unclassified")] += position_value
-        series.append(
-            {
-                "date": session.isoformat(),
-                "value": as_float(deployed + realized + open_value - VARIABLE_ENTRY_USD * len(active)),
-                "gain_loss": as_float(realized + open_value - VARIABLE_ENTRY_USD * len(active)),
-                "deployed_capital": as_float(deployed),
-                "active_positions": len(active),
-            }
-        )
-        sector_exposure.append(
-            {
-                "date": session.isoformat(),
-                "sectors": [
-                    {
-                        "sector": sector,
-                        "value": as_float(value),
-                        "weight_pct": as_float(value / open_value * Decimal("100")),
-                    }
-                    for sector, value in sorted(sector_values.items())
-                    if open_value
-                ],
-            }
-        )
-        signal_counts: defaultdict[str, int] = defaultdict(int)
-        for position in active.values():
-            signal_counts[str(position.get("entry_signal") or "unknown")] += 1
-        signal_mix.append(
-            {
-                "date": session.isoformat(),
-                "signals": [
-                    {
-                        "signal": signal,
-                        "positions": count,
-                        "weight_pct": as_float(Decimal(count) / Decimal(len(active)) * Decimal("100")),
-                    }
-                    for signal, count in sorted(signal_counts.items())
-                    if active
-                ],
-            }
-        )
-        previous_session = on_or_before(market_bars, session)
+    book = TicketBook(lambda ticker, position: str(position.get("sector") or "Unclassified"))
+    previous_session = on_or_before(market_bars, VARIABLE_STRATEGY_START - timedelta(days=1))
+    checkpoints = SimulationCheckpoints(
+        "master",
+        {
+            "position_limit": MASTER_POSITION_LIMIT,
+            "sector_limit": MASTER_SECTOR_LIMIT,
+            "sectors": sectors,
+            "entry_usd": VARIABLE_ENTRY_USD,
+            "money_backend": book.money.name,
+            "strategy_start": VARIABLE_STRATEGY_START,
+        },
+        sessions,
+        prices.charts,
+        news_counts,
+    )
+    resumed = checkpoints.resume(selected_start)
+    if resumed:
+        book.restore(resumed)
+        previous_session = on_or_before(market_bars, date.fromisoformat(resumed["session"]))
+        sessions = [session for session in sessions if session > previous_session.day]
+
+    simulate(
+        sessions,
+        previous_session,
+        prices,
+        book.active,
+        orders,
+        book.fill,
+        book.mark,
+        lambda session, observed_day: checkpoints.record(session, lambda: book.checkpoint_state(observed_day)),
+    )
+    active, cycles, series = book.active, book.cycles, book.series
+    sector_exposure, signal_mix = book.sector_exposure, book.signal_mix
 
     open_positions: list[dict[str, object]] = []
     for ticker, position in active.items():
@@ -2287,88 +2493,53 @@ def variable_buy_only_detail(
             charts[ticker] = bars
             asset_types[ticker] = security_type
 
-    positions: dict[str, dict[str, object]] = {}
-    series: list[dict[str, object]] = []
-    sector_exposure: list[dict[str, object]] = []
-    signal_mix: list[dict[str, object]] = []
-    previous_session = on_or_before(market_bars, VARIABLE_STRATEGY_START - timedelta(days=1))
-    for session in sessions:
-        if not previous_session:
-            previous_session = on_or_before(market_bars, session - timedelta(days=1))
-        for ticker, bars in charts.items():
-            if ticker in positions:
+    prices = SessionPrices(
+        {**charts, MARKET_KEY: market_bars},
+        simulation_days(market_bars, VARIABLE_STRATEGY_START, latest_market.day),
+    )
+
+    def orders(observed_day: date) -> Iterator[Order]:
+        for ticker in charts:
+            if ticker in book.active:
                 continue
-            signal_bars = tuple(bar for bar in bars if bar.day <= previous_session.day)
-            category = entry_signal(live_signal(signal_bars))
+            category = entry_signal(live_signal(prices.history(ticker, observed_day)))
             if not category or (entry_category and category != entry_category):
                 continue
-            price_bar = on_or_before(bars, session)
-            if not price_bar or price_bar.day <= previous_session.day:
-                continue
-            positions[ticker] = {
-                "ticker": ticker,
-                "entry_signal": category,
-                "signal_observed_date": previous_session.day.isoformat(),
-                "entry_date": price_bar.day.isoformat(),
-                "entry_price": as_float(price_bar.close),
-                "shares": VARIABLE_ENTRY_USD / price_bar.close,
-                "initial_value": as_float(VARIABLE_ENTRY_USD),
-            }
-        deployed = VARIABLE_ENTRY_USD * len(positions)
-        current = Decimal("0")
-        sector_values: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0"))
-        for ticker, position in positions.items():
-            price_bar = on_or_before(charts[ticker], session)
-            if price_bar:
-                position_value = Decimal(str(position["shares"])) * price_bar.close
-                current += position_value
-                sector, _ = sector_for_asset(
-                    ticker,
-                    asset_types.get(ticker, "stock"),
-                    [strategy_name],
-                )
-                sector_values[sector] += position_value
-        series.append(
-            {
-                "date": session.isoformat(),
-                "value": as_float(current),
-                "gain_loss": as_float(current - deployed),
-                "deployed_capital": as_float(deployed),
-                "active_positions": len(positions),
-            }
-        )
-        sector_exposure.append(
-            {
-                "date": session.isoformat(),
-                "sectors": [
-                    {
-                        "sector": sector,
-                        "value": as_float(value),
-                        "weight_pct": as_float(value / current * Decimal("100")),
-                    }
-                    for sector, value in sorted(sector_values.items())
-                    if current
-                ],
-            }
-        )
-        signal_counts: defaultdict[str, int] = defaultdict(int)
-        for position in positions.values():
-            signal_counts[str(position.get("entry_signal") or "unknown")] += 1
-        signal_mix.append(
-            {
-                "date": session.isoformat(),
-                "signals": [
-                    {
-                        "signal": signal,
-                        "positions": count,
-                        "weight_pct": as_float(Decimal(count) / Decimal(len(positions)) * Decimal("100")),
-                    }
-                    for signal, count in sorted(signal_counts.items())
-                    if positions
-                ],
-            }
-        )
-        previous_session = on_or_before(market_bars, session)
+            yield Order(ticker, "buy", candidate={"entry_signal": category})
+
+    book = TicketBook(
+        lambda ticker, position: sector_for_asset(ticker, asset_types.get(ticker, "stock"), [strategy_name])[0],
+    )
+    previous_session = on_or_before(market_bars, VARIABLE_STRATEGY_START - timedelta(days=1))
+    checkpoints = SimulationCheckpoints(
+        "buy-only",
+        {
+            "entry_category": entry_category,
+            "entry_usd": VARIABLE_ENTRY_USD,
+            "money_backend": book.money.name,
+            "strategy_start": VARIABLE_STRATEGY_START,
+        },
+        sessions,
+        prices.charts,
+    )
+    resumed = checkpoints.resume(selected_start)
+    if resumed:
+        book.restore(resumed)
+        previous_session = on_or_before(market_bars, date.fromisoformat(resumed["session"]))
+        sessions = [session for session in sessions if session > previous_session.day]
+
+    simulate(
+        sessions,
+        previous_session,
+        prices,
+        book.active,
+        orders,
+        book.fill,
+        book.mark,
+        lambda session, observed_day: checkpoints.record(session, lambda: book.checkpoint_state(observed_day)),
+    )
+    positions, series = book.active, book.series
+    sector_exposure, signal_mix = book.sector_exposure, book.signal_mix
 
     open_positions: list[dict[str, object]] = []
     for ticker, position in positions.items():
@@ -2430,11 +2601,10 @@ def variable_buy_only_detail(
     )
 
     pending_next_close_orders: list[dict[str, object]] = []
-    for ticker, bars in sorted(charts.items()):
+    for ticker in sorted(charts):
         if ticker in positions:
             continue
-        signal_bars = tuple(bar for bar in bars if bar.day <= latest_market.day)
-        category = entry_signal(live_signal(signal_bars))
+        category = entry_signal(live_signal(prices.history(ticker, latest_market.day)))
         if not category or (entry_category and category != entry_category):
             continue
         pending_next_close_orders.append(
@@ -2800,6 +2970,28 @@ def build_overview(
     fx_currency, fx_bars = fetch_chart("CAD=X")
     if fx_currency != "CAD":
         raise ValueError("unexpected CAD=X currency")
+    fx = fx_series(fx_bars)
+    usd_growth: dict[tuple[str, str], Decimal | None] = {}
+    for asset, row in indexed.items():
+        if row.get("warning"):
+            continue
+        growth = Decimal(str(row["end_price"])) / Decimal(str(row["start_price"]))
+        if row["currency"] == "CAD":
+            start_fx = fx.on_or_after(date.fromisoformat(row["start_date"]))
+            end_fx = fx.on_or_before(date.fromisoformat(row["end_date"]))
+            growth = growth * (start_fx.close / end_fx.close) if start_fx and end_fx else None
+        usd_growth[asset] = growth
+    convertible = [asset for asset, growth in usd_growth.items() if growth is not None]
+    usd_growth.update(
+        zip(
+            convertible,
+            fee_adjusted(
+                [usd_growth[asset] for asset in convertible],
+                [indexed[asset]["currency"] for asset in convertible],
+                apply_wealthsimple_fx_fees,
+            ),
+        )
+    )
     traders: list[dict[str, object]] = []
     for investor, assets in grouped.items():
         initial = Decimal("0")
@@ -2823,15 +3015,9 @@ def build_overview(
                 )
                 warnings.append(f"{asset[0]}: {row['warning']}")
             else:
-                growth = Decimal(str(row["end_price"])) / Decimal(str(row["start_price"]))
-                if row["currency"] == "CAD":
-                    start_fx = on_or_after(fx_bars, date.fromisoformat(row["start_date"]))
-                    end_fx = on_or_before(fx_bars, date.fromisoformat(row["end_date"]))
-                    if not start_fx or not end_fx:
-                        raise ValueError("missing CAD/USD exchange rate")
-                    growth *= start_fx.close / end_fx.close
-                elif apply_wealthsimple_fx_fees:
-                    growth *= Decimal("1") - WEALTHSIMPLE_FX_FEE
+                growth = usd_growth[asset]
+                if growth is None:
+                    raise ValueError("missing CAD/USD exchange rate")
                 current_part = amount * growth
                 current += current_part
                 lookback_parts.append(
@@ -2966,11 +3152,13 @@ def paper_trader_detail(
     fx_currency, fx_bars = fetch_chart("CAD=X")
     if fx_currency != "CAD":
         raise ValueError("unexpected CAD=X currency")
-    latest_fx = on_or_before(fx_bars, end)
+    fx = fx_series(fx_bars)
+    latest_fx = fx.on_or_before(end)
     if not latest_fx:
         raise ValueError("missing CAD/USD exchange rate")
+    money = money_backend()
     positions: list[dict[str, object]] = []
-    daily_parts: list[tuple[Decimal, str, tuple[Bar, ...], Decimal]] = []
+    daily_parts: list[tuple[object, str, tuple[Bar, ...], Decimal]] = []
     for (ticker, security_type), amount in assets.items():
         if not amount:
             continue
@@ -2981,20 +3169,19 @@ def paper_trader_detail(
             latest = on_or_before(bars, end)
             if not baseline or not latest:
                 raise ValueError("missing prices for selected window")
-            baseline_fx = on_or_after(fx_bars, baseline.day)
+            baseline_fx = fx.on_or_after(baseline.day)
             if currency == "CAD":
                 if not baseline_fx:
                     raise ValueError("missing inception CAD/USD exchange rate")
-                quantity = amount * baseline_fx.close / baseline.close
-                current = quantity * latest.close / latest_fx.close
-            elif currency == "USD":
-                spendable = (
-                    amount * (Decimal("1") - WEALTHSIMPLE_FX_FEE)
-                    if apply_wealthsimple_fx_fees
-                    else amount
+                local = money.converted(money.amount(amount), money.price(baseline_fx.close))
+                quantity = money.shares(local, money.price(baseline.close))
+                current = money.to_decimal(
+                    money.unconverted(money.value(quantity, money.price(latest.close)), money.price(latest_fx.close))
                 )
-                quantity = spendable / baseline.close
-                current = quantity * latest.close
+            elif currency == "USD":
+                spendable = fee_adjusted([amount], [currency], apply_wealthsimple_fx_fees)[0]
+                quantity = money.shares(money.amount(spendable), money.price(baseline.close))
+                current = money.to_decimal(money.value(quantity, money.price(latest.close)))
             else:
                 raise ValueError(f"unsupported currency {currency}")
             daily_parts.append((quantity, currency, bars, amount))
@@ -3031,18 +3218,28 @@ def paper_trader_detail(
             if end is None or bar.day <= end
         }
     )
+    rates = fx.rates(series_days)
+    columns = [
+        fx.to_usd(
+            [
+                money.value(quantity, money.price(close)) if close is not None else None
+                for close in forward_filled(bars, series_days)
+            ],
+            currency,
+            rates,
+            money,
+        )
+        for quantity, currency, bars, _ in daily_parts
+    ]
     series = []
-    for day in series_days:
-        fx = on_or_before(fx_bars, day)
-        total = Decimal("0")
-        if not fx:
+    for index, day in enumerate(series_days):
+        if rates[index] is None:
             continue
-        for quantity, currency, bars, _ in daily_parts:
-            bar = on_or_before(bars, day)
-            if not bar:
-                continue
-            total += quantity * bar.close / fx.close if currency == "CAD" else quantity * bar.close
-        series.append({"date": day.isoformat(), "value": as_float(total)})
+        total = money.zero
+        for column in columns:
+            if column[index] is not None:
+                total += column[index]
+        series.append({"date": day.isoformat(), "value": as_float(money.to_decimal(total))})
     initial = sum((Decimal(str(row["initial_value"])) for row in positions), Decimal("0"))
     current = sum((Decimal(str(row["current_value"])) for row in positions), Decimal("0"))
     fixed_changes = fixed_changes_from_series(series)
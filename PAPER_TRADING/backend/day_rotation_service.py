@@ -22,6 +22,16 @@ from backend.dashboard_service import (
 )
 from backend.model_portfolio_service import _asset_available, _asset_ever_available, _trailing_volatility
 from backend.news_strategy import load_daily_news_counts, news_metrics
+from backend.returns_store import SymbolReturns, symbol_returns
+from backend.simulation_kernel import (
+    MARKET_KEY,
+    Order,
+    SessionPrices,
+    observed_holding_values,
+    rebalance_orders,
+    simulate,
+    simulation_days,
+)
 from backend.universe_service import read_asset_universe
 
 
@@ -133,6 +143,7 @@ def daily_rotation_portfolio_response(end: date | None = None) -> dict[str, obje
         raise ValueError("missing daily rotation market sessions")
 
     charts: dict[str, tuple[object, ...]] = {}
+    returns: dict[str, SymbolReturns] = {}
     sectors: dict[str, str] = {}
     rows_by_ticker: dict[str, dict[str, object]] = {}
     for row in (item for item in universe if _asset_ever_available(item, latest_market.day)):
@@ -145,6 +156,7 @@ def daily_rotation_portfolio_response(end: date | None = None) -> dict[str, obje
         if not bars:
             continue
         charts[ticker] = bars
+        returns[ticker] = symbol_returns(yahoo_symbol(ticker, asset_type), bars)
         rows_by_ticker[ticker] = row
         configured_sector = str(row.get("sector") or "").strip()
         sectors[ticker] = configured_sector or sector_for_asset(
@@ -156,19 +168,24 @@ def daily_rotation_portfolio_response(end: date | None = None) -> dict[str, obje
     if not isinstance(news_counts, dict):
         news_counts = {}
 
+    prices = SessionPrices(
+        {**charts, MARKET_KEY: market_bars},
+        simulation_days(market_bars, VARIABLE_STRATEGY_START, latest_market.day),
+    )
+
     def candidates(observed_day: date) -> list[dict[str, object]]:
         candidates_for_day: list[dict[str, object]] = []
-        for ticker, bars in charts.items():
+        for ticker in charts:
             if not _asset_available(rows_by_ticker[ticker], observed_day):
                 continue
-            signal_bars = tuple(bar for bar in bars if bar.day <= observed_day)
+            signal_bars = prices.history(ticker, observed_day)
             signal = live_signal(signal_bars)
             category = entry_signal(signal)
             if not category or not isinstance(signal, dict):
                 continue
             counts = news_counts.get(ticker, {})
             news = news_metrics(counts if isinstance(counts, dict) else {}, observed_day)
-            score, components = _rotation_score(signal, category, news, _trailing_volatility(signal_bars))
+            score, components = _rotation_score(signal, category, news, _trailing_volatility(returns[ticker], len(signal_bars)))
             minimum = ROTATION_NEAR_MIN_SCORE if category == "near" else ROTATION_MIN_SCORE
             if score < minimum:
                 continue
@@ -193,131 +210,114 @@ def daily_rotation_portfolio_response(end: date | None = None) -> dict[str, obje
     total_traded = Decimal("0")
     previous_session = on_or_before(market_bars, VARIABLE_STRATEGY_START - timedelta(days=1))
 
-    for session in sessions:
-        if not previous_session:
-            previous_session = on_or_before(market_bars, session - timedelta(days=1))
-        selected = candidates(previous_session.day)
-        selected_by_ticker = {str(row["ticker"]): row for row in selected}
-        weights = _rotation_weights(selected)
-        observed_equity = cash
-        observed_values: dict[str, Decimal] = {}
-        for ticker, holding in holdings.items():
-            bar = on_or_before(charts[ticker], previous_session.day)
-            if bar:
-                observed_values[ticker] = Decimal(str(holding["shares"])) * bar.close
-                observed_equity += observed_values[ticker]
+    buys = sells = 0
+    traded_today = Decimal("0")
 
-        orders: list[dict[str, object]] = []
-        for ticker in sorted(set(holdings) | set(weights)):
-            current_value = observed_values.get(ticker, Decimal("0"))
-            target_weight = weights.get(ticker, Decimal("0"))
-            delta = observed_equity * target_weight - current_value
-            if target_weight and ticker in holdings and observed_equity and abs(delta) / observed_equity < ROTATION_REBALANCE_BAND:
-                continue
-            if abs(delta) >= Decimal("1"):
-                orders.append({
-                    "ticker": ticker,
-                    "action": "buy" if delta > 0 else "sell",
-                    "usd_amount": abs(delta),
-                    "target_weight": target_weight,
-                    "candidate": selected_by_ticker.get(ticker, {}),
-                })
+    def orders(observed_day: date) -> list[Order]:
+        selected = candidates(observed_day)
+        observed_values, observed_equity = observed_holding_values(holdings, prices, observed_day, cash)
+        return rebalance_orders(
+            holdings,
+            _rotation_weights(selected),
+            observed_values,
+            observed_equity,
+            ROTATION_REBALANCE_BAND,
+            {str(row["ticker"]): row for row in selected},
+        )
 
-        buys = sells = 0
-        traded_today = Decimal("0")
-        for order in sorted(orders, key=lambda item: 0 if item["action"] == "sell" else 1):
-            ticker = str(order["ticker"])
-            bar = on_or_before(charts[ticker], session)
-            if not bar or bar.day <= previous_session.day:
-                continue
-            target_weight = Decimal(str(order["target_weight"]))
-            candidate = order["candidate"] if isinstance(order["candidate"], dict) else {}
-            if order["action"] == "sell":
-                holding = holdings.get(ticker)
-                if not holding:
-                    continue
-                available_value = Decimal(str(holding["shares"])) * bar.close
-                full_exit = target_weight == 0
-                sale_value = available_value if full_exit else min(Decimal(str(order["usd_amount"])), available_value)
-                quantity = Decimal(str(holding["shares"])) if full_exit else sale_value / bar.close
-                cost = quantity * Decimal(str(holding["average_cost"]))
-                pnl = sale_value - cost
-                holding["shares"] = Decimal(str(holding["shares"])) - quantity
-                holding["remaining_cost"] = Decimal(str(holding["remaining_cost"])) - cost
-                holding["proceeds"] = Decimal(str(holding["proceeds"])) + sale_value
-                holding["realized_pnl"] = Decimal(str(holding["realized_pnl"])) + pnl
-                cash += sale_value
-                sells += 1
-                traded_today += sale_value
-                trades.append({
-                    "date": bar.day.isoformat(), "signal_observed_date": previous_session.day.isoformat(),
-                    "action": "sell", "ticker": ticker, "entry_signal": holding.get("entry_signal"),
-                    "rotation_score": holding.get("rotation_score"), "execution_price": as_float(bar.close),
-                    "quantity": as_float(quantity), "usd_amount": as_float(sale_value),
-                    "target_weight_pct": as_float(target_weight * 100), "realized_gain_loss": as_float(pnl),
-                    "reason": "rotated out of daily top ranks" if full_exit else "daily target rebalance",
+    def fill(order: Order, bar: object, observed_day: date) -> None:
+        nonlocal cash, buys, sells, traded_today
+        ticker = order.ticker
+        target_weight = order.target_weight
+        candidate = order.candidate
+        if order.action == "sell":
+            holding = holdings.get(ticker)
+            if not holding:
+                return
+            available_value = Decimal(str(holding["shares"])) * bar.close
+            full_exit = target_weight == 0
+            sale_value = available_value if full_exit else min(order.usd_amount, available_value)
+            quantity = Decimal(str(holding["shares"])) if full_exit else sale_value / bar.close
+            cost = quantity * Decimal(str(holding["average_cost"]))
+            pnl = sale_value - cost
+            holding["shares"] = Decimal(str(holding["shares"])) - quantity
+            holding["remaining_cost"] = Decimal(str(holding["remaining_cost"])) - cost
+            holding["proceeds"] = Decimal(str(holding["proceeds"])) + sale_value
+            holding["realized_pnl"] = Decimal(str(holding["realized_pnl"])) + pnl
+            cash += sale_value
+            sells += 1
+            traded_today += sale_value
+            trades.append({
+                "date": bar.day.isoformat(), "signal_observed_date": observed_day.isoformat(),
+                "action": "sell", "ticker": ticker, "entry_signal": holding.get("entry_signal"),
+                "rotation_score": holding.get("rotation_score"), "execution_price": as_float(bar.close),
+                "quantity": as_float(quantity), "usd_amount": as_float(sale_value),
+                "target_weight_pct": as_float(target_weight * 100), "realized_gain_loss": as_float(pnl),
+                "reason": "rotated out of daily top ranks" if full_exit else "daily target rebalance",
+            })
+            if full_exit:
+                realized.append({
+                    "ticker": ticker, "entry_date": holding["entry_date"], "exit_date": bar.day.isoformat(),
+                    "initial_value": as_float(Decimal(str(holding["initial_cost"]))),
+                    "ending_value": as_float(Decimal(str(holding["proceeds"]))),
+                    "gain_loss": as_float(Decimal(str(holding["realized_pnl"]))),
+                    "return_pct": as_float(pct_change(Decimal(str(holding["proceeds"])), Decimal(str(holding["initial_cost"])))),
+                    "entry_signal": holding.get("entry_signal"), "sector": holding.get("sector"), "status": "closed",
                 })
-                if full_exit:
-                    realized.append({
-                        "ticker": ticker, "entry_date": holding["entry_date"], "exit_date": bar.day.isoformat(),
-                        "initial_value": as_float(Decimal(str(holding["initial_cost"]))),
-                        "ending_value": as_float(Decimal(str(holding["proceeds"]))),
-                        "gain_loss": as_float(Decimal(str(holding["realized_pnl"]))),
-                        "return_pct": as_float(pct_change(Decimal(str(holding["proceeds"])), Decimal(str(holding["initial_cost"])))),
-                        "entry_signal": holding.get("entry_signal"), "sector": holding.get("sector"), "status": "closed",
-                    })
-                    del holdings[ticker]
+                del holdings[ticker]
+        else:
+            purchase = min(order.usd_amount, cash)
+            if purchase < Decimal("1"):
+                return
+            quantity = purchase / bar.close
+            holding = holdings.get(ticker)
+            if holding:
+                old_shares = Decimal(str(holding["shares"]))
+                old_cost = Decimal(str(holding["remaining_cost"]))
+                holding["shares"] = old_shares + quantity
+                holding["remaining_cost"] = old_cost + purchase
+                holding["initial_cost"] = Decimal(str(holding["initial_cost"])) + purchase
+                holding["average_cost"] = (old_cost + purchase) / (old_shares + quantity)
             else:
-                purchase = min(Decimal(str(order["usd_amount"])), cash)
-                if purchase < Decimal("1"):
-                    continue
-                quantity = purchase / bar.close
-                holding = holdings.get(ticker)
-                if holding:
-                    old_shares = Decimal(str(holding["shares"]))
-                    old_cost = Decimal(str(holding["remaining_cost"]))
-                    holding["shares"] = old_shares + quantity
-                    holding["remaining_cost"] = old_cost + purchase
-                    holding["initial_cost"] = Decimal(str(holding["initial_cost"])) + purchase
-                    holding["average_cost"] = (old_cost + purchase) / (old_shares + quantity)
-                else:
-                    holding = holdings[ticker] = {
-                        "shares": quantity, "average_cost": bar.close, "remaining_cost": purchase,
-                        "initial_cost": purchase, "proceeds": Decimal("0"), "realized_pnl": Decimal("0"),
-                        "entry_date": bar.day.isoformat(), "sector": candidate.get("sector", sectors[ticker]),
-                    }
-                holding.update({
-                    "entry_signal": candidate.get("entry_signal", holding.get("entry_signal")),
-                    "rotation_score": as_float(Decimal(str(candidate.get("rotation_score", 0)))),
-                    "signal_score": candidate.get("signal_score", 0), "news_articles_7d": candidate.get("news_articles_7d", 0),
-                })
-                cash -= purchase
-                buys += 1
-                traded_today += purchase
-                trades.append({
-                    "date": bar.day.isoformat(), "signal_observed_date": previous_session.day.isoformat(),
-                    "action": "buy", "ticker": ticker, "entry_signal": holding.get("entry_signal"),
-                    "rotation_score": holding.get("rotation_score"), "execution_price": as_float(bar.close),
-                    "quantity": as_float(quantity), "usd_amount": as_float(purchase),
-                    "target_weight_pct": as_float(target_weight * 100), "realized_gain_loss": None,
-                    "reason": "entered daily top ranks" if Decimal(str(holding["initial_cost"])) == purchase else "daily target rebalance",
-                })
+                holding = holdings[ticker] = {
+                    "shares": quantity, "average_cost": bar.close, "remaining_cost": purchase,
+                    "initial_cost": purchase, "proceeds": Decimal("0"), "realized_pnl": Decimal("0"),
+                    "entry_date": bar.day.isoformat(), "sector": candidate.get("sector", sectors[ticker]),
+                }
+            holding.update({
+                "entry_signal": candidate.get("entry_signal", holding.get("entry_signal")),
+                "rotation_score": as_float(Decimal(str(candidate.get("rotation_score", 0)))),
+                "signal_score": candidate.get("signal_score", 0), "news_articles_7d": candidate.get("news_articles_7d", 0),
+            })
+            cash -= purchase
+            buys += 1
+            traded_today += purchase
+            trades.append({
+                "date": bar.day.isoformat(), "signal_observed_date": observed_day.isoformat(),
+                "action": "buy", "ticker": ticker, "entry_signal": holding.get("entry_signal"),
+                "rotation_score": holding.get("rotation_score"), "execution_price": as_float(bar.close),
+                "quantity": as_float(quantity), "usd_amount": as_float(purchase),
+                "target_weight_pct": as_float(target_weight * 100), "realized_gain_loss": None,
+                "reason": "entered daily top ranks" if Decimal(str(holding["initial_cost"])) == purchase else "daily target rebalance",
+            })
 
+
+    def mark(session: date, observed_day: date, marks: list[tuple[str, object]]) -> None:
+        nonlocal total_traded, buys, sells, traded_today
         total_traded += traded_today
         equity = cash
         sector_values: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0"))
-        for ticker, holding in holdings.items():
-            bar = on_or_before(charts[ticker], session)
-            if bar:
-                value = Decimal(str(holding["shares"])) * bar.close
-                equity += value
-                sector_values[str(holding.get("sector") or "Unclassified")] += value
+        for ticker, bar in marks:
+            holding = holdings[ticker]
+            value = Decimal(str(holding["shares"])) * bar.close
+            equity += value
+            sector_values[str(holding.get("sector") or "Unclassified")] += value
         series.append({
             "date": session.isoformat(), "value": as_float(equity), "cash": as_float(cash),
             "invested_value": as_float(equity - cash), "active_positions": len(holdings),
         })
         daily_rotations.append({
-            "date": session.isoformat(), "signal_observed_date": previous_session.day.isoformat(),
+            "date": session.isoformat(), "signal_observed_date": observed_day.isoformat(),
             "buys": buys, "sells": sells, "traded_value": as_float(traded_today),
             "turnover_pct": as_float(traded_today / equity * 100) if equity else 0,
             "position_count": len(holdings), "cash_pct": as_float(cash / equity * 100) if equity else 0,
@@ -329,7 +329,10 @@ def daily_rotation_portfolio_response(end: date | None = None) -> dict[str, obje
                 for sector, value in sorted(sector_values.items(), key=lambda item: item[1], reverse=True)
             ],
         })
-        previous_session = on_or_before(market_bars, session)
+        buys = sells = 0
+        traded_today = Decimal("0")
+
+    simulate(sessions, previous_session, prices, holdings, orders, fill, mark)
 
     final_equity = Decimal(str(series[-1]["value"]))
     positions: list[dict[str, object]] = []
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Mapping, Sequence
+
+from backend.compact_bars import Bar
+from backend.simulation_checkpoints import config_digest
+
+
+DETAIL_MEMO_ENTRIES = 128
+
+LOCK = threading.Lock()
+_DETAILS: OrderedDict[str, dict[str, object]] = OrderedDict()
+STATS = {"hits": 0, "misses": 0}
+
+
+def chart_tails_fingerprint(
+    charts: Mapping[str, Sequence[Bar]],
+    news_to_date: object,
+    news_counts: Mapping[str, object] | None = None,
+) -> str:
+    digest = hashlib.sha1(str(news_to_date).encode("utf-8"))
+    for ticker in sorted(charts):
+        bars = charts[ticker]
+        last = bars[-1] if bars else None
+        digest.update(
+            f"{ticker}:{len(bars)}:{last.day if last else ''}:{last.close if last else ''};".encode("utf-8")
+        )
+        if news_counts is not None:
+            digest.update(json.dumps(news_counts.get(ticker), sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def detail_key(
+    kind: str,
+    config: Mapping[str, object],
+    charts: Mapping[str, Sequence[Bar]],
+    news_to_date: object,
+    news_counts: Mapping[str, object] | None = None,
+) -> str:
+    return f"{config_digest(kind, config)}:{chart_tails_fingerprint(charts, news_to_date, news_counts)}"
+
+
+def recall_detail(key: str) -> dict[str, object] | None:
+    with LOCK:
+        detail = _DETAILS.get(key)
+        if detail is None:
+            STATS["misses"] += 1
+            return None
+        _DETAILS.move_to_end(key)
+        STATS["hits"] += 1
+    return copy.deepcopy(detail)
+
+
+def remember_detail(key: str, detail: dict[str, object]) -> dict[str, object]:
+    stored = copy.deepcopy(detail)
+    with LOCK:
+        _DETAILS[key] = stored
+        _DETAILS.move_to_end(key)
+        while len(_DETAILS) > DETAIL_MEMO_ENTRIES:
+            _DETAILS.popitem(last=False)
+    return detail
+
+
+def clear_detail_memo() -> None:
+    with LOCK:
+        _DETAILS.clear()
+        STATS["hits"] = 0
+        STATS["misses"] = 0
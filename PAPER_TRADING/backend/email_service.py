@@ -13,6 +13,7 @@ from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from backend.dashboard_cache import cached_or_build_eod, cached_or_build_overview
 from backend.dashboard_service import trader_detail
 from backend.news_service import load_dotenv
+from backend.portfolio_detail_store import stored_detail
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -418,11 +419,17 @@ def send_daily_instructions(
             "strategy": config["strategy"],
         }
 
-    detail = trader_detail(
+    detail = stored_detail(
         config["strategy"],
         start,
         end,
-        apply_wealthsimple_fx_fees=apply_wealthsimple_fx_fees,
+        apply_wealthsimple_fx_fees,
+        lambda: trader_detail(
+            config["strategy"],
+            start,
+            end,
+            apply_wealthsimple_fx_fees=apply_wealthsimple_fx_fees,
+        ),
     )
     overview = cached_or_build_overview(start, end, apply_wealthsimple_fx_fees)
     eod = cached_or_build_eod(apply_wealthsimple_fx_fees)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date
+from decimal import Decimal
+from typing import Protocol, Sequence
+
+from backend.money_backend import DecimalMoney, MoneyBackend
+from backend.wealthsimple_metadata import WEALTHSIMPLE_FX_FEE_RATE
+
+
+FX_SYMBOL = "CAD=X"
+FX_SERIES_ENTRIES = 4
+WEALTHSIMPLE_FX_FEE = Decimal(str(WEALTHSIMPLE_FX_FEE_RATE))
+
+LOCK = threading.Lock()
+_SERIES: OrderedDict[int, FxSeries] = OrderedDict()
+STATS = {"hits": 0, "builds": 0}
+
+
+class PricePoint(Protocol):
+    day: date
+    close: Decimal
+
+
+def forward_filled(bars: Sequence[PricePoint], days: Sequence[date]) -> list[Decimal | None]:
+    column: list[Decimal | None] = []
+    index = 0
+    close: Decimal | None = None
+    for day in days:
+        while index < len(bars) and bars[index].day <= day:
+            close = bars[index].close
+            index += 1
+        column.append(close)
+    return column
+
+
+class FxSeries:
+    __slots__ = ("bars", "ordinals")
+
+    def __init__(self, bars: Sequence[PricePoint]) -> None:
+        self.bars = bars
+        self.ordinals = array("i", (bar.day.toordinal() for bar in bars))
+
+    def on_or_before(self, day: date | None) -> PricePoint | None:
+        count = len(self.ordinals) if day is None else bisect_right(self.ordinals, day.toordinal())
+        return self.bars[count - 1] if count else None
+
+    def on_or_after(self, day: date) -> PricePoint | None:
+        count = bisect_right(self.ordinals, day.toordinal() - 1)
+        return self.bars[count] if count < len(self.bars) else None
+
+    def nearest(self, day: date) -> PricePoint | None:
+        return self.on_or_after(day) or self.on_or_before(day)
+
+    def rates(self, days: Sequence[date]) -> list[Decimal | None]:
+        return forward_filled(self.bars, days)
+
+    def to_usd(
+        self,
+        values: Sequence[object | None],
+        currency: str,
+        rates: Sequence[Decimal | None],
+        money: MoneyBackend | None = None,
+    ) -> list[object | None]:
+        if currency == "USD":
+            return list(values)
+        if currency != "CAD":
+            raise ValueError(f"unsupported currency {currency}")
+        money = money or DecimalMoney()
+        return [
+            money.unconverted(value, money.price(rate)) if value is not None and rate else None
+            for value, rate in zip(values, rates)
+        ]
+
+
+def fx_series(bars: Sequence[PricePoint]) -> FxSeries:
+    key = id(bars)
+    with LOCK:
+        cached = _SERIES.get(key)
+        if cached is not None and cached.bars is bars:
+            _SERIES.move_to_end(key)
+            STATS["hits"] += 1
+            return cached
+    series = FxSeries(bars)
+    with LOCK:
+        STATS["builds"] += 1
+        _SERIES[key] = series
+        _SERIES.move_to_end(key)
+        while len(_SERIES) > FX_SERIES_ENTRIES:
+            _SERIES.popitem(last=False)
+    return series
+
+
+def fee_adjusted(
+    amounts: Sequence[Decimal],
+    currencies: Sequence[str],
+    apply_wealthsimple_fx_fees: bool,
+) -> list[Decimal]:
+    if not apply_wealthsimple_fx_fees:
+        return list(amounts)
+    spendable = Decimal("1") - WEALTHSIMPLE_FX_FEE
+    return [
+        amount if currency == "CAD" else amount * spendable
+        for amount, currency in zip(amounts, currencies)
+    ]
+
+
+def fx_series_report() -> dict[str, object]:
+    with LOCK:
+        return {**STATS, "entries": len(_SERIES), "max_entries": FX_SERIES_ENTRIES}
+
+
+def clear_fx_series() -> None:
+    with LOCK:
+        _SERIES.clear()
+        for name in STATS:
+            STATS[name] = 0
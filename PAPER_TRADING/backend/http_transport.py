@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import atexit
+import base64
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from email.message import Message
+from io import BytesIO
+from pathlib import Path
+from threading import Lock
+from urllib.error import URLError
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from urllib.request import Request
+from urllib.request import urlopen as network_urlopen
+from urllib.response import addinfourl
+
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_FIXTURE_FILE = ROOT / "data" / "http_fixtures.json.gz"
+MODE_ENV = "PAPER_TRADING_HTTP_MODE"
+FIXTURE_ENV = "PAPER_TRADING_HTTP_FIXTURES"
+MODES = ("live", "record", "replay")
+FIXTURE_VERSION = 1
+SECRET_QUERY_PARAMS = {"key", "apikey", "api_key", "token", "access_token"}
+VOLATILE_QUERY_PARAMS = {"period2", "start", "end", "publishedafter"}
+
+LOCK = Lock()
+_ARCHIVES: dict[Path, dict[str, dict[str, object]]] = {}
+_LOOSE_INDEX: dict[Path, dict[str, str]] = {}
+_DIRTY: set[Path] = set()
+_FLUSH_REGISTERED = False
+
+
+def transport_mode() -> str:
+    mode = os.environ.get(MODE_ENV, "live").strip().casefold() or "live"
+    if mode not in MODES:
+        raise ValueError(f"{MODE_ENV} must be one of {', '.join(MODES)}")
+    return mode
+
+
+def fixture_path() -> Path:
+    configured = os.environ.get(FIXTURE_ENV, "").strip()
+    return Path(configured) if configured else DEFAULT_FIXTURE_FILE
+
+
+def normalized_url(url: str, *, drop_volatile: bool = False) -> str:
+    parts = urlsplit(url)
+    params = []
+    for name, value in parse_qsl(parts.query, keep_blank_values=True):
+        folded = name.casefold()
+        if folded in SECRET_QUERY_PARAMS:
+            value = "redacted"
+        if drop_volatile and folded in VOLATILE_QUERY_PARAMS:
+            continue
+        params.append((name, value))
+    return urlunsplit(
+        (
+            parts.scheme.casefold(),
+            parts.netloc.casefold(),
+            parts.path or "/",
+            urlencode(sorted(params)),
+            "",
+        )
+    )
+
+
+def request_key(method: str, url: str, data: bytes | None = None, *, drop_volatile: bool = False) -> str:
+    body_hash = hashlib.sha1(data).hexdigest()[:16] if data else "-"
+    return f"{method.upper()} {normalized_url(url, drop_volatile=drop_volatile)} {body_hash}"
+
+
+def load_archive(path: Path) -> dict[str, dict[str, object]]:
+    archive = _ARCHIVES.get(path)
+    if archive is not None:
+        return archive
+    archive = {}
+    if path.exists():
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            payload = {}
+        if isinstance(payload, dict) and payload.get("version") == FIXTURE_VERSION:
+            entries = payload.get("entries")
+            archive = entries if isinstance(entries, dict) else {}
+    _ARCHIVES[path] = archive
+    _LOOSE_INDEX[path] = {}
+    for key, entry in sorted(archive.items(), key=lambda item: str(item[1].get("recorded_at") or "")):
+        _LOOSE_INDEX[path][str(entry.get("loose_key"))] = key
+    return archive
+
+
+def flush_fixtures() -> None:
+    with LOCK:
+        for path in sorted(_DIRTY):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary_path = path.with_suffix(f"{path.suffix}.tmp")
+            with gzip.open(temporary_path, "wt", encoding="utf-8") as handle:
+                json.dump({"version": FIXTURE_VERSION, "entries": _ARCHIVES[path]}, handle, sort_keys=True)
+            temporary_path.replace(path)
+        _DIRTY.clear()
+
+
+def clear_loaded_fixtures() -> None:
+    with LOCK:
+        _ARCHIVES.clear()
+        _LOOSE_INDEX.clear()
+        _DIRTY.clear()
+
+
+def fixture_response(entry: dict[str, object], url: str) -> addinfourl:
+    headers = Message()
+    headers["Content-Type"] = str(entry.get("content_type") or "application/octet-stream")
+    body = base64.b64decode(str(entry.get("body") or ""))
+    return addinfourl(BytesIO(body), headers, url, int(entry.get("status") or 200))
+
+
+def replay(request: Request) -> addinfourl:
+    path = fixture_path()
+    exact = request_key(request.get_method(), request.full_url, request.data)
+    loose = request_key(request.get_method(), request.full_url, request.data, drop_volatile=True)
+    with LOCK:
+        archive = load_archive(path)
+        entry = archive.get(exact) or archive.get(_LOOSE_INDEX[path].get(loose, ""))
+    if entry is None:
+        raise URLError(f"no recorded fixture for {exact} in {path}")
+    return fixture_response(entry, request.full_url)
+
+
+def add_fixture(
+    request: Request,
+    body: bytes,
+    *,
+    status: int = 200,
+    content_type: str = "application/json",
+    path: Path | None = None,
+) -> dict[str, object]:
+    global _FLUSH_REGISTERED
+    entry = {
+        "method": request.get_method(),
+        "url": normalized_url(request.full_url),
+        "loose_key": request_key(request.get_method(), request.full_url, request.data, drop_volatile=True),
+        "status": status,
+        "content_type": content_type,
+        "body": base64.b64encode(body).decode("ascii"),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    path = path or fixture_path()
+    with LOCK:
+        key = request_key(request.get_method(), request.full_url, request.data)
+        load_archive(path)[key] = entry
+        _LOOSE_INDEX[path][str(entry["loose_key"])] = key
+        _DIRTY.add(path)
+        if not _FLUSH_REGISTERED:
+            atexit.register(flush_fixtures)
+            _FLUSH_REGISTERED = True
+    return entry
+
+
+def record(request: Request, timeout: float) -> addinfourl:
+    with network_urlopen(request, timeout=timeout) as response:
+        body = response.read()
+        entry = add_fixture(
+            request,
+            body,
+            status=response.status,
+            content_type=response.headers.get("Content-Type") or "",
+        )
+    return fixture_response(entry, request.full_url)
+
+
+def urlopen(request: Request | str, timeout: float = 20):
+    if isinstance(request, str):
+        request = Request(request)
+    mode = transport_mode()
+    if mode == "replay":
+        return replay(request)
+    if mode == "record":
+        return record(request, timeout)
+    return network_urlopen(request, timeout=timeout)
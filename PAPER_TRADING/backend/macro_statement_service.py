@@ -8,6 +8,8 @@ from datetime import date, datetime, timezone
 from email.utils import parsedate_to_datetime
 from typing import Any
 
+from backend.http_transport import urlopen
+
 
 BANK_OF_CANADA_FEEDS = [
     {
@@ -238,7 +240,7 @@ def fetch_bank_of_canada_statements(timeout_seconds: float = 4.0) -> tuple[list[
                 str(feed["url"]),
                 headers={"User-Agent": "paper-trading-dashboard/1.0"},
             )
-            with urllib.request.urlopen(request, timeout=timeout_seconds) as response:
+            with urlopen(request, timeout=timeout_seconds) as response:
                 body = response.read().decode("utf-8", errors="replace")
             statements.extend(parse_bank_of_canada_feed(body, str(feed["name"]), str(feed["url"])))
         except Exception as exc:  # pragma: no cover - network behavior varies by environment.
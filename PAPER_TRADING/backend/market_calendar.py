@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+EARLY_CLOSE = time(13, 0)
+FX_WEEK_CLOSE = time(17, 0)
+FINALIZE_DELAY = timedelta(minutes=20)
+INTRADAY_REFRESH_ENV = "PAPER_TRADING_INTRADAY_REFRESH_MINUTES"
+DEFAULT_INTRADAY_REFRESH_MINUTES = 10
+CONTINUOUS_REFRESH_ENV = "PAPER_TRADING_CONTINUOUS_REFRESH_MINUTES"
+DEFAULT_CONTINUOUS_REFRESH_MINUTES = 30
+NYSE = "nyse"
+TSX = "tsx"
+CONTINUOUS = "continuous"
+FX = "fx"
+TSX_SUFFIXES = (".TO", ".V", ".NE", ".CN")
+TSX_INDEXES = {"^GSPTSE"}
+CONTINUOUS_QUOTE_CURRENCIES = ("USD", "CAD", "USDT", "USDC", "EUR")
+
+
+def exchange_timezone() -> timezone | ZoneInfo:
+    try:
+        return ZoneInfo("America/New_York")
+    except ZoneInfoNotFoundError:
+        return timezone(timedelta(hours=-5))
+
+
+def refresh_interval(env: str, default: float) -> timedelta:
+    try:
+        minutes = float(os.environ.get(env, default))
+    except ValueError:
+        minutes = default
+    return timedelta(minutes=max(minutes, 1))
+
+
+def intraday_refresh_interval() -> timedelta:
+    return refresh_interval(INTRADAY_REFRESH_ENV, DEFAULT_INTRADAY_REFRESH_MINUTES)
+
+
+def continuous_refresh_interval() -> timedelta:
+    return refresh_interval(CONTINUOUS_REFRESH_ENV, DEFAULT_CONTINUOUS_REFRESH_MINUTES)
+
+
+def symbol_exchange(symbol: str | None) -> str:
+    text = (symbol or "").strip().upper()
+    if text.endswith("=X"):
+        return FX
+    if text.endswith(tuple(f"-{currency}" for currency in CONTINUOUS_QUOTE_CURRENCIES)):
+        return CONTINUOUS
+    if text.endswith(TSX_SUFFIXES) or text in TSX_INDEXES:
+        return TSX
+    return NYSE
+
+
+def easter_sunday(year: int) -> date:
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def last_weekday(year: int, month: int, weekday: int) -> date:
+    last = (date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1))
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def observed(day: date) -> date:
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def shifted_to_weekdays(days: list[date]) -> set[date]:
+    taken: set[date] = set()
+    for day in days:
+        while day.weekday() >= 5 or day in taken:
+            day += timedelta(days=1)
+        taken.add(day)
+    return taken
+
+
+@lru_cache(maxsize=32)
+def tsx_holidays(year: int) -> frozenset[date]:
+    holidays = shifted_to_weekdays([date(year, 1, 1), date(year, 7, 1), date(year, 12, 25), date(year, 12, 26)])
+    holidays |= {
+        nth_weekday(year, 2, 0, 3),
+        easter_sunday(year) - timedelta(days=2),
+        date(year, 5, 24) - timedelta(days=date(year, 5, 24).weekday()),
+        nth_weekday(year, 8, 0, 1),
+        nth_weekday(year, 9, 0, 1),
+        nth_weekday(year, 10, 0, 2),
+    }
+    return frozenset(holidays)
+
+
+@lru_cache(maxsize=32)
+def nyse_holidays(year: int) -> frozenset[date]:
+    holidays = {
+        nth_weekday(year, 1, 0, 3),
+        nth_weekday(year, 2, 0, 3),
+        easter_sunday(year) - timedelta(days=2),
+        last_weekday(year, 5, 0),
+        observed(date(year, 7, 4)),
+        nth_weekday(year, 9, 0, 1),
+        nth_weekday(year, 11, 3, 4),
+        observed(date(year, 12, 25)),
+    }
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.add(observed(new_year))
+    if year >= 2022:
+        holidays.add(observed(date(year, 6, 19)))
+    return frozenset(holidays)
+
+
+def exchange_holidays(year: int, exchange: str = NYSE) -> frozenset[date]:
+    if exchange == TSX:
+        return tsx_holidays(year)
+    if exchange in {CONTINUOUS, FX}:
+        return frozenset()
+    return nyse_holidays(year)
+
+
+def is_trading_day(day: date, exchange: str = NYSE) -> bool:
+    return day.weekday() < 5 and day not in exchange_holidays(day.year, exchange)
+
+
+def session_close_time(day: date, exchange: str = NYSE) -> time:
+    if exchange == TSX:
+        early = {date(day.year, 12, 24), date(day.year, 12, 31)}
+    else:
+        early = {nth_weekday(day.year, 11, 3, 4) + timedelta(days=1), date(day.year, 12, 24), date(day.year, 7, 3)}
+    return EARLY_CLOSE if day in early and is_trading_day(day, exchange) else MARKET_CLOSE
+
+
+def session_bounds(day: date, exchange: str = NYSE) -> tuple[datetime, datetime]:
+    zone = exchange_timezone()
+    return (
+        datetime.combine(day, MARKET_OPEN, tzinfo=zone),
+        datetime.combine(day, session_close_time(day, exchange), tzinfo=zone),
+    )
+
+
+def previous_trading_day(day: date, exchange: str = NYSE) -> date:
+    day -= timedelta(days=1)
+    while not is_trading_day(day, exchange):
+        day -= timedelta(days=1)
+    return day
+
+
+def fx_week_close(now: datetime) -> datetime:
+    local = now.astimezone(exchange_timezone())
+    friday = local.date() - timedelta(days=(local.weekday() - 4) % 7)
+    close = datetime.combine(friday, FX_WEEK_CLOSE, tzinfo=exchange_timezone())
+    return close if close <= local else close - timedelta(days=7)
+
+
+def market_phase(now: datetime, exchange: str = NYSE) -> str:
+    if exchange == CONTINUOUS:
+        return "open"
+    if exchange == FX:
+        local = now.astimezone(exchange_timezone())
+        weekday, clock = local.weekday(), local.time()
+        closed = weekday == 5 or (weekday == 4 and clock >= FX_WEEK_CLOSE) or (weekday == 6 and clock < FX_WEEK_CLOSE)
+        return "closed" if closed else "open"
+    local = now.astimezone(exchange_timezone())
+    if not is_trading_day(local.date(), exchange):
+        return "closed"
+    opens, closes = session_bounds(local.date(), exchange)
+    if local < opens:
+        return "pre_open"
+    if local < closes:
+        return "open"
+    return "after_close"
+
+
+def last_finalization_time(now: datetime, exchange: str = NYSE) -> datetime:
+    if exchange == CONTINUOUS:
+        return datetime.combine(now.astimezone(timezone.utc).date(), time(0), tzinfo=timezone.utc)
+    if exchange == FX:
+        week_close = fx_week_close(now)
+        finalized = week_close + FINALIZE_DELAY
+        if market_phase(now, FX) == "closed":
+            return finalized if finalized <= now else week_close
+        return max(datetime.combine(now.astimezone(timezone.utc).date(), time(0), tzinfo=timezone.utc), finalized)
+    local = now.astimezone(exchange_timezone())
+    day = local.date()
+    if is_trading_day(day, exchange):
+        finalized = session_bounds(day, exchange)[1] + FINALIZE_DELAY
+        if local >= finalized:
+            return finalized
+    return session_bounds(previous_trading_day(day, exchange), exchange)[1] + FINALIZE_DELAY
+
+
+def chart_needs_refresh(fetched_at: datetime, now: datetime | None = None, *, symbol: str | None = None) -> bool:
+    now = now or datetime.now(timezone.utc)
+    exchange = symbol_exchange(symbol)
+    if fetched_at < last_finalization_time(now, exchange):
+        return True
+    if exchange == CONTINUOUS or (exchange == FX and market_phase(now, FX) == "open"):
+        return now - fetched_at >= continuous_refresh_interval()
+    if market_phase(now, exchange) == "open":
+        return now - fetched_at >= intraday_refresh_interval()
+    return False
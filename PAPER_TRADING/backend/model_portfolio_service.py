@@ -24,6 +24,16 @@ from backend.dashboard_service import (
 )
 from backend.macro_statement_service import bank_of_canada_macro_context
 from backend.news_strategy import load_daily_news_counts, news_metrics
+from backend.returns_store import SymbolReturns, symbol_returns
+from backend.simulation_kernel import (
+    MARKET_KEY,
+    Order,
+    SessionPrices,
+    observed_holding_values,
+    rebalance_orders,
+    simulate,
+    simulation_days,
+)
 from backend.universe_service import read_asset_universe
 
 
@@ -41,6 +51,8 @@ MODEL_REBALANCE_BAND = Decimal("0.03")
 MODEL_MIN_SCORE = Decimal("50")
 MODEL_NEAR_MIN_SCORE = Decimal("75")
 MODEL_EXIT_BUFFER_SESSIONS = 10
+MODEL_VOLATILITY_SESSIONS = 21
+MODEL_VOLATILITY_MIN_RETURNS = 5
 MODEL_V2_SOFT_DRAWDOWN = Decimal("-8")
 MODEL_V2_MEDIUM_DRAWDOWN = Decimal("-12")
 MODEL_V2_HARD_DRAWDOWN = Decimal("-18")
@@ -49,6 +61,12 @@ MODEL_V3_MIN_SELL_DRAWDOWN = Decimal("-7")
 MODEL_V3_MAX_SELL_DRAWDOWN = Decimal("-20")
 MODEL_V3_DRAWDOWN_MULTIPLIER = Decimal("2.50")
 MODEL_V4_INTRADAY_PROXY_MULTIPLIER = Decimal("0.75")
+MODEL_RISK_MODES = {
+    MODEL_PORTFOLIO_NAME: "base",
+    MODEL_PORTFOLIO_V2_NAME: "v2",
+    MODEL_PORTFOLIO_V3_NAME: "v3",
+    MODEL_PORTFOLIO_V4_NAME: "v4",
+}
 
 
 def _asset_available(row: dict[str, object], observed_day: date) -> bool:
@@ -80,15 +98,12 @@ def _asset_ever_available(row: dict[str, object], end: date) -> bool:
     return not archived_at or date.fromisoformat(archived_at) > VARIABLE_STRATEGY_START
 
 
-def _trailing_volatility(bars: tuple[object, ...]) -> Decimal:
-    closes = [Decimal(str(bar.close)) for bar in bars[-21:]]
-    if len(closes) < 6:
-        return Decimal("0")
-    returns = [float(pct_change(current, previous)) for previous, current in zip(closes, closes[1:])]
-    if len(returns) < 2:
+def _trailing_volatility(returns: SymbolReturns, count: int) -> Decimal:
+    window = returns.trailing(count, MODEL_VOLATILITY_SESSIONS).pct
+    if len(window) < MODEL_VOLATILITY_MIN_RETURNS:
         return Decimal("0")
-    mean = sum(returns) / len(returns)
-    variance = sum((value - mean) ** 2 for value in returns) / (len(returns) - 1)
+    mean = sum(window) / len(window)
+    variance = sum((value - mean) ** 2 for value in window) / (len(window) - 1)
     return Decimal(str(math.sqrt(variance) * math.sqrt(252)))
 
 
@@ -324,89 +339,88 @@ def _average_drawdown_adjusted_weights(
     return adjusted
 
 
-def systematic_model_portfolio_response(end: date | None = None, start: date | None = None) -> dict[str, object]:
-    return _systematic_model_portfolio_response(end, risk_mode="base", selected_start=start)
-
-
-def systematic_model_portfolio_v2_response(end: date | None = None, start: date | None = None) -> dict[str, object]:
-    return _systematic_model_portfolio_response(end, risk_mode="v2", selected_start=start)
+class ModelCandidates:
+    def __init__(self, end: date | None = None) -> None:
+        universe = read_asset_universe()
+        owners = owners_by_asset()
+        _, market_bars = fetch_chart("SPY")
+        latest_market = on_or_before(market_bars, end)
+        if not latest_market or latest_market.day < VARIABLE_STRATEGY_START:
+            raise ValueError("model portfolio requires an ending market date on or after 2026-01-31")
+        sessions = [bar.day for bar in market_bars if VARIABLE_STRATEGY_START <= bar.day <= latest_market.day]
+        if not sessions:
+            raise ValueError("missing model portfolio market sessions")
 
+        latest_eligible = [row for row in universe if _asset_ever_available(row, latest_market.day)]
+        charts: dict[str, tuple[object, ...]] = {}
+        asset_types: dict[str, str] = {}
+        sectors: dict[str, str] = {}
+        added_dates: dict[str, date] = {}
+        returns: dict[str, SymbolReturns] = {}
+        universe_by_ticker: dict[str, dict[str, object]] = {}
+        for row in latest_eligible:
+            ticker = str(row["ticker"])
+            asset_type = str(row["asset_type"])
+            try:
+                _, bars = fetch_chart(yahoo_symbol(ticker, asset_type))
+            except Exception:
+                continue
+            if not bars:
+                continue
+            charts[ticker] = bars
+            returns[ticker] = symbol_returns(yahoo_symbol(ticker, asset_type), bars)
+            universe_by_ticker[ticker] = row
+            asset_types[ticker] = asset_type
+            configured_sector = str(row.get("sector") or "").strip()
+            sectors[ticker] = configured_sector or sector_for_asset(
+                ticker,
+                asset_type,
+                owners.get((ticker, asset_type), [MODEL_PORTFOLIO_NAME]),
+            )[0]
+            added_dates[ticker] = date.fromisoformat(str(row.get("added_at") or VARIABLE_STRATEGY_START.isoformat()))
 
-def systematic_model_portfolio_v3_response(end: date | None = None, start: date | None = None) -> dict[str, object]:
-    return _systematic_model_portfolio_response(end, risk_mode="v3", selected_start=start)
-
+        daily_news = load_daily_news_counts()
+        news_counts = daily_news.get("tickers", {})
+        if not isinstance(news_counts, dict):
+            news_counts = {}
 
-def systematic_model_portfolio_v4_response(end: date | None = None, start: date | None = None) -> dict[str, object]:
-    return _systematic_model_portfolio_response(end, risk_mode="v4", selected_start=start)
+        self.market_bars = market_bars
+        self.latest_market = latest_market
+        self.sessions = sessions
+        self.charts = charts
+        self.asset_types = asset_types
+        self.sectors = sectors
+        self.added_dates = added_dates
+        self.returns = returns
+        self.universe_by_ticker = universe_by_ticker
+        self.daily_news = daily_news
+        self.news_counts = news_counts
+        self.prices = SessionPrices(
+            {**charts, MARKET_KEY: market_bars},
+            simulation_days(market_bars, VARIABLE_STRATEGY_START, latest_market.day),
+        )
+        self.ranked: dict[date, list[dict[str, object]]] = {}
+        self.macro: dict[str, object] | None = None
 
+    def candidates(self, observed_day: date) -> list[dict[str, object]]:
+        ranked = self.ranked.get(observed_day)
+        if ranked is None:
+            ranked = self.ranked[observed_day] = self._rank(observed_day)
+        return ranked
 
-def _systematic_model_portfolio_response(
-    end: date | None = None,
-    risk_mode: str = "base",
-    selected_start: date | None = None,
-) -> dict[str, object]:
-    portfolio_name = {
-        "base": MODEL_PORTFOLIO_NAME,
-        "v2": MODEL_PORTFOLIO_V2_NAME,
-        "v3": MODEL_PORTFOLIO_V3_NAME,
-        "v4": MODEL_PORTFOLIO_V4_NAME,
-    }.get(risk_mode, MODEL_PORTFOLIO_NAME)
-    universe = read_asset_universe()
-    owners = owners_by_asset()
-    _, market_bars = fetch_chart("SPY")
-    latest_market = on_or_before(market_bars, end)
-    if not latest_market or latest_market.day < VARIABLE_STRATEGY_START:
-        raise ValueError("model portfolio requires an ending market date on or after 2026-01-31")
-    sessions = [bar.day for bar in market_bars if VARIABLE_STRATEGY_START <= bar.day <= latest_market.day]
-    if not sessions:
-        raise ValueError("missing model portfolio market sessions")
-    if selected_start and selected_start > latest_market.day:
-        raise ValueError("model portfolio selected start must be on or before ending market date")
-
-    latest_eligible = [row for row in universe if _asset_ever_available(row, latest_market.day)]
-    charts: dict[str, tuple[object, ...]] = {}
-    asset_types: dict[str, str] = {}
-    sectors: dict[str, str] = {}
-    added_dates: dict[str, date] = {}
-    universe_by_ticker: dict[str, dict[str, object]] = {}
-    for row in latest_eligible:
-        ticker = str(row["ticker"])
-        asset_type = str(row["asset_type"])
-        try:
-            _, bars = fetch_chart(yahoo_symbol(ticker, asset_type))
-        except Exception:
-            continue
-        if not bars:
-            continue
-        charts[ticker] = bars
-        universe_by_ticker[ticker] = row
-        asset_types[ticker] = asset_type
-        configured_sector = str(row.get("sector") or "").strip()
-        sectors[ticker] = configured_sector or sector_for_asset(
-            ticker,
-            asset_type,
-            owners.get((ticker, asset_type), [MODEL_PORTFOLIO_NAME]),
-        )[0]
-        added_dates[ticker] = date.fromisoformat(str(row.get("added_at") or VARIABLE_STRATEGY_START.isoformat()))
-
-    daily_news = load_daily_news_counts()
-    news_counts = daily_news.get("tickers", {})
-    if not isinstance(news_counts, dict):
-        news_counts = {}
-
-    def candidates(observed_day: date) -> list[dict[str, object]]:
+    def _rank(self, observed_day: date) -> list[dict[str, object]]:
         rows: list[dict[str, object]] = []
-        for ticker, bars in charts.items():
-            if added_dates[ticker] > observed_day or not _asset_available(universe_by_ticker[ticker], observed_day):
+        for ticker in self.charts:
+            if self.added_dates[ticker] > observed_day or not _asset_available(self.universe_by_ticker[ticker], observed_day):
                 continue
-            signal_bars = tuple(bar for bar in bars if bar.day <= observed_day)
+            signal_bars = self.prices.history(ticker, observed_day)
             signal = live_signal(signal_bars)
             category = entry_signal(signal)
             if not category or not isinstance(signal, dict):
                 continue
-            ticker_counts = news_counts.get(ticker, {})
+            ticker_counts = self.news_counts.get(ticker, {})
             news = news_metrics(ticker_counts if isinstance(ticker_counts, dict) else {}, observed_day)
-            volatility = _trailing_volatility(signal_bars)
+            volatility = _trailing_volatility(self.returns[ticker], len(signal_bars))
             score, score_components = _candidate_score(signal, category, news, volatility)
             minimum_score = MODEL_NEAR_MIN_SCORE if category == "near" else MODEL_MIN_SCORE
             if score < minimum_score:
@@ -414,8 +428,8 @@ def _systematic_model_portfolio_response(
             rows.append(
                 {
                     "ticker": ticker,
-                    "asset_type": asset_types[ticker],
-                    "sector": sectors[ticker],
+                    "asset_type": self.asset_types[ticker],
+                    "sector": self.sectors[ticker],
                     "entry_signal": category,
                     "model_score": score,
                     "signal_score": signal.get("overall_score", 0),
@@ -431,6 +445,74 @@ def _systematic_model_portfolio_response(
             )
         return _select_candidates(rows)
 
+    def macro_context(self) -> dict[str, object]:
+        if self.macro is None:
+            self.macro = bank_of_canada_macro_context(self.latest_market.day)
+        return self.macro
+
+
+def systematic_model_portfolio_response(end: date | None = None, start: date | None = None) -> dict[str, object]:
+    return _systematic_model_portfolio_response(end, risk_mode="base", selected_start=start)
+
+
+def systematic_model_portfolio_v2_response(end: date | None = None, start: date | None = None) -> dict[str, object]:
+    return _systematic_model_portfolio_response(end, risk_mode="v2", selected_start=start)
+
+
+def systematic_model_portfolio_v3_response(end: date | None = None, start: date | None = None) -> dict[str, object]:
+    return _systematic_model_portfolio_response(end, risk_mode="v3", selected_start=start)
+
+
+def systematic_model_portfolio_v4_response(end: date | None = None, start: date | None = None) -> dict[str, object]:
+    return _systematic_model_portfolio_response(end, risk_mode="v4", selected_start=start)
+
+
+def systematic_model_portfolio_responses(
+    end: date | None = None,
+    start: date | None = None,
+    portfolios: list[str] | None = None,
+) -> dict[str, dict[str, object]]:
+    names = list(MODEL_RISK_MODES) if portfolios is None else portfolios
+    unknown = [name for name in names if name not in MODEL_RISK_MODES]
+    if unknown:
+        raise KeyError(unknown[0])
+    model = ModelCandidates(end)
+    return {
+        name: _systematic_model_portfolio_response(
+            end,
+            risk_mode=MODEL_RISK_MODES[name],
+            selected_start=start,
+            model=model,
+        )
+        for name in names
+    }
+
+
+def _systematic_model_portfolio_response(
+    end: date | None = None,
+    risk_mode: str = "base",
+    selected_start: date | None = None,
+    model: ModelCandidates | None = None,
+) -> dict[str, object]:
+    portfolio_name = {
+        "base": MODEL_PORTFOLIO_NAME,
+        "v2": MODEL_PORTFOLIO_V2_NAME,
+        "v3": MODEL_PORTFOLIO_V3_NAME,
+        "v4": MODEL_PORTFOLIO_V4_NAME,
+    }.get(risk_mode, MODEL_PORTFOLIO_NAME)
+    model = model or ModelCandidates(end)
+    latest_market = model.latest_market
+    if selected_start and selected_start > latest_market.day:
+        raise ValueError("model portfolio selected start must be on or before ending market date")
+    market_bars = model.market_bars
+    sessions = model.sessions
+    charts = model.charts
+    asset_types = model.asset_types
+    sectors = model.sectors
+    daily_news = model.daily_news
+    prices = model.prices
+    candidates = model.candidates
+
     def portfolio_targets(
         observed_day: date,
         current_holdings: dict[str, dict[str, object]],
@@ -504,10 +586,12 @@ def _systematic_model_portfolio_response(
     total_traded = Decimal("0")
     previous_session = on_or_before(market_bars, VARIABLE_STRATEGY_START - timedelta(days=1))
 
-    for session in sessions:
-        if not previous_session:
-            previous_session = on_or_before(market_bars, session - timedelta(days=1))
-        selected, weights = portfolio_targets(previous_session.day, holdings, update_streaks=True)
+    buys = 0
+    sells = 0
+    traded_today = Decimal("0")
+
+    def orders(observed_day: date) -> list[Order]:
+        selected, weights = portfolio_targets(observed_day, holdings, update_streaks=True)
         selected_by_ticker = {str(row["ticker"]): row for row in selected}
         for ticker, holding in holdings.items():
             row = selected_by_ticker.get(ticker)
@@ -522,176 +606,148 @@ def _systematic_model_portfolio_response(
                     "news_articles_7d": row.get("news_articles_7d", 0),
                 }
             )
-        observed_values: dict[str, Decimal] = {}
-        observed_equity = cash
-        for ticker, holding in holdings.items():
-            bar = on_or_before(charts[ticker], previous_session.day)
-            if not bar:
-                continue
-            value = Decimal(str(holding["shares"])) * bar.close
-            observed_values[ticker] = value
-            observed_equity += value
-
-        orders: list[dict[str, object]] = []
-        for ticker in sorted(set(holdings) | set(weights)):
-            current_value = observed_values.get(ticker, Decimal("0"))
-            target_weight = weights.get(ticker, Decimal("0"))
-            target_value = observed_equity * target_weight
-            delta = target_value - current_value
-            if target_weight and ticker in holdings and observed_equity:
-                if abs(delta) / observed_equity < MODEL_REBALANCE_BAND:
-                    continue
-            candidate = selected_by_ticker.get(ticker)
-            if delta > 0 and candidate and candidate.get("retained_buffer"):
-                continue
-            if abs(delta) < Decimal("1"):
-                continue
-            orders.append(
+        observed_values, observed_equity = observed_holding_values(holdings, prices, observed_day, cash)
+        return rebalance_orders(
+            holdings,
+            weights,
+            observed_values,
+            observed_equity,
+            MODEL_REBALANCE_BAND,
+            selected_by_ticker,
+            hold_only=lambda candidate: bool(candidate.get("retained_buffer")),
+        )
+
+    def fill(order: Order, price_bar: object, observed_day: date) -> None:
+        nonlocal cash, buys, sells, traded_today
+        ticker = order.ticker
+        amount = order.usd_amount
+        candidate = order.candidate
+        if order.action == "sell":
+            holding = holdings.get(ticker)
+            if not holding:
+                return
+            available_value = Decimal(str(holding["shares"])) * price_bar.close
+            full_exit = order.target_weight == 0
+            sale_value = available_value if full_exit else min(amount, available_value)
+            quantity = Decimal(str(holding["shares"])) if full_exit else min(
+                sale_value / price_bar.close,
+                Decimal(str(holding["shares"])),
+            )
+            allocated_cost = quantity * Decimal(str(holding["average_cost"]))
+            realized_pnl = sale_value - allocated_cost
+            holding["shares"] = Decimal(str(holding["shares"])) - quantity
+            holding["remaining_cost"] = Decimal(str(holding["remaining_cost"])) - allocated_cost
+            holding["cumulative_proceeds"] = Decimal(str(holding["cumulative_proceeds"])) + sale_value
+            holding["cumulative_realized_pnl"] = Decimal(str(holding["cumulative_realized_pnl"])) + realized_pnl
+            cash += sale_value
+            sells += 1
+            traded_today += sale_value
+            trade_ledger.append(
                 {
+                    "date": price_bar.day.isoformat(),
+                    "signal_observed_date": observed_day.isoformat(),
+                    "action": "sell",
                     "ticker": ticker,
-                    "action": "buy" if delta > 0 else "sell",
-                    "usd_amount": abs(delta),
-                    "target_weight": target_weight,
-                    "candidate": selected_by_ticker.get(ticker),
+                    "execution_price": as_float(price_bar.close),
+                    "quantity": as_float(quantity),
+                    "usd_amount": as_float(sale_value),
+                    "realized_gain_loss": as_float(realized_pnl),
+                    "target_weight_pct": as_float(order.target_weight * 100),
+                    "reason": holding.get("drawdown_control_reason")
+                    or ("removed from model" if not order.target_weight else "rebalance band"),
                 }
             )
-
-        buys = 0
-        sells = 0
-        traded_today = Decimal("0")
-        for order in sorted(orders, key=lambda row: 0 if row["action"] == "sell" else 1):
-            ticker = str(order["ticker"])
-            price_bar = on_or_before(charts[ticker], session)
-            if not price_bar or price_bar.day <= previous_session.day:
-                continue
-            amount = Decimal(str(order["usd_amount"]))
-            candidate = order.get("candidate") or {}
-            if order["action"] == "sell":
-                holding = holdings.get(ticker)
-                if not holding:
-                    continue
-                available_value = Decimal(str(holding["shares"])) * price_bar.close
-                full_exit = Decimal(str(order["target_weight"])) == 0
-                sale_value = available_value if full_exit else min(amount, available_value)
-                quantity = Decimal(str(holding["shares"])) if full_exit else min(
-                    sale_value / price_bar.close,
-                    Decimal(str(holding["shares"])),
-                )
-                allocated_cost = quantity * Decimal(str(holding["average_cost"]))
-                realized_pnl = sale_value - allocated_cost
-                holding["shares"] = Decimal(str(holding["shares"])) - quantity
-                holding["remaining_cost"] = Decimal(str(holding["remaining_cost"])) - allocated_cost
-                holding["cumulative_proceeds"] = Decimal(str(holding["cumulative_proceeds"])) + sale_value
-                holding["cumulative_realized_pnl"] = Decimal(str(holding["cumulative_realized_pnl"])) + realized_pnl
-                cash += sale_value
-                sells += 1
-                traded_today += sale_value
-                trade_ledger.append(
-                    {
-                        "date": price_bar.day.isoformat(),
-                        "signal_observed_date": previous_session.day.isoformat(),
-                        "action": "sell",
-                        "ticker": ticker,
-                        "execution_price": as_float(price_bar.close),
-                        "quantity": as_float(quantity),
-                        "usd_amount": as_float(sale_value),
-                        "realized_gain_loss": as_float(realized_pnl),
-                        "target_weight_pct": as_float(Decimal(str(order["target_weight"])) * 100),
-                        "reason": holding.get("drawdown_control_reason")
-                        or ("removed from model" if not order["target_weight"] else "rebalance band"),
-                    }
-                )
-                if Decimal(str(holding["shares"])) <= Decimal("0.00000001"):
-                    realized_positions.append(
-                        {
-                            "ticker": ticker,
-                            "entry_date": holding["entry_date"],
-                            "exit_date": price_bar.day.isoformat(),
-                            "initial_value": as_float(Decimal(str(holding["initial_cost"]))),
-                            "ending_value": as_float(Decimal(str(holding["cumulative_proceeds"]))),
-                            "gain_loss": as_float(Decimal(str(holding["cumulative_realized_pnl"]))),
-                            "return_pct": as_float(
-                                pct_change(
-                                    Decimal(str(holding["cumulative_proceeds"])),
-                                    Decimal(str(holding["initial_cost"])),
-                                )
-                            ),
-                            "entry_signal": holding["entry_signal"],
-                            "sector": holding["sector"],
-                            "status": "closed",
-                        }
-                    )
-                    del holdings[ticker]
-            else:
-                purchase_value = min(amount, cash)
-                if purchase_value < Decimal("1"):
-                    continue
-                quantity = purchase_value / price_bar.close
-                holding = holdings.get(ticker)
-                if holding:
-                    previous_cost = Decimal(str(holding["remaining_cost"]))
-                    previous_shares = Decimal(str(holding["shares"]))
-                    holding["shares"] = previous_shares + quantity
-                    holding["remaining_cost"] = previous_cost + purchase_value
-                    holding["initial_cost"] = Decimal(str(holding["initial_cost"])) + purchase_value
-                    holding["average_cost"] = (previous_cost + purchase_value) / (previous_shares + quantity)
-                else:
-                    holdings[ticker] = {
-                        "ticker": ticker,
-                        "shares": quantity,
-                        "average_cost": price_bar.close,
-                        "remaining_cost": purchase_value,
-                        "initial_cost": purchase_value,
-                        "cumulative_proceeds": Decimal("0"),
-                        "cumulative_realized_pnl": Decimal("0"),
-                        "entry_date": price_bar.day.isoformat(),
-                        "entry_signal": candidate.get("entry_signal", "unknown"),
-                        "sector": candidate.get("sector", sectors.get(ticker, "Unclassified")),
-                        "peak_price": price_bar.close,
-                        "max_position_drawdown_pct": Decimal("0"),
-                        "last_close": price_bar.close,
-                        "daily_adverse_moves_pct": [],
-                    }
-                holding = holdings[ticker]
-                holding.update(
-                    {
-                        "entry_signal": candidate.get("entry_signal", holding.get("entry_signal", "unknown")),
-                        "sector": candidate.get("sector", holding.get("sector", "Unclassified")),
-                        "model_score": as_float(Decimal(str(candidate.get("model_score", 0)))),
-                        "signal_score": candidate.get("signal_score", 0),
-                        "news_articles_7d": candidate.get("news_articles_7d", 0),
-                        "target_weight": as_float(Decimal(str(order["target_weight"]))),
-                        "below_model_streak": 0,
-                    }
-                )
-                cash -= purchase_value
-                buys += 1
-                traded_today += purchase_value
-                trade_ledger.append(
+            if Decimal(str(holding["shares"])) <= Decimal("0.00000001"):
+                realized_positions.append(
                     {
-                        "date": price_bar.day.isoformat(),
-                        "signal_observed_date": previous_session.day.isoformat(),
-                        "action": "buy",
                         "ticker": ticker,
-                        "execution_price": as_float(price_bar.close),
-                        "quantity": as_float(quantity),
-                        "usd_amount": as_float(purchase_value),
-                        "realized_gain_loss": None,
-                        "target_weight_pct": as_float(Decimal(str(order["target_weight"])) * 100),
-                        "model_score": holding.get("model_score", 0),
-                        "entry_signal": holding.get("entry_signal"),
-                        "reason": "new model position" if Decimal(str(holding["initial_cost"])) == purchase_value else "rebalance band",
+                        "entry_date": holding["entry_date"],
+                        "exit_date": price_bar.day.isoformat(),
+                        "initial_value": as_float(Decimal(str(holding["initial_cost"]))),
+                        "ending_value": as_float(Decimal(str(holding["cumulative_proceeds"]))),
+                        "gain_loss": as_float(Decimal(str(holding["cumulative_realized_pnl"]))),
+                        "return_pct": as_float(
+                            pct_change(
+                                Decimal(str(holding["cumulative_proceeds"])),
+                                Decimal(str(holding["initial_cost"])),
+                            )
+                        ),
+                        "entry_signal": holding["entry_signal"],
+                        "sector": holding["sector"],
+                        "status": "closed",
                     }
                 )
+                del holdings[ticker]
+            return
+        purchase_value = min(amount, cash)
+        if purchase_value < Decimal("1"):
+            return
+        quantity = purchase_value / price_bar.close
+        holding = holdings.get(ticker)
+        if holding:
+            previous_cost = Decimal(str(holding["remaining_cost"]))
+            previous_shares = Decimal(str(holding["shares"]))
+            holding["shares"] = previous_shares + quantity
+            holding["remaining_cost"] = previous_cost + purchase_value
+            holding["initial_cost"] = Decimal(str(holding["initial_cost"])) + purchase_value
+            holding["average_cost"] = (previous_cost + purchase_value) / (previous_shares + quantity)
+        else:
+            holdings[ticker] = {
+                "ticker": ticker,
+                "shares": quantity,
+                "average_cost": price_bar.close,
+                "remaining_cost": purchase_value,
+                "initial_cost": purchase_value,
+                "cumulative_proceeds": Decimal("0"),
+                "cumulative_realized_pnl": Decimal("0"),
+                "entry_date": price_bar.day.isoformat(),
+                "entry_signal": candidate.get("entry_signal", "unknown"),
+                "sector": candidate.get("sector", sectors.get(ticker, "Unclassified")),
+                "peak_price": price_bar.close,
+                "max_position_drawdown_pct": Decimal("0"),
+                "last_close": price_bar.close,
+                "daily_adverse_moves_pct": [],
+            }
+        holding = holdings[ticker]
+        holding.update(
+            {
+                "entry_signal": candidate.get("entry_signal", holding.get("entry_signal", "unknown")),
+                "sector": candidate.get("sector", holding.get("sector", "Unclassified")),
+                "model_score": as_float(Decimal(str(candidate.get("model_score", 0)))),
+                "signal_score": candidate.get("signal_score", 0),
+                "news_articles_7d": candidate.get("news_articles_7d", 0),
+                "target_weight": as_float(order.target_weight),
+                "below_model_streak": 0,
+            }
+        )
+        cash -= purchase_value
+        buys += 1
+        traded_today += purchase_value
+        trade_ledger.append(
+            {
+                "date": price_bar.day.isoformat(),
+                "signal_observed_date": observed_day.isoformat(),
+                "action": "buy",
+                "ticker": ticker,
+                "execution_price": as_float(price_bar.close),
+                "quantity": as_float(quantity),
+                "usd_amount": as_float(purchase_value),
+                "realized_gain_loss": None,
+                "target_weight_pct": as_float(order.target_weight * 100),
+                "model_score": holding.get("model_score", 0),
+                "entry_signal": holding.get("entry_signal"),
+                "reason": "new model position" if Decimal(str(holding["initial_cost"])) == purchase_value else "rebalance band",
+            }
+        )
 
+    def mark(session: date, observed_day: date, marks: list[tuple[str, object]]) -> None:
+        nonlocal total_traded, buys, sells, traded_today
         total_traded += traded_today
         equity = cash
         sector_values: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0"))
         signal_counts: defaultdict[str, int] = defaultdict(int)
-        for ticker, holding in holdings.items():
-            price_bar = on_or_before(charts[ticker], session)
-            if not price_bar:
-                continue
+        for ticker, price_bar in marks:
+            holding = holdings[ticker]
             peak_price = max(Decimal(str(holding.get("peak_price") or price_bar.close)), price_bar.close)
             last_close = Decimal(str(holding.get("last_close") or price_bar.close))
             daily_move = pct_change(price_bar.close, last_close) if last_close else Decimal("0")
@@ -722,7 +778,7 @@ def _systematic_model_portfolio_response(
         daily_rebalances.append(
             {
                 "date": session.isoformat(),
-                "signal_observed_date": previous_session.day.isoformat(),
+                "signal_observed_date": observed_day.isoformat(),
                 "buys": buys,
                 "sells": sells,
                 "traded_value": as_float(traded_today),
@@ -757,7 +813,11 @@ def _systematic_model_portfolio_response(
                 ],
             }
         )
-        previous_session = on_or_before(market_bars, session)
+        buys = 0
+        sells = 0
+        traded_today = Decimal("0")
+
+    simulate(sessions, previous_session, prices, holdings, orders, fill, mark)
 
     final_equity = Decimal(str(series[-1]["value"]))
     positions: list[dict[str, object]] = []
@@ -801,7 +861,7 @@ def _systematic_model_portfolio_response(
 
     latest_selected, latest_weights = portfolio_targets(latest_market.day, holdings, update_streaks=False)
     latest_by_ticker = {str(row["ticker"]): row for row in latest_selected}
-    macro_context = bank_of_canada_macro_context(latest_market.day) if risk_mode != "base" else None
+    macro_context = model.macro_context() if risk_mode != "base" else None
     macro_multiplier = Decimal(str(macro_context.get("equity_exposure_multiplier") or 1)) if macro_context else Decimal("1")
     pending_orders: list[dict[str, object]] = []
     for ticker in sorted(set(holdings) | set(latest_weights)):
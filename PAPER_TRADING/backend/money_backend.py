@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import os
+from decimal import Decimal
+from typing import Mapping
+
+
+MONEY_BACKEND_ENV = "PAPER_TRADING_MONEY_BACKEND"
+MONEY_SCALE = 10**6
+SHARE_SCALE = 10**9
+PARITY_ABS_TOLERANCE = Decimal("0.01")
+PARITY_REL_TOLERANCE = Decimal("0.000001")
+
+
+def scaled_divide(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(numerator, denominator)
+    return quotient + (2 * remainder >= denominator)
+
+
+class DecimalMoney:
+    name = "decimal"
+
+    def __init__(self) -> None:
+        self.zero = Decimal("0")
+
+    def amount(self, value: Decimal) -> Decimal:
+        return value
+
+    def price(self, value: Decimal) -> Decimal:
+        return value
+
+    def shares(self, amount: Decimal, price: Decimal) -> Decimal:
+        return amount / price
+
+    def value(self, shares: Decimal, price: Decimal) -> Decimal:
+        return shares * price
+
+    def converted(self, amount: Decimal, rate: Decimal) -> Decimal:
+        return amount * rate
+
+    def unconverted(self, amount: Decimal, rate: Decimal) -> Decimal:
+        return amount / rate
+
+    def to_decimal(self, amount: Decimal) -> Decimal:
+        return amount
+
+    def shares_to_decimal(self, shares: Decimal) -> Decimal:
+        return shares
+
+    def shares_from_decimal(self, shares: Decimal) -> Decimal:
+        return shares
+
+
+class FloatMoney:
+    name = "float"
+
+    def __init__(self) -> None:
+        self.zero = 0.0
+        self.prices: dict[Decimal, float] = {}
+
+    def amount(self, value: Decimal) -> float:
+        return float(value)
+
+    def price(self, value: Decimal) -> float:
+        converted = self.prices.get(value)
+        if converted is None:
+            converted = self.prices[value] = float(value)
+        return converted
+
+    def shares(self, amount: float, price: float) -> float:
+        return amount / price
+
+    def value(self, shares: float, price: float) -> float:
+        return shares * price
+
+    def converted(self, amount: float, rate: float) -> float:
+        return amount * rate
+
+    def unconverted(self, amount: float, rate: float) -> float:
+        return amount / rate
+
+    def to_decimal(self, amount: float) -> Decimal:
+        return Decimal(str(round(amount, 6)))
+
+    def shares_to_decimal(self, shares: float) -> Decimal:
+        return Decimal(repr(shares))
+
+    def shares_from_decimal(self, shares: Decimal) -> float:
+        return float(shares)
+
+
+class FixedMoney:
+    name = "fixed"
+
+    def __init__(self) -> None:
+        self.zero = 0
+        self.prices: dict[Decimal, int] = {}
+
+    def amount(self, value: Decimal) -> int:
+        return int((value * MONEY_SCALE).to_integral_value())
+
+    def price(self, value: Decimal) -> int:
+        converted = self.prices.get(value)
+        if converted is None:
+            converted = self.prices[value] = self.amount(value)
+        return converted
+
+    def shares(self, amount: int, price: int) -> int:
+        return scaled_divide(amount * SHARE_SCALE, price)
+
+    def value(self, shares: int, price: int) -> int:
+        return scaled_divide(shares * price, SHARE_SCALE)
+
+    def converted(self, amount: int, rate: int) -> int:
+        return scaled_divide(amount * rate, MONEY_SCALE)
+
+    def unconverted(self, amount: int, rate: int) -> int:
+        return scaled_divide(amount * MONEY_SCALE, rate)
+
+    def to_decimal(self, amount: int) -> Decimal:
+        return Decimal(amount).scaleb(-6)
+
+    def shares_to_decimal(self, shares: int) -> Decimal:
+        return Decimal(shares).scaleb(-9)
+
+    def shares_from_decimal(self, shares: Decimal) -> int:
+        return int((shares * SHARE_SCALE).to_integral_value())
+
+
+MoneyBackend = DecimalMoney | FloatMoney | FixedMoney
+MONEY_BACKENDS = {
+    backend.name: backend
+    for backend in (DecimalMoney, FloatMoney, FixedMoney)
+}
+
+
+def money_backend(name: str | None = None) -> MoneyBackend:
+    selected = (name or os.environ.get(MONEY_BACKEND_ENV) or DecimalMoney.name).strip().lower()
+    if selected not in MONEY_BACKENDS:
+        raise ValueError(f"unknown money backend: {selected}")
+    return MONEY_BACKENDS[selected]()
+
+
+def parity_differences(
+    reference: object,
+    candidate: object,
+    abs_tolerance: Decimal = PARITY_ABS_TOLERANCE,
+    rel_tolerance: Decimal = PARITY_REL_TOLERANCE,
+    path: str = "$",
+) -> list[str]:
+    if isinstance(reference, bool) or isinstance(candidate, bool):
+        return [] if reference == candidate else [f"{path}: {reference!r} != {candidate!r}"]
+    if isinstance(reference, (int, float, Decimal)) and isinstance(candidate, (int, float, Decimal)):
+        expected = Decimal(str(reference))
+        actual = Decimal(str(candidate))
+        allowed = max(abs_tolerance, abs(expected) * rel_tolerance)
+        if abs(actual - expected) <= allowed:
+            return []
+        return [f"{path}: {reference} != {candidate} (tolerance {allowed})"]
+    if isinstance(reference, Mapping) and isinstance(candidate, Mapping):
+        differences: list[str] = [
+            f"{path}.{key}: missing" for key in sorted(set(reference) ^ set(candidate), key=str)
+        ]
+        for key in sorted(set(reference) & set(candidate), key=str):
+            differences += parity_differences(
+                reference[key], candidate[key], abs_tolerance, rel_tolerance, f"{path}.{key}"
+            )
+        return differences
+    if isinstance(reference, (list, tuple)) and isinstance(candidate, (list, tuple)):
+        if len(reference) != len(candidate):
+            return [f"{path}: length {len(reference)} != {len(candidate)}"]
+        differences = []
+        for index, (expected, actual) in enumerate(zip(reference, candidate)):
+            differences += parity_differences(
+                expected, actual, abs_tolerance, rel_tolerance, f"{path}[{index}]"
+            )
+        return differences
+    return [] if reference == candidate else [f"{path}: {reference!r} != {candidate!r}"]
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Iterable, Sequence
+
+from backend.benchmark_service import read_benchmarks
+from backend.compact_bars import Bar
+from backend.dashboard_service import fetch_chart
+from backend.fx_service import FX_SYMBOL, FxSeries, forward_filled, fx_series
+from backend.returns_store import SymbolReturns, symbol_returns
+
+
+SCHEMA_VERSION = "1.0"
+CALCULATION_VERSION = "multi-benchmark-1.1"
+BASE_CURRENCY = "USD"
+BENCHMARK_WINDOW_ENTRIES = 256
+BarsLoader = Callable[[str], Sequence[Bar]]
+
+LOCK = threading.Lock()
+_WINDOWS: OrderedDict[tuple[str, str, date, date], BenchmarkWindow] = OrderedDict()
+STATS = {"hits": 0, "builds": 0}
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkWindow:
+    returns: SymbolReturns
+    fx: FxSeries | None
+    baseline_day: date | None
+    levels: dict[date, float]
+    sessions: tuple[date, ...]
+
+
+def default_bars_loader(symbol: str) -> Sequence[Bar]:
+    return fetch_chart(symbol)[1]
+
+
+def _build_window(returns: SymbolReturns, fx: FxSeries | None, first_day: date, last_day: date) -> BenchmarkWindow:
+    baseline = returns.bar(first_day)
+    base_rate = fx.on_or_before(first_day) if fx is not None else None
+    if baseline is None or not float(baseline.close) or (fx is not None and (base_rate is None or not base_rate.close)):
+        return BenchmarkWindow(returns, fx, None, {}, ())
+    first = returns.count(first_day) - 1
+    last = returns.count(last_day)
+    bars = returns.bars[first:last]
+    days = [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+    closes = [float(close) for close in forward_filled(bars, days)]
+    if fx is not None:
+        rates = [float(rate) for rate in fx.rates(days)]
+        closes = [close / rate for close, rate in zip(closes, rates)]
+    levels = {day: close / closes[0] for day, close in zip(days, closes)}
+    sessions = tuple(bar.day for bar in bars if bar.day >= first_day)
+    return BenchmarkWindow(returns, fx, baseline.day, levels, sessions)
+
+
+def benchmark_window(
+    symbol: str,
+    first_day: date,
+    last_day: date,
+    bars_loader: BarsLoader = default_bars_loader,
+    currency: str = BASE_CURRENCY,
+) -> BenchmarkWindow:
+    if currency not in {BASE_CURRENCY, "CAD"}:
+        raise ValueError(f"unsupported benchmark currency {currency}")
+    returns = symbol_returns(symbol, bars_loader(symbol))
+    fx = fx_series(bars_loader(FX_SYMBOL)) if currency == "CAD" else None
+    key = (symbol, currency, first_day, last_day)
+    with LOCK:
+        cached = _WINDOWS.get(key)
+        if cached is not None and cached.returns is returns and cached.fx is fx:
+            _WINDOWS.move_to_end(key)
+            STATS["hits"] += 1
+            return cached
+    window = _build_window(returns, fx, first_day, last_day)
+    with LOCK:
+        STATS["builds"] += 1
+        _WINDOWS[key] = window
+        _WINDOWS.move_to_end(key)
+        while len(_WINDOWS) > BENCHMARK_WINDOW_ENTRIES:
+            _WINDOWS.popitem(last=False)
+    return window
+
+
+def benchmark_window_report() -> dict[str, object]:
+    with LOCK:
+        return {**STATS, "entries": len(_WINDOWS), "max_entries": BENCHMARK_WINDOW_ENTRIES}
+
+
+def clear_benchmark_windows() -> None:
+    with LOCK:
+        _WINDOWS.clear()
+        for name in STATS:
+            STATS[name] = 0
+
+
+class _RelativeAccumulator:
+    __slots__ = (
+        "sessions",
+        "wins",
+        "benchmark_sum",
+        "benchmark_squares",
+        "active_sum",
+        "active_squares",
+        "benchmark_peak",
+        "benchmark_drawdown",
+        "relative_peak",
+        "relative_drawdown",
+    )
+
+    def __init__(self) -> None:
+        self.sessions = self.wins = 0
+        self.benchmark_sum = self.benchmark_squares = self.active_sum = self.active_squares = 0.0
+        self.benchmark_peak = self.relative_peak = 1.0
+        self.benchmark_drawdown = self.relative_drawdown = 0.0
+
+    def add(self, portfolio_return: float, benchmark_return: float, level: float, relative: float) -> None:
+        self.sessions += 1
+        self.wins += portfolio_return > benchmark_return
+        self.benchmark_sum += benchmark_return
+        self.benchmark_squares += benchmark_return * benchmark_return
+        active = portfolio_return - benchmark_return
+        self.active_sum += active
+        self.active_squares += active * active
+        self.benchmark_peak = max(self.benchmark_peak, level)
+        self.benchmark_drawdown = min(self.benchmark_drawdown, (level / self.benchmark_peak - 1) * 100)
+        self.relative_peak = max(self.relative_peak, relative)
+        self.relative_drawdown = min(self.relative_drawdown, (relative / self.relative_peak - 1) * 100)
+
+
+def _annualized(total: float, squares: float, count: int) -> float:
+    if count < 2:
+        return 0.0
+    variance = max((squares - total * total / count) / (count - 1), 0.0)
+    return math.sqrt(variance) * math.sqrt(252)
+
+
+def multi_benchmark_comparison(
+    series: list[dict[str, object]],
+    *,
+    benchmarks: Iterable[dict[str, object]] | None = None,
+    bars_loader: BarsLoader = default_bars_loader,
+    include_series: bool = False,
+) -> dict[str, object]:
+    rows = sorted(
+        (
+            (date.fromisoformat(str(row["date"])[:10]), float(row["value"]))
+            for row in series
+            if row.get("date") and row.get("value") is not None
+        ),
+        key=lambda item: item[0],
+    )
+    registry = list(read_benchmarks() if benchmarks is None else benchmarks)
+    warnings: list[str] = []
+    if len(rows) < 2 or not rows[0][1]:
+        return {
+            "schema_version": SCHEMA_VERSION,
+            "calculation_version": CALCULATION_VERSION,
+            "portfolio_return_pct": 0.0,
+            "volatility_pct": 0.0,
+            "max_drawdown_pct": 0.0,
+            "benchmarks": [],
+            "warnings": ["Fewer than two positive portfolio observations; benchmark comparison is unavailable."],
+        }
+    first_day, first_value = rows[0]
+    last_day = rows[-1][0]
+    windows: list[tuple[dict[str, object], BenchmarkWindow]] = []
+    for benchmark in registry:
+        ticker = str(benchmark["ticker"])
+        currency = str(benchmark.get("currency") or BASE_CURRENCY).strip().upper()
+        if currency not in {BASE_CURRENCY, "CAD"}:
+            warnings.append(f"{ticker}: skipped; no {currency}/{BASE_CURRENCY} conversion is available")
+            continue
+        try:
+            window = benchmark_window(ticker, first_day, last_day, bars_loader, currency)
+        except Exception as exc:
+            warnings.append(f"{ticker}: benchmark history unavailable ({exc})")
+            continue
+        if window.baseline_day is None:
+            warnings.append(f"{ticker}: no benchmark close or CAD/USD rate on or before {first_day.isoformat()}")
+            continue
+        windows.append((benchmark, window))
+
+    accumulators = [_RelativeAccumulator() for _ in windows]
+    portfolio_sum = portfolio_squares = 0.0
+    portfolio_peak = first_value
+    portfolio_drawdown = 0.0
+    previous_value = first_value
+    previous_levels = [window.levels[first_day] for _, window in windows]
+    for day, value in rows[1:]:
+        portfolio_return = (value / previous_value - 1) * 100 if previous_value else 0.0
+        portfolio_sum += portfolio_return
+        portfolio_squares += portfolio_return * portfolio_return
+        portfolio_peak = max(portfolio_peak, value)
+        if portfolio_peak:
+            portfolio_drawdown = min(portfolio_drawdown, (value / portfolio_peak - 1) * 100)
+        growth = value / first_value
+        for index, (_, window) in enumerate(windows):
+            level = window.levels[day]
+            accumulators[index].add(portfolio_return, (level / previous_levels[index] - 1) * 100, level, growth / level)
+            previous_levels[index] = level
+        previous_value = value
+
+    portfolio_return_pct = (rows[-1][1] / first_value - 1) * 100
+    results: list[dict[str, object]] = []
+    for (benchmark, window), accumulator in zip(windows, accumulators):
+        benchmark_return_pct = (window.levels[last_day] - 1) * 100
+        result: dict[str, object] = {
+            "benchmark_id": benchmark["benchmark_id"],
+            "ticker": benchmark["ticker"],
+            "name": benchmark.get("name") or benchmark["ticker"],
+            "currency": benchmark.get("currency") or "",
+            "converted_to": BASE_CURRENCY if window.fx is not None else None,
+            "benchmark_return_pct": round(benchmark_return_pct, 6),
+            "alpha_pct": round(portfolio_return_pct - benchmark_return_pct, 6),
+            "win_rate_vs_benchmark_pct": round(accumulator.wins / accumulator.sessions * 100, 6) if accumulator.sessions else 0.0,
+            "benchmark_volatility_pct": round(_annualized(accumulator.benchmark_sum, accumulator.benchmark_squares, accumulator.sessions), 6),
+            "tracking_error_pct": round(_annualized(accumulator.active_sum, accumulator.active_squares, accumulator.sessions), 6),
+            "benchmark_max_drawdown_pct": round(accumulator.benchmark_drawdown, 6),
+            "relative_max_drawdown_pct": round(accumulator.relative_drawdown, 6),
+            "aligned_sessions": accumulator.sessions,
+        }
+        if include_series:
+            result["benchmark_series"] = [
+                {
+                    "date": session.isoformat(),
+                    "value": round(first_value * window.levels[session], 6),
+                    "return_pct": round((window.levels[session] - 1) * 100, 6),
+                }
+                for session in window.sessions
+            ]
+        results.append(result)
+    results.sort(key=lambda row: (-float(row["alpha_pct"]), str(row["benchmark_id"])))
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "calculation_version": CALCULATION_VERSION,
+        "from_date": first_day.isoformat(),
+        "to_date": last_day.isoformat(),
+        "portfolio_return_pct": round(portfolio_return_pct, 6),
+        "volatility_pct": round(_annualized(portfolio_sum, portfolio_squares, len(rows) - 1), 6),
+        "max_drawdown_pct": round(portfolio_drawdown, 6),
+        "benchmarks": results,
+        "warnings": warnings,
+    }
+
+
+def multi_benchmark_overview(
+    portfolio_details: list[dict[str, object]],
+    *,
+    benchmarks: Iterable[dict[str, object]] | None = None,
+    bars_loader: BarsLoader = default_bars_loader,
+) -> dict[str, object]:
+    registry = list(read_benchmarks() if benchmarks is None else benchmarks)
+    portfolios: list[dict[str, object]] = []
+    warnings: list[str] = []
+    for detail in portfolio_details:
+        portfolio_id = str(detail.get("portfolio_name") or detail.get("investor") or "").strip() or "Selected portfolio"
+        comparison = multi_benchmark_comparison(
+            list(detail.get("series") or []),
+            benchmarks=registry,
+            bars_loader=bars_loader,
+        )
+        warnings.extend(f"{portfolio_id}: {warning}" for warning in comparison.pop("warnings"))
+        portfolios.append({"strategy_id": portfolio_id, "label": str(detail.get("label") or portfolio_id), **comparison})
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "calculation_version": CALCULATION_VERSION,
+        "benchmark_count": len(registry),
+        "portfolios": portfolios,
+        "cache": benchmark_window_report(),
+        "warnings": sorted(set(warnings)),
+    }
@@ -11,8 +11,9 @@ from pathlib import Path
 from threading import Lock
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode, urlparse
-from urllib.request import Request, urlopen
+from urllib.request import Request
 
+from backend.http_transport import urlopen
 from backend.news_strategy import load_daily_news_counts
 
 
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterator
+
+from backend import dashboard_service, news_strategy, strategy_registry_service, universe_service
+from backend.fx_service import FX_SYMBOL
+from backend.money_backend import MONEY_BACKEND_ENV
+from backend.simulation_checkpoints import decode_state, encode_state
+
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+DETAIL_STORE_DIR = ROOT / "data" / "dashboard_cache" / "portfolio_details"
+DETAIL_STORE_VERSION = 2
+DETAIL_STORE_ENV = "PAPER_TRADING_DETAIL_STORE"
+MEMORY_DETAILS = 12
+DISK_DETAILS = 96
+
+LOCK = threading.Lock()
+_DETAILS: OrderedDict[str, dict[str, object]] = OrderedDict()
+_BUILDING: dict[str, threading.Lock] = {}
+_SCOPE: ContextVar[dict[str, str] | None] = ContextVar("detail_store_scope", default=None)
+STATS = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stale": 0, "spilled": 0}
+
+
+def detail_store_enabled() -> bool:
+    return os.environ.get(DETAIL_STORE_ENV, "1").strip().lower() not in {"0", "false", "off", "no"}
+
+
+def input_files() -> list[Path]:
+    return [
+        dashboard_service.TRADES_FILE,
+        dashboard_service.MASS_CHANGE_WATCHLIST_FILE,
+        news_strategy.DAILY_COUNTS_FILE,
+        universe_service.ASSET_UNIVERSE_FILE,
+        universe_service.ASSET_UNIVERSE_EVENT_FILE,
+        strategy_registry_service.STRATEGY_REGISTRY_FILE,
+    ]
+
+
+@lru_cache(maxsize=1)
+def code_fingerprint() -> str:
+    digest = hashlib.sha1()
+    for path in sorted(BACKEND_DIR.glob("*.py")):
+        digest.update(f"{path.name}:".encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+@contextmanager
+def detail_store_scope() -> Iterator[None]:
+    if _SCOPE.get() is not None:
+        yield
+        return
+    token = _SCOPE.set({})
+    try:
+        yield
+    finally:
+        _SCOPE.reset(token)
+
+
+def data_fingerprint() -> str:
+    scope = _SCOPE.get()
+    if scope is not None and "data" in scope:
+        return scope["data"]
+    _, market_bars = dashboard_service.fetch_chart("SPY")
+    last = market_bars[-1] if market_bars else None
+    digest = hashlib.sha1(
+        f"{len(market_bars)}:{last.day if last else ''}:{last.close if last else ''};".encode("utf-8")
+    )
+    digest.update(os.environ.get(MONEY_BACKEND_ENV, "").encode("utf-8"))
+    for path in input_files():
+        try:
+            stat = path.stat()
+            signature = f"{stat.st_mtime_ns}:{stat.st_size}"
+        except OSError:
+            signature = "missing"
+        digest.update(f"|{path}:{signature}".encode("utf-8"))
+    fingerprint = digest.hexdigest()
+    if scope is not None:
+        scope["data"] = fingerprint
+    return fingerprint
+
+
+def chart_token(symbol: str) -> str:
+    scope = _SCOPE.get()
+    name = f"chart:{symbol}"
+    if scope is not None and name in scope:
+        return scope[name]
+    try:
+        _, bars = dashboard_service.CHART_CACHE.get(symbol)
+        last = bars[-1] if bars else None
+        token = f"{len(bars)}:{last.day if last else ''}:{last.close if last else ''}"
+    except Exception:
+        token = "unavailable"
+    if scope is not None:
+        scope[name] = token
+    return token
+
+
+def detail_charts(detail: dict[str, object]) -> dict[str, str]:
+    raw_positions = detail.get("positions")
+    positions = [row for row in raw_positions if isinstance(row, dict)] if isinstance(raw_positions, list) else []
+    symbols = {FX_SYMBOL} | {
+        dashboard_service.yahoo_symbol(
+            str(position["ticker"]),
+            str(position.get("security_type") or position.get("asset_type") or "stock"),
+        )
+        for position in positions
+        if position.get("ticker")
+    }
+    return {symbol: chart_token(symbol) for symbol in sorted(symbols)}
+
+
+def charts_current(entry: dict[str, object]) -> bool:
+    charts = entry.get("charts")
+    return isinstance(charts, dict) and all(chart_token(symbol) == token for symbol, token in charts.items())
+
+
+def detail_store_key(portfolio: str, start: date | None, end: date | None, apply_fees: bool) -> str:
+    token = json.dumps(
+        {
+            "version": DETAIL_STORE_VERSION,
+            "code": code_fingerprint(),
+            "portfolio": portfolio,
+            "from_date": start.isoformat() if start else None,
+            "to_date": end.isoformat() if end else None,
+            "wealthsimple_fx_fees": apply_fees,
+            "data": data_fingerprint(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha1(token.encode("utf-8")).hexdigest()
+
+
+def spill_path(key: str) -> Path:
+    return DETAIL_STORE_DIR / f"{key}.json"
+
+
+def recall_detail(key: str) -> dict[str, object] | None:
+    with LOCK:
+        entry = _DETAILS.get(key)
+    if entry is not None:
+        if charts_current(entry):
+            with LOCK:
+                if key in _DETAILS:
+                    _DETAILS.move_to_end(key)
+                STATS["memory_hits"] += 1
+            return copy.deepcopy(entry["detail"])
+        forget_detail(key)
+        return None
+    path = spill_path(key)
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"), object_hook=decode_state)
+    except (OSError, json.JSONDecodeError):
+        entry = None
+    if not isinstance(entry, dict) or not isinstance(entry.get("detail"), dict):
+        with LOCK:
+            STATS["misses"] += 1
+        return None
+    if not charts_current(entry):
+        forget_detail(key)
+        return None
+    with LOCK:
+        STATS["disk_hits"] += 1
+    return remember_detail(key, entry["detail"], entry["charts"])
+
+
+def forget_detail(key: str) -> None:
+    with LOCK:
+        _DETAILS.pop(key, None)
+        STATS["stale"] += 1
+    spill_path(key).unlink(missing_ok=True)
+
+
+def remember_detail(key: str, detail: dict[str, object], charts: dict[str, str]) -> dict[str, object]:
+    stored = {"charts": dict(charts), "detail": copy.deepcopy(detail)}
+    evicted: list[tuple[str, dict[str, object]]] = []
+    with LOCK:
+        _DETAILS[key] = stored
+        _DETAILS.move_to_end(key)
+        while len(_DETAILS) > MEMORY_DETAILS:
+            evicted.append(_DETAILS.popitem(last=False))
+    for evicted_key, evicted_detail in evicted:
+        spill_detail(evicted_key, evicted_detail)
+    return detail
+
+
+def spill_detail(key: str, detail: dict[str, object]) -> None:
+    path = spill_path(key)
+    try:
+        DETAIL_STORE_DIR.mkdir(parents=True, exist_ok=True)
+        if not path.exists():
+            temporary = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temporary.write_text(json.dumps(encode_state(detail), sort_keys=True, default=str), encoding="utf-8")
+            temporary.replace(path)
+        spilled = sorted(DETAIL_STORE_DIR.glob("*.json"), key=lambda item: item.stat().st_mtime_ns)
+        for stale in spilled[: max(len(spilled) - DISK_DETAILS, 0)]:
+            stale.unlink(missing_ok=True)
+    except OSError:
+        return
+    with LOCK:
+        STATS["spilled"] += 1
+
+
+def stored_detail(
+    portfolio: str,
+    start: date | None,
+    end: date | None,
+    apply_fees: bool,
+    builder: Callable[[], dict[str, object]],
+) -> dict[str, object]:
+    if not detail_store_enabled():
+        return builder()
+    key = detail_store_key(portfolio, start, end, apply_fees)
+    detail = recall_detail(key)
+    if detail is not None:
+        return detail
+    with LOCK:
+        building = _BUILDING.setdefault(key, threading.Lock())
+    with building:
+        detail = recall_detail(key)
+        if detail is None:
+            detail = builder()
+            remember_detail(key, detail, detail_charts(detail))
+    with LOCK:
+        _BUILDING.pop(key, None)
+    return detail
+
+
+def detail_store_report() -> dict[str, object]:
+    with LOCK:
+        stats = dict(STATS)
+        memory_entries = len(_DETAILS)
+    spilled = list(DETAIL_STORE_DIR.glob("*.json")) if DETAIL_STORE_DIR.exists() else []
+    return {
+        **stats,
+        "memory_entries": memory_entries,
+        "max_memory_entries": MEMORY_DETAILS,
+        "disk_entries": len(spilled),
+        "max_disk_entries": DISK_DETAILS,
+    }
+
+
+def clear_detail_store(include_disk: bool = False) -> None:
+    with LOCK:
+        _DETAILS.clear()
+        for name in STATS:
+            STATS[name] = 0
+    if include_disk and DETAIL_STORE_DIR.exists():
+        for path in DETAIL_STORE_DIR.glob("*.json"):
+            path.unlink(missing_ok=True)
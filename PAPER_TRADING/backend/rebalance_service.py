@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 from decimal import Decimal, InvalidOperation
+from itertools import product
 
 from backend.wealth_operations_service import read_allocations, read_profiles
+from backend.wealthsimple_metadata import WEALTHSIMPLE_FX_FEE_RATE
+
+
+OPTIMIZER_MAX_SLEEVES = 8
+REBALANCE_MODES = ("bands", "optimize")
 
 
 def _decimal(value: object) -> Decimal:
@@ -26,24 +32,26 @@ def rebalance_profiles_response() -> dict[str, object]:
     }
 
 
-def rebalance_preview(
-    profile_id: str,
-    current_allocations: list[dict[str, object]],
-    portfolio_value: Decimal,
-    *,
-    exact_target: bool = False,
-) -> dict[str, object]:
+def _profile_targets(profile_id: str) -> tuple[dict[str, object], dict[str, Decimal], dict[str, str]]:
     profiles = {str(row["profile_id"]): row for row in read_profiles(include_research=True)}
     profile = profiles.get(profile_id.casefold())
     if not profile:
         raise ValueError(f"unknown profile: {profile_id}")
+    rows = [row for row in read_allocations() if str(row["profile_id"]) == profile_id.casefold()]
+    return (
+        profile,
+        {str(row["basket_id"]): Decimal(str(row["target_weight"])) for row in rows},
+        {str(row["basket_id"]): str(row.get("sector") or "") for row in rows},
+    )
+
+
+def _validated_current(
+    targets: dict[str, Decimal],
+    current_allocations: list[dict[str, object]],
+    portfolio_value: Decimal,
+) -> dict[str, Decimal]:
     if portfolio_value <= 0:
         raise ValueError("portfolio_value must be positive")
-    targets = {
-        str(row["basket_id"]): Decimal(str(row["target_weight"]))
-        for row in read_allocations()
-        if str(row["profile_id"]) == profile_id.casefold()
-    }
     if not targets or sum(targets.values(), Decimal("0")) != Decimal("100"):
         raise ValueError("profile targets must exist and sum to 100%")
 
@@ -64,13 +72,26 @@ def rebalance_preview(
         current.setdefault(basket, Decimal("0"))
     if abs(sum(current.values(), Decimal("0")) - Decimal("100")) > Decimal("0.0001"):
         raise ValueError("current weights must sum to 100%")
+    return current
 
-    rows: dict[str, dict[str, Decimal | str]] = {}
-    proposed: dict[str, Decimal] = {}
+
+def _policy_bands(targets: dict[str, Decimal]) -> dict[str, tuple[Decimal, Decimal]]:
+    bands: dict[str, tuple[Decimal, Decimal]] = {}
     for basket, target in targets.items():
         band = max(Decimal("2"), target * Decimal("0.20"))
-        lower = max(Decimal("0"), target - band)
-        upper = min(Decimal("100"), target + band)
+        bands[basket] = (max(Decimal("0"), target - band), min(Decimal("100"), target + band))
+    return bands
+
+
+def _band_weights(
+    current: dict[str, Decimal],
+    targets: dict[str, Decimal],
+    bands: dict[str, tuple[Decimal, Decimal]],
+    exact_target: bool,
+) -> dict[str, Decimal]:
+    proposed: dict[str, Decimal] = {}
+    for basket, target in targets.items():
+        lower, upper = bands[basket]
         value = current[basket]
         if exact_target:
             next_weight = target
@@ -81,14 +102,13 @@ def rebalance_preview(
         else:
             next_weight = value
         proposed[basket] = next_weight
-        rows[basket] = {"basket_id": basket, "current": value, "target": target, "lower": lower, "upper": upper}
 
     if not exact_target:
         imbalance = sum(proposed.values(), Decimal("0")) - Decimal("100")
         if imbalance > 0:
             donors = sorted(proposed, key=lambda basket: proposed[basket] - targets[basket], reverse=True)
             for basket in donors:
-                capacity = proposed[basket] - Decimal(str(rows[basket]["lower"]))
+                capacity = proposed[basket] - bands[basket][0]
                 reduction = min(max(capacity, Decimal("0")), imbalance)
                 proposed[basket] -= reduction
                 imbalance -= reduction
@@ -98,7 +118,7 @@ def rebalance_preview(
             need = -imbalance
             recipients = sorted(proposed, key=lambda basket: targets[basket] - proposed[basket], reverse=True)
             for basket in recipients:
-                capacity = Decimal(str(rows[basket]["upper"])) - proposed[basket]
+                capacity = bands[basket][1] - proposed[basket]
                 addition = min(max(capacity, Decimal("0")), need)
                 proposed[basket] += addition
                 need -= addition
@@ -107,19 +127,117 @@ def rebalance_preview(
 
     if abs(sum(proposed.values(), Decimal("0")) - Decimal("100")) > Decimal("0.0001"):
         raise ValueError("unable to produce a self-financing rebalance within policy bands")
+    return proposed
+
+
+def _fill_pattern(
+    intervals: dict[str, tuple[Decimal, Decimal]],
+    coefficients: dict[str, Decimal],
+    priority: dict[str, Decimal],
+    groups: dict[str, str],
+    caps: dict[str, Decimal],
+) -> dict[str, Decimal] | None:
+    weights = {basket: lower for basket, (lower, _) in intervals.items()}
+    remaining = Decimal("100") - sum(weights.values(), Decimal("0"))
+    used: dict[str, Decimal] = {}
+    for basket, weight in weights.items():
+        used[groups[basket]] = used.get(groups[basket], Decimal("0")) + weight
+    if remaining < 0 or any(used[group] > cap for group, cap in caps.items() if group in used):
+        return None
+    for basket in sorted(intervals, key=lambda basket: (coefficients[basket], -priority[basket])):
+        if remaining <= 0:
+            break
+        group = groups[basket]
+        room = min(intervals[basket][1] - weights[basket], remaining)
+        if group in caps:
+            room = min(room, caps[group] - used[group])
+        if room <= 0:
+            continue
+        weights[basket] += room
+        used[group] += room
+        remaining -= room
+    return weights if remaining <= Decimal("0.0000001") else None
+
+
+def _pattern_intervals(
+    current: dict[str, Decimal],
+    bands: dict[str, tuple[Decimal, Decimal]],
+    trade_costs: dict[str, Decimal],
+    sides: dict[str, str],
+    min_trade_pct: Decimal,
+) -> tuple[dict[str, tuple[Decimal, Decimal]], dict[str, Decimal]] | None:
+    intervals: dict[str, tuple[Decimal, Decimal]] = {}
+    coefficients: dict[str, Decimal] = {}
+    for basket, side in sides.items():
+        lower, upper = bands[basket]
+        value = current[basket]
+        if side == "hold":
+            interval = (value, value) if lower <= value <= upper else None
+            coefficients[basket] = Decimal("0")
+        elif side == "buy":
+            interval = (max(lower, value + min_trade_pct), upper)
+            coefficients[basket] = trade_costs[basket]
+        else:
+            interval = (lower, min(upper, value - min_trade_pct))
+            coefficients[basket] = -trade_costs[basket]
+        if interval is None or interval[0] > interval[1]:
+            return None
+        intervals[basket] = interval
+    return intervals, coefficients
+
+
+def optimized_weights(
+    current: dict[str, Decimal],
+    targets: dict[str, Decimal],
+    bands: dict[str, tuple[Decimal, Decimal]],
+    *,
+    trade_costs: dict[str, Decimal],
+    groups: dict[str, str],
+    caps: dict[str, Decimal],
+    min_trade_pct: Decimal = Decimal("0"),
+) -> dict[str, Decimal]:
+    if len(targets) > OPTIMIZER_MAX_SLEEVES:
+        raise ValueError(f"optimizer supports at most {OPTIMIZER_MAX_SLEEVES} sleeves per profile")
+    baskets = list(targets)
+    priority = {basket: targets[basket] - current[basket] for basket in baskets}
+    best: tuple[Decimal, int, dict[str, Decimal]] | None = None
+    for pattern in product(("hold", "buy", "sell"), repeat=len(baskets)):
+        resolved = _pattern_intervals(current, bands, trade_costs, dict(zip(baskets, pattern)), min_trade_pct)
+        if resolved is None:
+            continue
+        weights = _fill_pattern(*resolved, priority, groups, caps)
+        if weights is None:
+            continue
+        cost = sum((abs(weights[basket] - current[basket]) * trade_costs[basket] for basket in baskets), Decimal("0"))
+        trades = sum(weights[basket] != current[basket] for basket in baskets)
+        if best is None or (cost, trades) < best[:2]:
+            best = (cost, trades, weights)
+    if best is None:
+        raise ValueError("unable to produce a rebalance within policy bands, sector caps, and minimum trade size")
+    return best[2]
 
+
+def _preview_response(
+    profile: dict[str, object],
+    portfolio_value: Decimal,
+    exact_target: bool,
+    current: dict[str, Decimal],
+    targets: dict[str, Decimal],
+    bands: dict[str, tuple[Decimal, Decimal]],
+    proposed: dict[str, Decimal],
+) -> dict[str, object]:
     output_rows: list[dict[str, object]] = []
     turnover = Decimal("0")
     for basket in targets:
-        row = rows[basket]
+        lower, upper = bands[basket]
         change = proposed[basket] - current[basket]
         turnover += abs(change)
         output_rows.append({
             "basket_id": basket,
             "current_weight_pct": float(current[basket]),
             "target_weight_pct": float(targets[basket]),
-            "lower_band_pct": float(Decimal(str(row["lower"]))),
-            "upper_band_pct": float(Decimal(str(row["upper"]))),
+            "lower_band_pct": float(lower),
+            "upper_band_pct": float(upper),
             "drift_pct": float(current[basket] - targets[basket]),
             "action": "buy" if change > Decimal("0.0001") else "sell" if change < Decimal("-0.0001") else "hold",
             "proposed_weight_pct": float(proposed[basket]),
@@ -130,6 +248,7 @@ def rebalance_preview(
         "profile": profile,
         "portfolio_value": float(portfolio_value),
         "exact_target": exact_target,
+        "mode": "bands",
         "status": "draft_review_required",
         "allocations": output_rows,
         "estimated_one_way_turnover_pct": float(turnover / Decimal("2")),
@@ -141,3 +260,137 @@ def rebalance_preview(
         ],
         "methodology": "Trade breaches toward the nearest policy boundary, then rebalance inside remaining bands to keep proposed weights self-financing.",
     }
+
+
+def _optimized_preview(
+    profile: dict[str, object],
+    targets: dict[str, Decimal],
+    sectors: dict[str, str],
+    current_allocations: list[dict[str, object]],
+    portfolio_value: Decimal,
+    *,
+    apply_fx_fees: bool,
+    min_trade_dollars: Decimal,
+    sector_caps: dict[str, object] | None,
+) -> dict[str, object]:
+    current = _validated_current(targets, current_allocations, portfolio_value)
+    theme_cap = Decimal(str(profile.get("max_single_theme_pct") or 100))
+    bands = {basket: (lower, min(upper, theme_cap)) for basket, (lower, upper) in _policy_bands(targets).items()}
+    currencies = {
+        str(row.get("basket_id") or "").strip().casefold(): str(row.get("currency") or "").strip().upper()
+        for row in current_allocations
+    }
+    fx_rate = Decimal(str(WEALTHSIMPLE_FX_FEE_RATE))
+    trade_costs = {
+        basket: Decimal("1") + (fx_rate if apply_fx_fees and currencies.get(basket) == "USD" else Decimal("0"))
+        for basket in targets
+    }
+    caps = {str(group).strip().casefold(): _decimal(cap) for group, cap in (sector_caps or {}).items()}
+    if any(cap < 0 for cap in caps.values()):
+        raise ValueError("sector caps must not be negative")
+    if min_trade_dollars < 0:
+        raise ValueError("min_trade_dollars must not be negative")
+    groups = {basket: sectors.get(basket, "").casefold() or basket for basket in targets}
+    min_trade_pct = min_trade_dollars / portfolio_value * Decimal("100")
+    proposed = optimized_weights(
+        current,
+        targets,
+        bands,
+        trade_costs=trade_costs,
+        groups=groups,
+        caps=caps,
+        min_trade_pct=min_trade_pct,
+    )
+    response = _preview_response(profile, portfolio_value, False, current, targets, bands, proposed)
+    fx_cost = sum(
+        (abs(proposed[basket] - current[basket]) * (trade_costs[basket] - 1) for basket in targets),
+        Decimal("0"),
+    ) / Decimal("100") * portfolio_value
+    response["mode"] = "optimize"
+    response["optimizer"] = {
+        "objective": "minimize turnover plus FX-fee cost",
+        "fx_fee_rate": float(fx_rate) if apply_fx_fees else 0.0,
+        "estimated_fx_fee_dollars": float(fx_cost),
+        "min_trade_dollars": float(min_trade_dollars),
+        "sector_caps_pct": {group: float(cap) for group, cap in caps.items()},
+        "sectors": {group: sorted(basket for basket in targets if groups[basket] == group) for group in sorted(set(groups.values()))},
+        "single_theme_cap_pct": float(theme_cap),
+    }
+    response["methodology"] = (
+        "Solve for the self-financing weights with the lowest turnover and FX-fee cost inside policy bands, "
+        "sector caps shared by every sleeve in the same sector, and the single-theme cap; each sleeve either holds or trades at least the minimum size."
+    )
+    return response
+
+
+def rebalance_preview(
+    profile_id: str,
+    current_allocations: list[dict[str, object]],
+    portfolio_value: Decimal,
+    *,
+    exact_target: bool = False,
+    mode: str = "bands",
+    apply_fx_fees: bool = False,
+    min_trade_dollars: Decimal = Decimal("0"),
+    sector_caps: dict[str, object] | None = None,
+) -> dict[str, object]:
+    if mode not in REBALANCE_MODES:
+        raise ValueError(f"unknown rebalance mode: {mode}")
+    profile, targets, sectors = _profile_targets(profile_id)
+    if mode == "optimize":
+        return _optimized_preview(
+            profile,
+            targets,
+            sectors,
+            current_allocations,
+            portfolio_value,
+            apply_fx_fees=apply_fx_fees,
+            min_trade_dollars=min_trade_dollars,
+            sector_caps=sector_caps,
+        )
+    current = _validated_current(targets, current_allocations, portfolio_value)
+    bands = _policy_bands(targets)
+    proposed = _band_weights(current, targets, bands, exact_target)
+    return _preview_response(profile, portfolio_value, exact_target, current, targets, bands, proposed)
+
+
+def optimize_all_profiles(
+    portfolios: dict[str, dict[str, object]],
+    *,
+    apply_fx_fees: bool = False,
+    min_trade_dollars: Decimal = Decimal("0"),
+    sector_caps: dict[str, object] | None = None,
+) -> dict[str, object]:
+    portfolios = {str(key).strip().casefold(): value for key, value in portfolios.items()}
+    allocations = read_allocations()
+    results: list[dict[str, object]] = []
+    for profile in read_profiles(include_research=True):
+        profile_id = str(profile["profile_id"])
+        rows = [row for row in allocations if str(row["profile_id"]) == profile_id]
+        targets = {str(row["basket_id"]): Decimal(str(row["target_weight"])) for row in rows}
+        sectors = {str(row["basket_id"]): str(row.get("sector") or "") for row in rows}
+        portfolio = portfolios.get(profile_id)
+        if portfolio is None:
+            results.append({"profile_id": profile_id, "status": "missing_current_allocations", "preview": None, "error": None})
+            continue
+        try:
+            preview = _optimized_preview(
+                profile,
+                targets,
+                sectors,
+                list(portfolio.get("current_allocations") or []),
+                _decimal(portfolio.get("portfolio_value") or 0),
+                apply_fx_fees=apply_fx_fees,
+                min_trade_dollars=min_trade_dollars,
+                sector_caps=sector_caps,
+            )
+        except ValueError as exc:
+            results.append({"profile_id": profile_id, "status": "error", "preview": None, "error": str(exc)})
+            continue
+        results.append({"profile_id": profile_id, "status": "optimized", "preview": preview, "error": None})
+    unknown = sorted(set(portfolios) - {str(row["profile_id"]) for row in results})
+    return {
+        "execution_mode": "draft_review_only",
+        "profiles": results,
+        "warnings": [f"unknown profile: {profile_id}" for profile_id in unknown],
+    }
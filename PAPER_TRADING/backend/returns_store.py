@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import math
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Sequence
+
+from backend.compact_bars import Bar
+
+
+RETURNS_STORE_ENTRIES = 512
+
+LOCK = threading.Lock()
+_RETURNS: OrderedDict[str, SymbolReturns] = OrderedDict()
+STATS = {"hits": 0, "builds": 0, "invalidations": 0}
+
+
+@dataclass(frozen=True, slots=True)
+class ReturnWindow:
+    ordinals: memoryview
+    simple: memoryview
+    log: memoryview
+    pct: memoryview
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def days(self) -> list[date]:
+        return [date.fromordinal(ordinal) for ordinal in self.ordinals]
+
+    def simple_by_day(self) -> dict[date, float]:
+        return {
+            date.fromordinal(ordinal): value
+            for ordinal, value in zip(self.ordinals, self.simple)
+            if not math.isnan(value)
+        }
+
+
+class SymbolReturns:
+    __slots__ = ("bars", "ordinals", "simple", "log", "pct")
+
+    def __init__(self, bars: Sequence[Bar]) -> None:
+        self.bars = bars
+        self.ordinals = array("i", (bar.day.toordinal() for bar in bars))
+        self.simple = array("d", [math.nan] if bars else [])
+        self.log = array("d", [math.nan] if bars else [])
+        self.pct = array("d", [math.nan] if bars else [])
+        previous_close: Decimal | None = None
+        previous_float = 0.0
+        for bar in bars:
+            close = Decimal(str(bar.close))
+            current_float = float(close)
+            if previous_close is not None:
+                self.pct.append(float((close / previous_close - 1) * 100) if previous_close else 0.0)
+                if previous_float > 0 and current_float > 0:
+                    self.simple.append(current_float / previous_float - 1)
+                    self.log.append(math.log(current_float / previous_float))
+                else:
+                    self.simple.append(math.nan)
+                    self.log.append(math.nan)
+            previous_close = close
+            previous_float = current_float
+
+    def matches(self, bars: Sequence[Bar]) -> bool:
+        if self.bars is bars:
+            return True
+        return len(self.bars) == len(bars) and (not bars or self.bars[-1] == bars[-1]) and tuple(self.bars) == tuple(bars)
+
+    def count(self, day: date | None) -> int:
+        if day is None:
+            return len(self.ordinals)
+        return bisect_right(self.ordinals, day.toordinal())
+
+    def bar(self, day: date | None) -> Bar | None:
+        count = self.count(day)
+        return self.bars[count - 1] if count else None
+
+    def slice(self, first: int, last: int) -> ReturnWindow:
+        return ReturnWindow(
+            memoryview(self.ordinals)[first:last],
+            memoryview(self.simple)[first:last],
+            memoryview(self.log)[first:last],
+            memoryview(self.pct)[first:last],
+        )
+
+    def window(self, start: date, end: date | None) -> ReturnWindow:
+        first = bisect_right(self.ordinals, start.toordinal() - 1)
+        return self.slice(first + 1, max(self.count(end), first + 1))
+
+    def trailing(self, count: int, sessions: int) -> ReturnWindow:
+        return self.slice(max(1, count - sessions + 1), max(count, 1))
+
+
+def symbol_returns(symbol: str, bars: Sequence[Bar]) -> SymbolReturns:
+    with LOCK:
+        cached = _RETURNS.get(symbol)
+        if cached is not None and cached.matches(bars):
+            _RETURNS.move_to_end(symbol)
+            STATS["hits"] += 1
+            return cached
+    returns = SymbolReturns(bars)
+    with LOCK:
+        STATS["builds"] += 1
+        if cached is not None:
+            STATS["invalidations"] += 1
+        _RETURNS[symbol] = returns
+        _RETURNS.move_to_end(symbol)
+        while len(_RETURNS) > RETURNS_STORE_ENTRIES:
+            _RETURNS.popitem(last=False)
+    return returns
+
+
+def returns_store_report() -> dict[str, object]:
+    with LOCK:
+        return {**STATS, "entries": len(_RETURNS), "max_entries": RETURNS_STORE_ENTRIES}
+
+
+def clear_returns_store() -> None:
+    with LOCK:
+        _RETURNS.clear()
+        for name in STATS:
+            STATS[name] = 0
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
 import math
-from collections import defaultdict
+from collections import defaultdict, deque
 from datetime import date
 from decimal import Decimal
 
 
 SCHEMA_VERSION = "1.0"
 CALCULATION_VERSION = "wealth-risk-2026-06-12"
+ROLLING_WINDOWS = (21, 63)
 
 
-def _as_float(value: Decimal) -> float:
+def _as_float(value: Decimal | float) -> float:
     return round(float(value), 6)
 
 
@@ -100,10 +101,10 @@ def _concentration(positions: list[dict[str, object]]) -> dict[str, object]:
 
 
 def _benchmark_metrics(
-    portfolio_series: list[dict[str, object]],
+    portfolio_returns: list[tuple[str, Decimal]],
     benchmark_series: list[dict[str, object]],
 ) -> dict[str, object]:
-    portfolio = dict(_returns(portfolio_series))
+    portfolio = dict(portfolio_returns)
     benchmark = dict(_returns(benchmark_series))
     common = sorted(set(portfolio) & set(benchmark))
     if len(common) < 2:
@@ -126,21 +127,250 @@ def _benchmark_metrics(
     }
 
 
+def _float_returns(series: list[dict[str, object]]) -> list[tuple[str, float]]:
+    cleaned = sorted(
+        ((str(row["date"]), float(row["value"])) for row in series if row.get("date") and row.get("value") is not None),
+        key=lambda item: item[0],
+    )
+    return [
+        (day, current / previous - 1)
+        for (_, previous), (day, current) in zip(cleaned, cleaned[1:])
+        if previous
+    ]
+
+
+def _float_volatility(values: list[float]) -> float:
+    if len(values) < 2:
+        return 0.0
+    mean = sum(values) / len(values)
+    variance = sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+    return math.sqrt(variance) * math.sqrt(252) * 100
+
+
+def _float_drawdown_metrics(series: list[dict[str, object]]) -> dict[str, object]:
+    cleaned = sorted(
+        (
+            (date.fromisoformat(str(row["date"])).isoformat(), float(row["value"]))
+            for row in series
+            if row.get("date") and row.get("value") is not None
+        ),
+        key=lambda item: item[0],
+    )
+    if not cleaned:
+        return _drawdown_metrics([])
+    peak_day, peak = cleaned[0]
+    maximum = 0.0
+    current_underwater = 0
+    longest_recovery = 0
+    drawdowns: list[dict[str, object]] = []
+    for day, value in cleaned:
+        if value >= peak:
+            longest_recovery = max(longest_recovery, current_underwater)
+            peak = value
+            peak_day = day
+            current_underwater = 0
+        else:
+            current_underwater += 1
+        drawdown = (value / peak - 1) * 100 if peak else 0.0
+        maximum = min(maximum, drawdown)
+        drawdowns.append({"date": day, "drawdown_pct": round(drawdown, 6), "peak_date": peak_day})
+    return {
+        "maximum_drawdown_pct": round(maximum, 6),
+        "current_drawdown_pct": drawdowns[-1]["drawdown_pct"],
+        "longest_recovery_sessions": max(longest_recovery, current_underwater),
+        "current_underwater_sessions": current_underwater,
+        "drawdown_series": drawdowns,
+    }
+
+
+def _float_concentration(positions: list[dict[str, object]]) -> dict[str, object]:
+    values = [max(float(row.get("current_value") or 0), 0.0) for row in positions]
+    total = sum(values)
+    weights = sorted((value / total for value in values if total and value > 0), reverse=True)
+    hhi = sum(weight * weight for weight in weights)
+    return {
+        "position_count": len(weights),
+        "largest_position_weight_pct": round(weights[0] * 100, 6) if weights else 0,
+        "top_five_weight_pct": round(sum(weights[:5]) * 100, 6),
+        "effective_number_of_holdings": round(1 / hhi, 6) if hhi else 0,
+    }
+
+
+def _float_benchmark_metrics(
+    portfolio_returns: list[tuple[str, float]],
+    benchmark_series: list[dict[str, object]],
+) -> dict[str, object]:
+    portfolio = dict(portfolio_returns)
+    benchmark = dict(_float_returns(benchmark_series))
+    common = sorted(set(portfolio) & set(benchmark))
+    if len(common) < 2:
+        return {"beta": None, "tracking_error_pct": None, "aligned_sessions": len(common)}
+    portfolio_values = [portfolio[day] for day in common]
+    benchmark_values = [benchmark[day] for day in common]
+    portfolio_mean = sum(portfolio_values) / len(common)
+    benchmark_mean = sum(benchmark_values) / len(common)
+    covariance = sum(
+        (portfolio_value - portfolio_mean) * (benchmark_value - benchmark_mean)
+        for portfolio_value, benchmark_value in zip(portfolio_values, benchmark_values)
+    ) / (len(common) - 1)
+    variance = sum((value - benchmark_mean) ** 2 for value in benchmark_values) / (len(common) - 1)
+    active_returns = [portfolio_value - benchmark_value for portfolio_value, benchmark_value in zip(portfolio_values, benchmark_values)]
+    return {
+        "beta": round(covariance / variance, 6) if variance else None,
+        "tracking_error_pct": round(_float_volatility(active_returns), 6),
+        "aligned_sessions": len(common),
+    }
+
+
+class _RollingMoments:
+    __slots__ = ("count", "sum_x", "sum_y", "sum_xx", "sum_yy", "sum_xy")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum_x = self.sum_y = self.sum_xx = self.sum_yy = self.sum_xy = 0.0
+
+    def add(self, x: float, y: float, sign: int = 1) -> None:
+        self.count += sign
+        self.sum_x += sign * x
+        self.sum_y += sign * y
+        self.sum_xx += sign * x * x
+        self.sum_yy += sign * y * y
+        self.sum_xy += sign * x * y
+
+    def remove(self, x: float, y: float) -> None:
+        self.add(x, y, -1)
+
+    def _centered(self, total: float, left: float, right: float) -> float:
+        if self.count < 2:
+            return 0.0
+        return (total - left * right / self.count) / (self.count - 1)
+
+    def _variance(self, total: float, values: float) -> float:
+        variance = self._centered(total, values, values)
+        return variance if variance > 1e-12 * total / max(self.count, 1) else 0.0
+
+    def variance_x(self) -> float:
+        return self._variance(self.sum_xx, self.sum_x)
+
+    def variance_y(self) -> float:
+        return self._variance(self.sum_yy, self.sum_y)
+
+    def covariance(self) -> float:
+        return self._centered(self.sum_xy, self.sum_x, self.sum_y)
+
+
+def _rolling_window_series(
+    cleaned: list[tuple[str, float]],
+    benchmark: dict[str, float],
+    market: dict[str, float],
+    window: int,
+) -> list[dict[str, object]]:
+    own = _RollingMoments()
+    relative = _RollingMoments()
+    correlated = _RollingMoments()
+    entries: deque[tuple[float | None, float | None, float | None]] = deque()
+    peaks: deque[tuple[int, float]] = deque()
+    rows: list[dict[str, object]] = []
+    for index, (day, value) in enumerate(cleaned):
+        while peaks and peaks[-1][1] <= value:
+            peaks.pop()
+        peaks.append((index, value))
+        if peaks[0][0] <= index - window:
+            peaks.popleft()
+        if index == 0:
+            continue
+        previous = cleaned[index - 1][1]
+        daily = value / previous - 1 if previous else None
+        benchmark_daily = benchmark.get(day) if daily is not None else None
+        market_daily = market.get(day) if daily is not None else None
+        entries.append((daily, benchmark_daily, market_daily))
+        if daily is not None:
+            own.add(daily, daily)
+            if benchmark_daily is not None:
+                relative.add(daily, benchmark_daily)
+            if market_daily is not None:
+                correlated.add(daily, market_daily)
+        if len(entries) > window:
+            dropped, dropped_benchmark, dropped_market = entries.popleft()
+            if dropped is not None:
+                own.remove(dropped, dropped)
+                if dropped_benchmark is not None:
+                    relative.remove(dropped, dropped_benchmark)
+                if dropped_market is not None:
+                    correlated.remove(dropped, dropped_market)
+        if len(entries) < window:
+            continue
+        benchmark_variance = relative.variance_y()
+        market_variance = correlated.variance_y() * correlated.variance_x()
+        peak = peaks[0][1]
+        rows.append(
+            {
+                "date": day,
+                "volatility_pct": round(math.sqrt(own.variance_x()) * math.sqrt(252) * 100, 6) if own.count >= 2 else None,
+                "beta": round(relative.covariance() / benchmark_variance, 6) if benchmark_variance else None,
+                "drawdown_pct": round((value / peak - 1) * 100, 6) if peak else 0.0,
+                "spy_correlation": round(
+                    max(-1.0, min(1.0, correlated.covariance() / math.sqrt(market_variance))), 6
+                )
+                if market_variance
+                else None,
+            }
+        )
+    return rows
+
+
+def rolling_risk_series(
+    series: list[dict[str, object]],
+    benchmark_series: list[dict[str, object]],
+    market_series: list[dict[str, object]] | None = None,
+    windows: tuple[int, ...] = ROLLING_WINDOWS,
+) -> list[dict[str, object]]:
+    cleaned = sorted(
+        (
+            (date.fromisoformat(str(row["date"])).isoformat(), float(row["value"]))
+            for row in series
+            if row.get("date") and row.get("value") is not None
+        ),
+        key=lambda item: item[0],
+    )
+    benchmark = dict(_float_returns(benchmark_series))
+    market = benchmark if market_series is None else dict(_float_returns(market_series))
+    return [
+        {"window_sessions": window, "series": _rolling_window_series(cleaned, benchmark, market, window)}
+        for window in windows
+    ]
+
+
 def portfolio_risk_response(
     detail: dict[str, object],
     start: date,
     end: date,
     *,
     base_currency: str = "USD",
+    exact: bool = False,
+    rolling: bool = False,
+    market_series: list[dict[str, object]] | None = None,
 ) -> dict[str, object]:
     series = list(detail.get("series") or [])
     positions = list(detail.get("positions") or [])
     benchmark = detail.get("benchmark_comparison") if isinstance(detail.get("benchmark_comparison"), dict) else {}
-    daily_returns = [value for _, value in _returns(series)]
-    downside_returns = [value for value in daily_returns if value < 0]
-    drawdown = _drawdown_metrics(series)
-    concentration = _concentration(positions)
-    relative = _benchmark_metrics(series, list(benchmark.get("benchmark_series") or []))
+    benchmark_series = list(benchmark.get("benchmark_series") or [])
+    if exact:
+        portfolio_returns = _returns(series)
+        daily_returns = [value for _, value in portfolio_returns]
+        volatility = _sample_volatility(daily_returns)
+        downside_deviation = _sample_volatility([value for value in daily_returns if value < 0])
+        drawdown = _drawdown_metrics(series)
+        concentration = _concentration(positions)
+        relative = _benchmark_metrics(portfolio_returns, benchmark_series)
+    else:
+        float_returns = _float_returns(series)
+        daily_returns = [value for _, value in float_returns]
+        volatility = _float_volatility(daily_returns)
+        downside_deviation = _float_volatility([value for value in daily_returns if value < 0])
+        drawdown = _float_drawdown_metrics(series)
+        concentration = _float_concentration(positions)
+        relative = _float_benchmark_metrics(float_returns, benchmark_series)
     warnings = [str(value) for value in detail.get("warnings") or []]
     if len(series) < 20:
         warnings.append("Fewer than 20 daily portfolio observations; volatility and drawdown confidence is low.")
@@ -175,7 +405,7 @@ def portfolio_risk_response(
     if sectors and Decimal(str(sectors[0]["weight_pct"])) > Decimal("30"):
         alerts.append({"severity": "high", "type": "sector_concentration", "message": f"{sectors[0]['sector']} exceeds 30% of current position value."})
 
-    return {
+    response = {
         "schema_version": SCHEMA_VERSION,
         "calculation_version": CALCULATION_VERSION,
         "portfolio_name": detail.get("investor") or detail.get("portfolio_name") or "portfolio",
@@ -184,10 +414,10 @@ def portfolio_risk_response(
         "as_of": str(series[-1]["date"]) if series else end.isoformat(),
         "base_currency": base_currency,
         "metrics": {
-            "annualized_volatility_pct": _as_float(_sample_volatility(daily_returns)),
-            "downside_deviation_pct": _as_float(_sample_volatility(downside_returns)),
-            "best_day_pct": _as_float(max(daily_returns, default=Decimal("0")) * 100),
-            "worst_day_pct": _as_float(min(daily_returns, default=Decimal("0")) * 100),
+            "annualized_volatility_pct": _as_float(volatility),
+            "downside_deviation_pct": _as_float(downside_deviation),
+            "best_day_pct": _as_float(max(daily_returns, default=0) * 100),
+            "worst_day_pct": _as_float(min(daily_returns, default=0) * 100),
             **{key: value for key, value in drawdown.items() if key != "drawdown_series"},
             **concentration,
             **relative,
@@ -210,3 +440,6 @@ def portfolio_risk_response(
             "sources": ["Existing PAPER_TRADING portfolio series", "Yahoo close data", "Configured portfolio benchmark"],
         },
     }
+    if rolling:
+        response["rolling_series"] = rolling_risk_series(series, benchmark_series, market_series)
+    return response
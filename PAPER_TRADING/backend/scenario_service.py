@@ -1,12 +1,51 @@
 from __future__ import annotations
 
-from datetime import date
-from typing import Callable
+import math
+import os
+import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import Callable, Sequence
+
+from backend.compact_bars import Bar
+from backend.market_calendar import is_trading_day
+from backend.returns_store import SymbolReturns
 
 
 SCHEMA_VERSION = "1.0"
-CALCULATION_VERSION = "linear-scenarios-1.0"
+CALCULATION_VERSION = "linear-scenarios-1.2"
 RECONCILIATION_TOLERANCE = 0.01
+BOOTSTRAP_PATHS = 5000
+BOOTSTRAP_HORIZON_SESSIONS = 21
+BOOTSTRAP_BLOCK_SESSIONS = 5
+BOOTSTRAP_HISTORY_DAYS = 3 * 365
+BOOTSTRAP_MINIMUM_SESSIONS = 60
+BOOTSTRAP_CHUNK_PATHS = 1000
+BOOTSTRAP_SEED = 0
+BOOTSTRAP_CONFIDENCES = (0.95, 0.99)
+BOOTSTRAP_PERCENTILES = (1, 5, 10, 25, 50, 75, 90, 95, 99)
+BOOTSTRAP_HISTOGRAM_BINS = 20
+BOOTSTRAP_WORKERS_ENV = "PAPER_TRADING_BOOTSTRAP_WORKERS"
+STRESS_MARKET_TICKER = "SPY"
+STRESS_HISTORY_DAYS = 10 * 365
+STRESS_WORST_WINDOWS = 3
+STRESS_MINIMUM_COVERAGE = 0.8
+HISTORICAL_STRESS_WINDOWS: tuple[dict[str, object], ...] = (
+    {"window_id": "q4-2018-selloff", "name": "Q4 2018 selloff", "start": date(2018, 9, 20), "end": date(2018, 12, 24)},
+    {"window_id": "covid-crash-2020", "name": "COVID-19 crash", "start": date(2020, 2, 19), "end": date(2020, 3, 23)},
+    {"window_id": "rate-shock-2022", "name": "2022 rate shock", "start": date(2022, 1, 3), "end": date(2022, 10, 12)},
+    {"window_id": "carry-unwind-2024", "name": "August 2024 carry unwind", "start": date(2024, 7, 16), "end": date(2024, 8, 5)},
+    {"window_id": "tariff-shock-2025", "name": "2025 tariff shock", "start": date(2025, 2, 19), "end": date(2025, 4, 8)},
+)
+ARCHIVE_START = date(2015, 1, 1)
+ARCHIVE_ENTRIES = 256
+ReturnsLoader = Callable[[str, str, date, date], dict[date, float]]
+
+ARCHIVE_LOCK = threading.Lock()
+_ARCHIVES: OrderedDict[str, tuple[date, tuple[Bar, ...], Sequence[Bar] | None, SymbolReturns | None]] = OrderedDict()
 UNKNOWN = "Unknown / Unclassified"
 TECHNOLOGY_TERMS = (
     "technology",
@@ -124,6 +163,426 @@ SCENARIOS: tuple[dict[str, object], ...] = (
 )
 
 
+def archived_returns(symbol: str, start: date) -> SymbolReturns:
+    from backend import dashboard_service
+
+    _, recent = dashboard_service.fetch_chart(symbol)
+    with ARCHIVE_LOCK:
+        cached = _ARCHIVES.get(symbol)
+        if cached is not None and cached[0] <= start:
+            _ARCHIVES.move_to_end(symbol)
+            if cached[2] is recent and cached[3] is not None:
+                return cached[3]
+    if cached is not None and cached[0] <= start:
+        archive_start, archived = cached[0], cached[1]
+    else:
+        archive_start = min(start, ARCHIVE_START)
+        _, downloaded = dashboard_service.download_chart(symbol, archive_start)
+        archived = tuple(bar for bar in downloaded if bar.day < dashboard_service.FETCH_START)
+    first_recent = recent[0].day if recent else date.max
+    returns = SymbolReturns((*(bar for bar in archived if bar.day < first_recent), *recent))
+    with ARCHIVE_LOCK:
+        _ARCHIVES[symbol] = (archive_start, archived, recent, returns)
+        _ARCHIVES.move_to_end(symbol)
+        while len(_ARCHIVES) > ARCHIVE_ENTRIES:
+            _ARCHIVES.popitem(last=False)
+    return returns
+
+
+def clear_archived_returns() -> None:
+    with ARCHIVE_LOCK:
+        _ARCHIVES.clear()
+
+
+def default_returns_loader(ticker: str, asset_type: str, start: date, end: date) -> dict[date, float]:
+    from backend.correlation_service import stored_returns
+    from backend.dashboard_service import FETCH_START, yahoo_symbol
+
+    if start >= FETCH_START:
+        return stored_returns(ticker, asset_type, start, end)
+    return archived_returns(yahoo_symbol(ticker, asset_type or "stock"), start).window(start, end).simple_by_day()
+
+
+def bootstrap_workers() -> int:
+    try:
+        return max(1, int(os.environ.get(BOOTSTRAP_WORKERS_ENV, "1")))
+    except ValueError:
+        return 1
+
+
+def equity_sessions(start: date, end: date) -> list[date]:
+    days = (start + timedelta(days=offset) for offset in range((end - start).days + 1))
+    return [day for day in days if is_trading_day(day)]
+
+
+def session_returns(returns: dict[date, float], sessions: Sequence[date]) -> dict[date, float]:
+    folded: dict[date, float] = {}
+    for day in sorted(returns):
+        index = bisect_left(sessions, day)
+        if index == len(sessions):
+            break
+        session = sessions[index]
+        folded[session] = (1 + folded.get(session, 0.0)) * (1 + returns[day]) - 1
+    return folded
+
+
+def joint_return_history(
+    positions: list[dict[str, object]],
+    start: date,
+    end: date,
+    returns_loader: ReturnsLoader,
+) -> tuple[list[date], list[float], list[str], list[str]]:
+    total_value = sum(float(position["current_value"]) for position in positions)
+    calendar = equity_sessions(start, end)
+    histories: dict[str, dict[date, float]] = {}
+    warnings: list[str] = []
+    for position in positions:
+        ticker = str(position["ticker"])
+        try:
+            returns = session_returns(returns_loader(ticker, normalized_type(position) or "stock", start, end), calendar)
+        except Exception as exc:
+            warnings.append(f"{ticker}: return history unavailable for simulation ({exc})")
+            continue
+        if len(returns) < BOOTSTRAP_MINIMUM_SESSIONS:
+            warnings.append(f"{ticker}: only {len(returns)} daily returns; excluded from simulation")
+            continue
+        histories[ticker] = returns
+    if not histories:
+        return [], [], [], warnings
+    sessions = sorted(set.intersection(*(set(returns) for returns in histories.values())))
+    modelled_value = sum(float(position["current_value"]) for position in positions if position["ticker"] in histories)
+    if total_value and modelled_value < total_value:
+        warnings.append(
+            f"Simulation covers {modelled_value / total_value * 100:.2f}% of current value; weights were renormalized across modelled positions."
+        )
+    weights = {
+        str(position["ticker"]): float(position["current_value"]) / modelled_value
+        for position in positions
+        if position["ticker"] in histories
+    }
+    growth = [
+        math.log(max(1 + sum(weight * histories[ticker][session] for ticker, weight in weights.items()), 1e-12))
+        for session in sessions
+    ]
+    return sessions, growth, sorted(weights), warnings
+
+
+def _bootstrap_chunk(task: tuple[list[float], int, int, int, int]) -> list[float]:
+    prefix, paths, horizon, block, seed = task
+    count = len(prefix) - 1
+    total = prefix[count]
+    generator = random.Random(seed)
+    outcomes: list[float] = []
+    for _ in range(paths):
+        growth = 0.0
+        remaining = horizon
+        while remaining:
+            length = min(block, remaining)
+            first = generator.randrange(count)
+            last = first + length
+            growth += prefix[last] - prefix[first] if last <= count else total - prefix[first] + prefix[last - count]
+            remaining -= length
+        outcomes.append(math.expm1(growth))
+    return outcomes
+
+
+def bootstrap_outcomes(
+    growth: list[float],
+    *,
+    paths: int = BOOTSTRAP_PATHS,
+    horizon_sessions: int = BOOTSTRAP_HORIZON_SESSIONS,
+    block_sessions: int = BOOTSTRAP_BLOCK_SESSIONS,
+    seed: int = BOOTSTRAP_SEED,
+    workers: int = 1,
+) -> list[float]:
+    if not growth:
+        raise ValueError("bootstrap requires at least one historical session")
+    if paths < 1 or horizon_sessions < 1 or block_sessions < 1:
+        raise ValueError("paths, horizon_sessions and block_sessions must be positive")
+    prefix = [0.0]
+    for value in growth:
+        prefix.append(prefix[-1] + value)
+    block = min(block_sessions, len(growth))
+    seeds = random.Random(seed)
+    tasks = [
+        (prefix, min(BOOTSTRAP_CHUNK_PATHS, paths - first), horizon_sessions, block, seeds.getrandbits(64))
+        for first in range(0, paths, BOOTSTRAP_CHUNK_PATHS)
+    ]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            chunks = list(executor.map(_bootstrap_chunk, tasks))
+    else:
+        chunks = [_bootstrap_chunk(task) for task in tasks]
+    return [outcome for chunk in chunks for outcome in chunk]
+
+
+def outcome_distribution(outcomes: list[float], total_value: float) -> dict[str, object]:
+    ordered = sorted(outcomes)
+    count = len(ordered)
+
+    def quantile(level: float) -> float:
+        position = (count - 1) * level
+        lower = math.floor(position)
+        upper = min(lower + 1, count - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    risk = []
+    for confidence in BOOTSTRAP_CONFIDENCES:
+        threshold = quantile(1 - confidence)
+        tail = ordered[: max(1, math.ceil(count * (1 - confidence)))]
+        value_at_risk = max(-threshold, 0.0)
+        expected_shortfall = max(-sum(tail) / len(tail), 0.0)
+        risk.append(
+            {
+                "confidence_pct": confidence * 100,
+                "value_at_risk_pct": value_at_risk * 100,
+                "value_at_risk_dollars": value_at_risk * total_value,
+                "conditional_value_at_risk_pct": expected_shortfall * 100,
+                "conditional_value_at_risk_dollars": expected_shortfall * total_value,
+            }
+        )
+    low, high = ordered[0], ordered[-1]
+    width = (high - low) / BOOTSTRAP_HISTOGRAM_BINS
+    counts = [0] * BOOTSTRAP_HISTOGRAM_BINS
+    for outcome in ordered:
+        counts[min(int((outcome - low) / width), BOOTSTRAP_HISTOGRAM_BINS - 1) if width else 0] += 1
+    return {
+        "expected_return_pct": sum(ordered) / count * 100,
+        "probability_of_loss_pct": sum(outcome < 0 for outcome in ordered) / count * 100,
+        "tail_risk": risk,
+        "percentiles": [{"percentile": level, "return_pct": quantile(level / 100) * 100} for level in BOOTSTRAP_PERCENTILES],
+        "histogram": [
+            {
+                "lower_return_pct": (low + width * index) * 100,
+                "upper_return_pct": (low + width * (index + 1)) * 100,
+                "paths": hits,
+            }
+            for index, hits in enumerate(counts)
+            if width or index == 0
+        ],
+    }
+
+
+def bootstrap_simulation(
+    positions: list[dict[str, object]],
+    as_of: date,
+    *,
+    returns_loader: ReturnsLoader = default_returns_loader,
+    paths: int = BOOTSTRAP_PATHS,
+    horizon_sessions: int = BOOTSTRAP_HORIZON_SESSIONS,
+    block_sessions: int = BOOTSTRAP_BLOCK_SESSIONS,
+    seed: int = BOOTSTRAP_SEED,
+    workers: int | None = None,
+) -> tuple[dict[str, object] | None, list[str]]:
+    start = as_of - timedelta(days=BOOTSTRAP_HISTORY_DAYS)
+    sessions, growth, tickers, warnings = joint_return_history(positions, start, as_of, returns_loader)
+    if len(sessions) < BOOTSTRAP_MINIMUM_SESSIONS:
+        warnings.append(
+            f"Only {len(sessions)} jointly observed sessions are available; at least {BOOTSTRAP_MINIMUM_SESSIONS} are required for simulation."
+        )
+        return None, warnings
+    outcomes = bootstrap_outcomes(
+        growth,
+        paths=paths,
+        horizon_sessions=horizon_sessions,
+        block_sessions=block_sessions,
+        seed=seed,
+        workers=bootstrap_workers() if workers is None else workers,
+    )
+    total_value = sum(float(position["current_value"]) for position in positions if position["ticker"] in tickers)
+    return (
+        {
+            "method": "circular_block_bootstrap",
+            "paths": paths,
+            "horizon_sessions": horizon_sessions,
+            "block_sessions": min(block_sessions, len(sessions)),
+            "seed": seed,
+            "history_start": sessions[0].isoformat(),
+            "history_end": sessions[-1].isoformat(),
+            "history_sessions": len(sessions),
+            "modelled_tickers": tickers,
+            "modelled_value": total_value,
+            **outcome_distribution(outcomes, total_value),
+        },
+        warnings,
+    )
+
+
+def worst_drawdown_windows(returns: dict[date, float], count: int = STRESS_WORST_WINDOWS) -> list[dict[str, object]]:
+    episodes: list[tuple[float, date, date]] = []
+    level = 1.0
+    peak_level = 1.0
+    peak_day: date | None = None
+    trough_level = 1.0
+    trough_day: date | None = None
+    for day in sorted(returns):
+        level *= 1 + returns[day]
+        if peak_day is None or level >= peak_level:
+            if trough_day is not None and peak_day is not None:
+                episodes.append((trough_level / peak_level - 1, peak_day, trough_day))
+            peak_level, peak_day = level, day
+            trough_level, trough_day = level, None
+        elif level < trough_level:
+            trough_level, trough_day = level, day
+    if trough_day is not None and peak_day is not None:
+        episodes.append((trough_level / peak_level - 1, peak_day, trough_day))
+    return [
+        {
+            "window_id": f"{STRESS_MARKET_TICKER.casefold()}-drawdown-{rank}",
+            "name": f"{STRESS_MARKET_TICKER} drawdown #{rank} ({depth * 100:.2f}%)",
+            "start": start,
+            "end": end,
+        }
+        for rank, (depth, start, end) in enumerate(sorted(episodes)[:count], start=1)
+    ]
+
+
+def stress_positions(portfolio_detail: dict[str, object]) -> list[tuple[str, str, float]]:
+    raw_positions = portfolio_detail.get("positions")
+    positions = [row for row in raw_positions if isinstance(row, dict)] if isinstance(raw_positions, list) else []
+    return [
+        (text(position.get("ticker")).upper(), normalized_type(position) or "stock", float(position.get("current_value") or 0))
+        for position in positions
+        if text(position.get("ticker")) and float(position.get("current_value") or 0) > 0
+    ]
+
+
+def _window_columns(
+    histories: dict[str, dict[date, float]],
+    start: date,
+    end: date,
+) -> tuple[list[date], dict[str, list[float]], dict[str, float]]:
+    windowed: dict[str, dict[date, float]] = {}
+    for ticker, returns in histories.items():
+        days = sorted(returns)
+        windowed[ticker] = {day: returns[day] for day in days[bisect_right(days, start) : bisect_right(days, end)]}
+    calendar = sorted(windowed.get(STRESS_MARKET_TICKER) or {}) or equity_sessions(start + timedelta(days=1), end)
+    columns: dict[str, list[float]] = {}
+    coverage: dict[str, float] = {}
+    for ticker, returns in windowed.items():
+        folded = session_returns(returns, calendar)
+        growth = 1.0
+        column: list[float] = []
+        for day in calendar:
+            growth *= 1 + folded.get(day, 0.0)
+            column.append(growth)
+        columns[ticker] = column
+        coverage[ticker] = len(folded) / len(calendar) if calendar else 0.0
+    return calendar, columns, coverage
+
+
+def _replay_window(
+    positions: list[tuple[str, str, float]],
+    calendar: list[date],
+    columns: dict[str, list[float]],
+    coverage: dict[str, float],
+) -> dict[str, object]:
+    total_value = sum(value for _, _, value in positions)
+    covered = [(ticker, value) for ticker, _, value in positions if coverage.get(ticker, 0.0) >= STRESS_MINIMUM_COVERAGE]
+    covered_value = sum(value for _, value in covered)
+    if not calendar or not covered:
+        return {
+            "status": "unavailable",
+            "sessions": len(calendar),
+            "covered_weight_pct": 0.0,
+            "return_pct": None,
+            "dollar_impact": None,
+            "worst_point_return_pct": None,
+            "max_drawdown_pct": None,
+        }
+    path = [(total_value - covered_value) / total_value] * len(calendar)
+    for ticker, value in covered:
+        weight = value / total_value
+        path = [level + weight * growth for level, growth in zip(path, columns[ticker])]
+    peak = 1.0
+    max_drawdown = 0.0
+    for level in path:
+        peak = max(peak, level)
+        max_drawdown = min(max_drawdown, level / peak - 1)
+    return {
+        "status": "complete" if covered_value >= total_value else "partial",
+        "sessions": len(calendar),
+        "covered_weight_pct": covered_value / total_value * 100,
+        "return_pct": (path[-1] - 1) * 100,
+        "dollar_impact": (path[-1] - 1) * total_value,
+        "worst_point_return_pct": min(min(path) - 1, 0.0) * 100,
+        "max_drawdown_pct": max_drawdown * 100,
+    }
+
+
+def historical_stress_replay(
+    portfolio_details: list[dict[str, object]],
+    as_of: date,
+    *,
+    returns_loader: ReturnsLoader = default_returns_loader,
+    windows: tuple[dict[str, object], ...] = HISTORICAL_STRESS_WINDOWS,
+    worst_windows: int = STRESS_WORST_WINDOWS,
+) -> dict[str, object]:
+    history_start = as_of - timedelta(days=STRESS_HISTORY_DAYS)
+    warnings: list[str] = []
+    try:
+        market = returns_loader(STRESS_MARKET_TICKER, "etf", history_start, as_of)
+    except Exception as exc:
+        market = {}
+        warnings.append(f"{STRESS_MARKET_TICKER}: return history unavailable for drawdown detection ({exc})")
+    replay_windows = [
+        {**window, "source": "named"} for window in windows if window["start"] <= as_of
+    ] + [{**window, "source": "market_drawdown"} for window in worst_drawdown_windows(market, worst_windows)]
+    portfolios = [(detail, stress_positions(detail)) for detail in portfolio_details]
+    histories: dict[str, dict[date, float]] = {STRESS_MARKET_TICKER: market}
+    for ticker, asset_type in sorted({(ticker, asset_type) for _, positions in portfolios for ticker, asset_type, _ in positions}):
+        if ticker in histories:
+            continue
+        try:
+            histories[ticker] = returns_loader(ticker, asset_type, history_start, as_of)
+        except Exception as exc:
+            histories[ticker] = {}
+            warnings.append(f"{ticker}: return history unavailable for stress replay ({exc})")
+
+    results: list[list[dict[str, object]]] = [[] for _ in portfolios]
+    window_rows: list[dict[str, object]] = []
+    for window in replay_windows:
+        start, end = window["start"], min(window["end"], as_of)
+        calendar, columns, coverage = _window_columns(histories, start, end)
+        market_column = columns[STRESS_MARKET_TICKER]
+        market_return = (market_column[-1] - 1) * 100 if market_column and coverage[STRESS_MARKET_TICKER] else None
+        row = {
+            "window_id": window["window_id"],
+            "name": window["name"],
+            "source": window["source"],
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "market_return_pct": market_return,
+        }
+        window_rows.append({**row, "sessions": len(calendar)})
+        for index, (_, positions) in enumerate(portfolios):
+            results[index].append({**row, **_replay_window(positions, calendar, columns, coverage)})
+    earliest = min((day for returns in histories.values() for day in returns), default=None)
+    if earliest is None or any(row["source"] == "named" and date.fromisoformat(str(row["start"])) < earliest for row in window_rows):
+        warnings.append(
+            f"Price history starts {earliest.isoformat() if earliest else 'nowhere'}; earlier named windows are reported as unavailable or partial."
+        )
+    return {
+        "as_of": as_of.isoformat(),
+        "windows": window_rows,
+        "portfolios": [
+            {
+                "portfolio": text(detail.get("label") or detail.get("investor") or detail.get("portfolio_name")) or "Selected portfolio",
+                "total_current_value": sum(value for _, _, value in positions),
+                "windows": rows,
+            }
+            for (detail, positions), rows in zip(portfolios, results)
+        ],
+        "assumptions": [
+            "Current holdings are replayed buy-and-hold through each window using actual daily closes.",
+            f"Windows follow {STRESS_MARKET_TICKER} sessions; returns on other days, such as crypto weekends, are compounded into the next session.",
+            f"Positions with daily returns on fewer than {STRESS_MINIMUM_COVERAGE:.0%} of a window's sessions are held flat as uncovered value.",
+            f"Market drawdown windows are the deepest non-overlapping {STRESS_MARKET_TICKER} peak-to-trough episodes since {(as_of - timedelta(days=STRESS_HISTORY_DAYS)).isoformat()}.",
+        ],
+        "warnings": warnings,
+    }
+
+
 def scenario_as_of(portfolio_detail: dict[str, object]) -> str:
     explicit = text(portfolio_detail.get("as_of") or portfolio_detail.get("to_date"))
     if explicit:
@@ -133,7 +592,19 @@ def scenario_as_of(portfolio_detail: dict[str, object]) -> str:
     return max(dates, default=date.today().isoformat())
 
 
-def scenario_response(portfolio_detail: dict[str, object], *, base_currency: str = "USD") -> dict[str, object]:
+def scenario_response(
+    portfolio_detail: dict[str, object],
+    *,
+    base_currency: str = "USD",
+    simulate: bool = False,
+    returns_loader: ReturnsLoader = default_returns_loader,
+    paths: int = BOOTSTRAP_PATHS,
+    horizon_sessions: int = BOOTSTRAP_HORIZON_SESSIONS,
+    block_sessions: int = BOOTSTRAP_BLOCK_SESSIONS,
+    seed: int = BOOTSTRAP_SEED,
+    workers: int | None = None,
+    replay_history: bool = False,
+) -> dict[str, object]:
     raw_positions = portfolio_detail.get("positions")
     positions = [row for row in raw_positions if isinstance(row, dict)] if isinstance(raw_positions, list) else []
     warnings: list[str] = []
@@ -218,21 +689,44 @@ def scenario_response(portfolio_detail: dict[str, object], *, base_currency: str
             }
         )
 
+    simulation = None
+    as_of = scenario_as_of(portfolio_detail)
+    if simulate and total_value:
+        simulation, simulation_warnings = bootstrap_simulation(
+            usable,
+            date.fromisoformat(as_of[:10]),
+            returns_loader=returns_loader,
+            paths=paths,
+            horizon_sessions=horizon_sessions,
+            block_sessions=block_sessions,
+            seed=seed,
+            workers=workers,
+        )
+        warnings.extend(simulation_warnings)
+    historical = None
+    if replay_history and total_value:
+        replay = historical_stress_replay([portfolio_detail], date.fromisoformat(as_of[:10]), returns_loader=returns_loader)
+        historical = replay["portfolios"][0]["windows"]
+        warnings.extend(replay["warnings"])
+
     return {
         "schema_version": SCHEMA_VERSION,
         "calculation_version": CALCULATION_VERSION,
         "portfolio": text(portfolio_detail.get("investor") or portfolio_detail.get("portfolio_name")) or "Selected portfolio",
-        "as_of": scenario_as_of(portfolio_detail),
+        "as_of": as_of,
         "base_currency": base_currency.upper(),
         "total_current_value": total_value,
         "position_count": len(usable),
         "scenarios": results,
+        "simulation": simulation,
+        "historical_replay": historical,
         "assumptions": [
             "Results are deterministic linear first-order estimates, not forecasts.",
             "Position weights are normalized from positive current values.",
             "Unknown classifications remain unassigned rather than receiving an inferred shock.",
             "ETF constituent look-through, derivatives convexity, taxes, trading costs, and liquidity effects are excluded.",
             "The CAD scenario applies a linear -10% translation shock to positions explicitly marked USD.",
+            "Simulated paths resample blocks of jointly observed daily returns and hold current weights constant over the horizon.",
         ],
         "data_quality": {
             "warnings": warnings,
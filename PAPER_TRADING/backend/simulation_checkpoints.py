@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from bisect import bisect_left
+from calendar import monthrange
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Mapping, Sequence
+
+from backend.compact_bars import Bar
+
+
+ROOT = Path(__file__).resolve().parents[1]
+CHECKPOINT_DIR = ROOT / "data" / "dashboard_cache" / "simulation_checkpoints"
+CHECKPOINT_VERSION = 2
+CHECKPOINTS_ENV = "PAPER_TRADING_SIMULATION_CHECKPOINTS"
+SERIES_TAIL_ROWS = 40
+MEMORY_CHECKPOINTS = 256
+
+LOCK = threading.Lock()
+_MEMORY: OrderedDict[str, str] = OrderedDict()
+
+
+def checkpoints_enabled() -> bool:
+    return os.environ.get(CHECKPOINTS_ENV, "1").strip().lower() not in {"0", "false", "off", "no"}
+
+
+def checkpoint_dates(start: date, end: date) -> list[tuple[str, date]]:
+    checkpoints: list[tuple[str, date]] = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        last_day = monthrange(year, month)[1]
+        for label, day in (("BOM", 1), ("Mid-month", 15), ("EOM", last_day)):
+            checkpoint = date(year, month, day)
+            if start <= checkpoint <= end:
+                checkpoints.append((label, checkpoint))
+        month += 1
+        if month == 13:
+            year += 1
+            month = 1
+    return checkpoints
+
+
+def encode_state(value: object) -> object:
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    if isinstance(value, dict):
+        return {str(key): encode_state(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_state(item) for item in value]
+    return value
+
+
+def decode_state(value: dict[str, Any]) -> object:
+    if set(value) == {"__decimal__"}:
+        return Decimal(value["__decimal__"])
+    return value
+
+
+def config_digest(kind: str, config: Mapping[str, object]) -> str:
+    token = json.dumps(
+        {"kind": kind, "version": CHECKPOINT_VERSION, "config": encode_state(config)},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(token.encode("utf-8")).hexdigest()
+
+
+def data_fingerprints(
+    charts: Mapping[str, Sequence[Bar]],
+    news_counts: Mapping[str, object],
+    through_days: Sequence[date],
+) -> dict[date, str]:
+    boundaries = sorted(set(through_days))
+    if not boundaries:
+        return {}
+    combined = {day: hashlib.sha1() for day in boundaries}
+    for ticker in sorted(set(charts) | set(news_counts)):
+        digest = hashlib.sha1(ticker.encode("utf-8"))
+        bars = charts.get(ticker, ())
+        counts = news_counts.get(ticker)
+        news_days = sorted(counts.items()) if isinstance(counts, dict) else []
+        bar_index = 0
+        news_index = 0
+        for boundary in boundaries:
+            while bar_index < len(bars) and bars[bar_index].day <= boundary:
+                bar = bars[bar_index]
+                digest.update(f"b{bar.day.toordinal()}:{bar.close}:{bar.volume};".encode("utf-8"))
+                bar_index += 1
+            boundary_text = boundary.isoformat()
+            while news_index < len(news_days) and str(news_days[news_index][0]) <= boundary_text:
+                day, count = news_days[news_index]
+                digest.update(f"n{day}:{count};".encode("utf-8"))
+                news_index += 1
+            combined[boundary].update(digest.digest())
+    return {day: digest.hexdigest() for day, digest in combined.items()}
+
+
+class SimulationCheckpoints:
+    def __init__(
+        self,
+        kind: str,
+        config: Mapping[str, object],
+        sessions: Sequence[date],
+        charts: Mapping[str, Sequence[Bar]],
+        news_counts: Mapping[str, object] | None = None,
+    ) -> None:
+        self.kind = kind
+        self.enabled = checkpoints_enabled() and bool(sessions)
+        self.config_digest = config_digest(kind, config)
+        self.boundaries: dict[date, date] = {}
+        if self.enabled:
+            for _, checkpoint in checkpoint_dates(sessions[0], sessions[-1]):
+                index = bisect_left(sessions, checkpoint)
+                if index:
+                    self.boundaries[checkpoint] = sessions[index - 1]
+        self.fingerprints = (
+            data_fingerprints(charts, news_counts or {}, list(self.boundaries.values()))
+            if self.boundaries
+            else {}
+        )
+        self._pending = sorted(self.boundaries)
+        self.resumed_from: date | None = None
+
+    def path(self, checkpoint: date) -> Path:
+        boundary = self.boundaries[checkpoint]
+        digest = hashlib.sha1(
+            f"{self.config_digest}|{self.fingerprints[boundary]}".encode("utf-8")
+        ).hexdigest()[:20]
+        return CHECKPOINT_DIR / f"{self.kind}__{checkpoint.isoformat()}__{digest}.json"
+
+    def resume(self, selected_start: date) -> dict[str, Any] | None:
+        for checkpoint in sorted(self.boundaries, reverse=True):
+            if checkpoint > selected_start:
+                continue
+            state = read_checkpoint(self.path(checkpoint))
+            if state is None or state.get("session") != self.boundaries[checkpoint].isoformat():
+                continue
+            self.resumed_from = checkpoint
+            self._pending = [day for day in self._pending if day > checkpoint]
+            return state
+        return None
+
+    def record(self, session: date, state: Callable[[], dict[str, object]]) -> None:
+        due: list[date] = []
+        while self._pending and self._pending[0] <= session:
+            due.append(self._pending.pop(0))
+        snapshot: dict[str, object] | None = None
+        for checkpoint in due:
+            path = self.path(checkpoint)
+            if path.name in _MEMORY or path.exists():
+                continue
+            snapshot = snapshot or state()
+            if snapshot.get("session") != self.boundaries[checkpoint].isoformat():
+                continue
+            write_checkpoint(path, self.kind, checkpoint, snapshot)
+
+
+def series_tail(series: list[dict[str, object]]) -> list[dict[str, object]]:
+    return series[-SERIES_TAIL_ROWS:]
+
+
+def read_checkpoint(path: Path) -> dict[str, Any] | None:
+    with LOCK:
+        text = _MEMORY.get(path.name)
+        if text is not None:
+            _MEMORY.move_to_end(path.name)
+    if text is None:
+        if not path.exists():
+            return None
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        remember(path.name, text)
+    try:
+        wrapped = json.loads(text, object_hook=decode_state)
+    except json.JSONDecodeError:
+        return None
+    metadata = wrapped.get("checkpoint") if isinstance(wrapped, dict) else None
+    state = wrapped.get("state") if isinstance(wrapped, dict) else None
+    if not isinstance(metadata, dict) or not isinstance(state, dict):
+        return None
+    if metadata.get("version") != CHECKPOINT_VERSION:
+        return None
+    return state
+
+
+def write_checkpoint(path: Path, kind: str, checkpoint: date, state: dict[str, object]) -> Path:
+    wrapped = {
+        "checkpoint": {
+            "version": CHECKPOINT_VERSION,
+            "kind": kind,
+            "date": checkpoint.isoformat(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "state": encode_state(state),
+    }
+    text = json.dumps(wrapped, sort_keys=True)
+    remember(path.name, text)
+    try:
+        CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporary.write_text(text, encoding="utf-8")
+        temporary.replace(path)
+    except OSError:
+        pass
+    return path
+
+
+def remember(name: str, text: str) -> None:
+    with LOCK:
+        _MEMORY[name] = text
+        _MEMORY.move_to_end(name)
+        while len(_MEMORY) > MEMORY_CHECKPOINTS:
+            _MEMORY.popitem(last=False)
+
+
+def clear_memory_checkpoints() -> None:
+    with LOCK:
+        _MEMORY.clear()
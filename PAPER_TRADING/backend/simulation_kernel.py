@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable, Iterable, Mapping, Sequence
+
+from backend.compact_bars import Bar
+
+
+MARKET_KEY = "^market"
+
+
+@dataclass(slots=True)
+class Order:
+    ticker: str
+    action: str
+    usd_amount: Decimal = Decimal("0")
+    target_weight: Decimal = Decimal("0")
+    candidate: dict[str, object] = field(default_factory=dict)
+
+
+class SessionPrices:
+    def __init__(self, charts: Mapping[str, Sequence[Bar]], days: Iterable[date]) -> None:
+        self.charts = charts
+        self.days = sorted(set(days))
+        self.positions = {day: index for index, day in enumerate(self.days)}
+        self.ordinals = {ticker: [bar.day.toordinal() for bar in bars] for ticker, bars in charts.items()}
+        self.counts = {
+            ticker: [bisect_right(ordinals, day.toordinal()) for day in self.days]
+            for ticker, ordinals in self.ordinals.items()
+        }
+
+    def count(self, ticker: str, day: date) -> int:
+        index = self.positions.get(day)
+        if index is not None:
+            return self.counts[ticker][index]
+        return bisect_right(self.ordinals[ticker], day.toordinal())
+
+    def bar(self, ticker: str, day: date) -> Bar | None:
+        count = self.count(ticker, day)
+        return self.charts[ticker][count - 1] if count else None
+
+    def history(self, ticker: str, day: date) -> tuple[Bar, ...]:
+        return tuple(self.charts[ticker][: self.count(ticker, day)])
+
+
+def simulation_days(market_bars: Sequence[Bar], start: date, end: date) -> list[date]:
+    first = start - timedelta(days=7)
+    return [bar.day for bar in market_bars if first <= bar.day <= end]
+
+
+def simulate(
+    sessions: Sequence[date],
+    previous_session: Bar | None,
+    prices: SessionPrices,
+    holdings: Mapping[str, object],
+    orders: Callable[[date], Iterable[Order]],
+    fill: Callable[[Order, Bar, date], None],
+    mark: Callable[[date, date, list[tuple[str, Bar]]], None],
+    checkpoint: Callable[[date, date], None] | None = None,
+) -> Bar | None:
+    for session in sessions:
+        if not previous_session:
+            previous_session = prices.bar(MARKET_KEY, session - timedelta(days=1))
+        observed_day = previous_session.day
+        if checkpoint is not None:
+            checkpoint(session, observed_day)
+        for order in orders(observed_day):
+            bar = prices.bar(order.ticker, session)
+            if not bar or bar.day <= observed_day:
+                continue
+            fill(order, bar, observed_day)
+        marks: list[tuple[str, Bar]] = []
+        for ticker in holdings:
+            bar = prices.bar(ticker, session)
+            if bar:
+                marks.append((ticker, bar))
+        mark(session, observed_day, marks)
+        previous_session = prices.bar(MARKET_KEY, session)
+    return previous_session
+
+
+def observed_holding_values(
+    holdings: Mapping[str, Mapping[str, object]],
+    prices: SessionPrices,
+    observed_day: date,
+    cash: Decimal,
+) -> tuple[dict[str, Decimal], Decimal]:
+    values: dict[str, Decimal] = {}
+    equity = cash
+    for ticker, holding in holdings.items():
+        bar = prices.bar(ticker, observed_day)
+        if not bar:
+            continue
+        values[ticker] = Decimal(str(holding["shares"])) * bar.close
+        equity += values[ticker]
+    return values, equity
+
+
+def rebalance_orders(
+    holdings: Mapping[str, object],
+    weights: Mapping[str, Decimal],
+    values: Mapping[str, Decimal],
+    equity: Decimal,
+    band: Decimal,
+    candidates: Mapping[str, dict[str, object]],
+    hold_only: Callable[[dict[str, object]], bool] | None = None,
+) -> list[Order]:
+    orders: list[Order] = []
+    for ticker in sorted(set(holdings) | set(weights)):
+        current_value = values.get(ticker, Decimal("0"))
+        target_weight = weights.get(ticker, Decimal("0"))
+        delta = equity * target_weight - current_value
+        if target_weight and ticker in holdings and equity and abs(delta) / equity < band:
+            continue
+        candidate = candidates.get(ticker) or {}
+        if delta > 0 and hold_only is not None and hold_only(candidate):
+            continue
+        if abs(delta) < Decimal("1"):
+            continue
+        orders.append(Order(ticker, "buy" if delta > 0 else "sell", abs(delta), target_weight, candidate))
+    orders.sort(key=lambda order: 0 if order.action == "sell" else 1)
+    return orders
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from itertools import product
+from typing import Iterator
+
+from backend.dashboard_service import (
+    STRATEGY_LAB_ENTRY_NEWS_RULES,
+    STRATEGY_LAB_ENTRY_RULES,
+    STRATEGY_LAB_EXIT_RULES,
+    STRATEGY_LAB_UNIVERSES,
+    ObservationCache,
+    hybrid_news_optimized_assets,
+    mass_change_assets,
+    strategy_lab_detail,
+    tracked_stock_assets,
+)
+from backend.strategy_selector_service import max_drawdown_from_series
+
+
+STRATEGY_LAB_BATCH_LIMIT = 300
+STRATEGY_LAB_BATCH_WORKERS = 4
+LAB_CONFIG_FIELDS = ("entry_signal_rule", "entry_news_rule", "exit_rule", "universe")
+LAB_CONFIG_DEFAULTS = {
+    "entry_signal_rule": "any",
+    "entry_news_rule": "ignore",
+    "exit_rule": "signal-disappears",
+    "universe": "tracked-stocks",
+}
+LAB_CONFIG_CHOICES = {
+    "entry_signal_rule": STRATEGY_LAB_ENTRY_RULES,
+    "entry_news_rule": STRATEGY_LAB_ENTRY_NEWS_RULES,
+    "exit_rule": STRATEGY_LAB_EXIT_RULES,
+    "universe": STRATEGY_LAB_UNIVERSES,
+}
+
+
+def lab_config(raw: dict[str, object]) -> dict[str, str]:
+    unknown = set(raw) - set(LAB_CONFIG_FIELDS)
+    if unknown:
+        raise ValueError(f"unknown strategy lab field: {sorted(unknown)[0]}")
+    config: dict[str, str] = {}
+    for field in LAB_CONFIG_FIELDS:
+        value = str(raw.get(field) or LAB_CONFIG_DEFAULTS[field]).strip().casefold()
+        if value not in LAB_CONFIG_CHOICES[field]:
+            raise ValueError(f"unknown {field}: {value}")
+        config[field] = value
+    return config
+
+
+def lab_config_label(config: dict[str, str]) -> str:
+    return " | ".join(config[field] for field in LAB_CONFIG_FIELDS)
+
+
+def strategy_lab_configs(payload: dict[str, object]) -> list[dict[str, str]]:
+    raw_configs = payload.get("configs") or []
+    grid = payload.get("grid") or {}
+    if not isinstance(raw_configs, list) or not isinstance(grid, dict):
+        raise ValueError("configs must be a list and grid must be an object")
+    configs = [lab_config(raw) for raw in raw_configs if isinstance(raw, dict)]
+    if len(configs) != len(raw_configs):
+        raise ValueError("each strategy lab config must be an object")
+    if grid:
+        unknown = set(grid) - set(LAB_CONFIG_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown strategy lab field: {sorted(unknown)[0]}")
+        axes = []
+        for field in LAB_CONFIG_FIELDS:
+            values = grid.get(field) or [LAB_CONFIG_DEFAULTS[field]]
+            if values == "all":
+                values = sorted(LAB_CONFIG_CHOICES[field])
+            if not isinstance(values, list):
+                raise ValueError(f"grid {field} must be a list or 'all'")
+            axes.append(values)
+        configs += [lab_config(dict(zip(LAB_CONFIG_FIELDS, values))) for values in product(*axes)]
+    unique = list({lab_config_label(config): config for config in configs}.values())
+    if not unique:
+        raise ValueError("strategy lab batch needs at least one config")
+    if len(unique) > STRATEGY_LAB_BATCH_LIMIT:
+        raise ValueError(f"strategy lab batch is limited to {STRATEGY_LAB_BATCH_LIMIT} configs")
+    return unique
+
+
+def universe_size(universe: str) -> int:
+    if universe == "mass-change":
+        return len(mass_change_assets())
+    if universe == "hybrid":
+        return len(hybrid_news_optimized_assets())
+    return len(tracked_stock_assets())
+
+
+def lab_summary(config: dict[str, str], detail: dict[str, object]) -> dict[str, object]:
+    closed = [row for row in detail.get("realized_positions", []) if isinstance(row, dict)]
+    winners = [row for row in closed if float(row.get("gain_loss") or 0) > 0]
+    return {
+        **config,
+        "label": lab_config_label(config),
+        "status": "ok",
+        "from_date": detail["from_date"],
+        "to_date": detail["to_date"],
+        "initial_value": detail["initial_value"],
+        "current_value": detail["current_value"],
+        "gain_loss": detail["gain_loss"],
+        "return_pct": detail["return_pct"],
+        "max_drawdown_pct": round(max_drawdown_from_series(detail.get("series", [])), 6),
+        "trade_cycles": detail["trade_cycles"],
+        "closed_cycles": detail["closed_cycles"],
+        "open_positions": detail["position_count"],
+        "win_rate_pct": round(len(winners) / len(closed) * 100, 6) if closed else None,
+        "pending_orders": len(detail.get("pending_next_close_orders", [])),
+    }
+
+
+def run_lab_config(
+    config: dict[str, str],
+    start: date,
+    end: date | None,
+    apply_wealthsimple_fx_fees: bool,
+    observation_cache: ObservationCache,
+) -> dict[str, object]:
+    try:
+        detail = strategy_lab_detail(
+            start,
+            end,
+            apply_wealthsimple_fx_fees=apply_wealthsimple_fx_fees,
+            observation_cache=observation_cache,
+            **config,
+        )
+    except ValueError as exc:
+        return {**config, "label": lab_config_label(config), "status": "error", "error": str(exc)}
+    return lab_summary(config, detail)
+
+
+def iter_strategy_lab_batch(
+    start: date,
+    end: date | None,
+    configs: list[dict[str, str]],
+    apply_wealthsimple_fx_fees: bool = False,
+    workers: int = STRATEGY_LAB_BATCH_WORKERS,
+) -> Iterator[dict[str, object]]:
+    observation_cache: ObservationCache = {}
+    sizes = {universe: universe_size(universe) for universe in {config["universe"] for config in configs}}
+    ordered = sorted(configs, key=lambda config: -sizes[config["universe"]])
+    yield run_lab_config(ordered[0], start, end, apply_wealthsimple_fx_fees, observation_cache)
+    if len(ordered) == 1:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(ordered) - 1))) as executor:
+        futures = [
+            executor.submit(run_lab_config, config, start, end, apply_wealthsimple_fx_fees, observation_cache)
+            for config in ordered[1:]
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def rank_lab_results(rows: list[dict[str, object]]) -> dict[str, list[dict[str, object]]]:
+    ranked = sorted(
+        (row for row in rows if row["status"] == "ok"),
+        key=lambda row: (-float(row["return_pct"]), -float(row["gain_loss"]), str(row["label"])),
+    )
+    return {
+        "results": [{"rank": rank, **row} for rank, row in enumerate(ranked, start=1)],
+        "failed": sorted((row for row in rows if row["status"] != "ok"), key=lambda row: str(row["label"])),
+    }
+
+
+def strategy_lab_batch_response(
+    start: date,
+    end: date | None,
+    payload: dict[str, object],
+    apply_wealthsimple_fx_fees: bool = False,
+) -> dict[str, object]:
+    configs = strategy_lab_configs(payload)
+    rows = list(iter_strategy_lab_batch(start, end, configs, apply_wealthsimple_fx_fees))
+    return {
+        "config_count": len(configs),
+        "ranking_basis": "return_pct, then gain_loss",
+        **rank_lab_results(rows),
+    }
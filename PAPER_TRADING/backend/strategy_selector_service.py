@@ -3,6 +3,8 @@ from __future__ import annotations
 from datetime import date
 from statistics import median
 
+from backend.risk_service import rolling_risk_series
+
 
 SCHEMA_VERSION = "1.0"
 CALCULATION_VERSION = "strategy-selector-1.0"
@@ -215,6 +217,7 @@ def strategy_selector_response(
     strategy_details: list[dict[str, object]],
     *,
     apply_wealthsimple_fx_fees: bool = False,
+    include_rolling_risk: bool = False,
 ) -> dict[str, object]:
     metric_rows = []
     for detail in strategy_details:
@@ -222,7 +225,15 @@ def strategy_selector_response(
         if not strategy_id:
             continue
         metrics = strategy_metrics(detail)
-        metric_rows.append({"strategy_id": strategy_id, "label": str(detail.get("label") or strategy_id), "metrics": metrics})
+        row = {"strategy_id": strategy_id, "label": str(detail.get("label") or strategy_id), "metrics": metrics}
+        if include_rolling_risk:
+            benchmark = detail.get("benchmark_comparison") if isinstance(detail.get("benchmark_comparison"), dict) else {}
+            row["rolling_risk"] = rolling_risk_series(
+                [item for item in detail.get("series", []) if isinstance(item, dict)],
+                list(benchmark.get("benchmark_series") or []),
+                detail.get("market_series"),
+            )
+        metric_rows.append(row)
 
     population = {
         "return_pct": [number(row["metrics"].get("return_pct")) for row in metric_rows],
@@ -247,6 +258,7 @@ def strategy_selector_response(
                 "metrics": row["metrics"],
                 "warnings": warnings,
                 "review_action": "manual_review" if warnings else "eligible_for_research_review",
+                **({"rolling_risk": row["rolling_risk"]} if "rolling_risk" in row else {}),
             }
         )
     ranked.sort(key=lambda row: (-number(row.get("score")), str(row.get("strategy_id"))))
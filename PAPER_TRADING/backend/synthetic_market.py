@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import csv
+import json
+import math
+import os
+import random
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterator
+from urllib.request import Request
+
+from backend import dashboard_service, http_transport, news_strategy, universe_service
+from backend.dashboard_service import FETCH_START, HISTORY_START, Bar, chart_url, yahoo_symbol
+
+
+SYNTHETIC_PREFIX = "SYN"
+SYNTHETIC_SECTORS = (
+    "Technology",
+    "Semiconductors",
+    "Healthcare",
+    "Financials",
+    "Energy",
+    "Industrials",
+    "Consumer",
+    "Communication Services",
+)
+WATCHLIST_COLUMNS = ("ticker", "security_type", "added_date", "sector", "theme", "source", "reason", "confidence", "notes")
+CAD_SUFFIXES = (".TO", ".NE", ".V")
+
+
+def synthetic_tickers(count: int) -> list[str]:
+    if count < 0:
+        raise ValueError("ticker count must not be negative")
+    return [f"{SYNTHETIC_PREFIX}{index:04d}" for index in range(1, count + 1)]
+
+
+def trading_sessions(start: date, end: date) -> list[date]:
+    sessions = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            sessions.append(day)
+        day += timedelta(days=1)
+    return sessions
+
+
+def synthetic_bars(symbol: str, start: date, end: date, seed: int = 7) -> tuple[Bar, ...]:
+    rng = random.Random(f"{seed}:{symbol}")
+    if symbol == "CAD=X":
+        price, volatility, drift_choices = 1.37, 0.003, (-0.0002, 0.0, 0.0002)
+    elif symbol == "SPY":
+        price, volatility, drift_choices = 590.0, 0.009, (-0.001, 0.0004, 0.0008)
+    else:
+        price = math.exp(rng.uniform(math.log(3), math.log(400)))
+        volatility = rng.uniform(0.012, 0.055)
+        drift_choices = (-0.004, -0.001, 0.0, 0.001, 0.003, 0.006)
+    base_volume = 0.0 if symbol == "CAD=X" else math.exp(rng.uniform(math.log(2e5), math.log(3e7)))
+    drift = rng.choice(drift_choices)
+    regime_left = rng.randint(15, 60)
+    bars = []
+    for day in trading_sessions(start, end):
+        if regime_left <= 0:
+            drift = rng.choice(drift_choices)
+            regime_left = rng.randint(15, 60)
+        regime_left -= 1
+        daily_return = drift + rng.gauss(0, volatility)
+        spike = base_volume and rng.random() < 0.02
+        if spike:
+            daily_return += rng.choice((-1, 1)) * rng.uniform(2, 6) * volatility
+        price = max(price * math.exp(daily_return), 0.01)
+        volume = base_volume * rng.lognormvariate(0, 0.35) * (1 + abs(daily_return) / max(volatility, 1e-9) * 0.4)
+        if spike:
+            volume *= rng.uniform(3, 8)
+        bars.append(Bar(day, Decimal(str(round(price, 4))), Decimal(int(volume))))
+    return tuple(bars)
+
+
+def synthetic_news_counts(
+    bars_by_ticker: dict[str, tuple[Bar, ...]],
+    seed: int = 7,
+) -> dict[str, object]:
+    tickers: dict[str, dict[str, int]] = {}
+    days: list[date] = []
+    for ticker, bars in sorted(bars_by_ticker.items()):
+        rng = random.Random(f"{seed}:news:{ticker}")
+        coverage = rng.uniform(0.02, 2.5)
+        counts: dict[str, int] = {}
+        previous = None
+        for bar in bars:
+            move = abs(float(bar.close / previous.close - 1)) if previous and previous.close else 0.0
+            rate = coverage * (1 + move * 40)
+            count = sum(rng.random() < rate / 8 for _ in range(8))
+            if count:
+                counts[bar.day.isoformat()] = count
+            previous = bar
+        tickers[ticker] = counts
+        days.extend(bar.day for bar in bars)
+    return {
+        "source": "synthetic",
+        "from_date": min(days).isoformat() if days else None,
+        "to_date": max(days).isoformat() if days else None,
+        "tickers": tickers,
+    }
+
+
+def chart_payload(symbol: str, bars: tuple[Bar, ...]) -> dict[str, object]:
+    currency = "CAD" if symbol == "CAD=X" or symbol.upper().endswith(CAD_SUFFIXES) else "USD"
+    return {
+        "chart": {
+            "result": [
+                {
+                    "meta": {"currency": currency, "symbol": symbol, "synthetic": True},
+                    "timestamp": [
+                        int(datetime.combine(bar.day, time(14, 30), tzinfo=timezone.utc).timestamp())
+                        for bar in bars
+                    ],
+                    "indicators": {
+                        "quote": [
+                            {
+                                "close": [float(bar.close) for bar in bars],
+                                "volume": [int(bar.volume) for bar in bars],
+                            }
+                        ]
+                    },
+                }
+            ],
+            "error": None,
+        }
+    }
+
+
+def existing_chart_symbols() -> set[str]:
+    symbols = {"SPY", "CAD=X"}
+    symbols |= {yahoo_symbol(row["ticker"], row["security_type"]) for row in dashboard_service.read_trades()}
+    symbols |= {yahoo_symbol(ticker, security_type) for ticker, security_type in dashboard_service.mass_change_assets()}
+    symbols |= {
+        yahoo_symbol(str(row["ticker"]), str(row["asset_type"]))
+        for row in universe_service.read_asset_universe()
+    }
+    return symbols
+
+
+def write_synthetic_market(
+    directory: Path,
+    ticker_count: int,
+    *,
+    seed: int = 7,
+    end: date | None = None,
+) -> dict[str, Path]:
+    end = end or date.today()
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "asset_universe": directory / "asset_universe.csv",
+        "mass_change_watchlist": directory / "mass_change_watchlist.csv",
+        "news_counts": directory / "historical_news_daily_counts.json",
+        "http_fixtures": directory / "http_fixtures.json.gz",
+    }
+    tickers = synthetic_tickers(ticker_count)
+    rng = random.Random(f"{seed}:universe")
+    sectors = {ticker: rng.choice(SYNTHETIC_SECTORS) for ticker in tickers}
+
+    universe_rows = [universe_service.serialize_row(row) for row in universe_service.read_asset_universe()]
+    universe_rows += [
+        universe_service.serialize_row(
+            {
+                "ticker": ticker,
+                "asset_type": "stock",
+                "currency": "USD",
+                "sector": sectors[ticker],
+                "theme": "Synthetic",
+                "source": "synthetic_market",
+                "status": "active",
+                "strategy_eligible": True,
+                "watchlist_eligible": True,
+                "benchmark_eligible": False,
+                "wealthsimple_supported_status": "unknown",
+                "added_at": HISTORY_START.isoformat(),
+                "notes": f"Synthetic scale-test ticker (seed {seed})",
+            }
+        )
+        for ticker in tickers
+    ]
+    with paths["asset_universe"].open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=universe_service.ASSET_UNIVERSE_COLUMNS, quoting=csv.QUOTE_ALL)
+        writer.writeheader()
+        writer.writerows(universe_rows)
+
+    with paths["mass_change_watchlist"].open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=WATCHLIST_COLUMNS, quoting=csv.QUOTE_ALL)
+        writer.writeheader()
+        writer.writerows(
+            {
+                "ticker": ticker,
+                "security_type": "stock",
+                "added_date": HISTORY_START.isoformat(),
+                "sector": sectors[ticker],
+                "theme": "Synthetic",
+                "source": "synthetic_market",
+                "reason": "scale test",
+                "confidence": "low",
+                "notes": "",
+            }
+            for ticker in tickers
+        )
+
+    symbols = sorted(existing_chart_symbols() | set(tickers))
+    charts = {symbol: synthetic_bars(symbol, FETCH_START, end, seed) for symbol in symbols}
+    news_charts = {ticker: charts[ticker] for ticker in tickers}
+    news_charts |= {
+        str(row["ticker"]): charts[yahoo_symbol(str(row["ticker"]), str(row["asset_type"]))]
+        for row in universe_service.read_asset_universe()
+        if str(row["asset_type"]) == "stock"
+    }
+    paths["news_counts"].write_text(json.dumps(synthetic_news_counts(news_charts, seed), indent=2), encoding="utf-8")
+
+    http_transport.clear_loaded_fixtures()
+    if paths["http_fixtures"].exists():
+        paths["http_fixtures"].unlink()
+    for symbol, bars in charts.items():
+        http_transport.add_fixture(
+            Request(chart_url(symbol)),
+            json.dumps(chart_payload(symbol, bars)).encode("utf-8"),
+            path=paths["http_fixtures"],
+        )
+    http_transport.flush_fixtures()
+    return paths
+
+
+@contextmanager
+def use_synthetic_market(directory: Path) -> Iterator[None]:
+    previous_files = (
+        dashboard_service.MASS_CHANGE_WATCHLIST_FILE,
+        news_strategy.DAILY_COUNTS_FILE,
+        universe_service.ASSET_UNIVERSE_FILE,
+    )
+    previous_env = {name: os.environ.get(name) for name in (http_transport.MODE_ENV, http_transport.FIXTURE_ENV)}
+    dashboard_service.MASS_CHANGE_WATCHLIST_FILE = directory / "mass_change_watchlist.csv"
+    news_strategy.DAILY_COUNTS_FILE = directory / "historical_news_daily_counts.json"
+    universe_service.ASSET_UNIVERSE_FILE = directory / "asset_universe.csv"
+    os.environ[http_transport.MODE_ENV] = "replay"
+    os.environ[http_transport.FIXTURE_ENV] = str(directory / "http_fixtures.json.gz")
+    dashboard_service.CHART_CACHE.clear()
+    news_strategy.load_daily_news_counts.cache_clear()
+    try:
+        yield
+    finally:
+        (
+            dashboard_service.MASS_CHANGE_WATCHLIST_FILE,
+            news_strategy.DAILY_COUNTS_FILE,
+            universe_service.ASSET_UNIVERSE_FILE,
+        ) = previous_files
+        for name, value in previous_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        dashboard_service.CHART_CACHE.clear()
+        dashboard_service.clear_hot_charts()
+        news_strategy.load_daily_news_counts.cache_clear()
+        http_transport.clear_loaded_fixtures()
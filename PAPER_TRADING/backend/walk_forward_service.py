@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+from backend.dashboard_service import (
+    VARIABLE_STRATEGY_START,
+    ObservationCache,
+    as_float,
+    pct_change,
+    registry_strategy_config,
+    strategy_lab_detail,
+)
+from backend.strategy_registry_service import read_strategies
+
+
+WALK_FORWARD_WINDOW_SESSIONS = 21
+DISTRIBUTION_POINTS = (("p10", 10), ("p25", 25), ("median", 50), ("p75", 75), ("p90", 90))
+
+
+def rolling_origins(days: list[date], window_sessions: int, step_sessions: int | None = None) -> list[int]:
+    if window_sessions < 1:
+        raise ValueError("window_sessions must be at least 1")
+    if step_sessions is not None and step_sessions < 1:
+        raise ValueError("step_sessions must be at least 1")
+    if step_sessions:
+        candidates = list(range(0, len(days), step_sessions))
+    else:
+        candidates = [
+            index
+            for index, day in enumerate(days)
+            if index == 0 or (day.year, day.month) != (days[index - 1].year, days[index - 1].month)
+        ]
+    return [origin for origin in candidates if origin + window_sessions <= len(days)]
+
+
+def window_metrics(series: list[dict[str, object]], origin: int, last: int) -> dict[str, object]:
+    values = [Decimal(str(row["value"])) for row in series]
+    deployed = [Decimal(str(row["deployed_capital"])) for row in series]
+    starting_value = values[origin - 1] if origin else Decimal("0")
+    starting_deployed = deployed[origin - 1] if origin else Decimal("0")
+    basis = starting_value + deployed[last] - starting_deployed
+    peak = Decimal("0")
+    previous = Decimal("0")
+    worst = Decimal("0")
+    up_sessions = 0
+    for index in range(origin, last + 1):
+        new_capital = deployed[index] - starting_deployed
+        gain = values[index] - starting_value - new_capital
+        capital = starting_value + new_capital
+        peak = max(peak, gain)
+        if capital:
+            worst = min(worst, (gain - peak) / capital * 100)
+        up_sessions += gain > previous
+        previous = gain
+    sessions = last - origin + 1
+    return {
+        "from_date": series[origin]["date"],
+        "to_date": series[last]["date"],
+        "initial_value": as_float(basis),
+        "current_value": as_float(values[last]),
+        "gain_loss": as_float(values[last] - basis),
+        "return_pct": as_float(pct_change(values[last], basis)),
+        "max_drawdown_pct": as_float(worst),
+        "hit_rate_pct": as_float(Decimal(up_sessions) / Decimal(sessions) * 100),
+        "active_positions": series[last]["active_positions"],
+    }
+
+
+def percentile(ordered: list[float], point: int) -> float:
+    position = (len(ordered) - 1) * point / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return round(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower), 6)
+
+
+def distribution(values: list[float]) -> dict[str, float | int | None]:
+    if not values:
+        return {"count": 0, "mean": None, "min": None, **{label: None for label, _ in DISTRIBUTION_POINTS}, "max": None}
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 6),
+        "min": ordered[0],
+        **{label: percentile(ordered, point) for label, point in DISTRIBUTION_POINTS},
+        "max": ordered[-1],
+    }
+
+
+def walk_forward_strategy(
+    strategy: dict[str, object],
+    end: date | None,
+    window_sessions: int,
+    step_sessions: int | None,
+    apply_wealthsimple_fx_fees: bool,
+    observation_cache: ObservationCache,
+) -> dict[str, object]:
+    config = registry_strategy_config(strategy)
+    detail = strategy_lab_detail(
+        VARIABLE_STRATEGY_START,
+        end,
+        apply_wealthsimple_fx_fees=apply_wealthsimple_fx_fees,
+        observation_cache=observation_cache,
+        **config,
+    )
+    series = detail["series"]
+    days = [date.fromisoformat(str(row["date"])) for row in series]
+    windows = [
+        window_metrics(series, origin, origin + window_sessions - 1)
+        for origin in rolling_origins(days, window_sessions, step_sessions)
+    ]
+    returns = [float(window["return_pct"]) for window in windows]
+    return {
+        "strategy_id": strategy["strategy_id"],
+        "strategy_name": strategy["strategy_name"],
+        "status": strategy["status"],
+        "lab_config": config,
+        "windows_evaluated": len(windows),
+        "positive_window_pct": as_float(
+            Decimal(sum(value > 0 for value in returns)) / Decimal(len(returns)) * 100
+        )
+        if returns
+        else None,
+        "return_pct": distribution(returns),
+        "max_drawdown_pct": distribution([float(window["max_drawdown_pct"]) for window in windows]),
+        "hit_rate_pct": distribution([float(window["hit_rate_pct"]) for window in windows]),
+        "windows": windows,
+    }
+
+
+def walk_forward_response(
+    end: date | None,
+    window_sessions: int = WALK_FORWARD_WINDOW_SESSIONS,
+    step_sessions: int | None = None,
+    strategy_id: str | None = None,
+    apply_wealthsimple_fx_fees: bool = False,
+) -> dict[str, object]:
+    strategies = read_strategies(include_retired=strategy_id is not None)
+    if strategy_id is not None:
+        strategies = [row for row in strategies if str(row["strategy_id"]) == strategy_id.casefold()]
+        if not strategies:
+            raise KeyError(strategy_id)
+    observation_cache: ObservationCache = {}
+    evaluated: list[dict[str, object]] = []
+    skipped: list[dict[str, object]] = []
+    for strategy in strategies:
+        try:
+            evaluated.append(
+                walk_forward_strategy(
+                    strategy,
+                    end,
+                    window_sessions,
+                    step_sessions,
+                    apply_wealthsimple_fx_fees,
+                    observation_cache,
+                )
+            )
+        except ValueError as exc:
+            skipped.append({"strategy_id": strategy["strategy_id"], "reason": str(exc)})
+    evaluated.sort(
+        key=lambda row: (
+            row["return_pct"]["median"] is None,
+            -(row["return_pct"]["median"] or 0),
+            str(row["strategy_id"]),
+        )
+    )
+    return {
+        "window_sessions": window_sessions,
+        "origins": f"every {step_sessions} sessions" if step_sessions else "first session of each month",
+        "strategy_start": VARIABLE_STRATEGY_START.isoformat(),
+        "method": (
+            "Each strategy is simulated once from its start. Every rolling window is then read "
+            "from that single path, using the same basis as a preview over that window: equity "
+            "before the window plus capital deployed inside it."
+        ),
+        "strategies": evaluated,
+        "skipped": skipped,
+    }
@@ -33,6 +33,7 @@ ALLOCATION_FIELDS = [
     "basket_id",
     "target_weight",
     "allocation_role",
+    "sector",
     "rationale",
 ]
 COMMAND_FIELDS = [
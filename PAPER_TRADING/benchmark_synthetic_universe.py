@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from backend.dashboard_service import DEFAULT_START, build_overview, latest_market_date  # noqa: E402
+from backend.model_portfolio_service import systematic_model_portfolio_response  # noqa: E402
+from backend.synthetic_market import use_synthetic_market, write_synthetic_market  # noqa: E402
+
+
+def timed(label: str, builder) -> float:
+    started = time.perf_counter()
+    builder()
+    elapsed = time.perf_counter() - started
+    print(f"  {label}: {elapsed:.2f}s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure overview and model-portfolio build time on generated synthetic universes."
+    )
+    parser.add_argument("sizes", nargs="*", type=int, default=[50, 200, 500], help="Synthetic ticker counts to test.")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the generated market.")
+    parser.add_argument("--to-date", help="Last synthetic session, YYYY-MM-DD. Defaults to today.")
+    parser.add_argument("--skip-model", action="store_true", help="Only time build_overview.")
+    args = parser.parse_args()
+    end = date.fromisoformat(args.to_date) if args.to_date else None
+
+    rows = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as temporary:
+            directory = Path(temporary)
+            started = time.perf_counter()
+            write_synthetic_market(directory, size, seed=args.seed, end=end)
+            print(f"{size} synthetic tickers generated in {time.perf_counter() - started:.2f}s")
+            with use_synthetic_market(directory):
+                market_end = latest_market_date()
+                overview = timed("build_overview", lambda: build_overview(DEFAULT_START, market_end))
+                model = 0.0 if args.skip_model else timed(
+                    "systematic_model_portfolio_response",
+                    lambda: systematic_model_portfolio_response(market_end, DEFAULT_START),
+                )
+        rows.append((size, overview, model))
+
+    print()
+    print("| Tickers | build_overview | model portfolio |")
+    print("| ---: | ---: | ---: |")
+    for size, overview, model in rows:
+        print(f"| {size} | {overview:.2f}s | {model:.2f}s |")
+
+
+if __name__ == "__main__":
+    main()
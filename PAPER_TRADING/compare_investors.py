@@ -9,7 +9,10 @@ from datetime import date, datetime, timezone
 from decimal import Decimal
 from pathlib import Path
 from urllib.parse import quote, urlencode
-from urllib.request import Request, urlopen
+from urllib.request import Request
+
+from backend.fx_service import fx_series
+from backend.http_transport import urlopen
 
 
 TRADES_FILE = Path(__file__).parent / "data" / "trades.csv"
@@ -122,10 +125,6 @@ def fallback_inception_price(
     return price_on_or_before(prices, trade_day)
 
 
-def exchange_rate_for_day(prices: list[PricePoint], day: date) -> PricePoint | None:
-    return price_on_or_after(prices, day) or price_on_or_before(prices, day)
-
-
 def yahoo_symbol(ticker: str, security_type: str) -> str:
     if security_type == "crypto":
         return CRYPTO_SYMBOLS[ticker]
@@ -165,9 +164,8 @@ def main() -> int:
     fx_currency, fx_prices = fetch_daily_prices("CAD=X")
     if fx_currency != "CAD":
         raise RuntimeError("unexpected CAD=X currency")
-    latest_fx = (
-        price_on_or_before(fx_prices, args.to_date) if args.to_date else fx_prices[-1]
-    )
+    fx_rates = fx_series(fx_prices)
+    latest_fx = fx_rates.on_or_before(args.to_date)
     if not latest_fx:
         raise RuntimeError("missing ending CAD/USD exchange rate")
 
@@ -199,7 +197,7 @@ def main() -> int:
                 if not inception or inception.day > latest_price.day:
                     raise ValueError("missing shared-window inception price")
                 if currency == "CAD":
-                    inception_fx = exchange_rate_for_day(fx_prices, inception.day)
+                    inception_fx = fx_rates.nearest(inception.day)
                     if not inception_fx:
                         raise ValueError("missing inception CAD/USD exchange rate")
                     quantity = amount * inception_fx.close / inception.close
@@ -223,7 +221,7 @@ def main() -> int:
             elif not inception:
                 raise ValueError("missing inception price")
             elif currency == "CAD":
-                inception_fx = exchange_rate_for_day(fx_prices, inception.day)
+                inception_fx = fx_rates.nearest(inception.day)
                 if not inception_fx:
                     raise ValueError("missing inception CAD/USD exchange rate")
                 quantity = amount * inception_fx.close / inception.close
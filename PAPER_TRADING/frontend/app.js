@@ -1867,7 +1867,7 @@ async function loadRiskCorrelation(force = false) {
   }
   const button = $("#load-risk-correlation");
   button.disabled = true;
-  $("#risk-correlation-status").textContent = "Loading and aligning top-position price histories...";
+  $("#risk-correlation-status").textContent = "Loading and aligning position price histories...";
   try {
     state.riskCorrelation = await fetchJson(`/api/wealth/correlation?${requestKey}`);
     state.riskCorrelationRequestKey = requestKey;
@@ -9,7 +9,9 @@ from datetime import date, datetime, time, timedelta, timezone
 from pathlib import Path
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+from urllib.request import Request
+
+from backend.http_transport import urlopen
 
 
 ENV_FILE = Path(__file__).parent.parent / ".env"
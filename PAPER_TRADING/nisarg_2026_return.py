@@ -8,7 +8,9 @@ from datetime import date, datetime, timezone
 from decimal import Decimal
 from pathlib import Path
 from urllib.parse import quote, urlencode
-from urllib.request import Request, urlopen
+from urllib.request import Request
+
+from backend.http_transport import urlopen
 
 
 ACTIVITIES_FILE = Path(__file__).parent / "data" / "wealthsimple_activities.csv"
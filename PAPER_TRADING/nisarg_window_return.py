@@ -8,8 +8,8 @@ from datetime import date
 from decimal import Decimal
 from pathlib import Path
 
+from backend.fx_service import FxSeries, fx_series
 from compare_investors import (
-    exchange_rate_for_day,
     fetch_daily_prices,
     price_on_or_after,
     price_on_or_before,
@@ -106,13 +106,13 @@ def usd_value(
     value: Decimal,
     currency: str,
     day: date,
-    fx_prices,
+    fx_rates: FxSeries,
 ) -> Decimal:
     if currency == "USD":
         return value
     if currency != "CAD":
         raise ValueError(f"unsupported market currency {currency}")
-    fx = exchange_rate_for_day(fx_prices, day)
+    fx = fx_rates.nearest(day)
     if not fx:
         raise ValueError(f"missing CAD/USD exchange rate for {day}")
     return value / fx.close
@@ -151,7 +151,8 @@ def calculate_window(
             window_trades.append(row)
 
     _, fx_prices = fetch_daily_prices("CAD=X")
-    latest_fx = price_on_or_before(fx_prices, end) if end else fx_prices[-1]
+    fx_rates = fx_series(fx_prices)
+    latest_fx = fx_rates.on_or_before(end)
     if not latest_fx:
         raise ValueError("missing ending CAD/USD exchange rate")
     ending_day = latest_fx.day
@@ -160,7 +161,7 @@ def calculate_window(
     for trade in window_trades:
         cash_cad = decimal(trade["net_cash_amount"])
         trade_day = date.fromisoformat(trade["transaction_date"])
-        cash_usd = usd_value(cash_cad, "CAD", trade_day, fx_prices)
+        cash_usd = usd_value(cash_cad, "CAD", trade_day, fx_rates)
         if trade["activity_sub_type"] == "BUY":
             result.buys_usd += -cash_usd
         elif trade["activity_sub_type"] == "SELL":
@@ -183,13 +184,13 @@ def calculate_window(
                 opening_quantity * opening_price.close,
                 currency,
                 opening_price.day,
-                fx_prices,
+                fx_rates,
             )
             ending_value = usd_value(
                 ending_quantity * ending_price.close,
                 currency,
                 ending_price.day,
-                fx_prices,
+                fx_rates,
             )
         except Exception as exc:
             result.warnings.append(f"{ticker}: excluded from valuation: {exc}")
@@ -10,10 +10,11 @@ from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 from pathlib import Path
-from urllib.request import Request, urlopen
+from urllib.request import Request
 
 from analyze_forward_volume_signals import average, pct_change
 from analyze_volume_spikes import DailyBar, fetch_daily_bars
+from backend.http_transport import urlopen
 from paper_trading import FIELDNAMES, TRADES_FILE
 
 
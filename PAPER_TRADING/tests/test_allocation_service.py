@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import random
 import sys
+from collections import defaultdict
 from datetime import date
+from decimal import Decimal
 from pathlib import Path
 
 
@@ -10,6 +13,8 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from backend.allocation_service import (  # noqa: E402
     UNKNOWN,
     build_allocation_response,
+    metadata_index,
+    position_columns,
     resolved_instrument_metadata,
 )
 
@@ -125,3 +130,47 @@ def test_unique_ticker_metadata_resolves_when_position_type_is_missing() -> None
     )
     assert response["metadata_coverage"]["complete_value_pct"] == 100
     assert response["allocation"]["asset_type"][0]["name"] == "stock"
+
+
+def test_columnar_rollups_match_position_walk_across_many_portfolios() -> None:
+    generator = random.Random(8)
+    tickers = ["AAA", "BBB", "RY", "NVDA", "BTCUSD", "ZZZ"]
+    portfolios = []
+    for index in range(200):
+        positions: list[dict[str, object]] = []
+        for _ in range(generator.randint(0, 12)):
+            position: dict[str, object] = {"ticker": generator.choice(tickers), "current_value": round(generator.uniform(-5, 900), 6)}
+            if generator.random() < 0.7:
+                position["security_type"] = generator.choice(["stock", "etf", "crypto", ""])
+            if generator.random() < 0.15:
+                position["sector"] = generator.choice(["Technology", "Unclassified"])
+            if generator.random() < 0.15:
+                position["currency"] = generator.choice(["usd", "CAD"])
+            positions.append(position)
+        portfolios.append(portfolio(f"P{index}", positions))
+
+    response = build_allocation_response(portfolios, METADATA, as_of=date(2026, 6, 12))
+
+    metadata = metadata_index(METADATA)
+    expected: dict[str, defaultdict[object, Decimal]] = {name: defaultdict(Decimal) for name in ("sector", "asset_type", "currency", "security")}
+    for row in portfolios:
+        for position in row["positions"]:
+            value = Decimal(str(position["current_value"]))
+            if value <= 0:
+                continue
+            ticker, asset_type = str(position["ticker"]), str(position.get("security_type") or "")
+            resolved = resolved_instrument_metadata(
+                ticker, asset_type, position, metadata.get((ticker, asset_type)) or metadata.get((ticker, "")) or {}
+            )
+            for name in ("sector", "asset_type", "currency"):
+                expected[name][resolved[name]] += value
+            expected["security"][(ticker, resolved["asset_type"])] += value
+    allocation = response["allocation"]
+    for name in ("sector", "asset_type", "currency"):
+        assert {row["name"]: row["current_value"] for row in allocation[name]} == {key: float(value) for key, value in expected[name].items()}
+    assert {(row["ticker"], row["asset_type"]): row["current_value"] for row in allocation["security"]} == {
+        key: float(value) for key, value in expected["security"].items()
+    }
+    columns = position_columns(portfolios, metadata, [])
+    assert response["position_record_count"] == len(columns.values)
+    assert len(columns.resolutions) < len(columns.values) / 10
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analyze_signal_news_grid import (
+    Observation,
+    array_money_backend,
+    build_observations,
+    observation_arrays,
+    run_grid,
+    simulate,
+    simulate_arrays,
+    strategy_grid,
+)
+from backend.compact_bars import Bar
+from backend.money_backend import MONEY_BACKEND_ENV, parity_differences
+from backend.synthetic_market import use_synthetic_market, write_synthetic_market
+
+
+def grid_observations() -> tuple[list[date], dict[date, dict[str, Observation]]]:
+    sessions = [date(2026, 3, 2) + timedelta(days=offset) for offset in range(45)]
+    observations: dict[date, dict[str, Observation]] = {}
+    for index, session in enumerate(sessions):
+        observations[session] = {
+            ticker: Observation(
+                category=(None, "fresh", "strict", "near")[(index // 3 + shift) % 4] if (index + shift) % 11 < 6 else None,
+                one_month_return=Decimal(((index * 7 + shift) % 25) - 12),
+                articles_7d=(index + shift) % 4,
+                articles_prior_7d=(index + 2 * shift) % 3,
+                close=Decimal("21.5") + Decimal((index * shift) % 17) / Decimal("3"),
+            )
+            for shift, ticker in enumerate(("AAA", "BBB", "CCC", "DDD"), start=1)
+            if (index + shift) % 13
+        }
+    return sessions, observations
+
+
+def test_dense_simulation_matches_decimal_reference_for_every_strategy() -> None:
+    sessions, observations = grid_observations()
+    arrays = observation_arrays(sessions, observations)
+    for strategy in strategy_grid():
+        expected = simulate(strategy, sessions, observations)
+        assert parity_differences(expected, simulate_arrays(strategy, arrays)) == [], strategy.label
+        assert parity_differences(
+            simulate(strategy, sessions[10:], observations),
+            simulate_arrays(strategy, arrays, 10),
+        ) == [], strategy.label
+
+
+def test_build_observations_matches_across_worker_counts(tmp_path) -> None:
+    write_synthetic_market(tmp_path, 1, seed=3, end=date(2026, 2, 27))
+    days = [date(2025, 12, 1) + timedelta(days=offset) for offset in range(90)]
+    market = tuple(Bar(day, Decimal(500 + index), Decimal(1000)) for index, day in enumerate(days) if day.weekday() < 5)
+    charts = {
+        "AAA": tuple(Bar(bar.day, Decimal(10 + index % 7), Decimal(100 * index)) for index, bar in enumerate(market)),
+        "BBB": tuple(Bar(bar.day, Decimal(40 - index % 5), Decimal(50 * index)) for index, bar in enumerate(market) if index > 30),
+    }
+    counts = {"AAA": {"2026-01-05": 3, "2026-01-12": 1}}
+
+    with use_synthetic_market(tmp_path):
+        serial = build_observations(charts, market, counts, date(2026, 2, 20))
+        parallel = build_observations(charts, market, counts, date(2026, 2, 20), workers=2)
+
+    assert serial == parallel
+    assert serial[0][0] == date(2026, 1, 1)
+    assert "BBB" not in serial[1][date(2026, 1, 2)]
+    assert serial[1][date(2026, 1, 13)]["AAA"].articles_7d == 1
+    assert serial[1][date(2026, 1, 13)]["AAA"].articles_prior_7d == 3
+
+
+def test_run_grid_resumes_from_result_file(tmp_path) -> None:
+    sessions, observations = grid_observations()
+    arrays = observation_arrays(sessions, observations)
+    results = tmp_path / "grid.jsonl"
+    strategies = strategy_grid(none_streaks=(3, 5, 8), momentum_cutoffs=(Decimal("0"), Decimal("-4")))
+
+    first = run_grid(arrays, strategies[:100], results)
+    lines = results.read_text(encoding="utf-8").splitlines()
+    marker = json.loads(lines[0])
+    marker["gain"] = 123456.0
+    lines[0] = json.dumps(marker)
+    results.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    rows = run_grid(arrays, strategies, results, workers=2)
+
+    assert len(first) == 100
+    assert len(rows) == len(strategies) == len(results.read_text(encoding="utf-8").splitlines())
+    assert {row["strategy"]: row for row in rows}[marker["strategy"]]["gain"] == 123456.0
+    assert {type(row["momentum_cutoff"]) for row in rows} == {Decimal}
+    keys = [(row["return_pct"], row["gain"]) for row in rows]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_grid_search_rejects_non_float_money_backends(monkeypatch) -> None:
+    monkeypatch.delenv(MONEY_BACKEND_ENV, raising=False)
+    assert array_money_backend().name == "float"
+    monkeypatch.setenv(MONEY_BACKEND_ENV, "float")
+    assert array_money_backend().name == "float"
+    monkeypatch.setenv(MONEY_BACKEND_ENV, "fixed")
+    with pytest.raises(ValueError, match="float64"):
+        array_money_backend()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import random
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.basket_service import aligned_closes, basket_return_series, rebalance_indexes, should_rebalance
+from backend.dashboard_service import as_float, on_or_before
+
+
+class Bar:
+    def __init__(self, day: date, close: Decimal) -> None:
+        self.day = day
+        self.close = close
+
+
+def scanned_series(
+    components: list[dict[str, object]],
+    start: date,
+    end: date | None,
+    frequency: str,
+) -> list[dict[str, object]]:
+    sessions = sorted(
+        {
+            bar.day
+            for component in components
+            for bar in component["bars"]
+            if bar.day >= start and (end is None or bar.day <= end)
+        }
+    )
+    value = Decimal("1")
+    shares: dict[str, Decimal] = {}
+
+    def rebalance(day: date) -> None:
+        shares.clear()
+        for component in components:
+            bar = on_or_before(component["bars"], day)
+            if bar and bar.close:
+                shares[str(component["ticker"])] = value * component["weight"] / bar.close
+
+    rebalance(sessions[0])
+    series: list[dict[str, object]] = []
+    previous = sessions[0]
+    for session in sessions:
+        current = Decimal("0")
+        for component in components:
+            bar = on_or_before(component["bars"], session)
+            if bar and bar.close and str(component["ticker"]) in shares:
+                current += shares[str(component["ticker"])] * bar.close
+        value = current
+        series.append(
+            {
+                "date": session.isoformat(),
+                "value": as_float(value),
+                "return_pct": as_float((value - Decimal("1")) * Decimal("100")),
+            }
+        )
+        if should_rebalance(previous, session, frequency):
+            rebalance(session)
+        previous = session
+    return series
+
+
+def random_components(count: int, seed: int) -> list[dict[str, object]]:
+    generator = random.Random(seed)
+    components: list[dict[str, object]] = []
+    for index in range(count):
+        close = Decimal(str(round(generator.uniform(10, 200), 2)))
+        first = date(2025, 11, 3) + timedelta(days=generator.randrange(0, 120))
+        bars: list[Bar] = []
+        for offset in range(260):
+            day = first + timedelta(days=offset)
+            if day.weekday() >= 5 or generator.random() < 0.05:
+                continue
+            close = max(Decimal("0.5"), close * Decimal(str(round(1 + generator.gauss(0, 0.02), 4))))
+            bars.append(Bar(day, close.quantize(Decimal("0.0001"))))
+        components.append({"ticker": f"M{index}", "asset_type": "stock", "weight": Decimal(1) / Decimal(count), "bars": tuple(bars)})
+    return components
+
+
+@pytest.mark.parametrize("frequency", ["none", "monthly", "quarterly"])
+def test_aligned_series_matches_scanned_series(frequency: str) -> None:
+    components = random_components(9, seed=len(frequency))
+    start = date(2026, 1, 15)
+    end = date(2026, 6, 30)
+
+    assert basket_return_series(components, start, end, frequency) == scanned_series(components, start, end, frequency)
+
+
+def test_closes_forward_fill_and_rebalance_at_period_starts() -> None:
+    bars = (Bar(date(2026, 1, 30), Decimal("10")), Bar(date(2026, 2, 3), Decimal("12")))
+    sessions = [date(2026, 1, 29), date(2026, 1, 30), date(2026, 2, 2), date(2026, 2, 3), date(2026, 4, 1)]
+
+    assert aligned_closes([{"bars": bars}], sessions) == [[None, Decimal("10"), Decimal("10"), Decimal("12"), Decimal("12")]]
+    assert rebalance_indexes(sessions, "monthly") == [0, 2, 4]
+    assert rebalance_indexes(sessions, "quarterly") == [0, 4]
+    assert rebalance_indexes(sessions, "none") == [0]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.chart_cache import ChartCache
+
+
+def test_concurrent_misses_share_one_load() -> None:
+    calls: list[str] = []
+    release = threading.Event()
+
+    def loader(symbol: str) -> str:
+        calls.append(symbol)
+        release.wait(2)
+        return f"{symbol}-bars"
+
+    cache = ChartCache(loader)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(cache.get, "SPY") for _ in range(8)]
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == ["SPY-bars"] * 8
+    assert calls == ["SPY"]
+    assert cache.stats()["loads"] == 1
+    assert cache.stats()["shared_waits"] == 7
+
+
+def test_refresh_swaps_value_without_blocking_readers() -> None:
+    versions = iter(["old", "new"])
+    refreshing = threading.Event()
+    release = threading.Event()
+
+    def loader(symbol: str) -> str:
+        value = next(versions)
+        if value == "new":
+            refreshing.set()
+            release.wait(2)
+        return f"{symbol}-{value}"
+
+    cache = ChartCache(loader)
+    assert cache.get("CAD=X") == "CAD=X-old"
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        refreshed = executor.submit(cache.refresh, "CAD=X")
+        refreshing.wait(2)
+        assert cache.get("CAD=X") == "CAD=X-old"
+        release.set()
+        assert refreshed.result() == "CAD=X-new"
+    assert cache.get("CAD=X") == "CAD=X-new"
+
+
+def test_failed_load_is_shared_but_not_cached() -> None:
+    attempts: list[int] = []
+
+    def loader(symbol: str) -> str:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("rate limited")
+        return symbol
+
+    cache = ChartCache(loader)
+    with pytest.raises(OSError):
+        cache.get("NVDA")
+    assert cache.get("NVDA") == "NVDA"
+    assert cache.stats()["errors"] == 1
+
+
+def test_least_recently_used_symbol_is_evicted() -> None:
+    cache = ChartCache(lambda symbol: symbol, max_entries=2)
+    cache.get("AAPL")
+    cache.get("MSFT")
+    cache.get("AAPL")
+    cache.get("NVDA")
+
+    assert cache.symbols() == ["AAPL", "NVDA"]
+
+
+def test_stale_entry_is_updated_incrementally_and_served_on_failure() -> None:
+    now = [datetime(2026, 6, 10, 15, tzinfo=timezone.utc)]
+    updates: list[str] = []
+
+    def updater(symbol: str, cached: str) -> str:
+        updates.append(cached)
+        if len(updates) == 2:
+            raise OSError("offline")
+        return f"{cached}+tail"
+
+    cache = ChartCache(
+        lambda symbol: symbol,
+        updater=updater,
+        needs_refresh=lambda symbol, fetched_at, current: current - fetched_at >= timedelta(minutes=10),
+        clock=lambda: now[0],
+    )
+    assert cache.get("SPY") == "SPY"
+    now[0] += timedelta(minutes=5)
+    assert cache.get("SPY") == "SPY"
+    now[0] += timedelta(minutes=10)
+    assert cache.get("SPY") == "SPY+tail"
+    now[0] += timedelta(minutes=10)
+    assert cache.get("SPY") == "SPY+tail"
+    assert updates == ["SPY", "SPY+tail"]
+    assert cache.stats()["errors"] == 1
+
+
+def test_byte_budget_evicts_least_recently_used_symbols() -> None:
+    cache = ChartCache(lambda symbol: symbol * 10, max_entries=None, max_bytes=25, sizeof=len)
+    cache.get("AA")
+    cache.get("BB")
+    assert cache.stats()["bytes"] == 20
+    cache.get("C")
+
+    assert cache.symbols() == ["C"]
+    assert cache.stats()["bytes"] == 10
+    assert cache.stats()["evictions"] == 2
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import sys
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.compact_bars import Bar, CompactBars, estimated_bar_tuple_bytes
+
+
+def sample_bars() -> tuple[Bar, ...]:
+    return (
+        Bar(date(2026, 6, 8), Decimal("101.25"), Decimal("1200")),
+        Bar(date(2026, 6, 9), Decimal(str(99.87999725341797)), Decimal("0")),
+        Bar(date(2026, 6, 10), Decimal("103.5"), Decimal("1500.5")),
+    )
+
+
+def test_compact_bars_round_trip_as_a_bar_tuple_view() -> None:
+    bars = sample_bars()
+    compact = CompactBars.from_bars(bars)
+
+    assert compact == bars
+    assert compact[-1] == bars[-1]
+    assert compact[-2:] == bars[-2:]
+    assert list(reversed(compact)) == list(reversed(bars))
+    assert tuple(bar for bar in compact if bar.day <= date(2026, 6, 9)) == bars[:2]
+    assert compact + (bars[0],) == bars + (bars[0],)
+    assert compact.view() == compact
+    assert compact.nbytes() < estimated_bar_tuple_bytes(compact)
+
+
+def test_spliced_replaces_overlapping_tail() -> None:
+    compact = CompactBars.from_bars(sample_bars())
+    recent = CompactBars.from_bars(
+        (
+            Bar(date(2026, 6, 10), Decimal("104"), Decimal("2000")),
+            Bar(date(2026, 6, 11), Decimal("105"), Decimal("2100")),
+        )
+    )
+
+    spliced = compact.spliced(recent)
+
+    assert [bar.day.day for bar in spliced] == [8, 9, 10, 11]
+    assert spliced[2].close == Decimal("104")
+    assert len(compact) == 3
+    assert compact.spliced(CompactBars()) is compact
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import random
 import sys
 from datetime import date, timedelta
 from pathlib import Path
 
+import pytest
+
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from backend.correlation_service import (  # noqa: E402
+    correlation_clusters,
+    correlation_lookup,
+    correlation_matrix,
     correlation_response,
     direct_overlap_response,
+    effective_number_of_bets,
     pair_correlation,
     top_positions,
 )
@@ -100,3 +107,101 @@ def test_response_preserves_missing_history_warnings() -> None:
     assert result["data_quality"]["unavailable_pair_count"] == 1
     assert any("BBB" in warning for warning in result["data_quality"]["warnings"])
     assert result["diversification_warning"]
+
+
+def reference_clusters(tickers: list[str], lookup: dict[tuple[str, str], float], threshold: float = 0.7) -> list[list[str]]:
+    groups = [[ticker] for ticker in tickers]
+
+    def linkage(left: list[str], right: list[str]) -> float | None:
+        values = [lookup[(a, b)] for a in left for b in right if (a, b) in lookup]
+        return sum(values) / len(values) if values else None
+
+    while len(groups) > 1:
+        candidates = [
+            (value, left_index, right_index)
+            for left_index in range(len(groups))
+            for right_index in range(left_index + 1, len(groups))
+            if (value := linkage(groups[left_index], groups[right_index])) is not None and value >= threshold
+        ]
+        if not candidates:
+            break
+        _, left_index, right_index = max(candidates, key=lambda item: (item[0], -item[1], -item[2]))
+        groups[left_index] = groups[left_index] + groups.pop(right_index)
+    return sorted(sorted(group) for group in groups)
+
+
+def test_matrix_matches_pairwise_and_reports_clusters() -> None:
+    generator = random.Random(7)
+    base = [generator.gauss(0, 1) for _ in range(40)]
+    series = {
+        "AAA": returns(base),
+        "BBB": returns([value + generator.gauss(0, 0.1) for value in base]),
+        "CCC": returns([generator.gauss(0, 1) for _ in range(40)], missing={3, 9}),
+        "DDD": returns([generator.gauss(0, 1) for _ in range(40)]),
+        "EEE": returns([1.0] * 40),
+    }
+    tickers = list(series)
+
+    pairs = correlation_matrix(series, tickers, minimum_observations=20)
+
+    expected = [
+        {"left": left, "right": right, **pair_correlation(series[left], series[right], 20)}
+        for index, left in enumerate(tickers)
+        for right in tickers[index + 1 :]
+    ]
+    assert pairs == expected
+
+    lookup = correlation_lookup(pairs)
+    weights = {ticker: 1.0 for ticker in tickers}
+    clusters = correlation_clusters(tickers, weights, lookup)
+
+    assert clusters[0]["tickers"] == ["AAA", "BBB"]
+    assert len(clusters) == 4
+    assert 1 < effective_number_of_bets(weights, lookup) < 5
+    assert effective_number_of_bets({"AAA": 1.0, "BBB": 1.0}, {("AAA", "BBB"): 1.0, ("BBB", "AAA"): 1.0}) == 1
+
+
+def test_response_analyzes_every_position_by_default() -> None:
+    detail = {"investor": "Wide", "positions": [{"ticker": f"T{index:03}", "current_value": index + 1} for index in range(120)]}
+
+    def loader(ticker: str, asset_type: str, start: date, end: date) -> dict[date, float]:
+        del asset_type, start, end
+        generator = random.Random(ticker)
+        price = 100.0
+        prices: dict[date, float] = {}
+        for index in range(30):
+            price *= 1 + generator.gauss(0, 0.02)
+            prices[START + timedelta(days=index)] = price
+        return prices
+
+    result = correlation_response(detail, START, START + timedelta(days=40), price_loader=loader, include_clusters=True)
+    limited = correlation_response(detail, START, START + timedelta(days=40), price_loader=loader, max_positions=12)
+
+    assert result["selected_position_count"] == 120
+    assert len(result["pairwise_correlations"]) == 120 * 119 // 2
+    assert len(result["correlation_matrix"]["correlations"]) == 120
+    assert result["effective_number_of_bets"] > 1
+    assert sum(cluster["size"] for cluster in result["clusters"]) == 120
+    assert limited["selected_position_count"] == 12
+    assert "clusters" not in limited
+
+
+def test_clusters_match_brute_force_average_linkage() -> None:
+    generator = random.Random(11)
+    tickers = [f"T{index:03d}" for index in range(60)]
+    factors = [generator.randrange(6) for _ in tickers]
+    lookup: dict[tuple[str, str], float] = {}
+    for left_index, left in enumerate(tickers):
+        for right_index in range(left_index + 1, len(tickers)):
+            if generator.random() < 0.1:
+                continue
+            value = (0.8 if factors[left_index] == factors[right_index] else 0.1) + round(generator.uniform(-0.3, 0.3), 3)
+            lookup[(left, tickers[right_index])] = lookup[(tickers[right_index], left)] = value
+
+    clusters = correlation_clusters(tickers, {ticker: 1.0 for ticker in tickers}, lookup, threshold=0.7)
+
+    assert sorted(row["tickers"] for row in clusters) == reference_clusters(tickers, lookup)
+    for row in clusters:
+        values = [lookup[(a, b)] for a in row["tickers"] for b in row["tickers"] if (a, b) in lookup]
+        expected = sum(values) / len(values) if values else None
+        assert row["average_correlation"] == (None if expected is None else pytest.approx(expected))
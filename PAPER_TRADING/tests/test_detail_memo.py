@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import sys
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.dashboard_service import (
+    VARIABLE_STRATEGY_NAME,
+    strategy_lab_detail,
+    variable_strategy_detail,
+    variable_strategy_summary,
+)
+from backend.compact_bars import Bar
+from backend.detail_memo import STATS, clear_detail_memo, detail_key
+from backend.simulation_checkpoints import CHECKPOINTS_ENV
+from backend.synthetic_market import use_synthetic_market, write_synthetic_market
+
+
+def test_builtin_summary_and_lab_preview_share_one_simulation(tmp_path, monkeypatch) -> None:
+    write_synthetic_market(tmp_path, 3, seed=5, end=date(2026, 3, 13))
+    monkeypatch.setenv(CHECKPOINTS_ENV, "0")
+    clear_detail_memo()
+    start = date(2026, 2, 17)
+
+    with use_synthetic_market(tmp_path):
+        summary = variable_strategy_summary(start, None)
+        preview = strategy_lab_detail(start, None)
+        hits = STATS["hits"]
+        clear_detail_memo()
+        fresh = variable_strategy_detail(start, None, strategy_name="strategy-lab-preview")
+
+    assert hits == 1
+    assert summary["investor"] == VARIABLE_STRATEGY_NAME
+    assert preview["investor"] == "strategy-lab-preview"
+    assert summary["return_pct"] == preview["return_pct"]
+    assert {key: value for key, value in preview.items() if key != "lab_config"} == fresh
+
+
+def test_changed_market_data_misses_the_memo(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv(CHECKPOINTS_ENV, "0")
+    clear_detail_memo()
+    start = date(2026, 2, 17)
+    results = []
+    for seed in (5, 6):
+        directory = tmp_path / str(seed)
+        write_synthetic_market(directory, 3, seed=seed, end=date(2026, 3, 13))
+        with use_synthetic_market(directory):
+            results.append(variable_strategy_detail(start, None))
+
+    assert STATS == {"hits": 0, "misses": 2}
+    assert results[0]["series"] != results[1]["series"]
+
+
+def test_memo_hits_do_not_share_nested_rows(tmp_path, monkeypatch) -> None:
+    write_synthetic_market(tmp_path, 3, seed=5, end=date(2026, 3, 13))
+    monkeypatch.setenv(CHECKPOINTS_ENV, "0")
+    clear_detail_memo()
+    start = date(2026, 2, 17)
+
+    with use_synthetic_market(tmp_path):
+        first = variable_strategy_detail(start, None)
+        expected_series = [dict(row) for row in first["series"]]
+        first["label"] = "Selector label"
+        first["market_series"] = []
+        first["series"][0]["value"] = -1
+        first["positions"].clear()
+        second = variable_strategy_detail(start, None)
+        second["series"].pop()
+        third = variable_strategy_detail(start, None)
+
+    assert STATS == {"hits": 2, "misses": 1}
+    assert "label" not in third and "market_series" not in third
+    assert third["series"] == expected_series
+    assert third["positions"]
+
+
+def test_backfilled_news_counts_change_the_key() -> None:
+    charts = {"AAA": (Bar(date(2026, 3, 2), Decimal("10"), Decimal("1")),)}
+    before = detail_key("variable-detail", {}, charts, "2026-03-02", {"AAA": {"2026-03-01": 2}})
+    after = detail_key("variable-detail", {}, charts, "2026-03-02", {"AAA": {"2026-03-01": 2, "2026-02-27": 4}})
+
+    assert before != after
+    assert before == detail_key("variable-detail", {}, charts, "2026-03-02", {"AAA": {"2026-03-01": 2}, "BBB": {"x": 1}})
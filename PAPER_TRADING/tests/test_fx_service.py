@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import random
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.compact_bars import Bar
+from backend.dashboard_service import on_or_after, on_or_before
+from backend.fx_service import (
+    WEALTHSIMPLE_FX_FEE,
+    clear_fx_series,
+    fee_adjusted,
+    forward_filled,
+    fx_series,
+    fx_series_report,
+)
+
+
+def fx_bars(seed: int = 3, first: date = date(2026, 1, 5), days: int = 90) -> tuple[Bar, ...]:
+    generator = random.Random(seed)
+    rate = 1.37
+    bars: list[Bar] = []
+    for offset in range(days):
+        day = first + timedelta(days=offset)
+        if day.weekday() >= 5 or generator.random() < 0.1:
+            continue
+        rate *= 1 + generator.gauss(0, 0.003)
+        bars.append(Bar(day, Decimal(str(round(rate, 5))), Decimal("0")))
+    return tuple(bars)
+
+
+def test_lookups_match_linear_scans() -> None:
+    bars = fx_bars()
+    series = fx_series(bars)
+    days = [bars[0].day + timedelta(days=offset) for offset in range(-3, 100)]
+
+    for day in days:
+        assert series.on_or_before(day) == on_or_before(bars, day)
+        assert series.on_or_after(day) == on_or_after(bars, day)
+        assert series.nearest(day) == (on_or_after(bars, day) or on_or_before(bars, day))
+    assert series.on_or_before(None) == bars[-1]
+    assert series.rates(days) == [bar.close if bar else None for bar in (on_or_before(bars, day) for day in days)]
+
+
+def test_columns_convert_with_per_day_arithmetic() -> None:
+    bars = fx_bars()
+    series = fx_series(bars)
+    days = [bars[0].day - timedelta(days=1), *(bar.day for bar in bars[:20])]
+    rates = series.rates(days)
+    values = [None, *(Decimal(index * 37 + 5) for index in range(20))]
+
+    assert series.to_usd(values, "USD", rates) == values
+    assert series.to_usd(values, "CAD", rates) == [
+        None if value is None else value / on_or_before(bars, day).close
+        for value, day in zip(values, days)
+    ]
+    with pytest.raises(ValueError, match="unsupported currency"):
+        series.to_usd(values, "EUR", rates)
+    assert forward_filled(bars, days) == rates
+
+
+def test_fee_adjustment_applies_to_non_cad_amounts() -> None:
+    amounts = [Decimal("100"), Decimal("250"), Decimal("40")]
+    currencies = ["USD", "CAD", "USD"]
+
+    assert fee_adjusted(amounts, currencies, False) == amounts
+    assert fee_adjusted(amounts, currencies, True) == [
+        Decimal("100") * (Decimal("1") - WEALTHSIMPLE_FX_FEE),
+        Decimal("250"),
+        Decimal("40") * (Decimal("1") - WEALTHSIMPLE_FX_FEE),
+    ]
+
+
+def test_series_is_reused_for_the_same_bars() -> None:
+    clear_fx_series()
+    bars = fx_bars()
+    first = fx_series(bars)
+
+    assert fx_series(bars) is first
+    assert fx_series(fx_bars(seed=4)) is not first
+    assert fx_series_report()["hits"] == 1
+    assert fx_series_report()["builds"] == 2
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import sys
+from email.message import Message
+from io import BytesIO
+from pathlib import Path
+from urllib.error import URLError
+from urllib.request import Request
+from urllib.response import addinfourl
+
+import pytest
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend import http_transport
+
+
+def fake_network(calls: list[str]):
+    def opener(request: Request, timeout: float = 20) -> addinfourl:
+        del timeout
+        calls.append(request.full_url)
+        headers = Message()
+        headers["Content-Type"] = "application/json; charset=utf-8"
+        return addinfourl(BytesIO(json.dumps({"url": request.full_url}).encode()), headers, request.full_url, 200)
+
+    return opener
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch) -> Path:
+    path = tmp_path / "fixtures.json.gz"
+    monkeypatch.setenv(http_transport.FIXTURE_ENV, str(path))
+    http_transport.clear_loaded_fixtures()
+    yield path
+    http_transport.clear_loaded_fixtures()
+
+
+def test_record_then_replay_runs_offline_and_ignores_volatile_params(archive, monkeypatch) -> None:
+    calls: list[str] = []
+    monkeypatch.setattr(http_transport, "network_urlopen", fake_network(calls))
+    monkeypatch.setenv(http_transport.MODE_ENV, "record")
+    url = "https://query1.finance.yahoo.com/v8/finance/chart/SPY?period1=1&period2=100&interval=1d"
+    with http_transport.urlopen(Request(url, headers={"User-Agent": "Mozilla/5.0"})) as response:
+        recorded = json.load(response)
+    http_transport.flush_fixtures()
+    http_transport.clear_loaded_fixtures()
+
+    monkeypatch.setattr(http_transport, "network_urlopen", None)
+    monkeypatch.setenv(http_transport.MODE_ENV, "replay")
+    later = "https://QUERY1.finance.yahoo.com/v8/finance/chart/SPY?interval=1d&period2=999&period1=1"
+    with http_transport.urlopen(Request(later)) as response:
+        assert response.headers.get_content_charset() == "utf-8"
+        assert json.load(response) == recorded
+    assert calls == [url]
+    assert archive.exists()
+
+
+def test_replay_without_fixture_raises_url_error(archive, monkeypatch) -> None:
+    del archive
+    monkeypatch.setenv(http_transport.MODE_ENV, "replay")
+
+    with pytest.raises(URLError):
+        http_transport.urlopen(Request("https://api.stocktwits.com/api/2/trending/symbols.json"))
+
+
+def test_request_key_redacts_secrets_and_sorts_query() -> None:
+    key = http_transport.request_key("get", "https://www.googleapis.com/youtube/v3/search?q=NVDA&key=secret")
+
+    assert key == "GET https://www.googleapis.com/youtube/v3/search?key=redacted&q=NVDA -"
+
+
+def test_unknown_mode_is_rejected(monkeypatch) -> None:
+    monkeypatch.setenv(http_transport.MODE_ENV, "offline")
+
+    with pytest.raises(ValueError):
+        http_transport.transport_mode()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.market_calendar import (
+    CONTINUOUS,
+    FX,
+    NYSE,
+    TSX,
+    chart_needs_refresh,
+    exchange_holidays,
+    is_trading_day,
+    market_phase,
+    symbol_exchange,
+)
+
+
+def eastern(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=timezone(timedelta(hours=-4)))
+
+
+def test_exchange_holidays_follow_nyse_observance_rules() -> None:
+    assert exchange_holidays(2026) == {
+        date(2026, 1, 1),
+        date(2026, 1, 19),
+        date(2026, 2, 16),
+        date(2026, 4, 3),
+        date(2026, 5, 25),
+        date(2026, 6, 19),
+        date(2026, 7, 3),
+        date(2026, 9, 7),
+        date(2026, 11, 26),
+        date(2026, 12, 25),
+    }
+    assert not is_trading_day(date(2026, 6, 6))
+    assert is_trading_day(date(2026, 6, 8))
+
+
+def test_market_phase_uses_exchange_hours() -> None:
+    day = date(2026, 6, 10)
+
+    assert market_phase(eastern(day, 9, 0)) == "pre_open"
+    assert market_phase(eastern(day, 11, 0)) == "open"
+    assert market_phase(eastern(day, 16, 5)) == "after_close"
+    assert market_phase(eastern(date(2026, 6, 13), 11, 0)) == "closed"
+
+
+def test_chart_refresh_policy_by_phase(monkeypatch) -> None:
+    monkeypatch.setenv("PAPER_TRADING_INTRADAY_REFRESH_MINUTES", "15")
+    day = date(2026, 6, 10)
+
+    assert not chart_needs_refresh(eastern(day, 10, 0), eastern(day, 10, 10))
+    assert chart_needs_refresh(eastern(day, 10, 0), eastern(day, 10, 20))
+    assert chart_needs_refresh(eastern(day, 15, 55), eastern(day, 16, 30))
+    assert not chart_needs_refresh(eastern(day, 16, 30), eastern(day, 23, 0))
+    assert not chart_needs_refresh(eastern(day, 16, 30), eastern(date(2026, 6, 11), 8, 0))
+    assert not chart_needs_refresh(eastern(date(2026, 6, 12), 16, 25), eastern(date(2026, 6, 14), 12, 0))
+    assert chart_needs_refresh(eastern(date(2026, 6, 12), 12, 0), eastern(date(2026, 6, 13), 12, 0))
+
+
+def test_tsx_holidays_move_weekend_dates_forward() -> None:
+    assert exchange_holidays(2026, TSX) == {
+        date(2026, 1, 1),
+        date(2026, 2, 16),
+        date(2026, 4, 3),
+        date(2026, 5, 18),
+        date(2026, 7, 1),
+        date(2026, 8, 3),
+        date(2026, 9, 7),
+        date(2026, 10, 12),
+        date(2026, 12, 25),
+        date(2026, 12, 28),
+    }
+    assert {date(2021, 12, 27), date(2021, 12, 28)} <= exchange_holidays(2021, TSX)
+    assert date(2023, 7, 3) in exchange_holidays(2023, TSX)
+    assert is_trading_day(date(2026, 11, 26), TSX)
+    assert not is_trading_day(date(2026, 11, 26), NYSE)
+
+
+def test_symbols_pick_their_own_session_policy(monkeypatch) -> None:
+    monkeypatch.setenv("PAPER_TRADING_CONTINUOUS_REFRESH_MINUTES", "30")
+    saturday = date(2026, 6, 13)
+    canada_day = date(2026, 7, 1)
+
+    assert [symbol_exchange(symbol) for symbol in ("SPY", "XIU.TO", "^GSPTSE", "BTC-USD", "CAD=X", "BRK-B")] == [
+        NYSE,
+        TSX,
+        TSX,
+        CONTINUOUS,
+        FX,
+        NYSE,
+    ]
+    assert market_phase(eastern(canada_day, 11, 0), TSX) == "closed"
+    assert market_phase(eastern(canada_day, 11, 0)) == "open"
+    assert chart_needs_refresh(eastern(canada_day, 10, 0), eastern(canada_day, 10, 20), symbol="SPY")
+    assert not chart_needs_refresh(eastern(canada_day, 10, 0), eastern(canada_day, 10, 20), symbol="XIU.TO")
+    assert chart_needs_refresh(eastern(date(2026, 11, 26), 11, 0), eastern(date(2026, 11, 26), 11, 20), symbol="XIU.TO")
+    assert not chart_needs_refresh(eastern(saturday, 12, 0), eastern(saturday, 12, 20), symbol="BTC-USD")
+    assert chart_needs_refresh(eastern(saturday, 12, 0), eastern(saturday, 12, 40), symbol="BTC-USD")
+    assert chart_needs_refresh(eastern(saturday, 19, 50), eastern(saturday, 20, 5), symbol="ETH-USD")
+    assert not chart_needs_refresh(eastern(saturday, 12, 0), eastern(saturday, 12, 40), symbol="SPY")
+
+
+def test_fx_pairs_refresh_through_the_week_but_not_on_weekends(monkeypatch) -> None:
+    monkeypatch.setenv("PAPER_TRADING_CONTINUOUS_REFRESH_MINUTES", "30")
+    friday, saturday, sunday, monday = (date(2026, 6, day) for day in (12, 13, 14, 15))
+
+    assert market_phase(eastern(friday, 16, 59), FX) == "open"
+    assert market_phase(eastern(saturday, 12, 0), FX) == "closed"
+    assert market_phase(eastern(sunday, 16, 59), FX) == "closed"
+    assert market_phase(eastern(sunday, 17, 0), FX) == "open"
+    assert chart_needs_refresh(eastern(monday, 2, 0), eastern(monday, 2, 40), symbol="CAD=X")
+    assert not chart_needs_refresh(eastern(monday, 2, 0), eastern(monday, 2, 20), symbol="CAD=X")
+    assert chart_needs_refresh(eastern(friday, 16, 50), eastern(friday, 17, 25), symbol="CAD=X")
+    assert not chart_needs_refresh(eastern(friday, 17, 25), eastern(saturday, 12, 0), symbol="CAD=X")
+    assert not chart_needs_refresh(eastern(friday, 17, 25), eastern(saturday, 21, 0), symbol="CAD=X")
+    assert not chart_needs_refresh(eastern(friday, 17, 25), eastern(sunday, 16, 59), symbol="CAD=X")
+    assert chart_needs_refresh(eastern(friday, 17, 25), eastern(sunday, 17, 5), symbol="CAD=X")
+    assert chart_needs_refresh(eastern(saturday, 12, 0), eastern(saturday, 12, 40), symbol="BTC-USD")
@@ -8,11 +8,13 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+from backend import model_portfolio_service
 from backend.model_portfolio_service import (
     MODEL_MAX_NAME_WEIGHT,
     MODEL_MAX_NAMES_PER_SECTOR,
     MODEL_MAX_POSITIONS,
     MODEL_MAX_SECTOR_WEIGHT,
+    MODEL_RISK_MODES,
     _average_drawdown_adjusted_weights,
     _average_drawdown_sell_point_pct,
     _asset_available,
@@ -20,7 +22,9 @@ from backend.model_portfolio_service import (
     _select_candidates,
     _target_weights,
     systematic_model_portfolio_response,
+    systematic_model_portfolio_responses,
 )
+from backend.synthetic_market import use_synthetic_market, write_synthetic_market
 
 
 class Bar:
@@ -168,3 +172,28 @@ def test_model_response_reports_selected_window_return_separately() -> None:
     assert selected["return_pct"] != selected["inception_return_pct"]
     assert selected["inception_return_pct"] == inception["inception_return_pct"]
     assert selected["selected_start_value"] != selected["initial_value"]
+
+
+def test_variants_share_candidate_scoring_and_match_single_runs(tmp_path, monkeypatch) -> None:
+    write_synthetic_market(tmp_path, 3, seed=5, end=date(2026, 3, 13))
+    monkeypatch.setattr(model_portfolio_service, "bank_of_canada_macro_context", lambda day: {"as_of": day.isoformat()})
+    calls: list[int] = []
+    scored = model_portfolio_service.live_signal
+
+    def counted_signal(bars):
+        calls.append(1)
+        return scored(bars)
+
+    monkeypatch.setattr(model_portfolio_service, "live_signal", counted_signal)
+    with use_synthetic_market(tmp_path):
+        singles = {
+            name: model_portfolio_service._systematic_model_portfolio_response(risk_mode=mode)
+            for name, mode in MODEL_RISK_MODES.items()
+        }
+        single_calls = len(calls)
+        calls.clear()
+        variants = systematic_model_portfolio_responses()
+
+    assert list(variants) == list(MODEL_RISK_MODES)
+    assert variants == singles
+    assert len(calls) * len(MODEL_RISK_MODES) == single_calls
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analyze_signal_news_grid import Observation, Strategy, simulate
+from backend.dashboard_service import (
+    MASS_CHANGE_STRATEGY_NAME,
+    allocations,
+    mass_change_assets,
+    paper_trader_detail,
+    variable_strategy_detail,
+)
+from backend.money_backend import (
+    MONEY_BACKEND_ENV,
+    FixedMoney,
+    money_backend,
+    parity_differences,
+    scaled_divide,
+)
+from backend.simulation_checkpoints import CHECKPOINTS_ENV
+from backend.synthetic_market import use_synthetic_market, write_synthetic_market
+
+
+def grid_observations() -> tuple[list[date], dict[date, dict[str, Observation]]]:
+    sessions = [date(2026, 1, 5) + timedelta(days=offset) for offset in range(40)]
+    observations: dict[date, dict[str, Observation]] = {}
+    for index, session in enumerate(sessions):
+        observations[session] = {
+            ticker: Observation(
+                category="fresh" if (index + shift) % 12 < 5 else None,
+                one_month_return=Decimal(((index * 7 + shift) % 21) - 10),
+                articles_7d=(index + shift) % 4,
+                articles_prior_7d=(index + 2 * shift) % 3,
+                close=Decimal("13.37") + Decimal(index * shift) / Decimal("7"),
+            )
+            for shift, ticker in enumerate(("AAA", "BBB", "CCC"), start=1)
+        }
+    return sessions, observations
+
+
+def test_scaled_divide_rounds_half_up() -> None:
+    assert scaled_divide(5, 2) == 3
+    assert scaled_divide(7, 3) == 2
+    assert scaled_divide(8, 3) == 3
+
+
+def test_fixed_money_round_trips_reporting_values() -> None:
+    money = FixedMoney()
+    shares = money.shares(money.amount(Decimal("1000")), money.price(Decimal("3")))
+
+    assert money.shares_to_decimal(shares) == Decimal("333.333333333")
+    assert money.shares_from_decimal(money.shares_to_decimal(shares)) == shares
+    assert money.to_decimal(money.value(shares, money.price(Decimal("3")))) == Decimal("1000.000000")
+
+
+def test_fixed_money_converts_through_exchange_rates() -> None:
+    money = FixedMoney()
+    local = money.converted(money.amount(Decimal("1000")), money.price(Decimal("1.3725")))
+
+    assert money.to_decimal(local) == Decimal("1372.500000")
+    assert money.to_decimal(money.unconverted(local, money.price(Decimal("1.3725")))) == Decimal("1000.000000")
+
+
+def test_money_backend_reads_environment(monkeypatch) -> None:
+    monkeypatch.setenv(MONEY_BACKEND_ENV, "fixed")
+    assert money_backend().name == "fixed"
+    assert money_backend("float").name == "float"
+    with pytest.raises(ValueError):
+        money_backend("binary")
+
+
+def test_parity_differences_report_paths_outside_tolerance() -> None:
+    reference = {"rows": [{"value": Decimal("100.00"), "status": "open"}]}
+
+    assert parity_differences(reference, {"rows": [{"value": 100.004, "status": "open"}]}) == []
+    assert parity_differences(reference, {"rows": [{"value": 100.5, "status": "closed"}]}) == [
+        "$.rows[0].status: 'open' != 'closed'",
+        "$.rows[0].value: 100.00 != 100.5 (tolerance 0.01)",
+    ]
+
+
+@pytest.mark.parametrize("name", ["float", "fixed"])
+def test_grid_simulation_matches_decimal_backend(name: str) -> None:
+    sessions, observations = grid_observations()
+    strategy = Strategy("fresh-only", "active", "cooling", 5, Decimal("0"))
+    reference = simulate(strategy, sessions, observations, money_backend("decimal"))
+
+    assert reference["entries"] > reference["open"] > 0
+    assert parity_differences(reference, simulate(strategy, sessions, observations, money_backend(name))) == []
+
+
+def test_variable_strategy_matches_decimal_backend(tmp_path, monkeypatch) -> None:
+    write_synthetic_market(tmp_path, 3, seed=5, end=date(2026, 3, 13))
+    monkeypatch.setenv(CHECKPOINTS_ENV, "0")
+
+    def run(name: str) -> dict[str, object]:
+        monkeypatch.setenv(MONEY_BACKEND_ENV, name)
+        return variable_strategy_detail(
+            date(2026, 2, 17),
+            None,
+            strategy_name=MASS_CHANGE_STRATEGY_NAME,
+            more_signals_exit=True,
+            universe_assets=mass_change_assets(),
+        )
+
+    with use_synthetic_market(tmp_path):
+        reference = run("decimal")
+        assert parity_differences(reference, run("fixed")) == []
+
+
+@pytest.mark.parametrize("name", ["float", "fixed"])
+def test_paper_ledger_matches_decimal_backend(name: str, tmp_path, monkeypatch) -> None:
+    write_synthetic_market(tmp_path, 3, seed=5, end=date(2026, 3, 13))
+
+    def run(backend: str) -> list[dict[str, object]]:
+        monkeypatch.setenv(MONEY_BACKEND_ENV, backend)
+        return [
+            paper_trader_detail(investor, date(2026, 1, 5), None, apply_wealthsimple_fx_fees=fees)
+            for investor in allocations()
+            for fees in (False, True)
+        ]
+
+    with use_synthetic_market(tmp_path):
+        reference = run("decimal")
+        assert any(row["positions"] for row in reference)
+        assert parity_differences(reference, run(name)) == []
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import math
+import random
+import statistics
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.compact_bars import Bar
+from backend.dashboard_service import on_or_before
+from backend.multi_benchmark_service import (
+    benchmark_window_report,
+    clear_benchmark_windows,
+    multi_benchmark_comparison,
+    multi_benchmark_overview,
+)
+from backend.returns_store import clear_returns_store
+
+
+BENCHMARKS = [
+    {"benchmark_id": "sp500", "ticker": "SPY", "name": "S&P 500", "currency": "USD"},
+    {"benchmark_id": "tsx", "ticker": "XIU.TO", "name": "TSX 60", "currency": "CAD"},
+]
+
+
+def random_bars(seed: int, first: date = date(2025, 12, 1), days: int = 140, close: float = 100.0) -> tuple[Bar, ...]:
+    generator = random.Random(seed)
+    bars: list[Bar] = []
+    for offset in range(days):
+        day = first + timedelta(days=offset)
+        if day.weekday() >= 5 or generator.random() < 0.08:
+            continue
+        close *= 1 + generator.gauss(0, 0.012)
+        bars.append(Bar(day, Decimal(str(round(close, 4))), Decimal("1000")))
+    return tuple(bars)
+
+
+BARS = {"SPY": random_bars(1), "XIU.TO": random_bars(2), "CAD=X": random_bars(9, close=1.37)}
+
+
+def loader(symbol: str) -> tuple[Bar, ...]:
+    return BARS[symbol]
+
+
+def portfolio_series(seed: int, start: date = date(2026, 1, 5), days: int = 80) -> list[dict[str, object]]:
+    generator = random.Random(seed)
+    value = 10_000.0
+    series: list[dict[str, object]] = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        if day.weekday() >= 5:
+            continue
+        value *= 1 + generator.gauss(0.0005, 0.01)
+        series.append({"date": day.isoformat(), "value": round(value, 6)})
+    return series
+
+
+def max_drawdown(levels: list[float]) -> float:
+    peak = levels[0]
+    worst = 0.0
+    for level in levels:
+        peak = max(peak, level)
+        worst = min(worst, (level / peak - 1) * 100)
+    return worst
+
+
+def test_single_pass_matches_per_benchmark_scan() -> None:
+    clear_benchmark_windows()
+    clear_returns_store()
+    series = portfolio_series(7)
+    payload = multi_benchmark_comparison(series, benchmarks=BENCHMARKS, bars_loader=loader)
+    values = [float(row["value"]) for row in series]
+    days = [date.fromisoformat(str(row["date"])) for row in series]
+    portfolio_returns = [(current / previous - 1) * 100 for previous, current in zip(values, values[1:])]
+
+    assert payload["warnings"] == []
+    assert math.isclose(payload["volatility_pct"], statistics.stdev(portfolio_returns) * math.sqrt(252), abs_tol=1e-5)
+    assert math.isclose(payload["max_drawdown_pct"], max_drawdown(values), abs_tol=1e-6)
+    rows = {row["ticker"]: row for row in payload["benchmarks"]}
+    for benchmark in BENCHMARKS:
+        ticker = str(benchmark["ticker"])
+        closes = [float(on_or_before(BARS[ticker], day).close) for day in days]
+        if benchmark["currency"] == "CAD":
+            closes = [close / float(on_or_before(BARS["CAD=X"], day).close) for close, day in zip(closes, days)]
+        benchmark_returns = [(current / previous - 1) * 100 for previous, current in zip(closes, closes[1:])]
+        relative = [(value / values[0]) / (close / closes[0]) for value, close in zip(values, closes)]
+        row = rows[ticker]
+        benchmark_return = (closes[-1] / closes[0] - 1) * 100
+
+        assert row["aligned_sessions"] == len(series) - 1
+        assert row["converted_to"] == ("USD" if benchmark["currency"] == "CAD" else None)
+        assert math.isclose(row["benchmark_return_pct"], benchmark_return, abs_tol=1e-6)
+        assert math.isclose(row["alpha_pct"], payload["portfolio_return_pct"] - benchmark_return, abs_tol=1e-5)
+        wins = sum(mine > theirs for mine, theirs in zip(portfolio_returns, benchmark_returns))
+        assert math.isclose(row["win_rate_vs_benchmark_pct"], wins / len(portfolio_returns) * 100, abs_tol=1e-6)
+        assert math.isclose(row["benchmark_volatility_pct"], statistics.stdev(benchmark_returns) * math.sqrt(252), abs_tol=1e-5)
+        active = [mine - theirs for mine, theirs in zip(portfolio_returns, benchmark_returns)]
+        assert math.isclose(row["tracking_error_pct"], statistics.stdev(active) * math.sqrt(252), abs_tol=1e-5)
+        assert math.isclose(row["benchmark_max_drawdown_pct"], max_drawdown(closes), abs_tol=1e-6)
+        assert math.isclose(row["relative_max_drawdown_pct"], max_drawdown(relative), abs_tol=1e-6)
+    assert [row["alpha_pct"] for row in payload["benchmarks"]] == sorted((row["alpha_pct"] for row in payload["benchmarks"]), reverse=True)
+
+
+def test_overview_shares_benchmark_windows_across_portfolios() -> None:
+    clear_benchmark_windows()
+    clear_returns_store()
+    details = [{"investor": f"trader-{seed}", "series": portfolio_series(seed)} for seed in range(5)]
+    payload = multi_benchmark_overview(details, benchmarks=BENCHMARKS, bars_loader=loader)
+    standalone = multi_benchmark_comparison(details[3]["series"], benchmarks=BENCHMARKS, bars_loader=loader)
+
+    assert [row["strategy_id"] for row in payload["portfolios"]] == [f"trader-{seed}" for seed in range(5)]
+    assert payload["cache"]["builds"] == len(BENCHMARKS)
+    assert payload["cache"]["hits"] == len(BENCHMARKS) * 4
+    assert payload["portfolios"][3]["benchmarks"] == standalone["benchmarks"]
+    assert benchmark_window_report()["builds"] == len(BENCHMARKS)
+
+
+def test_missing_history_becomes_warning_and_series_is_forward_filled() -> None:
+    clear_benchmark_windows()
+    clear_returns_store()
+
+    def partial_loader(symbol: str) -> tuple[Bar, ...]:
+        if symbol == "XIU.TO":
+            raise ValueError("no chart data")
+        return tuple(bar for bar in BARS["SPY"] if bar.day >= date(2026, 3, 1)) if symbol == "LATE" else BARS[symbol]
+
+    registry = [
+        *BENCHMARKS,
+        {"benchmark_id": "late", "ticker": "LATE"},
+        {"benchmark_id": "stoxx", "ticker": "EXS1.DE", "currency": "EUR"},
+    ]
+    series = portfolio_series(3)
+    payload = multi_benchmark_comparison(series, benchmarks=registry, bars_loader=partial_loader, include_series=True)
+
+    assert [row["ticker"] for row in payload["benchmarks"]] == ["SPY"]
+    assert len(payload["warnings"]) == 3
+    assert "EXS1.DE: skipped; no EUR/USD conversion is available" in payload["warnings"]
+    benchmark_series = payload["benchmarks"][0]["benchmark_series"]
+    baseline = on_or_before(BARS["SPY"], date(2026, 1, 5))
+    assert benchmark_series[0]["date"] >= "2026-01-05"
+    assert math.isclose(
+        benchmark_series[-1]["return_pct"],
+        (float(on_or_before(BARS["SPY"], date.fromisoformat(series[-1]["date"])).close) / float(baseline.close) - 1) * 100,
+        abs_tol=1e-6,
+    )
+    assert multi_benchmark_comparison(series[:1], benchmarks=registry, bars_loader=partial_loader)["benchmarks"] == []
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import sys
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend import dashboard_service, portfolio_detail_store
+from backend.compact_bars import Bar, CompactBars
+from backend.portfolio_detail_store import (
+    DETAIL_STORE_ENV,
+    clear_detail_store,
+    detail_store_report,
+    detail_store_scope,
+    stored_detail,
+)
+from backend.synthetic_market import use_synthetic_market, write_synthetic_market
+
+
+START = date(2026, 2, 2)
+END = date(2026, 3, 13)
+
+
+def counting_builder(calls: list[str], name: str):
+    def build() -> dict[str, object]:
+        calls.append(name)
+        return {"portfolio": name, "current_value": Decimal("101.5"), "series": [{"value": 1.0}]}
+
+    return build
+
+
+def test_repeat_requests_share_one_build_and_spill_to_disk(tmp_path, monkeypatch) -> None:
+    write_synthetic_market(tmp_path, 2, seed=3, end=END)
+    monkeypatch.setattr(portfolio_detail_store, "DETAIL_STORE_DIR", tmp_path / "details")
+    monkeypatch.setattr(portfolio_detail_store, "MEMORY_DETAILS", 1)
+    clear_detail_store()
+    calls: list[str] = []
+
+    with use_synthetic_market(tmp_path):
+        first = stored_detail("alpha", START, END, False, counting_builder(calls, "alpha"))
+        first["label"] = "changed by caller"
+        again = stored_detail("alpha", START, END, False, counting_builder(calls, "alpha"))
+        stored_detail("alpha", START, END, True, counting_builder(calls, "alpha-fx"))
+        spilled = stored_detail("alpha", START, END, False, counting_builder(calls, "alpha"))
+        report = detail_store_report()
+
+    assert calls == ["alpha", "alpha-fx"]
+    assert "label" not in again
+    assert spilled == {"portfolio": "alpha", "current_value": Decimal("101.5"), "series": [{"value": 1.0}]}
+    assert report["memory_hits"] == 1
+    assert report["disk_hits"] == 1
+    assert report["memory_entries"] == 1
+    assert report["disk_entries"] >= 1
+    clear_detail_store(include_disk=True)
+
+
+def test_data_changes_and_disabled_store_rebuild(tmp_path, monkeypatch) -> None:
+    write_synthetic_market(tmp_path, 2, seed=3, end=END)
+    monkeypatch.setattr(portfolio_detail_store, "DETAIL_STORE_DIR", tmp_path / "details")
+    clear_detail_store()
+    calls: list[str] = []
+
+    with use_synthetic_market(tmp_path):
+        stored_detail("alpha", START, END, False, counting_builder(calls, "alpha"))
+        universe = tmp_path / "asset_universe.csv"
+        universe.write_text(universe.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+        stored_detail("alpha", START, END, False, counting_builder(calls, "alpha"))
+        monkeypatch.setenv(DETAIL_STORE_ENV, "0")
+        stored_detail("alpha", START, END, False, counting_builder(calls, "alpha"))
+
+    assert calls == ["alpha", "alpha", "alpha"]
+    clear_detail_store(include_disk=True)
+
+
+def test_callers_get_private_nested_rows(tmp_path, monkeypatch) -> None:
+    write_synthetic_market(tmp_path, 2, seed=3, end=END)
+    monkeypatch.setattr(portfolio_detail_store, "DETAIL_STORE_DIR", tmp_path / "details")
+    monkeypatch.setattr(portfolio_detail_store, "MEMORY_DETAILS", 1)
+    clear_detail_store()
+    calls: list[str] = []
+
+    with use_synthetic_market(tmp_path):
+        first = stored_detail("alpha", START, END, False, counting_builder(calls, "alpha"))
+        first["series"][0]["value"] = -1.0
+        second = stored_detail("alpha", START, END, False, counting_builder(calls, "alpha"))
+        second["series"].append({"value": 2.0})
+        stored_detail("beta", START, END, False, counting_builder(calls, "beta"))
+        from_disk = stored_detail("alpha", START, END, False, counting_builder(calls, "alpha"))
+        from_disk["series"].clear()
+        third = stored_detail("alpha", START, END, False, counting_builder(calls, "alpha"))
+
+    assert calls == ["alpha", "beta"]
+    assert second["series"][0] == {"value": 1.0}
+    assert third["series"] == [{"value": 1.0}]
+    clear_detail_store(include_disk=True)
+
+
+def test_scope_fingerprints_once_and_code_changes_rebuild(tmp_path, monkeypatch) -> None:
+    write_synthetic_market(tmp_path, 2, seed=3, end=END)
+    monkeypatch.setattr(portfolio_detail_store, "DETAIL_STORE_DIR", tmp_path / "details")
+    clear_detail_store()
+    calls: list[str] = []
+    fetches: list[str] = []
+    fetch_chart = dashboard_service.fetch_chart
+
+    def counting_fetch(symbol: str):
+        fetches.append(symbol)
+        return fetch_chart(symbol)
+
+    monkeypatch.setattr(dashboard_service, "fetch_chart", counting_fetch)
+    with use_synthetic_market(tmp_path):
+        with detail_store_scope():
+            for name in ("alpha", "beta", "alpha"):
+                stored_detail(name, START, END, False, counting_builder(calls, name))
+            with detail_store_scope():
+                stored_detail("gamma", START, END, False, counting_builder(calls, "gamma"))
+        scoped_fetches = len(fetches)
+        monkeypatch.setattr(portfolio_detail_store, "code_fingerprint", lambda: "changed-code")
+        stored_detail("alpha", START, END, False, counting_builder(calls, "alpha"))
+
+    assert scoped_fetches == 1
+    assert calls == ["alpha", "beta", "gamma", "alpha"]
+    clear_detail_store(include_disk=True)
+
+
+def advance_chart(symbol: str) -> None:
+    currency, bars = dashboard_service.CHART_CACHE.get(symbol)
+    last = bars[-1]
+    extra = CompactBars.from_bars([Bar(date.fromordinal(last.day.toordinal() + 1), last.close * 2, last.volume)])
+    dashboard_service.CHART_CACHE.put(symbol, (currency, bars.spliced(extra)))
+
+
+def test_crypto_and_fx_refreshes_rebuild_dependent_details(tmp_path, monkeypatch) -> None:
+    write_synthetic_market(tmp_path, 2, seed=3, end=END)
+    monkeypatch.setattr(portfolio_detail_store, "DETAIL_STORE_DIR", tmp_path / "details")
+    monkeypatch.setattr(portfolio_detail_store, "MEMORY_DETAILS", 1)
+    clear_detail_store()
+    calls: list[str] = []
+
+    def builder(name: str, ticker: str, security_type: str):
+        def build() -> dict[str, object]:
+            calls.append(name)
+            return {"portfolio": name, "positions": [{"ticker": ticker, "security_type": security_type}]}
+
+        return build
+
+    with use_synthetic_market(tmp_path):
+        stored_detail("crypto", START, END, False, builder("crypto", "BTCUSD", "crypto"))
+        stored_detail("stocks", START, END, False, builder("stocks", "SYN0001", "stock"))
+        stored_detail("crypto", START, END, False, builder("crypto", "BTCUSD", "crypto"))
+        advance_chart("BTC-USD")
+        stored_detail("crypto", START, END, False, builder("crypto", "BTCUSD", "crypto"))
+        stored_detail("stocks", START, END, False, builder("stocks", "SYN0001", "stock"))
+        advance_chart("CAD=X")
+        stored_detail("stocks", START, END, False, builder("stocks", "SYN0001", "stock"))
+        report = detail_store_report()
+
+    assert calls == ["crypto", "stocks", "crypto", "stocks"]
+    assert report["disk_hits"] == 2
+    assert report["stale"] == 2
+    clear_detail_store(include_disk=True)
@@ -9,7 +9,7 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from backend.rebalance_service import rebalance_preview
+from backend.rebalance_service import optimize_all_profiles, rebalance_preview
 
 
 def balanced_current(core: float = 55, growth: float = 30, defensive: float = 15) -> list[dict[str, object]]:
@@ -52,3 +52,87 @@ def test_exact_target_moves_all_sleeves_to_target() -> None:
 def test_invalid_inputs_are_rejected(profile: str, current: list[dict[str, object]], error: str) -> None:
     with pytest.raises(ValueError, match=error):
         rebalance_preview(profile, current, Decimal("100000"))
+
+
+def proposed(response: dict[str, object]) -> dict[str, float]:
+    return {str(row["basket_id"]): float(row["proposed_weight_pct"]) for row in response["allocations"]}
+
+
+def optimized(current: list[dict[str, object]], **options) -> dict[str, object]:
+    return rebalance_preview("balanced-growth", current, Decimal("100000"), mode="optimize", **options)
+
+
+def test_optimizer_minimizes_turnover_within_bands() -> None:
+    bands = rebalance_preview("balanced-growth", balanced_current(30, 55, 15), Decimal("100000"))
+    response = optimized(balanced_current(30, 55, 15))
+
+    assert proposed(response) == {"ai-wealth-core": 49, "ai-wealth-growth": 36, "ai-wealth-defensive-income": 15}
+    assert response["estimated_one_way_turnover_pct"] == 19
+    assert response["estimated_one_way_turnover_pct"] <= bands["estimated_one_way_turnover_pct"]
+    assert response["net_dollar_change"] == 0
+    assert all(row["action"] == "hold" for row in optimized(balanced_current())["allocations"])
+
+
+def test_optimizer_routes_flows_away_from_fx_fee_sleeves() -> None:
+    current = balanced_current(30, 55, 15)
+    current[0]["currency"] = "USD"
+
+    response = optimized(current, apply_fx_fees=True)
+
+    assert proposed(response) == {"ai-wealth-core": 46, "ai-wealth-growth": 36, "ai-wealth-defensive-income": 18}
+    assert response["optimizer"]["estimated_fx_fee_dollars"] == pytest.approx(16000 * 0.015)
+    assert proposed(optimized(current)) == {"ai-wealth-core": 49, "ai-wealth-growth": 36, "ai-wealth-defensive-income": 15}
+
+
+def test_optimizer_honours_minimum_trade_size_and_sector_caps() -> None:
+    small = optimized(balanced_current(43, 36, 21), min_trade_dollars=Decimal("5000"))
+    capped = optimized(balanced_current(30, 55, 15), sector_caps={"technology": 30})
+
+    assert proposed(optimized(balanced_current(43, 36, 21))) == {"ai-wealth-core": 46, "ai-wealth-growth": 36, "ai-wealth-defensive-income": 18}
+    assert proposed(small) == {"ai-wealth-core": 48, "ai-wealth-growth": 36, "ai-wealth-defensive-income": 16}
+    assert all(abs(row["proposed_dollar_change"]) >= 5000 for row in small["allocations"] if row["action"] != "hold")
+    assert proposed(capped)["ai-wealth-growth"] == 30
+    with pytest.raises(ValueError, match="minimum trade size"):
+        optimized(balanced_current(43, 36, 21), min_trade_dollars=Decimal("40000"))
+    with pytest.raises(ValueError, match="unknown rebalance mode"):
+        rebalance_preview("balanced-growth", balanced_current(), Decimal("100000"), mode="solver")
+
+
+def test_shared_sector_cap_binds_across_sleeves() -> None:
+    current = [
+        {"basket_id": "ai-wealth-growth", "current_weight": 55},
+        {"basket_id": "ai-wealth-tactical-ai", "current_weight": 15},
+        {"basket_id": "ai-wealth-core", "current_weight": 25},
+        {"basket_id": "ai-wealth-defensive-income", "current_weight": 5},
+    ]
+
+    uncapped = rebalance_preview("ai-growth", current, Decimal("100000"), mode="optimize")
+    capped = rebalance_preview("ai-growth", current, Decimal("100000"), mode="optimize", sector_caps={"Technology": 65})
+    weights = proposed(capped)
+
+    assert all(row["action"] == "hold" for row in uncapped["allocations"])
+    assert capped["optimizer"]["sectors"]["technology"] == ["ai-wealth-growth", "ai-wealth-tactical-ai"]
+    assert weights["ai-wealth-growth"] + weights["ai-wealth-tactical-ai"] == 65
+    assert weights["ai-wealth-growth"] < 60 and weights["ai-wealth-tactical-ai"] < 18
+    assert capped["estimated_one_way_turnover_pct"] == 5
+
+
+def test_batch_optimizes_every_profile_in_one_call() -> None:
+    batch = optimize_all_profiles(
+        {
+            "Balanced-Growth": {"current_allocations": balanced_current(30, 55, 15), "portfolio_value": 100000},
+            "ai-growth": {"current_allocations": [{"basket_id": "ai-wealth-growth", "current_weight": 100}], "portfolio_value": 50000},
+            "retired": {"current_allocations": [], "portfolio_value": 1},
+        }
+    )
+    statuses = {row["profile_id"]: row["status"] for row in batch["profiles"]}
+
+    assert statuses == {
+        "capital-preservation": "missing_current_allocations",
+        "balanced-growth": "optimized",
+        "ai-growth": "optimized",
+        "opportunistic-ai": "missing_current_allocations",
+    }
+    balanced = next(row for row in batch["profiles"] if row["profile_id"] == "balanced-growth")
+    assert proposed(balanced["preview"]) == proposed(optimized(balanced_current(30, 55, 15)))
+    assert batch["warnings"] == ["unknown profile: retired"]
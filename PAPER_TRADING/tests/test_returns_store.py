@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import math
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.compact_bars import Bar
+from backend.correlation_service import close_returns
+from backend.dashboard_service import on_or_before, pct_change
+from backend.model_portfolio_service import _trailing_volatility
+from backend.returns_store import clear_returns_store, returns_store_report, symbol_returns
+
+
+def make_bars(count: int, first: date = date(2026, 1, 5)) -> tuple[Bar, ...]:
+    bars: list[Bar] = []
+    close = Decimal("100")
+    day = first
+    while len(bars) < count:
+        if day.weekday() < 5:
+            close = (close * (Decimal("1") + Decimal((len(bars) * 37) % 11 - 5) / Decimal("300"))).quantize(Decimal("0.0001"))
+            bars.append(Bar(day, close, Decimal("1000")))
+        day += timedelta(days=1)
+    return tuple(bars)
+
+
+def scanned_volatility(bars: tuple[Bar, ...]) -> Decimal:
+    closes = [Decimal(str(bar.close)) for bar in bars[-21:]]
+    if len(closes) < 6:
+        return Decimal("0")
+    returns = [float(pct_change(current, previous)) for previous, current in zip(closes, closes[1:])]
+    mean = sum(returns) / len(returns)
+    variance = sum((value - mean) ** 2 for value in returns) / (len(returns) - 1)
+    return Decimal(str(math.sqrt(variance) * math.sqrt(252)))
+
+
+def test_windows_are_views_matching_close_returns() -> None:
+    clear_returns_store()
+    bars = make_bars(60)
+    returns = symbol_returns("AAA", bars)
+    start, end = bars[10].day - timedelta(days=1), bars[40].day
+    window = returns.window(start, end)
+    prices = {bar.day: float(bar.close) for bar in bars if start <= bar.day <= end}
+
+    assert window.simple.obj is returns.simple
+    assert window.simple_by_day() == close_returns(prices)
+    assert len(window) == len(window.log) == len(window.pct) == 30
+    assert math.isclose(math.exp(sum(window.log)), float(bars[40].close) / float(bars[10].close))
+    assert all(returns.bar(bar.day + timedelta(days=offset)) == on_or_before(bars, bar.day + timedelta(days=offset)) for bar in bars[:10] for offset in (0, 1, 2))
+    assert returns.bar(bars[0].day - timedelta(days=1)) is None
+
+
+def test_trailing_volatility_matches_bar_scan() -> None:
+    bars = make_bars(40)
+    returns = symbol_returns("AAA", bars)
+
+    for count in range(0, 41):
+        assert _trailing_volatility(returns, count) == scanned_volatility(bars[:count])
+
+
+def test_store_reuses_until_prices_advance() -> None:
+    clear_returns_store()
+    bars = make_bars(30)
+    first = symbol_returns("AAA", bars)
+
+    assert symbol_returns("AAA", tuple(bars)) is first
+    advanced = symbol_returns("AAA", make_bars(31))
+
+    assert advanced is not first
+    assert len(advanced.ordinals) == 31
+    assert returns_store_report()["hits"] == 1
+    assert returns_store_report()["invalidations"] == 1
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import math
+import random
 import sys
 from datetime import date, timedelta
+from decimal import Decimal
 from pathlib import Path
 
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from backend.risk_service import portfolio_risk_response
+from backend.money_backend import parity_differences
+from backend.risk_service import portfolio_risk_response, rolling_risk_series
 
 
 def series(values: list[float]) -> list[dict[str, object]]:
@@ -59,3 +63,108 @@ def test_sector_alert_uses_current_position_values() -> None:
     response = portfolio_risk_response(detail, date(2026, 1, 1), date(2026, 1, 30))
     assert response["sector_concentration"][0]["weight_pct"] == 70
     assert any(alert["type"] == "sector_concentration" for alert in response["alerts"])
+
+
+def test_float_metrics_match_decimal_reference() -> None:
+    generator = random.Random(17)
+    value = 100_000.0
+    benchmark = 100.0
+    values: list[float] = []
+    benchmark_values: list[float] = []
+    for _ in range(756):
+        market = generator.gauss(0.0004, 0.011)
+        value *= 1 + 1.2 * market + generator.gauss(0, 0.006)
+        benchmark *= 1 + market
+        values.append(round(value, 6))
+        benchmark_values.append(round(benchmark, 6))
+    detail = {
+        "investor": "multi-year",
+        "series": series(values),
+        "positions": [
+            {"ticker": f"T{index}", "sector": "Technology" if index % 3 else "Energy", "current_value": generator.uniform(500, 9000)}
+            for index in range(40)
+        ],
+        "benchmark_comparison": {"benchmark_series": series(benchmark_values)},
+    }
+
+    exact = portfolio_risk_response(detail, date(2026, 1, 1), date(2028, 1, 26), exact=True)
+    fast = portfolio_risk_response(detail, date(2026, 1, 1), date(2028, 1, 26))
+
+    assert parity_differences(exact, fast, abs_tolerance=Decimal("0.000002"), rel_tolerance=Decimal("0.000000001")) == []
+    assert fast["metrics"]["aligned_sessions"] == 755
+    assert fast["metrics"]["longest_recovery_sessions"] == exact["metrics"]["longest_recovery_sessions"]
+
+
+def windowed_reference(values: list[float], benchmark: list[float | None], market: list[float], window: int) -> list[dict[str, object]]:
+    benchmark_returns: dict[int, float] = {}
+    previous: float | None = None
+    for offset, value in enumerate(benchmark):
+        if value is not None:
+            if previous is not None:
+                benchmark_returns[offset] = value / previous - 1
+            previous = value
+    rows: list[dict[str, object]] = []
+    for index in range(window, len(values)):
+        returns = [values[offset] / values[offset - 1] - 1 for offset in range(index - window + 1, index + 1)]
+        pairs = [
+            (values[offset] / values[offset - 1] - 1, benchmark_returns[offset])
+            for offset in range(index - window + 1, index + 1)
+            if offset in benchmark_returns
+        ]
+        markets = [market[offset] / market[offset - 1] - 1 for offset in range(index - window + 1, index + 1)]
+        mean = sum(returns) / window
+        pair_x = sum(x for x, _ in pairs) / len(pairs)
+        pair_y = sum(y for _, y in pairs) / len(pairs)
+        market_mean = sum(markets) / window
+        covariance = sum((x - mean) * (y - market_mean) for x, y in zip(returns, markets))
+        rows.append(
+            {
+                "volatility_pct": math.sqrt(sum((value - mean) ** 2 for value in returns) / (window - 1)) * math.sqrt(252) * 100,
+                "beta": sum((x - pair_x) * (y - pair_y) for x, y in pairs) / sum((y - pair_y) ** 2 for _, y in pairs),
+                "drawdown_pct": (values[index] / max(values[index - window + 1 : index + 1]) - 1) * 100,
+                "spy_correlation": covariance
+                / math.sqrt(sum((x - mean) ** 2 for x in returns) * sum((y - market_mean) ** 2 for y in markets)),
+            }
+        )
+    return rows
+
+
+def test_rolling_series_match_full_window_recalculation() -> None:
+    generator = random.Random(5)
+    values, benchmark, market = [100.0], [50.0], [400.0]
+    for _ in range(299):
+        move = generator.gauss(0.0003, 0.012)
+        values.append(values[-1] * (1 + 0.9 * move + generator.gauss(0, 0.005)))
+        benchmark.append(benchmark[-1] * (1 + move + generator.gauss(0, 0.002)))
+        market.append(market[-1] * (1 + move))
+    gapped: list[float | None] = [None if index in {40, 41, 120} else value for index, value in enumerate(benchmark)]
+    benchmark_rows = [row for row, value in zip(series(benchmark), gapped) if value is not None]
+
+    rolling = rolling_risk_series(series(values), benchmark_rows, series(market))
+
+    assert [entry["window_sessions"] for entry in rolling] == [21, 63]
+    for entry in rolling:
+        window = entry["window_sessions"]
+        reference = windowed_reference(values, gapped, market, window)
+        assert len(entry["series"]) == len(reference) == len(values) - window
+        assert entry["series"][0]["date"] == series(values)[window]["date"]
+        for row, expected in zip(entry["series"], reference):
+            for key, value in expected.items():
+                assert math.isclose(row[key], value, rel_tol=1e-6, abs_tol=2e-6), (window, row["date"], key)
+
+
+def test_rolling_series_is_optional_and_handles_flat_history() -> None:
+    detail = {
+        "investor": "cash",
+        "series": series([100.0] * 30),
+        "positions": [],
+        "benchmark_comparison": {"benchmark_series": series([100 + index for index in range(30)])},
+    }
+
+    assert "rolling_series" not in portfolio_risk_response(detail, date(2026, 1, 1), date(2026, 1, 30))
+    rolling = portfolio_risk_response(detail, date(2026, 1, 1), date(2026, 1, 30), rolling=True)["rolling_series"]
+
+    assert rolling[1]["series"] == []
+    assert {(row["volatility_pct"], row["beta"], row["drawdown_pct"], row["spy_correlation"]) for row in rolling[0]["series"]} == {
+        (0.0, 0.0, 0.0, None)
+    }
@@ -1,12 +1,28 @@
 from __future__ import annotations
 
+import math
+import random
 import sys
+from datetime import date, timedelta
+from decimal import Decimal
 from pathlib import Path
 
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from backend.scenario_service import scenario_response  # noqa: E402
+from backend import dashboard_service  # noqa: E402
+from backend.compact_bars import Bar  # noqa: E402
+from backend.scenario_service import (  # noqa: E402
+    HISTORICAL_STRESS_WINDOWS,
+    bootstrap_outcomes,
+    clear_archived_returns,
+    default_returns_loader,
+    equity_sessions,
+    historical_stress_replay,
+    joint_return_history,
+    scenario_response,
+    worst_drawdown_windows,
+)
 
 
 def scenario(payload: dict[str, object], scenario_id: str) -> dict[str, object]:
@@ -84,3 +100,217 @@ def test_supplied_weights_are_normalized_from_values_with_warning() -> None:
     broad = next(row for row in response["scenarios"] if row["scenario_id"] == "broad-equity-down-20")
     assert broad["estimated_impact_pct"] == -20
     assert any("weights total 60.00%" in warning for warning in response["data_quality"]["warnings"])
+
+
+def synthetic_loader(drifts: dict[str, float], sessions: int = 250):
+    def load(ticker: str, asset_type: str, start: date, end: date) -> dict[date, float]:
+        del asset_type
+        generator = random.Random(ticker)
+        days = equity_sessions(start, end)[-sessions - 1 : -1]
+        return {
+            day: drifts[ticker] + generator.gauss(0, 0.01)
+            for index, day in enumerate(days)
+            if ticker != "SHORT" or index >= sessions - 30
+        }
+
+    return load
+
+
+def simulated(payload: dict[str, object], loader, **options) -> dict[str, object]:
+    return scenario_response(payload, simulate=True, returns_loader=loader, **options)
+
+
+def test_bootstrap_is_seeded_and_independent_of_worker_count() -> None:
+    growth = [math.log1p(random.Random(3).gauss(0.0005, 0.012)) for _ in range(400)]
+
+    serial = bootstrap_outcomes(growth, paths=2500, seed=11)
+    parallel = bootstrap_outcomes(growth, paths=2500, seed=11, workers=2)
+
+    assert len(serial) == 2500
+    assert parallel == serial
+    assert bootstrap_outcomes(growth, paths=2500, seed=12) != serial
+    constant = bootstrap_outcomes([math.log1p(0.001)] * 100, paths=10, horizon_sessions=21, block_sessions=5)
+    assert all(math.isclose(outcome, 1.001**21 - 1) for outcome in constant)
+
+
+def test_simulation_reports_tail_risk_next_to_linear_scenarios() -> None:
+    payload = {
+        "as_of": "2026-06-11",
+        "positions": [
+            {"ticker": "AAA", "current_value": 600, "asset_type": "stock", "sector": "Technology", "currency": "USD"},
+            {"ticker": "BBB", "current_value": 300, "asset_type": "stock", "sector": "Financials", "currency": "USD"},
+            {"ticker": "SHORT", "current_value": 100, "asset_type": "stock", "sector": "Energy", "currency": "USD"},
+        ],
+    }
+    loader = synthetic_loader({"AAA": 0.001, "BBB": -0.0005, "SHORT": 0.0})
+
+    response = simulated(payload, loader, paths=2000, seed=5)
+    simulation = response["simulation"]
+
+    assert len(response["scenarios"]) == 5
+    assert simulation == simulated(payload, loader, paths=2000, seed=5)["simulation"]
+    assert simulation["modelled_tickers"] == ["AAA", "BBB"]
+    assert simulation["modelled_value"] == 900
+    assert simulation["history_sessions"] == 250
+    assert sum(row["paths"] for row in simulation["histogram"]) == 2000
+    percentiles = [row["return_pct"] for row in simulation["percentiles"]]
+    assert percentiles == sorted(percentiles)
+    ninety_five, ninety_nine = simulation["tail_risk"]
+    assert 0 < ninety_five["value_at_risk_pct"] <= ninety_five["conditional_value_at_risk_pct"]
+    assert ninety_five["value_at_risk_pct"] <= ninety_nine["value_at_risk_pct"] <= ninety_nine["conditional_value_at_risk_pct"]
+    assert math.isclose(ninety_five["value_at_risk_dollars"], ninety_five["value_at_risk_pct"] / 100 * 900)
+    assert any("SHORT: only 30 daily returns" in warning for warning in response["data_quality"]["warnings"])
+    assert any("covers 90.00%" in warning for warning in response["data_quality"]["warnings"])
+
+
+def test_simulation_is_skipped_without_enough_joint_history() -> None:
+    payload = {"as_of": "2026-06-11", "positions": [{"ticker": "SHORT", "current_value": 100, "asset_type": "stock"}]}
+
+    response = simulated(payload, synthetic_loader({"SHORT": 0.0}))
+
+    assert response["simulation"] is None
+    assert any("0 jointly observed sessions" in warning for warning in response["data_quality"]["warnings"])
+    assert scenario_response(payload)["simulation"] is None
+
+
+def test_joint_history_folds_weekend_crypto_moves_into_the_next_session() -> None:
+    days = [date(2026, 3, 2) + timedelta(days=offset) for offset in range(140)]
+
+    def loader(ticker: str, asset_type: str, start: date, end: date) -> dict[date, float]:
+        if ticker == "BTCUSD":
+            return {day: -0.05 if day.weekday() >= 5 else 0.0 for day in days}
+        return {day: 0.0 for day in days if day.weekday() < 5}
+
+    positions = [
+        {"ticker": "AAA", "current_value": 500, "asset_type": "stock"},
+        {"ticker": "BTCUSD", "current_value": 500, "asset_type": "crypto"},
+    ]
+    sessions, growth, tickers, _ = joint_return_history(positions, days[0], days[-1], loader)
+
+    assert tickers == ["AAA", "BTCUSD"]
+    assert all(day.weekday() < 5 for day in sessions)
+    assert date(2026, 5, 25) not in sessions
+    assert math.isclose(dict(zip(sessions, growth))[date(2026, 5, 26)], math.log(1 + 0.5 * (0.95**2 - 1)))
+    previous = days[0] - timedelta(days=1)
+    for session, value in zip(sessions, growth):
+        weekend_days = sum(previous < day <= session and day.weekday() >= 5 for day in days)
+        assert math.isclose(value, math.log(1 + 0.5 * (0.95**weekend_days - 1)), abs_tol=1e-12)
+        previous = session
+    assert sum(growth) < 0
+
+
+def business_days(first: date, count: int) -> list[date]:
+    days: list[date] = []
+    day = first
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def test_worst_drawdown_windows_are_deepest_peak_to_trough_episodes() -> None:
+    days = business_days(date(2026, 1, 5), 9)
+    moves = [0.01, -0.05, -0.05, 0.2, -0.02, 0.03, -0.10, 0.02, 0.01]
+
+    windows = worst_drawdown_windows(dict(zip(days, moves)), count=2)
+
+    assert [(row["start"], row["end"]) for row in windows] == [(days[5], days[6]), (days[0], days[2])]
+    assert windows[0]["name"] == "SPY drawdown #1 (-10.00%)"
+
+
+def test_stress_replay_batches_holdings_across_portfolios_and_windows() -> None:
+    days = business_days(date(2026, 1, 5), 60)
+    history = {
+        "SPY": {day: (-0.02 if 20 < index <= 25 else 0.004) for index, day in enumerate(days)},
+        "AAA": {day: (-0.03 if 20 < index <= 25 else 0.002) for index, day in enumerate(days)},
+        "BBB": {day: 0.001 for day in days},
+        "NEW": {day: -0.5 for day in days[40:]},
+    }
+    calls: list[str] = []
+
+    def loader(ticker: str, asset_type: str, start: date, end: date) -> dict[date, float]:
+        calls.append(ticker)
+        return {day: value for day, value in history[ticker].items() if start <= day <= end}
+
+    named = ({"window_id": "pre-history", "name": "Before cache", "start": date(2020, 2, 19), "end": date(2020, 3, 23)},)
+    details = [
+        {"label": "Growth", "positions": [{"ticker": "AAA", "current_value": 750}, {"ticker": "BBB", "current_value": 250}]},
+        {"label": "Mixed", "positions": [{"ticker": "AAA", "current_value": 500}, {"ticker": "NEW", "current_value": 500}]},
+    ]
+
+    replay = historical_stress_replay(details, days[-1], returns_loader=loader, windows=named, worst_windows=1)
+
+    assert sorted(calls) == ["AAA", "BBB", "NEW", "SPY"]
+    assert [row["window_id"] for row in replay["windows"]] == ["pre-history", "spy-drawdown-1"]
+    assert (replay["windows"][1]["start"], replay["windows"][1]["end"]) == (days[20].isoformat(), days[25].isoformat())
+    growth, mixed = (row["windows"] for row in replay["portfolios"])
+    assert growth[0]["status"] == mixed[0]["status"] == "unavailable"
+    assert math.isclose(growth[1]["market_return_pct"], (0.98**5 - 1) * 100)
+    assert math.isclose(growth[1]["return_pct"], (0.75 * (0.97**5 - 1) + 0.25 * (1.001**5 - 1)) * 100)
+    assert math.isclose(growth[1]["dollar_impact"], growth[1]["return_pct"] / 100 * 1000)
+    assert growth[1]["status"] == "complete"
+    assert mixed[1]["status"] == "partial"
+    assert mixed[1]["covered_weight_pct"] == 50
+    assert math.isclose(mixed[1]["return_pct"], 0.5 * (0.97**5 - 1) * 100)
+    assert math.isclose(mixed[1]["max_drawdown_pct"], mixed[1]["worst_point_return_pct"])
+    assert any("earlier named windows" in warning for warning in replay["warnings"])
+
+
+def test_stress_replay_coverage_does_not_depend_on_crypto_in_the_batch() -> None:
+    days = [date(2026, 1, 5) + timedelta(days=offset) for offset in range(84)]
+    sessions = [day for day in days if day.weekday() < 5]
+    history = {
+        "SPY": {day: (-0.02 if 20 < index <= 25 else 0.004) for index, day in enumerate(sessions)},
+        "AAA": {day: (-0.03 if 20 < index <= 25 else 0.002) for index, day in enumerate(sessions)},
+        "BTCUSD": {day: -0.01 if day.weekday() >= 5 else 0.0 for day in days},
+    }
+
+    def loader(ticker: str, asset_type: str, start: date, end: date) -> dict[date, float]:
+        return {day: value for day, value in history[ticker].items() if start <= day <= end}
+
+    stocks = {"label": "Stocks", "positions": [{"ticker": "AAA", "current_value": 1000}]}
+    crypto = {"label": "Crypto", "positions": [{"ticker": "BTCUSD", "asset_type": "crypto", "current_value": 1000}]}
+
+    alone = historical_stress_replay([stocks], sessions[-1], returns_loader=loader, windows=(), worst_windows=1)
+    mixed = historical_stress_replay([stocks, crypto], sessions[-1], returns_loader=loader, windows=(), worst_windows=1)
+
+    stock_window = alone["portfolios"][0]["windows"][0]
+    assert stock_window["status"] == "complete"
+    assert mixed["portfolios"][0]["windows"][0] == stock_window
+    assert mixed["windows"] == alone["windows"]
+    crypto_window = mixed["portfolios"][1]["windows"][0]
+    weekend_days = sum(sessions[20] < day <= sessions[25] and day.weekday() >= 5 for day in days)
+    assert crypto_window["status"] == "complete"
+    assert math.isclose(crypto_window["return_pct"], (0.99**weekend_days - 1) * 100)
+
+
+def test_default_loader_stitches_archived_history_for_named_windows(monkeypatch) -> None:
+    clear_archived_returns()
+    days = [day for day in (date(2019, 12, 2) + timedelta(days=offset) for offset in range(2400)) if day.weekday() < 5]
+    bars = tuple(Bar(day, Decimal(str(round(100 * 1.0004**index, 4))), Decimal("1")) for index, day in enumerate(days))
+    recent = tuple(bar for bar in bars if bar.day >= dashboard_service.FETCH_START)
+    downloads: list[tuple[str, date]] = []
+
+    def download_chart(symbol: str, start: date = dashboard_service.FETCH_START):
+        downloads.append((symbol, start))
+        return "USD", tuple(bar for bar in bars if bar.day >= start)
+
+    monkeypatch.setattr(dashboard_service, "download_chart", download_chart)
+    monkeypatch.setattr(dashboard_service, "fetch_chart", lambda symbol: ("USD", recent))
+    as_of = days[-1]
+    covid = [window for window in HISTORICAL_STRESS_WINDOWS if window["window_id"] == "covid-crash-2020"]
+    replay = historical_stress_replay(
+        [{"label": "Index", "positions": [{"ticker": "SPY", "asset_type": "etf", "current_value": 100}]}],
+        as_of,
+        windows=tuple(covid),
+        worst_windows=0,
+    )
+    stitched = default_returns_loader("SPY", "etf", date(2025, 11, 3), date(2025, 12, 31))
+
+    assert replay["portfolios"][0]["windows"][0]["status"] == "complete"
+    assert math.isclose(replay["windows"][0]["market_return_pct"], (1.0004 ** replay["windows"][0]["sessions"] - 1) * 100, rel_tol=1e-4)
+    assert min(stitched) < dashboard_service.FETCH_START < max(stitched)
+    assert all(math.isclose(value, 0.0004, abs_tol=1e-5) for value in stitched.values())
+    assert downloads == [("SPY", date(2015, 1, 1))]
+    clear_archived_returns()
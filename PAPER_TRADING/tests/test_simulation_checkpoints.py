@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend import simulation_checkpoints
+from backend.compact_bars import Bar
+from backend.detail_memo import clear_detail_memo
+from backend.dashboard_service import MASS_CHANGE_STRATEGY_NAME, mass_change_assets, variable_strategy_detail
+from backend.simulation_checkpoints import SimulationCheckpoints, checkpoint_dates, data_fingerprints
+from backend.synthetic_market import use_synthetic_market, write_synthetic_market
+
+
+def weekday_sessions(start: date, end: date) -> list[date]:
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    return [day for day in days if day.weekday() < 5]
+
+
+def test_checkpoint_dates_cover_bom_mid_and_eom() -> None:
+    assert checkpoint_dates(date(2026, 2, 10), date(2026, 3, 15)) == [
+        ("Mid-month", date(2026, 2, 15)),
+        ("EOM", date(2026, 2, 28)),
+        ("BOM", date(2026, 3, 1)),
+        ("Mid-month", date(2026, 3, 15)),
+    ]
+
+
+def test_fingerprint_only_covers_history_through_each_boundary() -> None:
+    days = weekday_sessions(date(2026, 3, 2), date(2026, 3, 31))
+    bars = tuple(Bar(day, Decimal(index + 10), Decimal(100)) for index, day in enumerate(days))
+    early, late = date(2026, 3, 13), date(2026, 3, 31)
+    base = data_fingerprints({"AAA": bars}, {"AAA": {"2026-03-10": 2}}, [early, late])
+    revised_tail = bars[:-1] + (Bar(bars[-1].day, Decimal("99"), Decimal(100)),)
+    revised = data_fingerprints({"AAA": revised_tail}, {"AAA": {"2026-03-10": 2, "2026-03-20": 5}}, [early, late])
+
+    assert revised[early] == base[early]
+    assert revised[late] != base[late]
+
+
+def test_resume_uses_nearest_checkpoint_at_or_before_start(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(simulation_checkpoints, "CHECKPOINT_DIR", tmp_path)
+    simulation_checkpoints.clear_memory_checkpoints()
+    sessions = weekday_sessions(date(2026, 2, 2), date(2026, 4, 30))
+    config = {"entry_usd": Decimal("1000")}
+
+    writer = SimulationCheckpoints("test", config, sessions, {})
+    for index, session in enumerate(sessions):
+        previous = sessions[index - 1] if index else None
+        writer.record(
+            session,
+            lambda: {"session": previous.isoformat(), "deployed": Decimal("1000") * index},
+        )
+    simulation_checkpoints.clear_memory_checkpoints()
+
+    reader = SimulationCheckpoints("test", config, sessions, {})
+    state = reader.resume(date(2026, 3, 20))
+    assert reader.resumed_from == date(2026, 3, 15)
+    assert state["session"] == "2026-03-13"
+    assert state["deployed"] == Decimal("1000") * sessions.index(date(2026, 3, 13)) + Decimal("1000")
+    assert SimulationCheckpoints("test", {"entry_usd": Decimal("500")}, sessions, {}).resume(date(2026, 3, 20)) is None
+
+
+def test_resumed_strategy_matches_full_replay(tmp_path, monkeypatch) -> None:
+    write_synthetic_market(tmp_path, 4, seed=5, end=date(2026, 5, 29))
+    monkeypatch.setattr(simulation_checkpoints, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+    simulation_checkpoints.clear_memory_checkpoints()
+
+    def run(start: date) -> dict[str, object]:
+        return variable_strategy_detail(
+            start,
+            None,
+            strategy_name=MASS_CHANGE_STRATEGY_NAME,
+            more_signals_exit=True,
+            universe_assets=mass_change_assets(),
+        )
+
+    with use_synthetic_market(tmp_path):
+        monkeypatch.setenv(simulation_checkpoints.CHECKPOINTS_ENV, "0")
+        expected = run(date(2026, 4, 20))
+        monkeypatch.setenv(simulation_checkpoints.CHECKPOINTS_ENV, "1")
+        run(date(2026, 1, 1))
+        simulation_checkpoints.clear_memory_checkpoints()
+        clear_detail_memo()
+        resumed = run(date(2026, 4, 20))
+
+    assert list((tmp_path / "checkpoints").glob("variable__2026-04-15__*.json"))
+    assert resumed == expected
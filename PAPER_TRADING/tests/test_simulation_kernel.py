@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend import dashboard_service, day_rotation_service, model_portfolio_service
+from backend.compact_bars import Bar
+from backend.dashboard_service import on_or_before
+from backend.simulation_checkpoints import CHECKPOINTS_ENV
+from backend.simulation_kernel import SessionPrices, rebalance_orders
+from backend.synthetic_market import use_synthetic_market, write_synthetic_market
+
+
+PARITY_START = date(2026, 2, 17)
+PARITY_STRATEGIES = {
+    "variable": (
+        lambda: dashboard_service.variable_strategy_detail(
+            PARITY_START,
+            None,
+            strategy_name=dashboard_service.MASS_CHANGE_STRATEGY_NAME,
+            more_signals_exit=True,
+            universe_assets=dashboard_service.mass_change_assets(),
+        ),
+        "0edef274c8b6d298",
+    ),
+    "analysis-driven": (
+        lambda: dashboard_service.analysis_driven_strategy_detail(PARITY_START, None),
+        "7f225245d722f27b",
+    ),
+    "master": (
+        lambda: dashboard_service.master_portfolio_detail(PARITY_START, None),
+        "9c62583402d739f9",
+    ),
+    "buy-only": (
+        lambda: dashboard_service.variable_buy_only_detail(PARITY_START, None),
+        "df7c843a2030e1dd",
+    ),
+    "model": (
+        lambda: model_portfolio_service.systematic_model_portfolio_response(None, PARITY_START),
+        "8b2774a17006e086",
+    ),
+    "model-v2": (
+        lambda: model_portfolio_service.systematic_model_portfolio_v2_response(None, PARITY_START),
+        "220b8e98c7421c98",
+    ),
+    "model-v3": (
+        lambda: model_portfolio_service.systematic_model_portfolio_v3_response(None, PARITY_START),
+        "db82e7a66cf790fe",
+    ),
+    "model-v4": (
+        lambda: model_portfolio_service.systematic_model_portfolio_v4_response(None, PARITY_START),
+        "dd312249021f0637",
+    ),
+    "daily-rotation": (
+        lambda: day_rotation_service.daily_rotation_portfolio_response(None),
+        "8e63834467cdaeb1",
+    ),
+}
+
+
+def output_digest(payload: dict[str, object]) -> str:
+    stable = {key: value for key, value in payload.items() if key != "macro_context"}
+    return hashlib.sha1(json.dumps(stable, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+@pytest.fixture(scope="module")
+def synthetic_market(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("kernel-parity")
+    write_synthetic_market(directory, 3, seed=5, end=date(2026, 3, 13))
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv(CHECKPOINTS_ENV, "0")
+        with use_synthetic_market(directory):
+            yield directory
+
+
+@pytest.mark.parametrize("name", sorted(PARITY_STRATEGIES))
+def test_strategy_output_is_pinned(synthetic_market, name: str) -> None:
+    build, expected = PARITY_STRATEGIES[name]
+
+    assert output_digest(build()) == expected
+
+
+def test_session_prices_match_linear_lookup() -> None:
+    days = [date(2026, 3, 2) + timedelta(days=offset) for offset in range(20)]
+    bars = tuple(Bar(day, Decimal(index + 1), Decimal(10)) for index, day in enumerate(days) if day.weekday() < 5)
+    prices = SessionPrices({"AAA": bars}, days[5:15])
+
+    for day in [date(2026, 3, 1), *days, date(2026, 4, 1)]:
+        assert prices.bar("AAA", day) == on_or_before(bars, day)
+        assert prices.history("AAA", day) == tuple(bar for bar in bars if bar.day <= day)
+
+
+def test_rebalance_orders_sell_first_and_respect_band() -> None:
+    holdings = {"AAA": {"shares": Decimal("10")}, "BBB": {"shares": Decimal("5")}}
+    values = {"AAA": Decimal("500"), "BBB": Decimal("480")}
+    weights = {"AAA": Decimal("0.51"), "CCC": Decimal("0.40")}
+
+    orders = rebalance_orders(holdings, weights, values, Decimal("1000"), Decimal("0.03"), {})
+
+    assert [(order.ticker, order.action, order.usd_amount) for order in orders] == [
+        ("BBB", "sell", Decimal("480")),
+        ("CCC", "buy", Decimal("400.00")),
+    ]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.dashboard_service import strategy_lab_detail
+from backend.simulation_checkpoints import CHECKPOINTS_ENV
+from backend.strategy_lab_service import (
+    iter_strategy_lab_batch,
+    strategy_lab_batch_response,
+    strategy_lab_configs,
+)
+from backend.synthetic_market import use_synthetic_market, write_synthetic_market
+
+
+def test_grid_expands_defaults_and_deduplicates_explicit_configs() -> None:
+    configs = strategy_lab_configs(
+        {
+            "configs": [{"entry_signal_rule": "FRESH", "universe": "mass-change"}],
+            "grid": {"entry_signal_rule": ["fresh", "strict"], "exit_rule": "all", "universe": ["mass-change"]},
+        }
+    )
+
+    assert len(configs) == 12
+    assert configs[0] == {
+        "entry_signal_rule": "fresh",
+        "entry_news_rule": "ignore",
+        "exit_rule": "signal-disappears",
+        "universe": "mass-change",
+    }
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {},
+        {"configs": [{"exit_rule": "never"}]},
+        {"grid": {"sizing": ["equal"]}},
+        {"grid": {"entry_signal_rule": "fresh"}},
+        {"grid": {field: "all" for field in ("entry_signal_rule", "entry_news_rule", "exit_rule", "universe")}, "configs": [{"universe": "x"}]},
+    ],
+)
+def test_invalid_batch_payloads_raise_value_error(payload: dict[str, object]) -> None:
+    with pytest.raises(ValueError):
+        strategy_lab_configs(payload)
+
+
+def test_batch_matches_single_runs_and_ranks_by_return(tmp_path, monkeypatch) -> None:
+    write_synthetic_market(tmp_path, 3, seed=5, end=date(2026, 3, 13))
+    monkeypatch.setenv(CHECKPOINTS_ENV, "0")
+    payload = {
+        "grid": {
+            "entry_signal_rule": ["any", "fresh-or-strict"],
+            "exit_rule": ["signal-disappears", "technical-deterioration"],
+            "universe": ["mass-change"],
+        }
+    }
+    start = date(2026, 2, 17)
+
+    with use_synthetic_market(tmp_path):
+        configs = strategy_lab_configs(payload)
+        streamed = list(iter_strategy_lab_batch(start, None, configs, workers=2))
+        batch = strategy_lab_batch_response(start, None, payload)
+        singles = {
+            " | ".join(config.values()): strategy_lab_detail(start, None, **config)
+            for config in configs
+        }
+
+    assert len(streamed) == batch["config_count"] == 4
+    assert batch["failed"] == []
+    assert [row["rank"] for row in batch["results"]] == [1, 2, 3, 4]
+    returns = [row["return_pct"] for row in batch["results"]]
+    assert returns == sorted(returns, reverse=True)
+    for row in batch["results"]:
+        single = singles[row["label"]]
+        assert row["return_pct"] == single["return_pct"]
+        assert row["trade_cycles"] == single["trade_cycles"]
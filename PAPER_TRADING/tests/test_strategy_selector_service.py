@@ -101,3 +101,17 @@ def test_blend_respects_tactical_caps_and_is_read_only() -> None:
     tactical = sum(row["target_weight_pct"] for row in payload["draft_blend"] if row["sleeve"] != "core_policy")
     assert tactical <= 40
     assert payload["data_quality"]["write_behavior"] == "read_only_no_orders"
+
+
+def test_rolling_risk_is_attached_only_when_requested() -> None:
+    candidate = detail("systematic-model-portfolio", return_pct=25, alpha_pct=10, drawdown_pct=-6, points=70)
+    candidate["benchmark_comparison"]["benchmark_series"] = [
+        {"date": row["date"], "value": 100 + (index % 7)} for index, row in enumerate(candidate["series"])
+    ]
+
+    assert "rolling_risk" not in response(candidate)["ranked_strategies"][0]
+    payload = strategy_selector_response(date(2026, 1, 31), date(2026, 6, 5), [candidate], include_rolling_risk=True)
+    rolling = payload["ranked_strategies"][0]["rolling_risk"]
+
+    assert [(entry["window_sessions"], len(entry["series"])) for entry in rolling] == [(21, 49), (63, 7)]
+    assert all(row["spy_correlation"] is not None for entry in rolling for row in entry["series"])
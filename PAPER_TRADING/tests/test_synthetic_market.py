@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import sys
+from datetime import date
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.dashboard_service import CHART_CACHE, chart_cache_report, fetch_chart, mass_change_assets
+from backend.news_strategy import load_daily_news_counts
+from backend.synthetic_market import synthetic_bars, use_synthetic_market, write_synthetic_market
+from backend.universe_service import read_asset_universe
+
+
+def test_synthetic_bars_are_deterministic_weekday_sessions() -> None:
+    first = synthetic_bars("SYN0001", date(2026, 1, 1), date(2026, 2, 27), seed=3)
+    second = synthetic_bars("SYN0001", date(2026, 1, 1), date(2026, 2, 27), seed=3)
+
+    assert first == second
+    assert len(first) == 42
+    assert all(bar.day.weekday() < 5 and bar.close > 0 and bar.volume >= 0 for bar in first)
+    assert synthetic_bars("SYN0002", date(2026, 1, 1), date(2026, 2, 27), seed=3) != first
+
+
+def test_synthetic_market_loads_through_existing_interfaces(tmp_path) -> None:
+    write_synthetic_market(tmp_path, 3, seed=11, end=date(2026, 3, 31))
+
+    with use_synthetic_market(tmp_path):
+        currency, bars = fetch_chart("SYN0002")
+        _, market = fetch_chart("SPY")
+        counts = load_daily_news_counts()
+        watchlist = mass_change_assets()
+        universe = {row["ticker"] for row in read_asset_universe()}
+
+    assert currency == "USD"
+    assert bars == synthetic_bars("SYN0002", bars[0].day, date(2026, 3, 31), seed=11)
+    assert market[-1].day == date(2026, 3, 31)
+    assert set(counts["tickers"]) >= {"SYN0001", "SYN0002", "SYN0003"}
+    assert watchlist == [("SYN0001", "stock"), ("SYN0002", "stock"), ("SYN0003", "stock")]
+    assert {"SYN0001", "SYN0002", "SYN0003"} <= universe
+    assert "SYN0001" not in {row["ticker"] for row in read_asset_universe()}
+
+
+def test_materialized_charts_share_the_chart_cache_byte_budget(tmp_path, monkeypatch) -> None:
+    write_synthetic_market(tmp_path, 80, seed=7, end=date(2026, 3, 31))
+    symbols = [f"SYN{index:04d}" for index in range(1, 81)]
+
+    with use_synthetic_market(tmp_path):
+        first = {symbol: fetch_chart(symbol)[1] for symbol in symbols}
+        assert all(fetch_chart(symbol)[1] is first[symbol] for symbol in symbols)
+        summary = chart_cache_report()["summary"]
+        assert summary["materialized_symbols"] == 80
+        assert summary["bytes"] + summary["materialized_bytes"] <= summary["max_bytes"]
+
+        monkeypatch.setattr(CHART_CACHE, "max_bytes", summary["bytes"] + summary["materialized_bytes"] // 8)
+        fetch_chart("SPY")
+        summary = chart_cache_report()["summary"]
+        assert 0 < summary["materialized_symbols"] < 80
+        assert summary["materialized_evictions"] > 0
+        assert summary["bytes"] + summary["materialized_bytes"] <= summary["max_bytes"]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import csv
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend import strategy_registry_service
+from backend.dashboard_service import strategy_lab_detail
+from backend.simulation_checkpoints import CHECKPOINTS_ENV
+from backend.strategy_registry_service import STRATEGY_FIELDS
+from backend.synthetic_market import use_synthetic_market, write_synthetic_market
+from backend.walk_forward_service import distribution, rolling_origins, walk_forward_response
+
+
+def write_registry(path: Path) -> None:
+    rows = [
+        {
+            "strategy_id": "mass-more-signals",
+            "strategy_name": "mass-more-signals",
+            "status": "research",
+            "entry_rule": "any non-none mass-change universe technical signal",
+            "exit_rule": "ten missing-signal sessions and one-month return <= -5%",
+            "news_rule": "ignore",
+            "universe": "mass-change watchlist",
+        },
+        {
+            "strategy_id": "unmapped",
+            "strategy_name": "unmapped",
+            "status": "research",
+            "entry_rule": "moon phase",
+            "exit_rule": "never sell",
+            "news_rule": "ignore",
+            "universe": "tracked stocks",
+        },
+    ]
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=STRATEGY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_rolling_origins_use_month_starts_or_fixed_steps() -> None:
+    days = [date(2026, 1, 28) + timedelta(days=offset) for offset in range(40) if offset % 7 < 5]
+
+    assert [days[index] for index in rolling_origins(days, 5)] == [date(2026, 1, 28), date(2026, 2, 1), date(2026, 3, 1)]
+    assert rolling_origins(days, 10, step_sessions=8) == [0, 8, 16]
+    with pytest.raises(ValueError):
+        rolling_origins(days, 0)
+
+
+def test_distribution_interpolates_percentiles() -> None:
+    summary = distribution([4.0, 1.0, 3.0, 2.0])
+
+    assert summary["min"] == 1.0
+    assert summary["median"] == 2.5
+    assert summary["p90"] == 3.7
+    assert distribution([])["count"] == 0
+
+
+def test_windows_match_separate_previews(tmp_path, monkeypatch) -> None:
+    write_synthetic_market(tmp_path, 4, seed=11, end=date(2026, 5, 29))
+    registry = tmp_path / "strategy_registry.csv"
+    write_registry(registry)
+    monkeypatch.setattr(strategy_registry_service, "STRATEGY_REGISTRY_FILE", registry)
+    monkeypatch.setenv(CHECKPOINTS_ENV, "0")
+
+    with use_synthetic_market(tmp_path):
+        response = walk_forward_response(None, window_sessions=15)
+        strategy = response["strategies"][0]
+        config = strategy["lab_config"]
+        previews = [
+            strategy_lab_detail(
+                date.fromisoformat(window["from_date"]),
+                date.fromisoformat(window["to_date"]),
+                **config,
+            )
+            for window in strategy["windows"][1:4]
+        ]
+
+    assert [row["strategy_id"] for row in response["skipped"]] == ["unmapped"]
+    assert strategy["strategy_id"] == "mass-more-signals"
+    assert strategy["windows_evaluated"] == len(strategy["windows"]) == strategy["return_pct"]["count"] == 4
+    for window, preview in zip(strategy["windows"][1:4], previews):
+        for key in ("initial_value", "current_value", "gain_loss", "return_pct"):
+            assert window[key] == preview[key]
+        assert 0 <= window["hit_rate_pct"] <= 100
+        assert window["max_drawdown_pct"] <= 0